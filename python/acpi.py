@@ -29,10 +29,13 @@
 import _acpi
 import bits
 import bits.cdata
+import bits.hexdump
+import bits.integrity
 import bits.pyfs
 import bitfields
-from cpudetect import cpulib
-from collections import OrderedDict
+import bisect
+from collections import Counter, namedtuple, OrderedDict
+import contextlib
 import copy
 from cStringIO import StringIO
 import ctypes
@@ -41,7 +44,9 @@ import itertools
 import os
 import string
 import struct
+import sys
 import ttypager
+import types
 import unpack
 
 def _id(v):
@@ -64,7 +69,7 @@ def display_resources(name):
             print repr(raw_descriptor)
             if raw_descriptor is None:
                 continue
-            for descriptor in parse_descriptor(raw_descriptor):
+            for descriptor in iter_descriptors(raw_descriptor):
                 print descriptor
             print
 
@@ -93,66 +98,85 @@ class resource_data(bits.cdata.Union):
         ('large_resource', large_resource),
     ]
 
-def parse_descriptor(buf):
-    large_factory = [
-        parse_VendorDefinedLargeDescriptor,
-        parse_ExtendedInterruptDescriptor,
-    ]
-    small_factory = [
-        parse_IRQDescriptor,
-        parse_StartDependentFunctionsDescriptor,
-        parse_VendorDefinedSmallDescriptor,
-    ]
-    large_descriptor_dict = {
-        1 : Memory24BitRangeDescriptor,
-        2 : GenericRegisterDescriptor,
-        4 : parse_VendorDefinedLargeDescriptor,
-        5 : Memory32BitRangeDescriptor,
-        6 : FixedMemory32BitRangeDescriptor,
-        7 : DwordAddressSpaceDescriptor,
-        8 : WordAddressSpaceDescriptor,
-        9 : parse_ExtendedInterruptDescriptor,
-        0xA : QwordAddressSpaceDescriptor,
-        0xB : ExtendedAddressSpaceDescriptor,
-        0xC : None,
-        0xE : None,
-    }
-    small_descriptor_dict = {
-        4 : parse_IRQDescriptor,
-        5 : DMADescriptor,
-        6 : parse_StartDependentFunctionsDescriptor,
-        7 : EndDependentFunctionsDescriptor,
-        8 : IOPortDescriptor,
-        9 : FixedIOPortDescriptor,
-        0xA : FixedDMADescriptor,
-        0xE : parse_VendorDefinedSmallDescriptor,
-        0xF : EndTagDescriptor,
-    }
-    descriptors = list()
+_descriptor_table = None
+
+def _resource_descriptor_table():
+    """Return a 256-entry table mapping a resource descriptor's tag byte to its parser.
+
+    Each entry is either a descriptor class, a function (buf, offset) that
+    returns the class for a variable-length descriptor, or None for an
+    unrecognized tag.  Small descriptors whose layout depends only on the
+    length in their tag byte get resolved to a class when building the table."""
+    global _descriptor_table
+    if _descriptor_table is None:
+        large_descriptor_dict = {
+            1 : Memory24BitRangeDescriptor,
+            2 : GenericRegisterDescriptor,
+            4 : parse_VendorDefinedLargeDescriptor,
+            5 : Memory32BitRangeDescriptor,
+            6 : FixedMemory32BitRangeDescriptor,
+            7 : DwordAddressSpaceDescriptor,
+            8 : WordAddressSpaceDescriptor,
+            9 : parse_ExtendedInterruptDescriptor,
+            0xA : QwordAddressSpaceDescriptor,
+            0xB : ExtendedAddressSpaceDescriptor,
+        }
+        small_descriptor_dict = {
+            4 : parse_IRQDescriptor,
+            5 : DMADescriptor,
+            6 : parse_StartDependentFunctionsDescriptor,
+            7 : EndDependentFunctionsDescriptor,
+            8 : IOPortDescriptor,
+            9 : FixedIOPortDescriptor,
+            0xA : FixedDMADescriptor,
+            0xE : parse_VendorDefinedSmallDescriptor,
+            0xF : EndTagDescriptor,
+        }
+        table = [None] * 256
+        for item_name, cls in large_descriptor_dict.iteritems():
+            table[(LARGE_RESOURCE << 7) | item_name] = cls
+        for item_name, cls in small_descriptor_dict.iteritems():
+            for length in range(8):
+                tag = (item_name << 3) | length
+                if isinstance(cls, type):
+                    table[tag] = cls
+                else:
+                    table[tag] = cls(chr(tag))
+        _descriptor_table = table
+    return _descriptor_table
+
+def iter_descriptors(buf):
+    """Yield the resource descriptors in buf one at a time.
+
+    Copies buf once; each descriptor refers to its bytes within that copy.
+    On an unrecognized descriptor, yields an AcpiBuffer of the remaining
+    bytes and stops."""
+    table = _resource_descriptor_table()
+    shared = bytearray(buf)
     current = 0
-    end = len(buf)
+    end = len(shared)
     while current < end:
-        cls = None
-        res = resource_data.from_buffer_copy(buf, current)
-        if res.rtype == LARGE_RESOURCE:
-            cls = large_descriptor_dict.get(res.large_resource.item_name)
-        elif res.rtype == SMALL_RESOURCE:
-            cls = small_descriptor_dict.get(res.small_resource.item_name)
-        if cls is not None:
-            if cls in large_factory or cls in small_factory:
-                descriptor = cls(buf[current:]).from_buffer_copy(buf, current)
-            else:
-                descriptor = cls.from_buffer_copy(buf, current)
-            current += descriptor.length
-            if res.rtype == LARGE_RESOURCE:
-                current += 3
-            elif res.rtype == SMALL_RESOURCE:
-                current += 1
-            descriptors.append(descriptor)
+        tag = shared[current]
+        cls = table[tag]
+        if cls is None:
+            yield AcpiBuffer(shared[current:])
+            return
+        if not isinstance(cls, type):
+            cls = cls(shared, current)
+        yield cls.from_buffer(shared, current)
+        if tag >> 7 == LARGE_RESOURCE:
+            current += 3 + (shared[current+1] | (shared[current+2] << 8))
         else:
-            return AcpiBuffer(buf[current:])
+            current += 1 + (tag & 7)
+
+def parse_descriptor(buf):
+    descriptors = list()
+    for descriptor in iter_descriptors(buf):
+        if isinstance(descriptor, AcpiBuffer):
+            return descriptor
+        descriptors.append(descriptor)
     if len(descriptors):
-        return tuple(d for d in descriptors)
+        return tuple(descriptors)
     return buf
 
 class IRQDescriptor2(bits.cdata.Struct):
@@ -209,8 +233,8 @@ class IRQDescriptor3(bits.cdata.Struct):
         ('information', irq_information),
     ]
 
-def parse_IRQDescriptor(buf):
-    des = small_resource.from_buffer_copy(buf)
+def parse_IRQDescriptor(buf, offset=0):
+    des = small_resource.from_buffer_copy(buf, offset)
     if des.length == 2:
         return IRQDescriptor2
     return IRQDescriptor3
@@ -295,8 +319,8 @@ class StartDependentFunctionsDescriptor1(bits.cdata.Struct):
         ('priority', priority),
     ]
 
-def parse_StartDependentFunctionsDescriptor(buf):
-    des = small_resource.from_buffer_copy(buf)
+def parse_StartDependentFunctionsDescriptor(buf, offset=0):
+    des = small_resource.from_buffer_copy(buf, offset)
     if des.length == 0:
         return StartDependentFunctionsDescriptor0
     return StartDependentFunctionsDescriptor1
@@ -365,6 +389,7 @@ class FixedDMADescriptor(bits.cdata.Struct):
         '_SIZ': unpack.format_table("DMA transfer width={}", _dma_transfer_widths),
     }
 
+@bits.cdata.memoize_factory
 def VendorDefinedSmallDescriptor_factory(num_vendor_bytes):
     """Vendor-Defined Descriptor"""
     class VendorDefinedSmallDescriptor(bits.cdata.Struct):
@@ -374,10 +399,9 @@ def VendorDefinedSmallDescriptor_factory(num_vendor_bytes):
         ]
     return VendorDefinedSmallDescriptor
 
-def parse_VendorDefinedSmallDescriptor(buf):
-    des = VendorDefinedSmallDescriptor_factory(0)
-    num_vendor_bytes = len(buf) - ctypes.sizeof(des)
-    return VendorDefinedSmallDescriptor_factory(num_vendor_bytes)
+def parse_VendorDefinedSmallDescriptor(buf, offset=0):
+    des = small_resource.from_buffer_copy(buf, offset)
+    return VendorDefinedSmallDescriptor_factory(des.length)
 
 class EndTagDescriptor(bits.cdata.Struct):
     """End Tag"""
@@ -419,6 +443,7 @@ class Memory24BitRangeDescriptor(bits.cdata.Struct):
         ('_LEN', ctypes.c_uint16),
     ]
 
+@bits.cdata.memoize_factory
 def VendorDefinedLargeDescriptor_factory(num_vendor_bytes):
     """Vendor-Defined Descriptor"""
     class VendorDefinedLargeDescriptor(bits.cdata.Struct):
@@ -431,9 +456,10 @@ def VendorDefinedLargeDescriptor_factory(num_vendor_bytes):
         ]
     return VendorDefinedLargeDescriptor
 
-def parse_VendorDefinedLargeDescriptor(buf):
-    des = VendorDefinedLargeDescriptor_factory(0)
-    num_vendor_bytes = len(buf) - ctypes.sizeof(des)
+def parse_VendorDefinedLargeDescriptor(buf, offset=0):
+    des = VendorDefinedLargeDescriptor_factory(0).from_buffer_copy(buf, offset)
+    # The length covers uuid_sub_type and uuid as well as the vendor bytes
+    num_vendor_bytes = des.length - (ctypes.sizeof(des) - 3)
     return VendorDefinedLargeDescriptor_factory(num_vendor_bytes)
 
 class Memory32BitRangeDescriptor(bits.cdata.Struct):
@@ -572,6 +598,7 @@ class interrupt_vector_info(bits.cdata.Union):
         ('bits', interrupt_vector_info_bits),
     ]
 
+@bits.cdata.memoize_factory
 def ExtendedInterruptDescriptor_factory(num_interrupts):
     class ExtendedInterruptDescriptor(bits.cdata.Struct):
         """Extended Address Space Descriptor"""
@@ -584,8 +611,8 @@ def ExtendedInterruptDescriptor_factory(num_interrupts):
         ]
     return ExtendedInterruptDescriptor
 
-def parse_ExtendedInterruptDescriptor(buf):
-    res = ExtendedInterruptDescriptor_factory(0).from_buffer_copy(buf)
+def parse_ExtendedInterruptDescriptor(buf, offset=0):
+    res = ExtendedInterruptDescriptor_factory(0).from_buffer_copy(buf, offset)
     return ExtendedInterruptDescriptor_factory(res.interrupt_table_length)
 
 class QwordAddressSpaceDescriptor(bits.cdata.Struct):
@@ -709,6 +736,250 @@ def display_prt(name="_PRT"):
                 print prt
             print
 
+def _eisa_id_str(value):
+    """Return the string form of an ID from _HID or _CID, decoding compressed EISA IDs"""
+    if not isinstance(value, (int, long)):
+        return value
+    value = struct.unpack(">I", struct.pack("<I", value))[0]
+    return "{}{}{}{:04X}".format(chr(0x40 + ((value >> 26) & 0x1f)), chr(0x40 + ((value >> 21) & 0x1f)), chr(0x40 + ((value >> 16) & 0x1f)), value & 0xffff)
+
+_pci_host_bridge_ids = frozenset(("PNP0A03", "PNP0A08"))
+
+def _is_pci_host_bridge(path):
+    ids = [evaluate(path + "._HID")]
+    cid = evaluate(path + "._CID")
+    if isinstance(cid, tuple):
+        ids.extend(cid)
+    else:
+        ids.append(cid)
+    return any(_eisa_id_str(i) in _pci_host_bridge_ids for i in ids if i is not None)
+
+def _crs_interrupt(crs, index=0):
+    """Return (irq, edge, active_low) for the first interrupt of resource descriptor index of a _CRS, or None"""
+    if not isinstance(crs, AcpiBuffer):
+        return None
+    des = next(itertools.islice(iter_descriptors(crs), index, None), None)
+    if isinstance(des, (IRQDescriptor2, IRQDescriptor3)):
+        irqs = [irq for irq in range(16) if des._INT & (1 << irq)]
+        if not irqs:
+            return None
+        if isinstance(des, IRQDescriptor2):
+            return irqs[0], True, False
+        return irqs[0], bool(des.information._HE), bool(des.information._LL)
+    if hasattr(des, "interrupt_number"):
+        if not des.interrupt_table_length:
+            return None
+        return des.interrupt_number[0], bool(des.interrupt_vector_flags._HE), bool(des.interrupt_vector_flags._LL)
+    return None
+
+class IntxRoute(namedtuple("IntxRoute", ("segment", "bus", "device", "pin", "gsi", "edge", "active_low", "link", "ioapic_id", "ioapic_input", "prt"))):
+    """Route of a PCI INTx pin to a GSI.
+
+    pin counts from 0 for INTA, as in _PRT. link is the path of the interrupt
+    link device, or None if the _PRT names the GSI directly. ioapic_id and
+    ioapic_input are None if no I/O APIC in the MADT covers the GSI. prt is
+    the path of the _PRT providing the route."""
+    __slots__ = ()
+
+class IOApic(namedtuple("IOApic", ("ioapic_id", "address", "gsi_base"))):
+    """An I/O APIC from the MADT"""
+    __slots__ = ()
+
+class IOApicSource(namedtuple("IOApicSource", ("segment", "bus", "device", "function", "drhd_address"))):
+    """PCI requester ID of an I/O APIC for interrupt remapping, from the DMAR.
+
+    drhd_address is the register base of the remapping hardware unit with
+    the I/O APIC in its device scope."""
+    __slots__ = ()
+
+class InterruptRouting(object):
+    """Index of PCI interrupt routing, from _PRT, link devices, the MADT and the DMAR.
+
+    routes maps (segment, bus, device, pin) to an IntxRoute, with pin
+    counting from 0 for INTA, as in _PRT. ioapics maps each I/O APIC ID to
+    an IOApic from the MADT. isa_gsi maps each ISA IRQ to its GSI, applying
+    the MADT interrupt source overrides. ioapic_sources maps I/O APIC IDs to
+    the IOApicSource the DMAR gives them.
+
+    Building the index evaluates \\_PIC(1) to select APIC mode, if present,
+    then each _PRT below a PCI bridge with a known bus number, and the _CRS
+    of each interrupt link device. Bus numbers below a host bridge come from
+    the secondary bus number of each PCI-to-PCI bridge; segments other than 0
+    need an MCFG entry. Lookups afterward don't evaluate anything."""
+
+    def __init__(self, namespace, apic, dmar, mcfg):
+        self.routes = OrderedDict()
+        self.ioapics = OrderedDict()
+        self.isa_gsi = OrderedDict((irq, irq) for irq in range(16))
+        self.ioapic_sources = OrderedDict()
+        self._gsi_ioapic = {}
+        self._ecam = {}
+        if mcfg is not None:
+            for resource in mcfg.resources:
+                self._ecam[resource.segment] = resource.address
+        if apic is not None:
+            madt = load_decoders("APIC")
+            for subtable in apic.interrupt_controller_structures:
+                if subtable.subtype == madt.MADT_TYPE_IO_APIC:
+                    self.ioapics[subtable.io_apic_id] = IOApic(subtable.io_apic_id, subtable.io_apic_addr, subtable.global_sys_int_base)
+                elif subtable.subtype == madt.MADT_TYPE_INT_SRC_OVERRIDE and subtable.bus == 0:
+                    self.isa_gsi[subtable.source] = int(subtable.global_sys_interrupt)
+        self._ioapic_bases = sorted((ioapic.gsi_base, ioapic.ioapic_id) for ioapic in self.ioapics.itervalues())
+        if namespace.node("\\_PIC") is not None:
+            evaluate("\\_PIC", 1)
+        self._bus_cache = {}
+        links = {}
+        for node in namespace.named("_PRT"):
+            bridge = node.parent.path
+            location = self._bridge_bus(bridge)
+            if location is None:
+                continue
+            segment, bus = location
+            for entry in make_prt(evaluate(node.path)) or ():
+                if isinstance(entry, PciRoutingTablePICgsi):
+                    gsi, edge, active_low, link = entry.global_system_interrupt, False, True, None
+                elif isinstance(entry, PciRoutingTableAPIC):
+                    link = entry.source.NamePath
+                    key = (link, entry.source_index)
+                    if key not in links:
+                        links[key] = _crs_interrupt(evaluate(link + "._CRS"), entry.source_index)
+                    if links[key] is None:
+                        continue
+                    gsi, edge, active_low = links[key]
+                else:
+                    continue
+                gsi = int(gsi)
+                device = int(entry.address.device)
+                ioapic_id, ioapic_input = self.ioapic_input(gsi)
+                self.routes[(segment, bus, device, entry.pin)] = IntxRoute(segment, bus, device, entry.pin, gsi, edge, active_low, link, ioapic_id, ioapic_input, node.path)
+        if dmar is not None:
+            dmar_decoders = load_decoders("DMAR")
+            for subtable in dmar.remapping_structures:
+                if subtable.subtype != dmar_decoders.ACPI_DMAR_TYPE_DRHD:
+                    continue
+                for scope in subtable.device_scopes:
+                    if scope.type != dmar_decoders.ACPI_DMAR_SCOPE_TYPE_IOAPIC or not len(scope.paths):
+                        continue
+                    bus = scope.start_bus_number
+                    for path in scope.paths[:-1]:
+                        bus = self._secondary_bus(subtable.segment_number, bus, path.pci_device, path.pci_function)
+                        if bus is None:
+                            break
+                    else:
+                        path = scope.paths[len(scope.paths) - 1]
+                        self.ioapic_sources[scope.enumeration_id] = IOApicSource(subtable.segment_number, bus, path.pci_device, path.pci_function, subtable.base_address)
+
+    def _config_read(self, segment, bus, device, function, offset):
+        """Read a byte of PCI configuration space, or return None if unreachable"""
+        try:
+            if segment == 0:
+                return bits.pci_read(bus, device, function, offset, bytes=1)
+            if segment in self._ecam and self._ecam[segment] < 2**32:
+                return bits.pcie_read(bus, device, function, offset, bytes=1, memaddr=self._ecam[segment])
+        except Exception:
+            pass
+        return None
+
+    def _secondary_bus(self, segment, bus, device, function):
+        """Return the secondary bus number of a PCI-to-PCI bridge, or None"""
+        header_type = self._config_read(segment, bus, device, function, 0x0E)
+        if header_type is None or header_type & 0x7f != 1:
+            return None
+        secondary = self._config_read(segment, bus, device, function, 0x19)
+        if secondary in (None, 0, 0xff):
+            return None
+        return secondary
+
+    def _bridge_bus(self, path):
+        """Return (segment, bus) for the bus below the PCI bridge device at path, or None"""
+        if path in self._bus_cache:
+            return self._bus_cache[path]
+        location = None
+        if _is_pci_host_bridge(path):
+            segment = evaluate(path + "._SEG")
+            bus = evaluate(path + "._BBN")
+            location = (segment or 0, bus or 0)
+        else:
+            adr = evaluate(path + "._ADR")
+            parent = path.rpartition(".")[0]
+            if adr is not None and parent:
+                parent_location = self._bridge_bus(parent)
+                if parent_location is not None:
+                    segment, bus = parent_location
+                    secondary = self._secondary_bus(segment, bus, (adr >> 16) & 0x1f, adr & 0x7)
+                    if secondary is not None:
+                        location = (segment, secondary)
+        self._bus_cache[path] = location
+        return location
+
+    def route(self, segment, bus, device, pin):
+        """Return the IntxRoute for a PCI device's INTx pin, or None"""
+        return self.routes.get((segment, bus, device, pin))
+
+    def gsi(self, segment, bus, device, pin):
+        """Return the GSI a PCI device's INTx pin routes to, or None"""
+        route = self.routes.get((segment, bus, device, pin))
+        if route is None:
+            return None
+        return route.gsi
+
+    def ioapic_input(self, gsi):
+        """Return (I/O APIC ID, input) for a GSI, or (None, None)
+
+        The MADT doesn't give the number of inputs of each I/O APIC, so a GSI
+        belongs to the I/O APIC with the highest GSI base at or below it."""
+        result = self._gsi_ioapic.get(gsi)
+        if result is None:
+            index = bisect.bisect_right(self._ioapic_bases, (gsi, 0x100)) - 1
+            if index < 0:
+                result = (None, None)
+            else:
+                base, ioapic_id = self._ioapic_bases[index]
+                result = (ioapic_id, int(gsi - base))
+            self._gsi_ioapic[gsi] = result
+        return result
+
+    def export(self):
+        """Return all routes as a list of dicts, sorted by segment, bus, device and pin"""
+        return [route._asdict() for key, route in sorted(self.routes.iteritems())]
+
+    def __str__(self):
+        lines = ["{:>4} {:>3} {:>3} {:>4} {:>5} {:>5} {:>4} {:>6}  {:<18} {}".format("seg", "bus", "dev", "pin", "gsi", "mode", "pol", "ioapic", "link", "prt")]
+        for key, route in sorted(self.routes.iteritems()):
+            if route.ioapic_id is None:
+                ioapic = "-"
+            else:
+                ioapic = "{}/{}".format(route.ioapic_id, route.ioapic_input)
+            lines.append("{:04x} {:03x} {:03x} INT{} {:5} {:>5} {:>4} {:>6}  {:<18} {}".format(route.segment, route.bus, route.device, "ABCD"[route.pin & 3], route.gsi, "edge" if route.edge else "level", "low" if route.active_low else "high", ioapic, route.link or "-", route.prt))
+        if self.ioapics:
+            lines.append("")
+            for ioapic in self.ioapics.itervalues():
+                line = "I/O APIC {} at {:#010x}, GSI base {}".format(ioapic.ioapic_id, ioapic.address, ioapic.gsi_base)
+                source = self.ioapic_sources.get(ioapic.ioapic_id)
+                if source is not None:
+                    line += ", DMAR source {:04x}:{:02x}:{:02x}.{} (DRHD {:#x})".format(source.segment, source.bus, source.device, source.function, source.drhd_address)
+                lines.append(line)
+        overrides = [(irq, gsi) for irq, gsi in self.isa_gsi.iteritems() if irq != gsi]
+        if overrides:
+            lines.append("")
+            lines.extend("ISA IRQ {} -> GSI {}".format(irq, gsi) for irq, gsi in overrides)
+        return "\n".join(lines)
+
+_interrupt_routing = None
+
+def get_interrupt_routing():
+    """Return the InterruptRouting index.
+
+    The index gets built on first use, and again after the namespace changes."""
+    global _interrupt_routing
+    if _interrupt_routing is None:
+        _interrupt_routing = InterruptRouting(get_namespace(), parse_table("APIC"), parse_table("DMAR"), parse_table("MCFG"))
+    return _interrupt_routing
+
+def display_interrupt_routing():
+    with ttypager.page():
+        print get_interrupt_routing()
+
 class AcpiPower(bits.cdata.Struct):
     _pack_ = 1
     _fields_ = [
@@ -798,22 +1069,110 @@ def _acpi_object_from_python(obj):
     if isinstance(obj, tuple):
         return (ACPI_TYPE_PACKAGE, tuple(_acpi_object_from_python(arg) for arg in obj))
 
+class EvaluationCache(object):
+    """Cache of evaluate results for ACPI objects without side effects.
+
+    Disabled by default; set enabled, or use cached_evaluation(), to opt in.
+    Only objects of a type in pure_types, or with a name in pure_names, get
+    cached, keyed by path, arguments and unsafe_io setting. Loading a table,
+    changing the _OSI interfaces, and anything else that changes the
+    namespace clears the cache. AML can Store into data objects, so
+    evaluating any other Method while the cache is enabled clears it as well.
+    Cached results get returned as is, so don't modify them."""
+
+    # Evaluating data objects returns their value without running AML
+    pure_types = frozenset((
+        ACPI_TYPE_INTEGER,
+        ACPI_TYPE_STRING,
+        ACPI_TYPE_BUFFER,
+        ACPI_TYPE_PACKAGE,
+        ACPI_TYPE_POWER,
+        ACPI_TYPE_PROCESSOR,
+    ))
+
+    # Methods that only compute a description of the platform
+    pure_names = frozenset((
+        "_ADR", "_CID", "_CSD", "_CST", "_HID", "_MAT", "_PCT", "_PSD",
+        "_PSS", "_PTC", "_PXM", "_SUN", "_TSD", "_TSS", "_UID",
+    ))
+
+    def __init__(self):
+        self.enabled = False
+        self.hits = 0
+        self.misses = 0
+        self._results = {}
+
+    def clear(self):
+        """Discard all cached results"""
+        self._results.clear()
+
+    def stats(self):
+        """Return a dict of hit, miss, and entry counts"""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._results)}
+
+    def key(self, pathname, args, unsafe_io):
+        """Return the cache key for an evaluation, or None if not cacheable.
+
+        Clears the cache for a Method that doesn't get cached, since running
+        it may change the value of data objects."""
+        node = get_namespace().node(pathname)
+        if node is None:
+            return None
+        if node.object_type not in self.pure_types and node.name not in self.pure_names:
+            if node.object_type == ACPI_TYPE_METHOD:
+                self.clear()
+            return None
+        key = (node.path, args, unsafe_io)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+eval_cache = EvaluationCache()
+
+@contextlib.contextmanager
+def cached_evaluation():
+    """Context manager that enables eval_cache within its body"""
+    old_enabled = eval_cache.enabled
+    eval_cache.enabled = True
+    try:
+        yield eval_cache
+    finally:
+        eval_cache.enabled = old_enabled
+
 def evaluate(pathname, *args, **kwargs):
     """Evaluate an ACPI method and return the result.
 
     By default, ACPI method evaluation allows reads and writes of I/O ports.
     Pass the keyword argument unsafe_io=False to silently ignore I/O
-    operations."""
-    global acpi_unsafe_io
+    operations.
+
+    If eval_cache is enabled, evaluating an object without side effects again
+    returns the cached result."""
     unsafe_io = kwargs.get("unsafe_io")
+    key = None
+    if eval_cache.enabled:
+        key = eval_cache.key(pathname, args, bool(_native_unsafe_io.value) if unsafe_io is None else unsafe_io)
+        if key is not None:
+            try:
+                result = eval_cache._results[key]
+            except KeyError:
+                eval_cache.misses += 1
+            else:
+                eval_cache.hits += 1
+                return result
     if unsafe_io is not None:
-        old_unsafe_io = acpi_unsafe_io
-        acpi_unsafe_io = unsafe_io
+        old_unsafe_io = _native_unsafe_io.value
+        _native_unsafe_io.value = unsafe_io
     try:
-        return _acpi_object_to_python(_acpi._eval(pathname, tuple(_acpi_object_from_python(arg) for arg in args)))
+        result = _acpi_object_to_python(_acpi._eval(pathname, tuple(_acpi_object_from_python(arg) for arg in args)))
     finally:
         if unsafe_io is not None:
-            acpi_unsafe_io = old_unsafe_io
+            _native_unsafe_io.value = old_unsafe_io
+    if key is not None:
+        eval_cache._results[key] = result
+    return result
 
 acpi_object_types = {
     ACPI_TYPE_INTEGER: 'ACPI_TYPE_INTEGER',
@@ -835,6 +1194,7 @@ acpi_object_types = {
     ACPI_TYPE_LOCAL_REFERENCE: 'ACPI_TYPE_LOCAL_REFERENCE',
 }
 
+@bits.cdata.memoize_factory
 def ObjectInfo_factory(ids_length):
     class object_info_flags_bits(bits.cdata.Struct):
         _pack_ = 1
@@ -901,28 +1261,31 @@ def ObjectInfo_factory(ids_length):
         return s.unpack_peek_one("{}x{}s".format(offset - addr, length)).split("\x00", 1)[0]
 
 class ObjectInfo(unpack.Struct):
+    _layout = unpack.Layout([
+        ('info_size', "<I"),
+        ('name', "4s"),
+        ('object_type', "<I", unpack.format_table("{}", acpi_object_types)),
+        ('parameter_count', "B"),
+        ('valid', "B"),
+        ('current_status_valid', unpack.field_bit('valid', 0), "valid[0]={}"),
+        ('address_valid', unpack.field_bit('valid', 1), "valid[1]={}"),
+        ('hardware_id_valid', unpack.field_bit('valid', 2), "valid[2]={}"),
+        ('unique_id_valid', unpack.field_bit('valid', 3), "valid[3]={}"),
+        ('subsystem_id_valid', unpack.field_bit('valid', 4), "valid[4]={}"),
+        ('compatibility_id_valid', unpack.field_bit('valid', 5), "valid[5]={}"),
+        ('highest_dstates_valid', unpack.field_bit('valid', 6), "valid[6]={}"),
+        ('lowest_dstates_valid', unpack.field_bit('valid', 7), "valid[7]={}"),
+        ('flags', "B"),
+        ('highest_dstates', "4B"),
+        ('lowest_dstates', "5B"),
+        ('current_status', "<I"),
+    ])
+
     def __init__(self, data, addr):
         super(ObjectInfo, self).__init__()
         u = unpack.Unpackable(data)
         s = unpack.Unpackable(data)
-        self.add_field('info_size', u.unpack_one("<I"))
-        self.add_field('name', u.unpack_one("4s"))
-        self.add_field('object_type', u.unpack_one("<I"), unpack.format_table("{}", acpi_object_types))
-        self.add_field('parameter_count', u.unpack_one("B"))
-        self.add_field('valid', u.unpack_one("B"))
-        self.add_field('current_status_valid', bool(bitfields.getbits(self.valid, 0)), "valid[0]={}")
-        self.add_field('address_valid', bool(bitfields.getbits(self.valid, 1)), "valid[1]={}")
-        self.add_field('hardware_id_valid', bool(bitfields.getbits(self.valid, 2)), "valid[2]={}")
-        self.add_field('unique_id_valid', bool(bitfields.getbits(self.valid, 3)), "valid[3]={}")
-        self.add_field('subsystem_id_valid', bool(bitfields.getbits(self.valid, 4)), "valid[4]={}")
-        self.add_field('compatibility_id_valid', bool(bitfields.getbits(self.valid, 5)), "valid[5]={}")
-        self.add_field('highest_dstates_valid', bool(bitfields.getbits(self.valid, 6)), "valid[6]={}")
-        self.add_field('lowest_dstates_valid', bool(bitfields.getbits(self.valid, 7)), "valid[7]={}")
-
-        self.add_field('flags', u.unpack_one("B"))
-        self.add_field('highest_dstates', tuple(u.unpack_one("B") for i in range(4)))
-        self.add_field('lowest_dstates', tuple(u.unpack_one("B") for i in range(5)))
-        self.add_field('current_status', u.unpack_one("<I"))
+        self._layout.unpack(u, self)
 
         if self.current_status_valid:
             self.add_field('present', bool(bitfields.getbits(self.current_status, 0)), "current_status[0]={}")
@@ -957,12 +1320,249 @@ def scope(path):
     except ValueError:
         return "/"
 
+def _table_source(val):
+    """Return the address, data and buffer of a table to decode.
+
+    val may be the address of a table in memory, the name of a file
+    containing a table, or the table itself as a bytearray, a buffer, or a
+    string containing NUL bytes (which no filename can contain). For a file
+    or table contents, data holds the table, and address points to a copy in
+    buf, which the caller must keep alive. For an address, data and buf are
+    None."""
+    if isinstance(val, (int, long)):
+        return val, None, None
+    if isinstance(val, str) and "\0" not in val:
+        data = open(val, "rb").read()
+    elif isinstance(val, str):
+        data = val
+    else:
+        data = str(bytearray(val))
+    buf = ctypes.create_string_buffer(data, len(data))
+    return ctypes.addressof(buf), data, buf
+
+def _subtable_source(val, length):
+    """Return the address, length and buffer of a list of subtables.
+
+    val may be an address (with length giving the length of the subtables),
+    or the subtables themselves as a string, bytearray, or buffer. For the
+    subtables themselves, the address points to a copy in buf, which the
+    caller must keep alive."""
+    if isinstance(val, (int, long)):
+        return val, length, None
+    if not isinstance(val, str):
+        val = str(bytearray(val))
+    if length is None:
+        length = len(val)
+    buf = ctypes.create_string_buffer(val, len(val))
+    return ctypes.addressof(buf), length, buf
+
 def parse_table(signature, instance=1):
     addr = get_table_addr(signature, instance)
     if addr is None:
         return None
     signature = string.rstrip(signature,"!")
-    return globals()[signature](addr)
+    return _lookup(signature)(addr)
+
+# Table decoders live in the acpitables package, one module per signature,
+# and get loaded the first time something needs them.
+_table_decoders = {
+    "APIC": "apic",
+    "ASF": "asf",
+    "BERT": "bert",
+    "DMAR": "dmar",
+    "EINJ": "einj",
+    "FACP": "facp",
+    "FACS": "facs",
+    "HPET": "hpet",
+    "MCFG": "mcfg",
+    "MPST": "mpst",
+    "MSCT": "msct",
+    "MSDM": "msdm",
+    "PCCT": "pcct",
+    "PMTT": "pmtt",
+    "SLIC": "slic",
+    "SLIT": "slit",
+    "SPCR": "spcr",
+    "SRAT": "srat",
+    "UEFI": "uefi",
+    "WDDT": "wddt",
+}
+
+# The names each decoder module exports in its __all__, so that looking one
+# of them up on the acpi module loads the right decoder.  load_decoders
+# checks that these match.
+_decoder_exports = {
+    "APIC": (
+        "APIC", "APICSubtable", "APICSubtableIOApic",
+        "APICSubtableIntSrcOverride", "APICSubtableLocalApic",
+        "APICSubtableLocalApicNmi", "APICSubtableLocalGIC",
+        "APICSubtableLocalGICDistributor", "APICSubtableLocalGIC_flags",
+        "APICSubtableLocalGIC_flags_bits", "APICSubtableLocalx2Apic",
+        "APICSubtableLocalx2ApicNmi", "APICSubtableNmiIntSrc",
+        "APICSubtableUnknown_factory", "APICSubtable_int_flags",
+        "APICSubtable_int_flags_bits", "APIC_table_flags",
+        "APIC_table_flags_bits", "MADT_TYPE_INT_SRC_OVERRIDE",
+        "MADT_TYPE_IO_APIC", "MADT_TYPE_LOCAL_APIC",
+        "MADT_TYPE_LOCAL_APIC_NMI", "MADT_TYPE_LOCAL_GIC",
+        "MADT_TYPE_LOCAL_GIC_DISTRIBUTOR", "MADT_TYPE_LOCAL_X2APIC",
+        "MADT_TYPE_LOCAL_X2APIC_NMI", "MADT_TYPE_NMI_INT_SRC", "_MAT",
+        "_mat_factory", "_performance_interrupt_mode", "apic_factory",
+        "apic_subtable_list", "local_apic_flags", "local_apic_flags_bits",
+        "mps_inti_polarity", "mps_inti_trigger_mode", "parse_apic",
+        "parse_mat",
+    ),
+    "ASF": (
+        "ASF", "ASFSubtable", "ASF_ADDR", "ASF_ALERTDATA", "ASF_ALRT",
+        "ASF_CONTROLDATA", "ASF_INFO", "ASF_RCTL", "ASF_RMCP",
+        "ASF_addr_record_factory", "ASF_alrt_factory",
+        "ASF_boot_options_capabilities_1",
+        "ASF_boot_options_capabilities_1_bits",
+        "ASF_boot_options_capabilities_2",
+        "ASF_boot_options_capabilities_2_bits", "ASF_factory",
+        "ASF_info_flags", "ASF_info_flags_bits", "ASF_info_record",
+        "ASF_rctl_factory", "ASF_rmcp", "ASF_special_commands_2",
+        "ASF_special_commands_2_bits", "ASF_subtable_list",
+        "ASF_subtable_unknown_factory", "ASF_system_capabilities",
+        "ASF_system_capabilities_bits", "fixed_smbus_address", "parse_asf",
+    ),
+    "BERT": (
+        "BERT", "BERT_v1", "block_status_flags", "block_status_flags_bits",
+        "boot_error_region", "error_severity_flags",
+        "error_severity_flags_bits", "generic_error_data_entry", "parse_bert",
+    ),
+    "DMAR": (
+        "ACPI_DMAR_SCOPE_TYPE_BRIDGE", "ACPI_DMAR_SCOPE_TYPE_ENDPOINT",
+        "ACPI_DMAR_SCOPE_TYPE_HPET", "ACPI_DMAR_SCOPE_TYPE_IOAPIC",
+        "ACPI_DMAR_SCOPE_TYPE_NAMESPACE", "ACPI_DMAR_TYPE_ANDD",
+        "ACPI_DMAR_TYPE_ATSR", "ACPI_DMAR_TYPE_DRHD", "ACPI_DMAR_TYPE_RHSA",
+        "ACPI_DMAR_TYPE_RMRR", "DMAR", "DMARDeviceScopePath",
+        "DMARDeviceScope_factory", "DMARSubTableANDD_factory", "DMARSubtable",
+        "DMARSubtableATSR_factory", "DMARSubtableDRHD_factory",
+        "DMARSubtableRHSA", "DMARSubtableRMRR_factory",
+        "DMARSubtableUnknown_factory", "atsr_flags", "atsr_flags_bits",
+        "dmar_device_scope_list", "dmar_factory", "dmar_flags",
+        "dmar_flags_bits", "dmar_subtable_list", "drhd_flags",
+        "drhd_flags_bits", "parse_dmar",
+    ),
+    "EINJ": (
+        "EINJ", "InjectionInstructionEntry", "_error_injection_action",
+        "_error_injection_instruction", "einj_factory", "error_type_flags",
+        "error_type_flags_bits", "injection_instruction_entry_flags",
+        "injection_instruction_entry_flags_bits", "parse_einj",
+        "pcie_sbdf_struct", "pcie_sbdf_struct_bits",
+        "set_error_type_with_addr", "set_error_type_with_addr_flags",
+        "set_error_type_with_addr_flags_bits", "trigger_error_action",
+        "trigger_error_action_factory", "trigger_error_header",
+        "vendor_error_type_extension",
+    ),
+    "FACP": (
+        "FACP", "FACP_v1", "FACP_v3", "FACP_v4", "FACP_v5",
+        "_preferred_pm_profile", "facp_flags_bits_v1", "facp_flags_bits_v3",
+        "facp_flags_bits_v5", "facp_flags_v1", "facp_flags_v3",
+        "facp_flags_v5", "facp_iapc_arch_bits_v3", "facp_iapc_arch_bits_v4",
+        "facp_iapc_arch_bits_v5", "facp_iapc_arch_v3", "facp_iapc_arch_v4",
+        "facp_iapc_arch_v5", "parse_facp",
+    ),
+    "FACS": (
+        "FACS", "FACS_v0", "FACS_v1", "FACS_v2", "facs_flags",
+        "facs_flags_bits", "facs_flags_bits_v2", "facs_flags_v2",
+        "facs_global_lock", "facs_global_lock_bits", "facs_ospm_flags",
+        "facs_ospm_flags_bits", "parse_facs",
+    ),
+    "HPET": (
+        "HPET", "HPET_v1", "_page_protection_table", "event_timer_block_id",
+        "event_timer_block_id_bits", "hpet_capabilities",
+        "hpet_capabilities_bits", "parse_hpet",
+    ),
+    "MCFG": (
+        "MCFG", "MCFGResource", "mcfg_factory", "parse_mcfg",
+    ),
+    "MPST": (
+        "MPST", "MPSTCharacteristics", "MPSTMemPowerNode_factory",
+        "MPSTMemPowerNode_flags", "MPSTMemPowerNode_flags_bits", "MPSTState",
+        "mpst_factory", "mpst_subtable_list", "parse_mpst",
+        "power_state_structure_flags", "power_state_structure_flags_bits",
+        "power_state_structure_id", "power_state_structure_id_bits",
+    ),
+    "MSCT": (
+        "MSCT", "MSCTProximityDomainInfo_v1", "msct_factory", "parse_msct",
+    ),
+    "MSDM": (
+        "MSDM", "msdm_factory", "parse_msdm",
+    ),
+    "PCCT": (
+        "PCCT", "PCCTGenericCommSubspace", "PCCTSubtable",
+        "PCCT_GENERIC_COMMUNICATION_SUBSPACE", "PCCT_flags",
+        "PCCT_flags_bits", "parse_pcct", "pcct_factory", "pcct_subtable_list",
+        "pcct_subtable_unknown_factory",
+    ),
+    "PMTT": (
+        "PMTT", "PMTTSubtable", "PMTTSubtableDIMM",
+        "PMTTSubtableMemController_factory", "PMTTSubtableSocket_factory",
+        "PMTT_DIMM", "PMTT_MEMORY_CONTROLLER", "PMTT_SOCKET",
+        "PMTT_component_memory_type", "PMTT_flags", "PMTT_flags_bits",
+        "parse_pmtt", "pmtt_factory", "pmtt_subtable_list",
+        "pmtt_subtable_unknown_factory",
+    ),
+    "SLIC": (
+        "SLIC", "parse_slic", "slic_factory",
+    ),
+    "SLIT": (
+        "SLIT", "parse_slit", "slit_factory",
+    ),
+    "SPCR": (
+        "SPCR", "SPCR_v1", "_format_baud", "baud", "flow_control",
+        "flow_control_bits", "parse_spcr",
+    ),
+    "SRAT": (
+        "SRAT", "SRATLocalApicAffinity", "SRATLocalApicAffinity_flags",
+        "SRATLocalApicAffinity_flags_bits", "SRATLocalX2ApicAffinity",
+        "SRATLocalX2ApicAffinity_flags", "SRATLocalX2ApicAffinity_flags_bits",
+        "SRATMemoryAffinity", "SRATMemoryAffinity_flags",
+        "SRATMemoryAffinity_flags_bits", "SRATSubtable",
+        "SRATSubtableUnknown_factory", "SRAT_LOCAL_APIC_AFFINITY",
+        "SRAT_LOCAL_X2APIC_AFFINITY", "SRAT_MEMORY_AFFINITY", "parse_srat",
+        "srat_factory",
+    ),
+    "UEFI": (
+        "UEFI", "parse_uefi", "uefi_factory",
+    ),
+    "WDDT": (
+        "WDDT", "WDDT_v1", "_ownership_decode", "_wdt_active_decode",
+        "_wdt_available_decode", "parse_wddt", "wddt_capability",
+        "wddt_capability_bits", "wddt_status", "wddt_status_bits",
+    ),
+}
+
+_decoder_names = dict((name, signature) for signature, names in _decoder_exports.iteritems() for name in names)
+
+_loaded_decoders = {}
+
+def load_decoders(signature):
+    """Load the decoder module for a table signature and return it.
+
+    The names in the module's __all__ also become attributes of the acpi
+    module; __all__ must match _decoder_exports, so that looking up any of
+    those names loads the module."""
+    signature = string.rstrip(signature, "!")
+    name = "acpitables." + _table_decoders[signature]
+    module = _loaded_decoders.get(name)
+    if module is None:
+        __import__(name)
+        module = sys.modules[name]
+        assert set(module.__all__) == set(_decoder_exports[signature]), "{}.__all__ does not match _decoder_exports[{!r}]".format(name, signature)
+        g = globals()
+        for key in module.__all__:
+            g.setdefault(key, getattr(module, key))
+        _loaded_decoders[name] = module
+    return module
+
+def _lookup(name):
+    """Look up a global of the acpi module, loading table decoders if needed"""
+    g = globals()
+    if name not in g:
+        load_decoders(_decoder_names[name])
+    return g[name]
 
 def make_compat_parser(signature):
     def parse(printflag=False, instance=1):
@@ -995,19 +1595,15 @@ class RSDP_v2(bits.cdata.Struct):
     ]
 
 def RSDP(val):
-    """Create class based on decode of an RSDP table from address or filename."""
-    addr = val
-    if isinstance(val, str):
-        data = open(val).read()
-        buf = ctypes.create_string_buffer(data, len(data))
-        addr = ctypes.addressof(buf)
+    """Create class based on decode of an RSDP table from address, filename, or data."""
+    addr, data, buf = _table_source(val)
     r = RSDP_v1.from_address(addr)
     cls = RSDP_v1
     if r.revision == 2:
         cls = RSDP_v2
-    if isinstance(val, str):
+    if data is not None:
         return cls.from_buffer_copy(data)
-    return cls.from_address(addr)
+    return bits.cdata.from_address(cls, addr)
 
 parse_rsdp = make_compat_parser("RSDP")
 
@@ -1028,6 +1624,7 @@ class TableHeader(bits.cdata.Struct):
 def format_table_addrs(addrs):
     return "(\n{})".format(",\n".join("{:#x} ({})".format(addr, (ctypes.c_char * 4).from_address(addr).raw) for addr in addrs))
 
+@bits.cdata.memoize_factory
 def rsdt_factory(num_tables, no_formats=False):
     formats = { 'tables': format_table_addrs, }
     if no_formats:
@@ -1042,19 +1639,16 @@ def rsdt_factory(num_tables, no_formats=False):
     return RSDT_v1
 
 def RSDT(val):
-    addr = val
-    if isinstance(val, str):
-        data = open(val).read()
-        buf = ctypes.create_string_buffer(data, len(data))
-        addr = ctypes.addressof(buf)
+    addr, data, buf = _table_source(val)
     hdr = TableHeader.from_address(addr)
     num_tables = (hdr.length - ctypes.sizeof(TableHeader)) / ctypes.sizeof(ctypes.c_uint32)
-    if isinstance(val, str):
+    if data is not None:
         return rsdt_factory(num_tables, no_formats=True).from_buffer_copy(data)
-    return rsdt_factory(num_tables).from_address(addr)
+    return bits.cdata.from_address(rsdt_factory(num_tables), addr)
 
 parse_rsdt = make_compat_parser("RSDT")
 
+@bits.cdata.memoize_factory
 def xsdt_factory(num_tables, no_formats=False):
     formats = { 'tables': format_table_addrs, }
     if no_formats:
@@ -1069,268 +1663,16 @@ def xsdt_factory(num_tables, no_formats=False):
     return XSDT_v1
 
 def XSDT(val):
-    """Create class based on decode of an XSDT table from address or filename."""
-    addr = val
-    if isinstance(val, str):
-        data = open(val).read()
-        buf = ctypes.create_string_buffer(data, len(data))
-        addr = ctypes.addressof(buf)
+    """Create class based on decode of an XSDT table from address, filename, or data."""
+    addr, data, buf = _table_source(val)
     hdr = TableHeader.from_address(addr)
     num_tables = (hdr.length - ctypes.sizeof(TableHeader)) / ctypes.sizeof(ctypes.c_uint64)
-    if isinstance(val, str):
+    if data is not None:
         return xsdt_factory(num_tables, no_formats=True).from_buffer_copy(data)
-    return xsdt_factory(num_tables).from_address(addr)
+    return bits.cdata.from_address(xsdt_factory(num_tables), addr)
 
 parse_xsdt = make_compat_parser("XSDT")
 
-class DMARSubtable(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('subtype', ctypes.c_uint16),
-        ('length', ctypes.c_uint16),
-    ]
-
-class DMARDeviceScopePath(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('pci_device', ctypes.c_uint8),
-        ('pci_function', ctypes.c_uint8),
-    ]
-
-def DMARDeviceScope_factory(num_dev_scope_path):
-    class DMARDeviceScope(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = [
-            ('type', ctypes.c_uint8),
-            ('length', ctypes.c_uint8),
-            ('reserved', ctypes.c_uint16),
-            ('enumeration_id', ctypes.c_uint8),
-            ('start_bus_number', ctypes.c_uint8),
-            ('paths', DMARDeviceScopePath * num_dev_scope_path),
-        ]
-    return DMARDeviceScope
-
-def dmar_device_scope_list(addr, length):
-    end = addr + length
-    field_list = list()
-    subtable_num = 0
-    base_len_DMARDeviceScope = ctypes.sizeof(DMARDeviceScope_factory(0))
-    len_DMARDeviceScopePath = ctypes.sizeof(DMARDeviceScopePath)
-    while addr < end:
-        subtable_num += 1
-        subtable = DMARDeviceScope_factory(0).from_address(addr)
-        num_dev_scope_path = (subtable.length - base_len_DMARDeviceScope) / len_DMARDeviceScopePath
-        cls = DMARDeviceScope_factory(num_dev_scope_path)
-        addr += subtable.length
-        field_list.append( ('subtable{}'.format(subtable_num), cls) )
-    return field_list
-
-class drhd_flags_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('include_pci_all', ctypes.c_uint8, 1),
-    ]
-
-class drhd_flags(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint8),
-        ('bits', drhd_flags_bits),
-    ]
-
-def DMARSubtableDRHD_factory(field_list):
-
-    class subtables(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = field_list
-
-        def __iter__(self):
-            for f in self._fields_:
-                yield getattr(self, f[0])
-
-    class DMARSubtableDRHD(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = copy.copy(DMARSubtable._fields_) + [
-            ('flags', drhd_flags),
-            ('reserved', ctypes.c_uint8),
-            ('segment_number', ctypes.c_uint16),
-            ('base_address', ctypes.c_uint64),
-            ('device_scopes', subtables)
-        ]
-    return DMARSubtableDRHD
-
-def DMARSubtableRMRR_factory(field_list):
-
-    class subtables(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = field_list
-
-        def __iter__(self):
-            for f in self._fields_:
-                yield getattr(self, f[0])
-
-    class DMARSubtableRMRR(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = copy.copy(DMARSubtable._fields_) + [
-            ('reserved', ctypes.c_uint16),
-            ('segment_number', ctypes.c_uint16),
-            ('base_address', ctypes.c_uint64),
-            ('limit_address', ctypes.c_uint64),
-            ('device_scopes', subtables),
-        ]
-
-    return DMARSubtableRMRR
-
-class atsr_flags_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('all_ports', ctypes.c_uint8, 1),
-    ]
-
-class atsr_flags(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint8),
-        ('bits', atsr_flags_bits),
-    ]
-
-def DMARSubtableATSR_factory(field_list):
-
-    class subtables(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = field_list
-
-        def __iter__(self):
-            for f in self._fields_:
-                yield getattr(self, f[0])
-
-    class DMARSubtableATSR(bits.cdata.Struct):
-        _pack = 1
-        _fields_ = copy.copy(DMARSubtable._fields_) + [
-            ('flags', atsr_flags),
-            ('reserved', ctypes.c_uint8),
-            ('segment_number', ctypes.c_uint16),
-            ('device_scopes', subtables),
-        ]
-    return DMARSubtableATSR
-
-class DMARSubtableRHSA(bits.cdata.Struct):
-    _pack = 1
-    _fields_ = copy.copy(DMARSubtable._fields_) + [
-        ('reserved', ctypes.c_uint32),
-        ('base_address', ctypes.c_uint64),
-        ('proximity_domain', ctypes.c_uint32),
-    ]
-
-def DMARSubTableANDD_factory(obj_name_len):
-    class DMARSubTableANDD(bits.cdata.Struct):
-        _pack = 1
-        _fields_ = copy.copy(DMARSubtable._fields_) + [
-            ('reserved', ctypes.c_uint8 * 3),
-            ('device_num', ctypes.c_uint8),
-            ('object_name', ctypes.c_char * obj_name_len),
-        ]
-    return DMARSubTableANDD
-
-def DMARSubtableUnknown_factory(data_len):
-    class DMARSubtableUnknown(bits.cdata.Struct):
-        _pack = 1
-        _fields_ = copy.copy(DMARSubtable._fields_) + [
-            ('data', ctypes.c_uint8 * data_len),
-        ]
-    return DMARSubtableUnknown
-
-ACPI_DMAR_TYPE_DRHD = 0
-ACPI_DMAR_TYPE_RMRR = 1
-ACPI_DMAR_TYPE_ATSR = 2
-ACPI_DMAR_TYPE_RHSA = 3
-ACPI_DMAR_TYPE_ANDD = 4
-
-def dmar_subtable_list(addr, length):
-    end = addr + length
-    field_list = list()
-    subtable_num = 0
-    base_len_DRHD = ctypes.sizeof(DMARSubtableDRHD_factory(list()))
-    base_len_RMRR = ctypes.sizeof(DMARSubtableRMRR_factory(list()))
-    base_len_ATSR = ctypes.sizeof(DMARSubtableATSR_factory(list()))
-    base_len_ANDD = ctypes.sizeof(DMARSubTableANDD_factory(0))
-    while addr < end:
-        subtable_num += 1
-        subtable = DMARSubtable.from_address(addr)
-        if subtable.subtype == ACPI_DMAR_TYPE_DRHD:
-            next_field_list = dmar_device_scope_list(addr + base_len_DRHD, subtable.length - base_len_DRHD)
-            cls = DMARSubtableDRHD_factory(next_field_list)
-        elif subtable.subtype == ACPI_DMAR_TYPE_RMRR:
-            next_field_list = dmar_device_scope_list(addr + base_len_RMRR, subtable.length - base_len_RMRR)
-            cls = DMARSubtableRMRR_factory(next_field_list)
-        elif subtable.subtype == ACPI_DMAR_TYPE_ATSR:
-            next_field_list = dmar_device_scope_list(addr + base_len_ATSR, subtable.length - base_len_ATSR)
-            cls = DMARSubtableATSR_factory(next_field_list)
-        elif subtable.subtype == ACPI_DMAR_TYPE_RHSA:
-            cls = DMARSubtableRHSA
-        elif subtable.subtype == ACPI_DMAR_TYPE_ANDD:
-            cls = DMARSubTableANDD_factory(subtable.length - base_len_ANDD)
-        else:
-            cls = DMARSubtableUnknown_factory(subtable.length - ctypes.sizeof(DMARSubtable))
-        addr += subtable.length
-        field_list.append( ('subtable{}'.format(subtable_num), cls) )
-    return field_list
-
-class dmar_flags_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('intr_remap', ctypes.c_uint8, 1),
-        ('x2apic_opt_out', ctypes.c_uint8, 1),
-    ]
-
-class dmar_flags(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint8),
-        ('bits', dmar_flags_bits),
-    ]
-
-def dmar_factory(field_list):
-
-    class subtables(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = field_list
-
-        def __iter__(self):
-            for f in self._fields_:
-                yield getattr(self, f[0])
-
-    class DMAR_v1(bits.cdata.Struct):
-        _pack = 1
-        _fields_ = [
-            ('header', TableHeader),
-            ('host_addr_width', ctypes.c_uint8),
-            ('flags', ctypes.c_uint8),
-            ('reserved', ctypes.c_uint8 * 10),
-            ('remapping_structures', subtables),
-        ]
-
-    return DMAR_v1
-
-def DMAR(val):
-    """Create class based on decode of an DMAR table from address or filename."""
-    base_length = ctypes.sizeof(dmar_factory(list()))
-    addr = val
-    if isinstance(val, str):
-        data = open(val).read()
-        buf = ctypes.create_string_buffer(data, len(data))
-        addr = ctypes.addressof(buf)
-    hdr = TableHeader.from_address(addr)
-    field_list = dmar_subtable_list(addr + base_length, hdr.length - base_length)
-    if isinstance(val, str):
-        return dmar_factory(field_list).from_buffer_copy(data)
-    return dmar_factory(field_list).from_address(addr)
-
-parse_dmar = make_compat_parser("DMAR")
-
 class FixedFuncHwReg(bits.cdata.Struct):
     _pack_ = 1
     _fields_ = [
@@ -1378,18 +1720,6 @@ class SingleRegister(bits.cdata.Struct):
         ('EndTag', EndTagDescriptor),
     ]
 
-_preferred_pm_profile = {
-    0: 'Unspecified',
-    1: 'Desktop',
-    2: 'Mobile',
-    3: 'Workstation',
-    4: 'Enterprise Server',
-    5: 'SOHO Server',
-    6: 'Appliance PC',
-    7: 'Performance Server',
-    8: 'Tablet'
-}
-
 ASID_SYSTEM_MEMORY = 0
 ASID_SYSTEM_IO = 1
 ASID_PCI_CFG_SPACE = 2
@@ -1435,2487 +1765,170 @@ class GAS(bits.cdata.Struct):
         'access_size'      : unpack.format_table("{}", _access_sizes),
     }
 
-class facp_flags_bits_v1(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('wbinvd', ctypes.c_uint32, 1),
-        ('wbinvd_flush', ctypes.c_uint32, 1),
-        ('proc_c1', ctypes.c_uint32, 1),
-        ('p_lvl2_up', ctypes.c_uint32, 1),
-        ('pwr_button', ctypes.c_uint32, 1),
-        ('slp_button', ctypes.c_uint32, 1),
-        ('fix_rtc', ctypes.c_uint32, 1),
-        ('rtc_s4', ctypes.c_uint32, 1),
-        ('tmr_val_ext', ctypes.c_uint32, 1),
-        ('dck_cap', ctypes.c_uint32, 1),
-    ]
-
-class facp_flags_v1(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint32),
-        ('bits', facp_flags_bits_v1),
-    ]
-
-class FACP_v1(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('header', TableHeader),
-        ('firmware_ctrl', ctypes.c_uint32),
-        ('dsdt', ctypes.c_uint32),
-        ('int_model', ctypes.c_uint8),
-        ('reserved0', ctypes.c_uint8),
-        ('sci_int', ctypes.c_uint16),
-        ('smi_cmd', ctypes.c_uint32),
-        ('acpi_enable', ctypes.c_uint8),
-        ('acpi_disable', ctypes.c_uint8),
-        ('s4bios_req', ctypes.c_uint8),
-        ('reserved1', ctypes.c_uint8),
-        ('pm1a_evt_blk', ctypes.c_uint32),
-        ('pm1b_evt_blk', ctypes.c_uint32),
-        ('pm1a_cnt_blk', ctypes.c_uint32),
-        ('pm1b_cnt_blk', ctypes.c_uint32),
-        ('pm2_cnt_blk', ctypes.c_uint32),
-        ('pm_tmr_blk', ctypes.c_uint32),
-        ('gpe0_blk', ctypes.c_uint32),
-        ('gpe1_blk', ctypes.c_uint32),
-        ('pm1_evt_len', ctypes.c_uint8),
-        ('pm1_cnt_len', ctypes.c_uint8),
-        ('pm2_cnt_len', ctypes.c_uint8),
-        ('pm_tmr_len', ctypes.c_uint8),
-        ('gpe0_blk_len', ctypes.c_uint8),
-        ('gpe1_blk_len', ctypes.c_uint8),
-        ('gpe1_base', ctypes.c_uint8),
-        ('reserved2', ctypes.c_uint8),
-        ('p_lvl2_lat', ctypes.c_uint16),
-        ('p_lvl3_lat', ctypes.c_uint16),
-        ('flush_size', ctypes.c_uint16),
-        ('flush_stride', ctypes.c_uint16),
-        ('duty_offset', ctypes.c_uint8),
-        ('duty_width', ctypes.c_uint8),
-        ('day_alrm', ctypes.c_uint8),
-        ('mon_alrm', ctypes.c_uint8),
-        ('century', ctypes.c_uint8),
-        ('reserved3', ctypes.c_uint8 * 3),
-        ('flags', facp_flags_v1),
-    ]
+_cpus_initialized = False
 
-class facp_flags_bits_v3(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = copy.copy(facp_flags_bits_v1._fields_) + [
-        ('reset_reg_sup', ctypes.c_uint32, 1),
-        ('sealed_case', ctypes.c_uint32, 1),
-        ('headless', ctypes.c_uint32, 1),
-        ('cpu_sw_slp', ctypes.c_uint32, 1),
-        ('pci_exp_wak', ctypes.c_uint32, 1),
-        ('use_platform_clock', ctypes.c_uint32, 1),
-        ('s4_rtc_sts_valid', ctypes.c_uint32, 1),
-        ('remote_power_on_capable', ctypes.c_uint32, 1),
-        ('force_apic_cluster_mode', ctypes.c_uint32, 1),
-        ('force_apic_physical_destination_mode', ctypes.c_uint32, 1),
-    ]
+def _cpupaths(*args):
+    """Return the processor object paths and processor device paths"""
+    global _cpus_initialized
+    cpupaths, devpaths = _acpi._cpupaths(*args)
+    if not _cpus_initialized:
+        # The first call runs _OSC or _PDC for each processor, which can load
+        # additional tables into the namespace
+        _cpus_initialized = True
+        _namespace_changed()
+    return cpupaths, devpaths
+
+class CpuMap(object):
+    """Mappings between enabled ACPI processors, their IDs, and APIC IDs.
+
+    cpupaths lists the enabled processor objects followed by the enabled
+    processor devices. cpupath_procid maps processor objects to their ProcId,
+    and cpupath_uid maps processor devices to their _UID. cpupath_apicid,
+    apicid_cpupath, cpupath_socket and socket_cpupaths relate each path to
+    its (x2)APIC ID and socket index, as found through the MADT."""
+
+    def __init__(self, cpupaths, devpaths, apic):
+        self.cpupaths = []
+        self.cpupath_procid = OrderedDict()
+        self.cpupath_uid = OrderedDict()
+        self.cpupath_apicid = OrderedDict()
+        self.apicid_cpupath = {}
+        self.cpupath_socket = OrderedDict()
+        self.socket_cpupaths = OrderedDict()
+        if apic is None:
+            # No APIC table exists, so assume the existing cpus are enabled
+            self.procid_apicid = self.uid_x2apicid = None
+            self.cpupaths = list(cpupaths)
+            return
+        self.procid_apicid = apic.procid_apicid
+        self.uid_x2apicid = apic.uid_x2apicid
+        for cpupath in cpupaths:
+            procdef = evaluate(cpupath)
+            if procdef is not None and procdef.ProcId in self.procid_apicid:
+                self.cpupath_procid[cpupath] = procdef.ProcId
+                self._add(cpupath, self.procid_apicid[procdef.ProcId])
+        for devpath in devpaths:
+            uid = evaluate(devpath + "._UID")
+            if uid is not None and uid in self.uid_x2apicid:
+                self.cpupath_uid[devpath] = uid
+                self._add(devpath, self.uid_x2apicid[uid])
+
+    def _add(self, cpupath, apicid):
+        socket = bits.socket_index(apicid)
+        self.cpupaths.append(cpupath)
+        self.cpupath_apicid[cpupath] = apicid
+        self.apicid_cpupath.setdefault(apicid, cpupath)
+        self.cpupath_socket[cpupath] = socket
+        self.socket_cpupaths.setdefault(socket, []).append(cpupath)
+
+_cpumap = None
+
+def get_cpumap():
+    """Return the CpuMap for the enabled processors.
+
+    The map gets built on first use, and again after the namespace changes."""
+    global _cpumap
+    if _cpumap is None:
+        cpupaths, devpaths = _cpupaths()
+        _cpumap = CpuMap(cpupaths, devpaths, _lookup("parse_apic")())
+    return _cpumap
 
-class facp_flags_v3(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint32),
-        ('bits', facp_flags_bits_v3),
-    ]
+def get_cpupaths(*args):
+    if args:
+        # Check or apply the requested capabilities
+        _cpupaths(*args)
+    return list(get_cpumap().cpupaths)
 
-class facp_iapc_arch_bits_v3(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ =  [
-        ('legacy_devices', ctypes.c_uint16, 1),
-        ('8042', ctypes.c_uint16, 1),
-        ('vga_not_present', ctypes.c_uint16, 1),
-        ('msi_not_supported', ctypes.c_uint16, 1),
-    ]
+def find_procid():
+    return OrderedDict(sorted(get_cpumap().cpupath_procid.items()))
 
-class facp_iapc_arch_v3(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint16),
-        ('bits', facp_iapc_arch_bits_v3),
-    ]
+def find_uid():
+    return OrderedDict(sorted(get_cpumap().cpupath_uid.items()))
 
-class FACP_v3(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('header', TableHeader),
-        ('firmware_ctrl', ctypes.c_uint32),
-        ('dsdt', ctypes.c_uint32),
-        ('reserved0', ctypes.c_uint8),
-        ('preferred_pm_profile', ctypes.c_uint8),
-        ('sci_int', ctypes.c_uint16),
-        ('smi_cmd', ctypes.c_uint32),
-        ('acpi_enable', ctypes.c_uint8),
-        ('acpi_disable', ctypes.c_uint8),
-        ('s4bios_req', ctypes.c_uint8),
-        ('pstate_cnt', ctypes.c_uint8),
-        ('pm1a_evt_blk', ctypes.c_uint32),
-        ('pm1b_evt_blk', ctypes.c_uint32),
-        ('pm1a_cnt_blk', ctypes.c_uint32),
-        ('pm1b_cnt_blk', ctypes.c_uint32),
-        ('pm2_cnt_blk', ctypes.c_uint32),
-        ('pm_tmr_blk', ctypes.c_uint32),
-        ('gpe0_blk', ctypes.c_uint32),
-        ('gpe1_blk', ctypes.c_uint32),
-        ('pm1_evt_len', ctypes.c_uint8),
-        ('pm1_cnt_len', ctypes.c_uint8),
-        ('pm2_cnt_len', ctypes.c_uint8),
-        ('pm_tmr_len', ctypes.c_uint8),
-        ('gpe0_blk_len', ctypes.c_uint8),
-        ('gpe1_blk_len', ctypes.c_uint8),
-        ('gpe1_base', ctypes.c_uint8),
-        ('cst_cnt', ctypes.c_uint8),
-        ('p_lvl2_lat', ctypes.c_uint16),
-        ('p_lvl3_lat', ctypes.c_uint16),
-        ('flush_size', ctypes.c_uint16),
-        ('flush_stride', ctypes.c_uint16),
-        ('duty_offset', ctypes.c_uint8),
-        ('duty_width', ctypes.c_uint8),
-        ('day_alrm', ctypes.c_uint8),
-        ('mon_alrm', ctypes.c_uint8),
-        ('century', ctypes.c_uint8),
-        ('iapc_boot_arch', facp_iapc_arch_v3),
-        ('reserved1', ctypes.c_uint8),
-        ('flags', facp_flags_v3),
-        ('reset_reg', GAS),
-        ('reset_value', ctypes.c_uint8),
-        ('reserved2', ctypes.c_uint8 * 3),
-        ('x_firmware_ctrl', ctypes.c_uint64),
-        ('x_dsdt', ctypes.c_uint64),
-        ('x_pm1a_evt_blk', GAS),
-        ('x_pm1b_evt_blk', GAS),
-        ('x_pm1a_cnt_blk', GAS),
-        ('x_pm1b_cnt_blk', GAS),
-        ('x_pm2_cnt_blk', GAS),
-        ('x_pm_tmr_blk', GAS),
-        ('x_gpe0_blk', GAS),
-        ('x_gpe1_blk', GAS),
-    ]
+def commonprefix(l):
+    """Return the common prefix of a list of strings."""
+    if not l:
+        return ''
+    prefix = l[0]
+    for s in l[1:]:
+        for i, c in enumerate(prefix):
+            if c != s[i]:
+                prefix = s[:i]
+                break
+    return prefix
 
-    _formats = {
-        'preferred_pm_profile': unpack.format_table("{}", _preferred_pm_profile),
-    }
+def factor_commonprefix(l):
+    if not l:
+        return ''
+    if len(l) == 1:
+        return l[0]
+    prefix = commonprefix(l)
+    prefixlen = len(prefix)
+    return prefix + "{" + ", ".join([s[prefixlen:] for s in l]) + "}"
 
-class facp_iapc_arch_bits_v4(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = copy.copy(facp_iapc_arch_bits_v3._fields_) + [
-        ('pcie_aspm_controls', ctypes.c_uint16, 1),
-    ]
+def display_cpu_info():
+    cpumap = get_cpumap()
+    cpupaths = cpumap.cpupaths
+    if cpumap.procid_apicid is None or cpumap.uid_x2apicid is None:
+        return
+    socketindex_cpuscope = {}
+    s = factor_commonprefix(cpupaths) + '\n'
+    for cpupath in cpupaths:
+        s += '\n' + cpupath
+        def socket_str(socket_index):
+            if socket_index is None:
+                return ''
+            return ', socketIndex=0x%02x' % socket_index
+        def apicid_str(apicid):
+            if apicid is None:
+                return 'no ApicID'
+            return 'ApicID=0x%02x%s' % (apicid, socket_str(cpumap.cpupath_socket[cpupath]))
+        apicid = cpumap.cpupath_apicid.get(cpupath, None)
+        procid = cpumap.cpupath_procid.get(cpupath, None)
+        if procid is not None:
+            s += ' ProcID=%-2u (%s) ' % (procid, apicid_str(apicid))
+            socketindex_cpuscope.setdefault(cpumap.cpupath_socket[cpupath], []).append(scope(cpupath))
+        uid = cpumap.cpupath_uid.get(cpupath, None)
+        if uid is not None:
+            s += ' _UID=%s (%s)' % (uid, apicid_str(apicid))
+            socketindex_cpuscope.setdefault(cpumap.cpupath_socket[cpupath], []).append(scope(cpupath))
+    for value, scopes in socketindex_cpuscope.iteritems():
+        unique_scopes = set(scopes)
+        s += '\nsocket {0} contains {1} processors and {2} ACPI scope: {3}\n'.format(value, len(scopes), len(unique_scopes), ','.join(sorted(unique_scopes)))
+    ttypager.ttypager_wrap(s, indent=False)
 
-class facp_iapc_arch_v4(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint16),
-        ('bits', facp_iapc_arch_bits_v4),
-    ]
+def display_acpi_method(method, print_one):
+    """Helper function that performs all basic processing for evaluating an ACPI method"""
+    cpupaths = get_cpupaths()
+    uniques = {}
+    for cpupath in cpupaths:
+        value = evaluate(cpupath + "." + method)
+        uniques.setdefault(value, []).append(cpupath)
 
-class FACP_v4(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('header', TableHeader),
-        ('firmware_ctrl', ctypes.c_uint32),
-        ('dsdt', ctypes.c_uint32),
-        ('reserved0', ctypes.c_uint8),
-        ('preferred_pm_profile', ctypes.c_uint8),
-        ('sci_int', ctypes.c_uint16),
-        ('smi_cmd', ctypes.c_uint32),
-        ('acpi_enable', ctypes.c_uint8),
-        ('acpi_disable', ctypes.c_uint8),
-        ('s4bios_req', ctypes.c_uint8),
-        ('pstate_cnt', ctypes.c_uint8),
-        ('pm1a_evt_blk', ctypes.c_uint32),
-        ('pm1b_evt_blk', ctypes.c_uint32),
-        ('pm1a_cnt_blk', ctypes.c_uint32),
-        ('pm1b_cnt_blk', ctypes.c_uint32),
-        ('pm2_cnt_blk', ctypes.c_uint32),
-        ('pm_tmr_blk', ctypes.c_uint32),
-        ('gpe0_blk', ctypes.c_uint32),
-        ('gpe1_blk', ctypes.c_uint32),
-        ('pm1_evt_len', ctypes.c_uint8),
-        ('pm1_cnt_len', ctypes.c_uint8),
-        ('pm2_cnt_len', ctypes.c_uint8),
-        ('pm_tmr_len', ctypes.c_uint8),
-        ('gpe0_blk_len', ctypes.c_uint8),
-        ('gpe1_blk_len', ctypes.c_uint8),
-        ('gpe1_base', ctypes.c_uint8),
-        ('cst_cnt', ctypes.c_uint8),
-        ('p_lvl2_lat', ctypes.c_uint16),
-        ('p_lvl3_lat', ctypes.c_uint16),
-        ('flush_size', ctypes.c_uint16),
-        ('flush_stride', ctypes.c_uint16),
-        ('duty_offset', ctypes.c_uint8),
-        ('duty_width', ctypes.c_uint8),
-        ('day_alrm', ctypes.c_uint8),
-        ('mon_alrm', ctypes.c_uint8),
-        ('century', ctypes.c_uint8),
-        ('iapc_boot_arch', facp_iapc_arch_v4),
-        ('reserved1', ctypes.c_uint8),
-        ('flags', facp_flags_v3),
-        ('reset_reg', GAS),
-        ('reset_value', ctypes.c_uint8),
-        ('reserved2', ctypes.c_uint8 * 3),
-        ('x_firmware_ctrl', ctypes.c_uint64),
-        ('x_dsdt', ctypes.c_uint64),
-        ('x_pm1a_evt_blk', GAS),
-        ('x_pm1b_evt_blk', GAS),
-        ('x_pm1a_cnt_blk', GAS),
-        ('x_pm1b_cnt_blk', GAS),
-        ('x_pm2_cnt_blk', GAS),
-        ('x_pm_tmr_blk', GAS),
-        ('x_gpe0_blk', GAS),
-        ('x_gpe1_blk', GAS),
-    ]
+    print ttypager._wrap("%u unique %s values" % (len(uniques), method))
+    for value, cpupaths in sorted(uniques.iteritems(), key=(lambda (k,v): v)):
+        print
+        print ttypager._wrap(factor_commonprefix(cpupaths))
+        if value is None:
+            print "No %s found for these CPUs" % method
+        else:
+            print_one(value)
 
-    _formats = {
-        'preferred_pm_profile': unpack.format_table("{}", _preferred_pm_profile),
-    }
-
-class facp_flags_bits_v5(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = copy.copy(facp_flags_bits_v3._fields_) + [
-        ('hw_reduced_acpi', ctypes.c_uint32, 1),
-        ('low_power_s0_idle_capable', ctypes.c_uint32, 1),
-    ]
-
-class facp_flags_v5(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint32),
-        ('bits', facp_flags_bits_v5),
-    ]
-
-class facp_iapc_arch_bits_v5(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = copy.copy(facp_iapc_arch_bits_v4._fields_) + [
-        ('cmos_rtc_not_present', ctypes.c_uint16, 1),
-    ]
-
-class facp_iapc_arch_v5(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint16),
-        ('bits', facp_iapc_arch_bits_v5),
-    ]
-
-class FACP_v5(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('header', TableHeader),
-        ('firmware_ctrl', ctypes.c_uint32),
-        ('dsdt', ctypes.c_uint32),
-        ('reserved0', ctypes.c_uint8),
-        ('preferred_pm_profile', ctypes.c_uint8),
-        ('sci_int', ctypes.c_uint16),
-        ('smi_cmd', ctypes.c_uint32),
-        ('acpi_enable', ctypes.c_uint8),
-        ('acpi_disable', ctypes.c_uint8),
-        ('s4bios_req', ctypes.c_uint8),
-        ('pstate_cnt', ctypes.c_uint8),
-        ('pm1a_evt_blk', ctypes.c_uint32),
-        ('pm1b_evt_blk', ctypes.c_uint32),
-        ('pm1a_cnt_blk', ctypes.c_uint32),
-        ('pm1b_cnt_blk', ctypes.c_uint32),
-        ('pm2_cnt_blk', ctypes.c_uint32),
-        ('pm_tmr_blk', ctypes.c_uint32),
-        ('gpe0_blk', ctypes.c_uint32),
-        ('gpe1_blk', ctypes.c_uint32),
-        ('pm1_evt_len', ctypes.c_uint8),
-        ('pm1_cnt_len', ctypes.c_uint8),
-        ('pm2_cnt_len', ctypes.c_uint8),
-        ('pm_tmr_len', ctypes.c_uint8),
-        ('gpe0_blk_len', ctypes.c_uint8),
-        ('gpe1_blk_len', ctypes.c_uint8),
-        ('gpe1_base', ctypes.c_uint8),
-        ('cst_cnt', ctypes.c_uint8),
-        ('p_lvl2_lat', ctypes.c_uint16),
-        ('p_lvl3_lat', ctypes.c_uint16),
-        ('flush_size', ctypes.c_uint16),
-        ('flush_stride', ctypes.c_uint16),
-        ('duty_offset', ctypes.c_uint8),
-        ('duty_width', ctypes.c_uint8),
-        ('day_alrm', ctypes.c_uint8),
-        ('mon_alrm', ctypes.c_uint8),
-        ('century', ctypes.c_uint8),
-        ('iapc_boot_arch', facp_iapc_arch_v5),
-        ('reserved1', ctypes.c_uint8),
-        ('flags', facp_flags_v5),
-        ('reset_reg', GAS),
-        ('reset_value', ctypes.c_uint8),
-        ('reserved2', ctypes.c_uint8 * 3),
-        ('x_firmware_ctrl', ctypes.c_uint64),
-        ('x_dsdt', ctypes.c_uint64),
-        ('x_pm1a_evt_blk', GAS),
-        ('x_pm1b_evt_blk', GAS),
-        ('x_pm1a_cnt_blk', GAS),
-        ('x_pm1b_cnt_blk', GAS),
-        ('x_pm2_cnt_blk', GAS),
-        ('x_pm_tmr_blk', GAS),
-        ('x_gpe0_blk', GAS),
-        ('x_gpe1_blk', GAS),
-        ('sleep_control_reg', GAS),
-        ('sleep_status_reg', GAS),
-    ]
-
-    _formats = {
-        'preferred_pm_profile': unpack.format_table("{}", _preferred_pm_profile),
-    }
-
-def FACP(val):
-    """Create class based on decode of an FACP table from address or filename."""
-    addr = val
-    if isinstance(val, str):
-        data = open(val).read()
-        buf = ctypes.create_string_buffer(data, len(data))
-        addr = ctypes.addressof(buf)
-    hdr = TableHeader.from_address(addr)
-    if hdr.revision < 3:
-        cls = FACP_v1
-    elif hdr.revision == 3:
-        cls = FACP_v3
-    elif hdr.revision == 4:
-        cls = FACP_v4
-    else:
-        cls = FACP_v5
-    if isinstance(val, str):
-        return cls.from_buffer_copy(data)
-    return cls.from_address(addr)
-
-parse_facp = make_compat_parser("FACP")
-
-class facs_global_lock_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('pending', ctypes.c_uint32, 1),
-        ('owned', ctypes.c_uint32, 1),
-    ]
-
-class facs_global_lock(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint32),
-        ('bits', facs_global_lock_bits),
-    ]
-
-class facs_flags_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('s4bios_f', ctypes.c_uint32, 1),
-    ]
-
-class facs_flags(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint32),
-        ('bits', facs_flags_bits),
-    ]
-
-class facs_flags_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('s4bios_f', ctypes.c_uint32, 1),
-    ]
-
-class facs_flags(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint32),
-        ('bits', facs_flags_bits),
-    ]
-
-class facs_flags_bits_v2(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('s4bios_f', ctypes.c_uint32, 1),
-        ('64bit_wake_supported_f', ctypes.c_uint32, 1),
-    ]
-
-class facs_flags_v2(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint32),
-        ('bits', facs_flags_bits_v2),
-    ]
-
-class facs_ospm_flags_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('64bit_wake_f', ctypes.c_uint32, 1),
-    ]
-
-class facs_ospm_flags(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint32),
-        ('bits', facs_ospm_flags_bits),
-    ]
-
-class FACS_v0(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('signature', ctypes.c_char * 4),
-        ('length', ctypes.c_uint32),
-        ('hardware_signature', ctypes.c_uint32),
-        ('firmware_waking_vector', ctypes.c_uint32),
-        ('global_lock', facs_global_lock),
-        ('flags', facs_flags),
-        ('reserved', ctypes.c_uint8 * 40),
-    ]
-
-class FACS_v1(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('signature', ctypes.c_char * 4),
-        ('length', ctypes.c_uint32),
-        ('hardware_signature', ctypes.c_uint32),
-        ('firmware_waking_vector', ctypes.c_uint32),
-        ('global_lock', facs_global_lock),
-        ('flags', facs_flags),
-        ('x_firmware_waking_vector', ctypes.c_uint64),
-        ('version', ctypes.c_uint8),
-        ('reserved', ctypes.c_uint8 * 31),
-    ]
-
-class FACS_v2(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('signature', ctypes.c_char * 4),
-        ('length', ctypes.c_uint32),
-        ('hardware_signature', ctypes.c_uint32),
-        ('firmware_waking_vector', ctypes.c_uint32),
-        ('global_lock', facs_global_lock),
-        ('flags', facs_flags_v2),
-        ('x_firmware_waking_vector', ctypes.c_uint64),
-        ('version', ctypes.c_uint8),
-        ('pad', ctypes.c_uint8 * 3),
-        ('ospm_flags', facs_ospm_flags),
-        ('reserved', ctypes.c_uint8 * 24),
-    ]
-
-def FACS(val):
-    """Create class based on decode of an FACS table from address or filename."""
-    addr = val
-    if isinstance(val, str):
-        data = open(val).read()
-        buf = ctypes.create_string_buffer(data, len(data))
-        addr = ctypes.addressof(buf)
-    cls = FACS_v0
-    r = FACS_v0.from_address(addr)
-    if r.length != ctypes.sizeof(FACS_v0):
-        r = FACS_v1.from_address(addr)
-        if r.version == 1:
-            cls = FACS_v1
-        elif r.version == 2:
-            cls = FACS_v2
-    if isinstance(val, str):
-        return cls.from_buffer_copy(data)
-    return cls.from_address(addr)
-
-parse_facs = make_compat_parser("FACS")
-
-class MCFGResource(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('address', ctypes.c_uint64),
-        ('segment', ctypes.c_uint16),
-        ('start_bus', ctypes.c_uint8),
-        ('end_bus', ctypes.c_uint8),
-        ('reserved', ctypes.c_uint32),
-    ]
-
-def mcfg_factory(num_resources):
-    """Create variable-sized MCFG table based on the number of resources."""
-    class MCFG(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = [
-            ('header', TableHeader),
-            ('reserved', ctypes.c_uint64),
-            ('resources', num_resources * MCFGResource),
-        ]
-    return MCFG
-
-def MCFG(val):
-    """Create class based on decode of an MCFG table from address or filename."""
-    addr = val
-    if isinstance(val, str):
-        data = open(val).read()
-        buf = ctypes.create_string_buffer(data, len(data))
-        addr = ctypes.addressof(buf)
-    hdr = TableHeader.from_address(addr)
-    num_tables = (hdr.length - ctypes.sizeof(mcfg_factory(0))) / ctypes.sizeof(MCFGResource)
-    if isinstance(val, str):
-        return mcfg_factory(num_tables).from_buffer_copy(data)
-    return mcfg_factory(num_tables).from_address(addr)
-
-parse_mcfg = make_compat_parser("MCFG")
-
-class trigger_error_header(bits.cdata.Struct):
-    """Trigger error header used with the trigger_error_action table."""
-    _pack_ = 1
-    _fields_ = [
-        ('header_size', ctypes.c_uint32),
-        ('revision', ctypes.c_uint32),
-        ('table_size', ctypes.c_uint32),
-        ('entry_count', ctypes.c_uint32),
-    ]
-
-def trigger_error_action_factory(num_entries):
-    """Create variable-sized trigger error action table based on the number of trigger error instruction entries."""
-    class trigger_error_action(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = [
-            ('header', trigger_error_header),
-            ('entries', num_entries * InjectionInstructionEntry),
-        ]
-    return trigger_error_action
-
-def trigger_error_action(val):
-    """Create class based on decode of an trigger_error_action table from address or filename."""
-    addr = val
-    if isinstance(val, str):
-        data = open(val).read()
-        buf = ctypes.create_string_buffer(data, len(data))
-        addr = ctypes.addressof(buf)
-    hdr = trigger_error_header.from_address(addr)
-    num_entries = (hdr.table_size - ctypes.sizeof(trigger_error_action_factory(0))) / ctypes.sizeof(InjectionInstructionEntry)
-    if isinstance(val, str):
-        return trigger_error_action(num_entries).from_buffer_copy(data)
-    return trigger_error_action_factory(num_entries).from_address(addr)
-
-_error_injection_action = {
-    0x0  : 'BEGIN_INJECTION_OPERATION',
-    0x1  : 'GET_TRIGGER_ERROR_ACTION_TABLE',
-    0x2  : 'SET_ERROR_TYPE',
-    0x3  : 'GET_ERROR_TYPE',
-    0x4  : 'END_OPERATION',
-    0x5  : 'EXECUTE_OPERATION',
-    0x6  : 'CHECK_BUSY_STATUS',
-    0x7  : 'GET_COMMAND_STATUS',
-    0x8  : 'SET_ERROR_TYPE_WITH_ADDRESS',
-    0xFF : 'TRIGGER_ERROR',
-}
-
-_error_injection_instruction = {
-    0x00 : 'READ_REGISTER',
-    0x01 : 'READ_REGISTER_VALUE',
-    0x02 : 'WRITE_REGISTER',
-    0x03 : 'WRITE_REGISTER_VALUE',
-    0x04 : 'NOOP',
-}
-
-class error_type_flags_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('processor_correctable', ctypes.c_uint32, 1),
-        ('processor_uncorrectable_non_fatal', ctypes.c_uint32, 1),
-        ('processor_uncorrectable_fatal', ctypes.c_uint32, 1),
-        ('memory_correctable', ctypes.c_uint32, 1),
-        ('memory_uncorrectable_non_fatal', ctypes.c_uint32, 1),
-        ('memory_uncorrectable_fatal', ctypes.c_uint32, 1),
-        ('pci_express_correctable', ctypes.c_uint32, 1),
-        ('pci_express_uncorrectable_non_fatal', ctypes.c_uint32, 1),
-        ('pci_express_uncorrectable_fatal', ctypes.c_uint32, 1),
-        ('platform_correctable', ctypes.c_uint32, 1),
-        ('platform_uncorrectable_non_fatal', ctypes.c_uint32, 1),
-        ('platform_encorrectable_fatal', ctypes.c_uint32, 1),
-        ('reserved_12_30', ctypes.c_uint32, 19),
-        ('vendor_defined', ctypes.c_uint32, 1),
-    ]
-
-class error_type_flags(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint32),
-        ('bits', error_type_flags_bits),
-    ]
-
-class pcie_sbdf_struct_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('reserved_8_0', ctypes.c_uint32, 8),
-        ('function_num', ctypes.c_uint32, 3),
-        ('device_num', ctypes.c_uint32, 5),
-        ('bus_num', ctypes.c_uint32, 8),
-        ('pcie_segment', ctypes.c_uint32, 8),
-    ]
-
-class pcie_sbdf_struct(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint32),
-        ('bits', pcie_sbdf_struct_bits),
-    ]
-
-class set_error_type_with_addr_flags_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('processor_apic_valid', ctypes.c_uint32, 1),
-        ('memory_addr_and_mask_valid', ctypes.c_uint32, 1),
-        ('pcie_sbdf_valid', ctypes.c_uint32, 1),
-        ('reserved_31_3', ctypes.c_uint32, 29),
-    ]
-
-class set_error_type_with_addr_flags(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint32),
-        ('bits', set_error_type_with_addr_flags_bits),
-    ]
-
-class set_error_type_with_addr(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('error_type', error_type_flags),
-        ('vendor_error_type_extension_structure_offset', ctypes.c_uint32),
-        ('flags', set_error_type_with_addr_flags),
-        ('apic_id', ctypes.c_uint32),
-        ('memory_address', ctypes.c_uint64),
-        ('memory_address_range', ctypes.c_uint64),
-        ('pcie_sbdf', pcie_sbdf_struct),
-    ]
-
-class vendor_error_type_extension(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('length', ctypes.c_uint32),
-        ('sbdf', pcie_sbdf_struct),
-        ('vendor_id', ctypes.c_uint16),
-        ('device_id', ctypes.c_uint16),
-        ('rev_id', ctypes.c_uint8),
-        ('reserved', ctypes.c_uint8 * 3),
-    ]
-
-class injection_instruction_entry_flags_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('preserve_register', ctypes.c_uint8, 1),
-    ]
-
-class injection_instruction_entry_flags(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint8),
-        ('bits', injection_instruction_entry_flags_bits),
-    ]
-
-class InjectionInstructionEntry(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('injection_action', ctypes.c_uint8),
-        ('instruction', ctypes.c_uint8),
-        ('flags', injection_instruction_entry_flags),
-        ('reserved', ctypes.c_uint8),
-        ('register_region', GAS),
-        ('value', ctypes.c_uint64),
-        ('mask', ctypes.c_uint64),
-    ]
-    _formats = {
-        'injection_action' : unpack.format_table("{}", _error_injection_action),
-        'instruction' : unpack.format_table("{}", _error_injection_instruction),
-    }
-
-def einj_factory(num_entries):
-    """Create variable-sized EINJ table based on the number of injection instruction entries."""
-    class EINJ(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = [
-            ('header', TableHeader),
-            ('injection_header_size', ctypes.c_uint32),
-            ('injection_flags', ctypes.c_uint8),
-            ('reserved', 3 * ctypes.c_uint8),
-            ('injection_entry_count', ctypes.c_uint32),
-            ('entries', num_entries * InjectionInstructionEntry),
-        ]
-    return EINJ
-
-def EINJ(val):
-    """Create class based on decode of an EINJ table from address or filename."""
-    addr = val
-    if isinstance(val, str):
-        data = open(val).read()
-        buf = ctypes.create_string_buffer(data, len(data))
-        addr = ctypes.addressof(buf)
-    hdr = TableHeader.from_address(addr)
-    num_entries = (hdr.length - ctypes.sizeof(einj_factory(0))) / ctypes.sizeof(InjectionInstructionEntry)
-    if isinstance(val, str):
-        return einj_factory(num_entries).from_buffer_copy(data)
-    return einj_factory(num_entries).from_address(addr)
-
-parse_einj = make_compat_parser("EINJ")
-
-class error_severity_flags_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('correctable', ctypes.c_uint32, 1),
-        ('fatal', ctypes.c_uint32, 1),
-        ('corrected', ctypes.c_uint32, 1),
-        ('none', ctypes.c_uint32, 1),
-        ('reserved', ctypes.c_uint32, 28),
-    ]
-
-class error_severity_flags(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint32),
-        ('bits', error_severity_flags_bits),
-    ]
-
-class generic_error_data_entry(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('section_type', bits.cdata.GUID),
-        ('error_severity', error_severity_flags),
-        ('revision', ctypes.c_uint16),
-        ('validation_bits', ctypes.c_uint8),
-        ('flags', ctypes.c_uint8),
-        ('error_data_length', ctypes.c_uint32),
-        #('FRU_id', ?),
-        ('FRU_text', ctypes.c_uint8),
-        #('data', array of generic_error_data),
-    ]
-
-class block_status_flags_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('uncorrectable_error_valid', ctypes.c_uint32, 1),
-        ('correctable_error_valid', ctypes.c_uint32, 1),
-        ('multiple_uncorrectable_errors', ctypes.c_uint32, 1),
-        ('multiple_correctable_errors', ctypes.c_uint32, 1),
-        ('error_data_entry_count', ctypes.c_uint32, 10),
-        ('reserved', ctypes.c_uint32, 18),
-    ]
-
-class block_status_flags(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint32),
-        ('bits', block_status_flags_bits),
-    ]
-
-class boot_error_region(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('block_status', block_status_flags),
-        ('raw_data_offset', ctypes.c_uint32),
-        ('raw_data_length', ctypes.c_uint32),
-        ('data_length', ctypes.c_uint32),
-        ('error_severity', error_severity_flags),
-        ('generic_error_data', generic_error_data_entry),
-    ]
-
-class BERT_v1(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('header', TableHeader),
-        ('boot_error_region_length', ctypes.c_uint32),
-        ('boot_error_region', ctypes.c_uint64),
-    ]
-
-def BERT(val):
-    """Create class based on decode of an BERT table from address or filename."""
-    addr = val
-    if isinstance(val, str):
-        data = open(val).read()
-        buf = ctypes.create_string_buffer(data, len(data))
-        addr = ctypes.addressof(buf)
-        return BERT_v1.from_buffer_copy(data)
-    return BERT_v1.from_address(addr)
-
-parse_bert = make_compat_parser("BERT")
-
-class APICSubtable(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('subtype', ctypes.c_uint8),
-        ('length', ctypes.c_uint8),
-    ]
-
-class local_apic_flags_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('enabled', ctypes.c_uint32, 1),
-    ]
-
-class local_apic_flags(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint32),
-        ('bits', local_apic_flags_bits),
-    ]
-
-class APICSubtableLocalApic(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = copy.copy(APICSubtable._fields_) + [
-        ('proc_id', ctypes.c_uint8),
-        ('apic_id', ctypes.c_uint8),
-        ('flags', local_apic_flags),
-    ]
-
-class APICSubtableIOApic(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = copy.copy(APICSubtable._fields_) + [
-        ('io_apic_id', ctypes.c_uint8),
-        ('reserved', ctypes.c_uint8),
-        ('io_apic_addr', ctypes.c_uint32),
-        ('global_sys_int_base', ctypes.c_uint32),
-    ]
-
-mps_inti_polarity = {
-    0b00: 'Conforms to bus specifications',
-    0b01: 'Active high',
-    0b11: 'Active low',
-}
-
-mps_inti_trigger_mode = {
-    0b00: 'Conforms to bus specifications',
-    0b01: 'Edge-triggered',
-    0b11: 'Level-triggered',
-}
-
-class APICSubtable_int_flags_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('polarity', ctypes.c_uint16, 2),
-        ('trigger_mode', ctypes.c_uint16, 2),
-    ]
-    _formats = {
-        'polarity': unpack.format_table("{}", mps_inti_polarity),
-        'trigger_mode': unpack.format_table("{}", mps_inti_trigger_mode),
-    }
-
-class APICSubtable_int_flags(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint16),
-        ('bits', APICSubtable_int_flags_bits),
-    ]
-
-class APICSubtableNmiIntSrc(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = copy.copy(APICSubtable._fields_) + [
-        ('flags', APICSubtable_int_flags),
-        ('global_sys_interrupt', ctypes.c_uint32),
-    ]
-
-class APICSubtableLocalApicNmi(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = copy.copy(APICSubtable._fields_) + [
-        ('proc_id', ctypes.c_uint8),
-        ('flags', APICSubtable_int_flags),
-        ('lint_num', ctypes.c_uint8),
-    ]
-
-class APICSubtableIntSrcOverride(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = copy.copy(APICSubtable._fields_) + [
-        ('bus', ctypes.c_uint8),
-        ('source', ctypes.c_uint8),
-        ('global_sys_interrupt', ctypes.c_uint32),
-        ('flags', APICSubtable_int_flags)
-    ]
-
-class APICSubtableLocalx2Apic(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = copy.copy(APICSubtable._fields_) + [
-        ('reserved', ctypes.c_uint16),
-        ('x2apicid', ctypes.c_uint32),
-        ('flags', local_apic_flags),
-        ('uid', ctypes.c_uint32),
-    ]
-
-class APICSubtableLocalx2ApicNmi(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = copy.copy(APICSubtable._fields_) + [
-        ('flags', APICSubtable_int_flags),
-        ('uid', ctypes.c_uint32),
-        ('lint_num', ctypes.c_uint8),
-        ('reserved', ctypes.c_uint8 * 3),
-    ]
-
-_performance_interrupt_mode = {
-    0: 'Level-triggered',
-    1: 'Edge-triggered',
-}
-
-class APICSubtableLocalGIC_flags_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('enabled', ctypes.c_uint32, 1),
-        ('performance_interrupt_mode', ctypes.c_uint32, 1),
-    ]
-    _formats = {
-        'performance_interrupt_mode': unpack.format_table("{}", mps_inti_polarity),
-    }
-
-class APICSubtableLocalGIC_flags(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint32),
-        ('bits', APICSubtableLocalGIC_flags_bits),
-    ]
-
-class APICSubtableLocalGIC(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = copy.copy(APICSubtable._fields_) + [
-        ('reserved', ctypes.c_uint16),
-        ('gic_id', ctypes.c_uint32),
-        ('uid', ctypes.c_uint32),
-        ('flags', APICSubtableLocalGIC_flags),
-        ('parking_protocol_version', ctypes.c_uint32),
-        ('performance_interrupt_gsiv', ctypes.c_uint32),
-        ('parked_address', ctypes.c_uint64),
-        ('physical_base_adddress', ctypes.c_uint64),
-    ]
-
-class APICSubtableLocalGICDistributor(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = copy.copy(APICSubtable._fields_) + [
-        ('reserved1', ctypes.c_uint16),
-        ('gic_id', ctypes.c_uint32),
-        ('physical_base_adddress', ctypes.c_uint64),
-        ('system_vector_base', ctypes.c_uint32),
-        ('reserved2', ctypes.c_uint32),
-    ]
-
-def APICSubtableUnknown_factory(_len):
-    class APICSubtableUnknown(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = APICSubtable._fields_ + [
-            ('data', ctypes.c_uint8 * _len),
-        ]
-    return APICSubtableUnknown
-
-MADT_TYPE_LOCAL_APIC = 0
-MADT_TYPE_IO_APIC = 1
-MADT_TYPE_INT_SRC_OVERRIDE = 2
-MADT_TYPE_NMI_INT_SRC = 3
-MADT_TYPE_LOCAL_APIC_NMI = 4
-MADT_TYPE_LOCAL_X2APIC = 9
-MADT_TYPE_LOCAL_X2APIC_NMI = 0xA
-MADT_TYPE_LOCAL_GIC = 0xB
-MADT_TYPE_LOCAL_GIC_DISTRIBUTOR = 0xC
-
-class APIC_table_flags_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('pcat_compat', ctypes.c_uint32, 1),
-    ]
-
-class APIC_table_flags(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint32),
-        ('bits', APIC_table_flags_bits),
-    ]
-
-def apic_factory(field_list):
-    class subtables(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = field_list
-
-        def __iter__(self):
-            for f in self._fields_:
-                yield getattr(self, f[0])
-
-    class APIC_v3(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = [
-            ('header', TableHeader),
-            ('local_apic_address', ctypes.c_uint32),
-            ('flags', APIC_table_flags),
-            ('interrupt_controller_structures', subtables),
-        ]
-
-        @property
-        def procid_apicid(self):
-            procid_apicid_dict = {}
-            for subtable in self.interrupt_controller_structures:
-                # accumulate the dictionary
-                if subtable.subtype == MADT_TYPE_LOCAL_APIC:
-                    if subtable.flags.bits.enabled == 1:
-                        procid_apicid_dict[subtable.proc_id] = subtable.apic_id
-            return procid_apicid_dict
-
-        @property
-        def uid_x2apicid(self):
-            uid_x2apicid_dict = {}
-            for subtable in self.interrupt_controller_structures:
-                # accumulate the dictionary
-                if subtable.subtype == MADT_TYPE_LOCAL_X2APIC:
-                    if subtable.flags.bits.enabled == 1:
-                        uid_x2apicid_dict[subtable.uid] = subtable.x2apicid
-            return uid_x2apicid_dict
-
-    return APIC_v3
-
-def apic_subtable_list(addr, length):
-    end = addr + length
-    field_list = list()
-    subtable_num = 0
-    while addr < end:
-        subtable_num += 1
-        subtable = APICSubtable.from_address(addr)
-        addr += subtable.length
-        if subtable.subtype == MADT_TYPE_LOCAL_APIC:
-            cls = APICSubtableLocalApic
-        elif subtable.subtype == MADT_TYPE_IO_APIC:
-            cls = APICSubtableIOApic
-        elif subtable.subtype == MADT_TYPE_INT_SRC_OVERRIDE:
-            cls = APICSubtableIntSrcOverride
-        elif subtable.subtype == MADT_TYPE_NMI_INT_SRC:
-            cls = APICSubtableNmiIntSrc
-        elif subtable.subtype == MADT_TYPE_LOCAL_APIC_NMI:
-            cls = APICSubtableLocalApicNmi
-        elif subtable.subtype == MADT_TYPE_LOCAL_X2APIC:
-            cls = APICSubtableLocalx2Apic
-        elif subtable.subtype == MADT_TYPE_LOCAL_X2APIC_NMI:
-            cls = APICSubtableLocalx2ApicNmi
-        elif subtable.subtype == MADT_TYPE_LOCAL_GIC:
-            cls = APICSubtableLocalGIC
-        elif subtable.subtype == MADT_TYPE_LOCAL_GIC_DISTRIBUTOR:
-            cls = APICSubtableLocalGICDistributor
-        else:
-            cls = APICSubtableUnknown_factory(subtable.length - ctypes.sizeof(APICSubtable))
-        field_list.append( ('subtable{}'.format(subtable_num), cls) )
-    return field_list
-
-def APIC(val):
-    """Create class based on decode of an APIC table from address or filename."""
-    preamble_length = ctypes.sizeof(apic_factory(list()))
-    addr = val
-    if isinstance(val, str):
-        data = open(val).read()
-        buf = ctypes.create_string_buffer(data, len(data))
-        addr = ctypes.addressof(buf)
-    hdr = TableHeader.from_address(addr)
-    subtable_list = apic_subtable_list(addr + preamble_length, hdr.length - preamble_length)
-    if isinstance(val, str):
-        return apic_factory(subtable_list).from_buffer_copy(data)
-    return apic_factory(subtable_list).from_address(addr)
-
-def parse_apic(printflag=False, EnabledOnly=False, instance=1):
-    """Parse and optionally print an ACPI MADT table."""
-
-    apic = parse_table("APIC", instance)
-    if apic is None:
-        return None, None
-    if printflag:
-        with ttypager.page():
-            print apic
-    if EnabledOnly:
-        with ttypager.page():
-            print '\n'.join(str(subtable) for subtable in apic.interrupt_controller_structures if ((subtable.subtype in (MADT_TYPE_LOCAL_APIC, MADT_TYPE_LOCAL_X2APIC)) and subtable.flags.bits.enabled))
-    return apic
-
-def _mat_factory(field_list):
-    class _mat_subtables(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = field_list
-
-        def __iter__(self):
-            for f in self._fields_:
-                yield getattr(self, f[0])
-
-    return _mat_subtables
-
-def _MAT(mat_buffer):
-    """Multiple APIC Table Entry"""
-    buf = ctypes.create_string_buffer(mat_buffer, len(mat_buffer))
-    addr = ctypes.addressof(buf)
-    subtable_list = apic_subtable_list(addr, len(buf))
-    return _mat_factory(subtable_list).from_buffer_copy(buf)
-
-def parse_mat(mat_data):
-    """Parse Multiple APIC Table Entry"""
-    return _MAT(mat_data)
-
-class ASFSubtable(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('record_type', ctypes.c_uint8, 7),
-        ('last_record', ctypes.c_uint8, 1),
-        ('reserved', ctypes.c_uint8),
-        ('record_length', ctypes.c_uint16),
-    ]
-
-def ASF_subtable_unknown_factory(data_len):
-    class ASFSubtableUnknown(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = copy.copy(ASFSubtable._fields_) + [
-            ('data', ctypes.c_uint8 * data_len),
-        ]
-    return ASFSubtableUnknown
-
-class ASF_info_flags_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('smbus_support', ctypes.c_uint8, 1),
-    ]
-
-class ASF_info_flags(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint8),
-        ('bits', ASF_info_flags_bits),
-    ]
-
-class fixed_smbus_address(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('ASF_compliant_device', ctypes.c_uint8, 1),
-        ('address', ctypes.c_uint8, 7),
-    ]
-
-class ASF_info_record(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = copy.copy(ASFSubtable._fields_) + [
-        ('min_watchdog_reset_value', ctypes.c_uint8),
-        ('min_pollng_interval', ctypes.c_uint8),
-        ('system_id', ctypes.c_uint16),
-        ('iana_manufacturer_id', ctypes.c_uint8 * 4),
-        ('flags', ASF_info_flags),
-        ('reserved2', ctypes.c_uint8 * 3),
-    ]
-
-class ASF_ALERTDATA(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('device_address', ctypes.c_uint8),
-        ('command', ctypes.c_uint8),
-        ('data_mask', ctypes.c_uint8),
-        ('compare_value', ctypes.c_uint8),
-        ('event_sensor_type', ctypes.c_uint8),
-        ('event_type', ctypes.c_uint8),
-        ('event_offset', ctypes.c_uint8),
-        ('event_source_type', ctypes.c_uint8),
-        ('event_severity', ctypes.c_uint8),
-        ('sendor_number', ctypes.c_uint8),
-        ('entity', ctypes.c_uint8),
-        ('entity_instance', ctypes.c_uint8),
-    ]
-
-def ASF_alrt_factory(num_alerts):
-    class ASF_ALRT(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = copy.copy(ASFSubtable._fields_) + [
-            ('assertion_event_mask', ctypes.c_uint8),
-            ('deassertion_event_mask', ctypes.c_uint8),
-            ('number_alerts', ctypes.c_uint8),
-            ('array_element_length', ctypes.c_uint8),
-            ('device_array', ASF_ALERTDATA * num_alerts),
-        ]
-    return ASF_ALRT
-
-class ASF_CONTROLDATA(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('function', ctypes.c_uint8),
-        ('device_address', ctypes.c_uint8),
-        ('command', ctypes.c_uint8),
-        ('data_value', ctypes.c_uint8),
-    ]
-
-def ASF_rctl_factory(num_controls):
-    class ASF_RCTL(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = copy.copy(ASFSubtable._fields_) + [
-            ('number_controls', ctypes.c_uint8),
-            ('array_element_length', ctypes.c_uint8),
-            ('reserved2', ctypes.c_uint16),
-            ('control_array', ASF_CONTROLDATA * num_controls),
-        ]
-    return ASF_RCTL
-
-class ASF_boot_options_capabilities_1_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('firmware_verbosity_screen_blank', ctypes.c_uint8, 1),
-        ('power_button_lock', ctypes.c_uint8, 1),
-        ('reset_button_lock', ctypes.c_uint8, 1),
-        ('reserved_4_3', ctypes.c_uint8, 2),
-        ('lock_keyboard', ctypes.c_uint8, 1),
-        ('sleep_button_lock', ctypes.c_uint8, 1),
-        ('reserved_7', ctypes.c_uint8, 1),
-    ]
-
-class ASF_boot_options_capabilities_1(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint8),
-        ('bits', ASF_boot_options_capabilities_1_bits),
-    ]
-
-class ASF_boot_options_capabilities_2_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('reserved_2_0', ctypes.c_uint8, 3),
-        ('user_password_bypass', ctypes.c_uint8, 1),
-        ('forced_progress_events', ctypes.c_uint8, 1),
-        ('firmware_verbosity_verbose', ctypes.c_uint8, 1),
-        ('firmware_verbosity_quiet', ctypes.c_uint8, 1),
-        ('configuration_data_reset', ctypes.c_uint8, 1),
-    ]
-
-class ASF_boot_options_capabilities_2(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint8),
-        ('bits', ASF_boot_options_capabilities_2_bits),
-    ]
-
-class ASF_special_commands_2_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('force_pxe_boot', ctypes.c_uint8, 1),
-        ('force_hard_drive_boot', ctypes.c_uint8, 1),
-        ('force_hard_drive_safe_mode_boot', ctypes.c_uint8, 1),
-        ('force_diagnostic_boot', ctypes.c_uint8, 1),
-        ('force_cd_dvd_boot', ctypes.c_uint8, 1),
-        ('reserved', ctypes.c_uint8, 3),
-    ]
-
-class ASF_special_commands_2(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint8),
-        ('bits', ASF_special_commands_2_bits),
-    ]
-
-class ASF_system_capabilities_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('power_cycle_reset_only_on_secure_port', ctypes.c_uint8, 1),
-        ('power_down_only_on_secure_port', ctypes.c_uint8, 1),
-        ('power_on_only_on_secure_port', ctypes.c_uint8, 1),
-        ('reset_only_on_secure_port', ctypes.c_uint8, 1),
-        ('power_cycle_reset_on_compat_or_secure_port', ctypes.c_uint8, 1),
-        ('power_down_on_compat_or_secure_port', ctypes.c_uint8, 1),
-        ('power_on_via_compat_or_secure_port', ctypes.c_uint8, 1),
-        ('reset_only_on_compat_or_secure_port', ctypes.c_uint8, 1),
-    ]
-
-class ASF_system_capabilities(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint8),
-        ('bits', ASF_system_capabilities_bits),
-    ]
-
-class ASF_rmcp(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = copy.copy(ASFSubtable._fields_) + [
-        ('boot_options_capabilities_1', ASF_boot_options_capabilities_1),
-        ('boot_options_capabilities_2', ASF_boot_options_capabilities_2),
-        ('boot_options_capabilities_3', ctypes.c_uint8),
-        ('boot_options_capabilities_4', ctypes.c_uint8),
-        ('special_commands_1', ctypes.c_uint8),
-        ('special_commands_2', ASF_special_commands_2),
-        ('system_capabilities', ASF_system_capabilities),
-        ('completion_code', ctypes.c_uint8),
-        ('iana', ctypes.c_uint8 * 4),
-        ('special_command', ctypes.c_uint8),
-        ('special_command_parameter', ctypes.c_uint8 * 2),
-        ('boot_options', ctypes.c_uint8 * 2),
-        ('oem_parameters', ctypes.c_uint8 * 2),
-    ]
-
-def ASF_addr_record_factory(num_devices):
-
-    class ASF_addr_record(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = copy.copy(ASFSubtable._fields_) + [
-            ('seeprom_address', ctypes.c_uint8),
-            ('num_devices', ctypes.c_uint8),
-            ('fixed_smbus_addresses', fixed_smbus_address * num_devices),
-        ]
-    return ASF_addr_record
-
-def ASF_factory(field_list):
-    class subtables(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = field_list
-
-        def __iter__(self):
-            for f in self._fields_:
-                yield getattr(self, f[0])
-
-    class ASF_v1(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = [
-            ('header', TableHeader),
-            ('information_records', subtables),
-        ]
-
-    return ASF_v1
-
-ASF_INFO = 0
-ASF_ALRT = 1
-ASF_RCTL = 2
-ASF_RMCP = 3
-ASF_ADDR = 4
-
-def ASF_subtable_list(addr, length):
-    end = addr + length
-    field_list = list()
-    subtable_num = 0
-    ASF_addr_record_base_len = ctypes.sizeof(ASF_addr_record_factory(0))
-    ASF_alrt_base = ASF_alrt_factory(0)
-    ASF_rctl_base = ASF_rctl_factory(0)
-    while addr < end:
-        subtable_num += 1
-        subtable = ASFSubtable.from_address(addr)
-        if subtable.record_type == ASF_INFO:
-            cls = ASF_info_record
-        elif subtable.record_type == ASF_ALRT:
-            num_alerts = ASF_alrt_base.from_address(addr).number_alerts
-            cls = ASF_alrt_factory(num_alerts)
-        elif subtable.record_type == ASF_RCTL:
-            num_controls = ASF_rctl_base.from_address(addr).number_controls
-            cls = ASF_rctl_factory(num_controls)
-        elif subtable.record_type == ASF_RMCP:
-            cls = ASF_rmcp
-        elif subtable.record_type == ASF_ADDR:
-            cls = ASF_addr_record_factory(subtable.record_length - ASF_addr_record_base_len)
-        else:
-            cls = (subtable.record_length - ctypes.sizeof(ASFSubtable))
-        addr += subtable.record_length
-        field_list.append( ('subtable{}'.format(subtable_num), cls) )
-    return field_list
-
-def ASF(val):
-    """Create class based on decode of an ASF! table from address or filename."""
-    base_length = ctypes.sizeof(ASF_factory(list()))
-    addr = val
-    if isinstance(val, str):
-        data = open(val).read()
-        buf = ctypes.create_string_buffer(data, len(data))
-        addr = ctypes.addressof(buf)
-    hdr = TableHeader.from_address(addr)
-    field_list = ASF_subtable_list(addr + base_length, hdr.length - base_length)
-    if isinstance(val, str):
-        return ASF_factory(field_list).from_buffer_copy(data)
-    return ASF_factory(field_list).from_address(addr)
-
-parse_asf = make_compat_parser("ASF!")
-
-class PCCTSubtable(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('subtype', ctypes.c_uint8),
-        ('length', ctypes.c_uint8),
-    ]
-
-def pcct_subtable_unknown_factory(data_len):
-    class PCCTSubtableUnknown(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = copy.copy(PCCTSubtable._fields_) + [
-            ('data', ctypes.c_uint8 * data_len),
-        ]
-    return PCCTSubtableUnknown
-
-class PCCTGenericCommSubspace(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = copy.copy(PCCTSubtable._fields_) + [
-        ('reserved', ctypes.c_uint8 * 6),
-        ('base_address', ctypes.c_uint64),
-        ('mem_range_length', ctypes.c_uint64),
-        ('doorbell_register', GAS),
-        ('doorbell_preserve', ctypes.c_uint64),
-        ('doorbell_write', ctypes.c_uint64),
-        ('nominal_latency', ctypes.c_uint32),
-        ('max_periodic_access_rate', ctypes.c_uint32),
-        ('min_request_turnaround_time', ctypes.c_uint16),
-    ]
-
-class PCCT_flags_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('sci_doorbell', ctypes.c_uint32, 1),
-    ]
-
-class PCCT_flags(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint32),
-        ('bits', PCCT_flags_bits),
-    ]
-
-def pcct_factory(field_list):
-    class subtables(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = field_list
-
-        def __iter__(self):
-            for f in self._fields_:
-                yield getattr(self, f[0])
-
-    class PCCT_v1(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = [
-            ('header', TableHeader),
-            ('flags', PCCT_flags),
-            ('reserved', ctypes.c_uint64),
-            ('pcc_subspace_structures', subtables),
-        ]
-
-    return PCCT_v1
-
-PCCT_GENERIC_COMMUNICATION_SUBSPACE = 0
-
-def pcct_subtable_list(addr, length):
-    end = addr + length
-    field_list = list()
-    subtable_num = 0
-    while addr < end:
-        subtable_num += 1
-        subtable = PCCTSubtable.from_address(addr)
-        if subtable.subtype == PCCT_GENERIC_COMMUNICATION_SUBSPACE:
-            cls = PCCTGenericCommSubspace
-        else:
-            cls = pcct_subtable_unknown_factory(subtable.length - ctypes.sizeof(PCCTSubtable))
-        addr += subtable.length
-        field_list.append( ('subtable{}'.format(subtable_num), cls) )
-    return field_list
-
-def PCCT(val):
-    """Create class based on decode of an PCCT table from address or filename."""
-    base_length = ctypes.sizeof(pcct_factory(list()))
-    addr = val
-    if isinstance(val, str):
-        data = open(val).read()
-        buf = ctypes.create_string_buffer(data, len(data))
-        addr = ctypes.addressof(buf)
-    hdr = TableHeader.from_address(addr)
-    field_list = pcct_subtable_list(addr + base_length, hdr.length - base_length)
-    if isinstance(val, str):
-        return pcct_factory(field_list).from_buffer_copy(data)
-    return pcct_factory(field_list).from_address(addr)
-
-parse_pcct = make_compat_parser("PCCT")
-
-PMTT_component_memory_type = {
-    0b00:   'Volatile memory',
-    0b01:   'Both volatile and non-volatile memory',
-    0b10:   'Non-volatile memory',
-}
-
-class PMTT_flags_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('top_level_aggregator_device', ctypes.c_uint16, 1),
-        ('physical_topology_element', ctypes.c_uint16, 1),
-    ]
-    _formats = {
-        'component_memory_type': unpack.format_table("{}", PMTT_component_memory_type),
-    }
-
-class PMTT_flags(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint16),
-        ('bits', PMTT_flags_bits),
-    ]
-
-class PMTTSubtable(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('subtype', ctypes.c_uint8),
-        ('reserved1', ctypes.c_uint8),
-        ('length', ctypes.c_uint16),
-        ('flags', PMTT_flags),
-        ('reserved2', ctypes.c_uint16),
-    ]
-
-def PMTTSubtableSocket_factory(field_list):
-
-    class subtables(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = field_list
-
-        def __iter__(self):
-            for f in self._fields_:
-                yield getattr(self, f[0])
-
-    class PMTTSubtableSocket(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = copy.copy(PMTTSubtable._fields_) + [
-            ('socket_identifier', ctypes.c_uint16),
-            ('reserved', ctypes.c_uint16),
-            ('memory_controller_structures', subtables),
-        ]
-
-    return PMTTSubtableSocket
-
-def PMTTSubtableMemController_factory(num_proximity_domains, field_list):
-    class subtables(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = field_list
-
-        def __iter__(self):
-            for f in self._fields_:
-                yield getattr(self, f[0])
-
-    class PMTTSubtableMemController(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = copy.copy(PMTTSubtable._fields_) + [
-            ('read_latency', ctypes.c_uint32),
-            ('write_latency', ctypes.c_uint32),
-            ('read_bandwidth', ctypes.c_uint32),
-            ('write_bandwidth', ctypes.c_uint32),
-            ('optimal_access_unit', ctypes.c_uint16),
-            ('optimal_access_aligment', ctypes.c_uint16),
-            ('reserved', ctypes.c_uint16),
-            ('number_proximity_domains', ctypes.c_uint16),
-            ('domains', (ctypes.c_uint32 * num_proximity_domains)),
-            ('physical_component_identifier_structures', subtables),
-        ]
-
-    return PMTTSubtableMemController
-
-class PMTTSubtableDIMM(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = copy.copy(PMTTSubtable._fields_) + [
-        ('physical_component_id', ctypes.c_uint16),
-        ('reserved', ctypes.c_uint16),
-        ('dimm_size', ctypes.c_uint32),
-        ('smbios_handle', ctypes.c_uint32),
-    ]
-
-def pmtt_subtable_unknown_factory(data_len):
-    class PMTTSubtableUnknown(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = copy.copy(PMTTSubtable._fields_) + [
-            ('data', ctypes.c_uint8 * data_len),
-        ]
-    return PMTTSubtableUnknown
-
-def pmtt_factory(field_list):
-    class subtables(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = field_list
-
-        def __iter__(self):
-            for f in self._fields_:
-                yield getattr(self, f[0])
-
-    class PMTT_v1(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = [
-            ('header', TableHeader),
-            ('reserved', ctypes.c_uint32),
-            ('memory_aggregator_device_structures', subtables),
-        ]
-
-    return PMTT_v1
-
-PMTT_SOCKET = 0
-PMTT_MEMORY_CONTROLLER = 1
-PMTT_DIMM = 2
-
-def pmtt_subtable_list(addr, length):
-    end = addr + length
-    field_list = list()
-    subtable_num = 0
-    skt_base_length = ctypes.sizeof(PMTTSubtableSocket_factory(list()))
-    mc_base_cls = PMTTSubtableMemController_factory(0, list())
-    while addr < end:
-        subtable_num += 1
-        subtable = PMTTSubtable.from_address(addr)
-        if subtable.subtype == PMTT_SOCKET:
-            next_field_list = pmtt_subtable_list(addr + skt_base_length, subtable.length - skt_base_length)
-            cls = PMTTSubtableSocket_factory(next_field_list)
-        elif subtable.subtype == PMTT_MEMORY_CONTROLLER:
-            base_subtable = mc_base_cls.from_address(addr)
-            base_length = ctypes.sizeof(PMTTSubtableMemController_factory(base_subtable.number_proximity_domains, list()))
-            next_field_list = pmtt_subtable_list(addr + base_length, subtable.length - base_length)
-            cls = PMTTSubtableMemController_factory(base_subtable.number_proximity_domains, next_field_list)
-        elif subtable.subtype == PMTT_DIMM:
-            cls = PMTTSubtableDIMM
-        else:
-            cls = pmtt_subtable_unknown_factory(subtable.length - ctypes.sizeof(PMTTSubtable))
-        addr += subtable.length
-        field_list.append( ('subtable{}'.format(subtable_num), cls) )
-    return field_list
-
-def PMTT(val):
-    """Create class based on decode of an PMTT table from address or filename."""
-    base_length = ctypes.sizeof(pmtt_factory(list()))
-    addr = val
-    if isinstance(val, str):
-        data = open(val).read()
-        buf = ctypes.create_string_buffer(data, len(data))
-        addr = ctypes.addressof(buf)
-    hdr = TableHeader.from_address(addr)
-    field_list = pmtt_subtable_list(addr + base_length, hdr.length - base_length)
-    if isinstance(val, str):
-        return pmtt_factory(field_list).from_buffer_copy(data)
-    return pmtt_factory(field_list).from_address(addr)
-
-parse_pmtt = make_compat_parser("PMTT")
-
-class MPSTMemPowerNode_flags_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('enabled', ctypes.c_uint8, 1),
-        ('power_managed', ctypes.c_uint8, 1),
-        ('hot_pluggable', ctypes.c_uint8, 1),
-    ]
-
-class MPSTMemPowerNode_flags(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint8),
-        ('bits', MPSTMemPowerNode_flags_bits),
-    ]
-
-class MPSTState(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('value', ctypes.c_uint8),
-        ('information_index', ctypes.c_uint8),
-    ]
-
-def MPSTMemPowerNode_factory(num_power_states, num_physical_components):
-    class MPSTMemPowerNode(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = [
-            ('flags', MPSTMemPowerNode_flags),
-            ('reserved', ctypes.c_uint8),
-            ('node_id', ctypes.c_uint16),
-            ('length', ctypes.c_uint32),
-            ('base_address_low', ctypes.c_uint32),
-            ('base_address_high', ctypes.c_uint32),
-            ('length_low', ctypes.c_uint32),
-            ('length_high', ctypes.c_uint32),
-            ('num_power_states', ctypes.c_uint32),
-            ('num_physical_components', ctypes.c_uint32),
-            ('memory_power_nodes', MPSTState * num_power_states),
-            ('physical_component_ids', ctypes.c_uint16 * num_physical_components),
-        ]
-    return MPSTMemPowerNode
-
-class power_state_structure_id_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('pss_id_value', ctypes.c_uint8, 6),
-        ('pss_id_revision', ctypes.c_uint8, 2),
-    ]
-
-class power_state_structure_id(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint8),
-        ('bits', power_state_structure_id_bits),
-    ]
-
-class power_state_structure_flags_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('memory_content_preserved', ctypes.c_uint8, 1),
-        ('autonomous_power_state_entry', ctypes.c_uint8, 1),
-        ('autonomous_power_state_exit', ctypes.c_uint8, 1),
-    ]
-
-class power_state_structure_flags(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint8),
-        ('bits', power_state_structure_flags_bits),
-    ]
-
-class MPSTCharacteristics(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('pss_id', power_state_structure_id),
-        ('flags', power_state_structure_flags),
-        ('reserved', ctypes.c_uint16),
-        ('average_power', ctypes.c_uint32),
-        ('relative_power', ctypes.c_uint32),
-        ('exit_latency', ctypes.c_uint64),
-        ('reserved2', ctypes.c_uint32),
-    ]
-
-def mpst_factory(field_list, characteristics_count):
-
-    class subtables(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = field_list
-
-        def __iter__(self):
-            for f in self._fields_:
-                yield getattr(self, f[0])
-
-    class MPST_v1(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = [
-            ('header', TableHeader),
-            ('pcc_id', ctypes.c_uint8),
-            ('reserved', ctypes.c_uint8 * 3),
-            ('memory_power_node_count', ctypes.c_uint16),
-            ('reserved2', ctypes.c_uint16),
-            ('memory_power_nodes', subtables),
-            ('characteristics_count', ctypes.c_uint16),
-            ('reserved3', ctypes.c_uint16),
-            ('characteristics', MPSTCharacteristics * characteristics_count),
-        ]
-
-    return MPST_v1
-
-def mpst_subtable_list(addr, memory_power_node_count):
-    field_list = list()
-    base_MPSTMemPowerNode = MPSTMemPowerNode_factory(0, 0)
-    for subtable_num in range(1, memory_power_node_count + 1):
-        subtable = base_MPSTMemPowerNode.from_address(addr)
-        cls = MPSTMemPowerNode_factory(subtable.num_power_states, subtable.num_physical_components)
-        addr += subtable.length
-        field_list.append( ('subtable{}'.format(subtable_num), cls) )
-    return field_list
-
-def MPST(val):
-    """Create class based on decode of an PMTT table from address or filename."""
-    base_length = ctypes.sizeof(mpst_factory(list(), 0))
-    addr = val
-    if isinstance(val, str):
-        data = open(val).read()
-        buf = ctypes.create_string_buffer(data, len(data))
-        addr = ctypes.addressof(buf)
-    mpst = mpst_factory(list(), 0).from_address(addr)
-    field_list = mpst_subtable_list(ctypes.addressof(mpst.memory_power_nodes), mpst.memory_power_node_count)
-    mpst = mpst_factory(field_list, 0).from_address(addr)
-    if isinstance(val, str):
-        return mpst_factory(field_list, mpst.characteristics_count).from_buffer_copy(data)
-    return mpst_factory(field_list, mpst.characteristics_count).from_address(addr)
-
-parse_mpst = make_compat_parser("MPST")
-
-class MSCTProximityDomainInfo_v1(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('revision', ctypes.c_uint8),
-        ('length', ctypes.c_uint8),
-        ('proximity_domain_range_low', ctypes.c_uint32),
-        ('proximity_domain_range_high', ctypes.c_uint32),
-        ('max_processor_capacity', ctypes.c_uint32),
-        ('max_memory_capacity', ctypes.c_uint64),
-    ]
-
-def msct_factory(num_proxdominfo):
-    class MSCT_v1(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = [
-            ('header', TableHeader),
-            ('proximity_domain_info_offset', ctypes.c_uint32),
-            ('max_proximity_domains', ctypes.c_uint32),
-            ('max_clock_domains', ctypes.c_uint32),
-            ('max_physical_address', ctypes.c_uint64),
-            ('proximity_domain_info_structs', num_proxdominfo * MSCTProximityDomainInfo_v1),
-        ]
-    return MSCT_v1
-
-def MSCT(val):
-    """Create class based on decode of an MSCT table from address or filename."""
-    addr = val
-    if isinstance(val, str):
-        data = open(val).read()
-        buf = ctypes.create_string_buffer(data, len(data))
-        addr = ctypes.addressof(buf)
-    hdr = TableHeader.from_address(addr)
-    num_tables = (hdr.length - ctypes.sizeof(TableHeader)) / ctypes.sizeof(MSCTProximityDomainInfo_v1)
-    if isinstance(val, str):
-        return msct_factory(num_tables).from_buffer_copy(data)
-    return msct_factory(num_tables).from_address(addr)
-
-parse_msct = make_compat_parser("MSCT")
-
-def msdm_factory(data_len):
-    """Create variable-sized MSDM table."""
-    class MSDM_v1(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = [
-            ('header', TableHeader),
-            ('software_licensing_structure', ctypes.c_uint8 * data_len),
-        ]
-    return MSDM_v1
-
-def MSDM(val):
-    """Create class based on decode of an MSDM table from address or filename."""
-    addr = val
-    if isinstance(val, str):
-        data = open(val).read()
-        buf = ctypes.create_string_buffer(data, len(data))
-        addr = ctypes.addressof(buf)
-    hdr = TableHeader.from_address(addr)
-    data_len = hdr.length - ctypes.sizeof(msdm_factory(0))
-    if isinstance(val, str):
-        return msdm_factory(data_len).from_buffer_copy(data)
-    return msdm_factory(data_len).from_address(addr)
-
-parse_msdm = make_compat_parser("MSDM")
-
-def slic_factory(data_len):
-    """Create variable-sized SLIC table."""
-    class SLIC_v1(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = [
-            ('header', TableHeader),
-            ('software_licensing_structure', ctypes.c_uint8 * data_len)
-        ]
-    return SLIC_v1
-
-def SLIC(val):
-    """Create class based on decode of an SLIC table from address or filename."""
-    addr = val
-    if isinstance(val, str):
-        data = open(val).read()
-        buf = ctypes.create_string_buffer(data, len(data))
-        addr = ctypes.addressof(buf)
-    hdr = TableHeader.from_address(addr)
-    data_len = hdr.length - ctypes.sizeof(slic_factory(0))
-    if isinstance(val, str):
-        return slic_factory(data_len).from_buffer_copy(data)
-    return slic_factory(data_len).from_address(addr)
-
-parse_slic = make_compat_parser("SLIC")
-
-def slit_factory(num_system_localities):
-    class SLIT_v1(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = [
-            ('header', TableHeader),
-            ('number_system_localities', ctypes.c_uint64),
-            ('relative_distances', ctypes.c_uint8 * num_system_localities * num_system_localities),
-        ]
-    return SLIT_v1
-
-def SLIT(val):
-    """Create class based on decode of an DMAR table from address or filename."""
-    addr = val
-    if isinstance(val, str):
-        data = open(val).read()
-        buf = ctypes.create_string_buffer(data, len(data))
-        addr = ctypes.addressof(buf)
-    s = slit_factory(0).from_address(addr)
-    if isinstance(val, str):
-        return slit_factory(s.number_system_localities).from_buffer_copy(data)
-    return slit_factory(s.number_system_localities).from_address(addr)
-
-parse_slit = make_compat_parser("SLIT")
-
-class SRATSubtable(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = [
-            ('subtype', ctypes.c_uint8),
-            ('length', ctypes.c_uint8),
-        ]
-
-class SRATLocalApicAffinity_flags_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('enabled', ctypes.c_uint32, 1),
-    ]
-
-class SRATLocalApicAffinity_flags(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint32),
-        ('bits', SRATLocalApicAffinity_flags_bits),
-    ]
-
-class SRATLocalApicAffinity(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = copy.copy(SRATSubtable._fields_) + [
-        ('proximity_domain_7_0', ctypes.c_uint8),
-        ('apic_id', ctypes.c_uint8),
-        ('flags', SRATLocalApicAffinity_flags),
-        ('local_sapic_eid', ctypes.c_uint8),
-        ('proximity_domain_31_8', ctypes.c_uint8 * 3),
-        ('clock_domain', ctypes.c_uint32),
-    ]
-
-class SRATMemoryAffinity_flags_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('enabled', ctypes.c_uint32, 1),
-        ('hot_pluggable', ctypes.c_uint32, 1),
-        ('nonvolatile', ctypes.c_uint32, 1),
-    ]
-
-class SRATMemoryAffinity_flags(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint32),
-        ('bits', SRATMemoryAffinity_flags_bits),
-    ]
-
-class SRATMemoryAffinity(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = copy.copy(SRATSubtable._fields_) + [
-        ('proximity_domain', ctypes.c_uint32),
-        ('reserved1', ctypes.c_uint8 * 2),
-        ('base_address_low', ctypes.c_uint32),
-        ('base_address_high', ctypes.c_uint32),
-        ('length_low', ctypes.c_uint32),
-        ('length_high', ctypes.c_uint32),
-        ('reserved2', ctypes.c_uint32),
-        ('flags', SRATMemoryAffinity_flags),
-        ('reserved3', ctypes.c_uint64),
-    ]
-
-class SRATLocalX2ApicAffinity_flags_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('enabled', ctypes.c_uint32, 1),
-    ]
-
-class SRATLocalX2ApicAffinity_flags(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint32),
-        ('bits', SRATLocalX2ApicAffinity_flags_bits),
-    ]
-
-class SRATLocalX2ApicAffinity(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = copy.copy(SRATSubtable._fields_) + [
-        ('reserved1', ctypes.c_uint16),
-        ('proximity_domain', ctypes.c_uint32),
-        ('x2apic_id', ctypes.c_uint32),
-        ('flags', SRATLocalX2ApicAffinity_flags),
-        ('clock_domain', ctypes.c_uint32),
-        ('reserved2', ctypes.c_uint32),
-    ]
-
-def SRATSubtableUnknown_factory(_len):
-    class SRATSubtableUnknown(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = copy.copy(SRATSubtable._fields_) + [
-            ('data', ctypes.c_uint8 * _len),
-        ]
-    return SRATSubtableUnknown
-
-SRAT_LOCAL_APIC_AFFINITY = 0
-SRAT_MEMORY_AFFINITY = 1
-SRAT_LOCAL_X2APIC_AFFINITY = 2
-
-def srat_factory(field_list):
-    class subtables(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = field_list
-
-        def __iter__(self):
-            for f in self._fields_:
-                yield getattr(self, f[0])
-
-    class SRAT_v3(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = [
-            ('header', TableHeader),
-            ('reserved1', ctypes.c_uint32),
-            ('reserved2', ctypes.c_uint64),
-            ('subtables', subtables),
-        ]
-        def __str__(self):
-            out = StringIO()
-            print >>out, "SRAT Summary\n"
-            mem = [t for t in self.subtables if (t.subtype == SRAT_MEMORY_AFFINITY) and t.flags.bits.enabled]
-            if mem:
-                print >>out, "Enabled Memory Affinity Domains"
-                for m in mem:
-                    domain = m.proximity_domain
-                    addr = (m.base_address_high << 32) + m.base_address_low
-                    len = (m.length_high << 32) +  m.length_low
-                    print >>out, "domain = {:#x}  base address = {:#016x}  length = {:#016x}".format(domain, addr, len)
-                print >>out
-            xapic = [t for t in  self.subtables if (t.subtype == SRAT_LOCAL_APIC_AFFINITY) and t.flags.bits.enabled]
-            x2apic = [t for t in  self.subtables if (t.subtype == SRAT_LOCAL_X2APIC_AFFINITY) and t.flags.bits.enabled]
-            if xapic or x2apic:
-                domain_apicids = {}
-                print >>out, "Enabled Processor Affinity Domains"
-                for x in xapic:
-                    domain = (x.proximity_domain_31_8[2] << 24) + (x.proximity_domain_31_8[1] << 16) + (x.proximity_domain_31_8[0] << 8) + x.proximity_domain_7_0
-                    domain_apicids.setdefault(domain, []).append(x.apic_id)
-                for x2 in x2apic:
-                    domain_apicids.setdefault(x2.proximity_domain, []).append(x2.x2apic_id)
-                for domain, apicids in domain_apicids.iteritems():
-                    print >>out, "domain={:#x}  apicids={}".format(domain, ','.join("{:#x}".format(a) for a in sorted(apicids)))
-                print >>out
-            print >>out, super(SRAT_v3, self).__str__()
-            return out.getvalue()
-
-    return SRAT_v3
-
-def SRAT(val):
-    """Create class based on decode of an SRAT table from address or filename."""
-    addr = val
-    if isinstance(val, str):
-        data = open(val).read()
-        buf = ctypes.create_string_buffer(data, len(data))
-        addr = ctypes.addressof(buf)
-    hdr = TableHeader.from_address(addr)
-    end = addr + hdr.length
-    current = addr + ctypes.sizeof(srat_factory(list()))
-    field_list = list()
-    subtable_num = 0
-    while current < end:
-        subtable_num += 1
-        subtable = SRATSubtable.from_address(current)
-        current += subtable.length
-        if subtable.subtype == SRAT_LOCAL_APIC_AFFINITY:
-            cls = SRATLocalApicAffinity
-        elif subtable.subtype == SRAT_MEMORY_AFFINITY:
-            cls = SRATMemoryAffinity
-        elif subtable.subtype == SRAT_LOCAL_X2APIC_AFFINITY:
-            cls = SRATLocalX2ApicAffinity
-        else:
-            cls = srat_subtable_unknown_factory(subtable.length - ctypes.sizeof(SRATSubtable))
-        field_list.append( ('subtable{}'.format(subtable_num), cls) )
-    if isinstance(val, str):
-        return srat_factory(field_list).from_buffer_copy(data)
-    return srat_factory(field_list).from_address(addr)
-
-def parse_srat(printflag=False, EnabledOnly=False, instance=1):
-    """Parse and optionally print an SRAT table."""
-
-    srat = parse_table("SRAT", instance)
-    if srat is None:
-        return None
-    if printflag:
-        with ttypager.page():
-            print srat
-    if EnabledOnly:
-        with ttypager.page():
-            print '\n'.join(str(subtable) for subtable in srat.subtables if subtable.flags.bits.enabled)
-    return srat
-
-def _asid_str(asid):
-    if asid >= 0xC0 and asid <= 0xff:
-        return 'OEM Defined'
-    _asid = {
-        ASID_SYSTEM_MEMORY: 'System Memory',
-        ASID_SYSTEM_IO: 'System IO',
-        ASID_PCI_CFG_SPACE: 'PCI Configuration Space',
-        ASID_EMBEDDED_CONTROLLER: 'Embedded Controller',
-        ASID_SMBUS: 'SMBus',
-        ASID_PCC: 'Platform Communications Channel (PCC)',
-        ASID_FFH: 'Functional Fixed Hardware',
-        }
-    return _asid.get(asid, 'Reserved')
-
-class flow_control_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('DCD', ctypes.c_uint8, 1),
-        ('RTSCTS', ctypes.c_uint8, 1),
-        ('XONXOFF', ctypes.c_uint8, 1),
-    ]
-
-class flow_control(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint8),
-        ('bits', flow_control_bits),
-    ]
-
-# Decode for baud rate the BIOS used for redirection
-baud = {
-    3: 9600,
-    4: 19200,
-    6: 57600,
-    7: 115200,
-}
-def _format_baud(val):
-    return baud.get(val, 'Reserved')
-
-class SPCR_v1(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('header', TableHeader),
-        ('interface_type', ctypes.c_uint8),
-        ('reserved0', ctypes.c_uint8 * 3),
-        ('base_address', GAS),
-        ('int_type', ctypes.c_uint8),
-        ('irq', ctypes.c_uint8),
-        ('global_sys_int', ctypes.c_uint32),
-        ('baud_rate', ctypes.c_uint8),
-        ('parity', ctypes.c_uint8),
-        ('stop_bits', ctypes.c_uint8),
-        ('flow_control', flow_control),
-        ('terminal_type', ctypes.c_uint8),
-        ('reserved1', ctypes.c_uint8),
-        ('pci_did', ctypes.c_uint16),
-        ('pci_vid', ctypes.c_uint16),
-        ('pci_bus', ctypes.c_uint8),
-        ('pci_dev', ctypes.c_uint8),
-        ('pci_func', ctypes.c_uint8),
-        ('pci_flags', ctypes.c_uint32),
-        ('pci_segment', ctypes.c_uint8),
-        ('reserved2', ctypes.c_uint8 * 4)
-    ]
-    _formats = {
-        'baud_rate': unpack.format_function("{}", _format_baud),
-        'parity': unpack.format_table("{}", { 0: 'No Parity' }),
-        'stop_bits': unpack.format_table("{}", { 1: '1 stop bit' }),
-    }
-
-def SPCR(val):
-    """Create class based on decode of an SPCR table from address or filename."""
-    addr = val
-    if isinstance(val, str):
-        data = open(val).read()
-        buf = ctypes.create_string_buffer(data, len(data))
-        addr = ctypes.addressof(buf)
-        return SPCR_v1.from_buffer_copy(data)
-    return SPCR_v1.from_address(addr)
-
-parse_spcr = make_compat_parser("SPCR")
-
-class event_timer_block_id_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('hardware_rev_id', ctypes.c_uint32, 8),
-        ('num_comparators', ctypes.c_uint32, 5),
-        ('count_size_cap_counter_size', ctypes.c_uint32, 1),
-        ('reserved', ctypes.c_uint32, 1),
-        ('legacy_replacement_IRQ_routing_capable', ctypes.c_uint32, 1),
-        ('pci_vid', ctypes.c_uint32, 16),
-    ]
-
-class event_timer_block_id(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint32),
-        ('bits', event_timer_block_id_bits),
-    ]
-
-_page_protection_table = {
-    0: 'No Guarantee for page protection',
-    1: '4KB page protected',
-    2: '64KB page protected',
-}
-
-class hpet_capabilities_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('page_protection', ctypes.c_uint8, 4),
-        ('oem_attributes', ctypes.c_uint8, 4),
-    ]
-    _formats = {
-        'page_protection': unpack.format_table("{:#x}", _page_protection_table),
-    }
-
-class hpet_capabilities(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint8),
-        ('bits', hpet_capabilities_bits),
-    ]
-
-class HPET_v1(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('header', TableHeader),
-        ('event_timer_block_id', event_timer_block_id),
-        ('base_address', GAS),
-        ('hpet_number', ctypes.c_uint8),
-        ('main_counter_min_clock_tick_in_periodic_mode', ctypes.c_uint16),
-        ('capabilities', hpet_capabilities),
-    ]
-
-def HPET(val):
-    """Create class based on decode of an HPET table from address or filename."""
-    addr = val
-    if isinstance(val, str):
-        data = open(val).read()
-        buf = ctypes.create_string_buffer(data, len(data))
-        addr = ctypes.addressof(buf)
-        return HPET_v1.from_buffer_copy(data)
-    return HPET_v1.from_address(addr)
-
-parse_hpet = make_compat_parser("HPET")
-
-def uefi_factory(data_len):
-
-    class UEFI_v1(bits.cdata.Struct):
-        _pack_ = 1
-        _fields_ = [
-            ('header', TableHeader),
-            ('identifier', bits.cdata.GUID),
-            ('data_offset', ctypes.c_uint16),
-            ('data', ctypes.c_uint8 * data_len),
-        ]
-        _formats = {
-            'identifier': bits.cdata._format_guid,
-        }
-
-    return UEFI_v1
-
-def UEFI(val):
-    """Create class based on decode of an UEFI table from address or filename."""
-    addr = val
-    if isinstance(val, str):
-        data = open(val).read()
-        buf = ctypes.create_string_buffer(data, len(data))
-        addr = ctypes.addressof(buf)
-    u = TableHeader.from_address(addr)
-    data_len = u.length - ctypes.sizeof(uefi_factory(0))
-    if isinstance(val, str):
-        return uefi_factory(data_len).from_buffer_copy(data)
-    return uefi_factory(data_len).from_address(addr)
-
-parse_uefi = make_compat_parser("UEFI")
-
-_wdt_available_decode = {
-    0: 'permanently disabled',
-    1: 'available',
-}
-
-_wdt_active_decode = {
-    0: 'WDT stopped when BIOS hands off control',
-    1: 'WDT running when BIOS hnads off control',
-}
-
-_ownership_decode = {
-    0: 'TCO is owned by the BIOS',
-    1: 'TCO is owned by the OS',
-}
-
-class wddt_status_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('wdt_available', ctypes.c_uint16, 1),
-        ('wdt_active', ctypes.c_uint16, 1),
-        ('ownership', ctypes.c_uint16, 1),
-        ('reserved', ctypes.c_uint16, 8),
-        ('user_reset_event', ctypes.c_uint16, 1),
-        ('wdt_event', ctypes.c_uint16, 1),
-        ('power_fail_event', ctypes.c_uint16, 1),
-        ('unknown_reset_event', ctypes.c_uint16, 1),
-    ]
-    _formats = {
-        'wdt_available': unpack.format_table("{}", _wdt_available_decode),
-        'wdt_active': unpack.format_table("{}", _wdt_active_decode),
-        'ownership': unpack.format_table("{}", _ownership_decode),
-    }
-
-class wddt_status(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint16),
-        ('bits', wddt_status_bits),
-    ]
-
-class wddt_capability_bits(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('auto_reset', ctypes.c_uint16, 1),
-        ('alert_support', ctypes.c_uint16, 1),
-        ('platform_directed_shutdown', ctypes.c_uint16, 1),
-        ('immediate_shutdown', ctypes.c_uint16, 1),
-        ('bios_handoff_support', ctypes.c_uint16, 1),
-    ]
-
-class wddt_capability(bits.cdata.Union):
-    _pack_ = 1
-    _anonymous_ = ("bits",)
-    _fields_ = [
-        ('data', ctypes.c_uint16),
-        ('bits', wddt_capability_bits),
-    ]
-
-class WDDT_v1(bits.cdata.Struct):
-    _pack_ = 1
-    _fields_ = [
-        ('header', TableHeader),
-        ('tco_spec_version', ctypes.c_uint16),
-        ('tco_description_table_version', ctypes.c_uint16),
-        ('pci_vid', ctypes.c_uint16),
-        ('tco_base_address', GAS),
-        ('timer_min_count', ctypes.c_uint16),
-        ('timer_max_count', ctypes.c_uint16),
-        ('timer_count_period', ctypes.c_uint16),
-        ('status', wddt_status),
-        ('capability', wddt_capability),
-    ]
-
-def WDDT(val):
-    """Create class based on decode of an WDDT table from address or filename."""
-    addr = val
-    if isinstance(val, str):
-        data = open(val).read()
-        buf = ctypes.create_string_buffer(data, len(data))
-        addr = ctypes.addressof(buf)
-        return WDDT_v1.from_buffer_copy(data)
-    return WDDT_v1.from_address(addr)
-
-parse_wddt = make_compat_parser("WDDT")
-
-def get_cpupaths(*args):
-    cpupaths, devpaths = _acpi._cpupaths(*args)
-    apic = parse_apic()
-    procid_apicid = apic.procid_apicid
-    uid_x2apicid = apic.uid_x2apicid
-    if procid_apicid is None or uid_x2apicid is None:
-        # No APIC table exists, so assume the existing cpus are enabled
-        return cpupaths
-    enabled_cpupaths = []
-    for cpupath in cpupaths:
-        procdef = evaluate(cpupath)
-        if procdef is not None and procdef.ProcId in procid_apicid:
-           enabled_cpupaths.append(cpupath)
-    for devpath in devpaths:
-        uid = evaluate(devpath + "._UID")
-        if uid is not None and uid in uid_x2apicid:
-           enabled_cpupaths.append(devpath)
-    return enabled_cpupaths
-
-def find_procid():
-    cpupaths = get_cpupaths()
-    cpupath_procid = {}
-    for cpupath in cpupaths:
-        if get_object_info(cpupath).object_type != ACPI_TYPE_PROCESSOR:
-            continue
-        processor = evaluate(cpupath)
-        if processor is not None:
-            cpupath_procid[cpupath] = processor.ProcId
-        else:
-            cpupath_procid[cpupath] = None
-    return OrderedDict(sorted(cpupath_procid.items()))
-
-def find_uid():
-    cpupaths = get_cpupaths()
-    cpupath_uid = {}
-    for cpupath in cpupaths:
-        if get_object_info(cpupath).object_type != ACPI_TYPE_DEVICE:
-            continue
-        value = evaluate(cpupath + "._UID")
-        cpupath_uid[cpupath] = value
-    return OrderedDict(sorted(cpupath_uid.items()))
-
-def commonprefix(l):
-    """Return the common prefix of a list of strings."""
-    if not l:
-        return ''
-    prefix = l[0]
-    for s in l[1:]:
-        for i, c in enumerate(prefix):
-            if c != s[i]:
-                prefix = s[:i]
-                break
-    return prefix
-
-def factor_commonprefix(l):
-    if not l:
-        return ''
-    if len(l) == 1:
-        return l[0]
-    prefix = commonprefix(l)
-    prefixlen = len(prefix)
-    return prefix + "{" + ", ".join([s[prefixlen:] for s in l]) + "}"
-
-def display_cpu_info():
-    cpupaths = get_cpupaths()
-    cpupath_procid = find_procid()
-    cpupath_uid = find_uid()
-    apic = parse_apic()
-    procid_apicid = apic.procid_apicid
-    uid_x2apicid = apic.uid_x2apicid
-    if procid_apicid is None or uid_x2apicid is None:
-        return
-    socketindex_cpuscope = {}
-    s = factor_commonprefix(cpupaths) + '\n'
-    for cpupath in cpupaths:
-        s += '\n' + cpupath
-        def socket_str(apicid):
-            socket_index = bits.socket_index(apicid)
-            if socket_index is None:
-                return ''
-            return ', socketIndex=0x%02x' % socket_index
-        def apicid_str(apicid):
-            if apicid is None:
-                return 'no ApicID'
-            return 'ApicID=0x%02x%s' % (apicid, socket_str(apicid))
-        procid = cpupath_procid.get(cpupath, None)
-        if procid is not None:
-            s += ' ProcID=%-2u (%s) ' % (procid, apicid_str(procid_apicid.get(procid, None)))
-            socketindex_cpuscope.setdefault(bits.socket_index(procid_apicid.get(procid, None)), []).append(scope(cpupath))
-        uid = cpupath_uid.get(cpupath, None)
-        if uid is not None:
-            s += ' _UID=%s (%s)' % (uid, apicid_str(uid_x2apicid.get(uid, None)))
-            socketindex_cpuscope.setdefault(bits.socket_index(uid_x2apicid.get(uid, None)), []).append(scope(cpupath))
-    for value, scopes in socketindex_cpuscope.iteritems():
-        unique_scopes = set(scopes)
-        s += '\nsocket {0} contains {1} processors and {2} ACPI scope: {3}\n'.format(value, len(scopes), len(unique_scopes), ','.join(sorted(unique_scopes)))
-    ttypager.ttypager_wrap(s, indent=False)
-
-def display_acpi_method(method, print_one):
-    """Helper function that performs all basic processing for evaluating an ACPI method"""
-    cpupaths = get_cpupaths()
-    uniques = {}
-    for cpupath in cpupaths:
-        value = evaluate(cpupath + "." + method)
-        uniques.setdefault(value, []).append(cpupath)
-
-    print ttypager._wrap("%u unique %s values" % (len(uniques), method))
-    for value, cpupaths in sorted(uniques.iteritems(), key=(lambda (k,v): v)):
-        print
-        print ttypager._wrap(factor_commonprefix(cpupaths))
-        if value is None:
-            print "No %s found for these CPUs" % method
-        else:
-            print_one(value)
-
-def parse_cpu_method(method):
-    cls = globals()["parse" + string.lower(method)]
-    cpupaths = get_cpupaths()
-    uniques = {}
-    for cpupath in cpupaths:
-        value = evaluate(cpupath + "." + method)
-        if value is not None:
-            obj = cls(value)
-        else:
-            obj = None
-        uniques.setdefault(obj, []).append(cpupath)
-    return uniques
+def parse_cpu_method(method):
+    """Evaluate method on every processor, and decode each distinct result.
+
+    Returns a dict mapping each decoded value (None if a processor has no
+    such method) to the list of processor paths that returned it. Processors
+    that return the same raw value share a single decode."""
+    cls = _lookup("parse" + string.lower(method))
+    values = [(cpupath, evaluate(cpupath + "." + method)) for cpupath in get_cpupaths()]
+    decoded = {}
+    uniques = {}
+    for cpupath, value in values:
+        if value not in decoded:
+            decoded[value] = None if value is None else cls(value)
+        uniques.setdefault(decoded[value], []).append(cpupath)
+    return uniques
 
 def display_cpu_method(method):
     uniques = parse_cpu_method(method)
@@ -3931,6 +1944,7 @@ def display_cpu_method(method):
             lines.extend(ttypager._wrap(str(value), indent=False).splitlines())
     ttypager.ttypager("\n".join(lines))
 
+@bits.cdata.memoize_factory
 def _CSD_factory(num_dependencies):
     class CStateDependency(bits.cdata.Struct):
         """C-State Dependency"""
@@ -3989,6 +2003,7 @@ def make_CStates(data):
         return tuple(make_CStates(v) for v in data)
     return data
 
+@bits.cdata.memoize_factory
 def _CST_factory(num_cstates):
     class _CST(bits.cdata.Struct):
         _pack = 1
@@ -4066,6 +2081,7 @@ _coordination_types = {
     0xFE : 'HW_ALL',
 }
 
+@bits.cdata.memoize_factory
 def _PSD_factory(num_dependencies):
     class PStateDependency(bits.cdata.Struct):
         _pack_ = 1
@@ -4094,6 +2110,7 @@ def parse_psd(psd_data):
     """Parse P-State Dependency"""
     return _PSD_factory(len(psd_data))(psd_data)
 
+@bits.cdata.memoize_factory
 def _PSS_factory(num_pstates):
     class PState(bits.cdata.Struct):
         _pack_ = 1
@@ -4166,6 +2183,7 @@ def parse_tpc(tpc_data):
     """Parse Throttling Present Capabilities"""
     return _TPC(tpc_data)
 
+@bits.cdata.memoize_factory
 def _TSD_factory(num_dependencies):
     class TStateDependency(bits.cdata.Struct):
         _pack_ = 1
@@ -4194,6 +2212,7 @@ def parse_tsd(dependencies):
     """Parse T-State Dependency"""
     return _TSD_factory(len(dependencies))(dependencies)
 
+@bits.cdata.memoize_factory
 def _TSS_factory(num_tstates):
     class TState(bits.cdata.Struct):
         """Throttling Supported States"""
@@ -4275,7 +2294,14 @@ class ACPI_BUFFER(bits.cdata.Struct):
 
 ACPI_WALK_CALLBACK = CFUNCTYPE(ACPI_STATUS, ACPI_HANDLE, UINT32, c_void_p, POINTER(c_void_p))
 
-terminate = CFUNCTYPE(None)(_acpi.acpica_terminate)
+_acpica_terminate = CFUNCTYPE(None)(_acpi.acpica_terminate)
+
+def terminate():
+    """Shut down ACPICA; the next ACPI operation initializes it again"""
+    global _cpus_initialized
+    _acpica_terminate()
+    _cpus_initialized = False
+    _namespace_changed()
 
 ACPI_FREE = CFUNCTYPE(None, c_void_p)(_acpi.ACPI_FREE)
 
@@ -4293,23 +2319,26 @@ def check_status(status):
     if status:
         raise ACPIException(status)
 
-acpi_unsafe_io = True
+# The C variable acpi_unsafe_io controls port I/O from AML, for both the
+# native and Python port I/O handlers, whether or not the AML runs through
+# evaluate. The acpi module exposes it as the attribute acpi_unsafe_io.
+_native_unsafe_io = ctypes.c_uint32.from_address(_acpi.acpi_unsafe_io)
 
 @CFUNCTYPE(ACPI_STATUS, ACPI_IO_ADDRESS, POINTER(UINT32), UINT32)
 def AcpiOsReadPort(Address, Value, Width):
     if Width == 8:
-        Value.contents.value = bits.inb(Address) if acpi_unsafe_io else 0xFF
+        Value.contents.value = bits.inb(Address) if _native_unsafe_io.value else 0xFF
     elif Width == 16:
-        Value.contents.value = bits.inw(Address) if acpi_unsafe_io else 0xFFFF
+        Value.contents.value = bits.inw(Address) if _native_unsafe_io.value else 0xFFFF
     elif Width == 32:
-        Value.contents.value = bits.inl(Address) if acpi_unsafe_io else 0xFFFFFFFF
+        Value.contents.value = bits.inl(Address) if _native_unsafe_io.value else 0xFFFFFFFF
     else:
         return AE_BAD_PARAMETER
     return AE_OK
 
 @CFUNCTYPE(ACPI_STATUS, ACPI_IO_ADDRESS, UINT32, UINT32)
 def AcpiOsWritePort(Address, Value, Width):
-    if not acpi_unsafe_io:
+    if not _native_unsafe_io.value:
         return AE_OK
     if Width == 8:
         bits.outb(Address, Value)
@@ -4321,8 +2350,121 @@ def AcpiOsWritePort(Address, Value, Width):
         return AE_BAD_PARAMETER
     return AE_OK
 
-bits.set_func_ptr(_acpi.AcpiOsReadPort_ptrptr, AcpiOsReadPort)
-bits.set_func_ptr(_acpi.AcpiOsWritePort_ptrptr, AcpiOsWritePort)
+def use_python_port_io(enable=True):
+    """Route AML port I/O through the Python AcpiOsReadPort and AcpiOsWritePort.
+
+    By default, ACPICA performs port I/O in C, without calling back into
+    Python for every access.  The Python handlers allow instrumenting port
+    I/O from Python, at the cost of a Python call per access.  Pass
+    enable=False to return to the native handlers."""
+    if enable:
+        bits.set_func_ptr(_acpi.AcpiOsReadPort_ptrptr, AcpiOsReadPort)
+        bits.set_func_ptr(_acpi.AcpiOsWritePort_ptrptr, AcpiOsWritePort)
+    else:
+        ctypes.c_ulong.from_address(_acpi.AcpiOsReadPort_ptrptr).value = _acpi.AcpiOsReadPortNative
+        ctypes.c_ulong.from_address(_acpi.AcpiOsWritePort_ptrptr).value = _acpi.AcpiOsWritePortNative
+
+_io_trace_directions = {
+    0: "read",
+    1: "write",
+}
+
+class IOTraceEntry(bits.cdata.Struct):
+    """AML port I/O access"""
+    _pack_ = 1
+    _fields_ = [
+        ('tsc', ctypes.c_uint64),
+        ('value', ctypes.c_uint32),
+        ('port', ctypes.c_uint16),
+        ('width', ctypes.c_uint8),
+        ('direction', ctypes.c_uint8),
+    ]
+    _formats = {
+        'direction': unpack.format_table("{}", _io_trace_directions),
+    }
+
+class _IOTraceRing(ctypes.Structure):
+    """Mirror of struct acpi_io_trace in osgrub2xf.c"""
+    _fields_ = [
+        ('count', ctypes.c_uint64),
+        ('entries', POINTER(IOTraceEntry)),
+        ('size', ctypes.c_uint32),
+        ('next', ctypes.c_uint32),
+    ]
+
+_io_trace_ring = _IOTraceRing.from_address(_acpi.acpi_io_trace)
+_io_trace_buffer = None
+
+IO_TRACE_SIGNATURE = "AMLIOTRC"
+
+class IOTraceHeader(bits.cdata.Struct):
+    """Header of saved AML port I/O trace data"""
+    _pack_ = 1
+    _fields_ = [
+        ('signature', ctypes.c_char * 8),
+        ('count', ctypes.c_uint64),
+        ('num_entries', ctypes.c_uint32),
+        ('entry_size', ctypes.c_uint32),
+    ]
+
+@bits.cdata.memoize_factory
+def io_trace_factory(num_entries):
+    class IOTrace(bits.cdata.Struct):
+        """AML port I/O trace"""
+        _pack_ = 1
+        _fields_ = copy.copy(IOTraceHeader._fields_) + [
+            ('entries', IOTraceEntry * num_entries),
+        ]
+    return IOTrace
+
+def start_io_trace(size=4096):
+    """Start recording AML port I/O in a ring holding the last size accesses.
+
+    Each entry records the port, width, value, direction, and TSC of one
+    access, whether made by the native or the Python handlers."""
+    global _io_trace_buffer
+    stop_io_trace()
+    _io_trace_buffer = (IOTraceEntry * size)()
+    _io_trace_ring.count = 0
+    _io_trace_ring.next = 0
+    _io_trace_ring.size = size
+    _io_trace_ring.entries = ctypes.cast(_io_trace_buffer, POINTER(IOTraceEntry))
+
+def stop_io_trace():
+    """Stop recording AML port I/O, keeping the entries recorded so far"""
+    _io_trace_ring.entries = None
+
+def io_trace_data():
+    """Return the recorded AML port I/O as a string, oldest access first.
+
+    The string contains an IOTraceHeader followed by the entries, and can be
+    saved and later decoded with decode_io_trace."""
+    entry_size = ctypes.sizeof(IOTraceEntry)
+    data = ""
+    if _io_trace_buffer is not None:
+        raw = buffer(_io_trace_buffer)
+        if _io_trace_ring.count < len(_io_trace_buffer):
+            data = raw[:_io_trace_ring.count * entry_size]
+        else:
+            split = _io_trace_ring.next * entry_size
+            data = raw[split:] + raw[:split]
+    header = IOTraceHeader(IO_TRACE_SIGNATURE, _io_trace_ring.count, len(data) / entry_size, entry_size)
+    return buffer(header)[:] + data
+
+def decode_io_trace(data):
+    """Decode AML port I/O trace data returned by io_trace_data"""
+    header = IOTraceHeader.from_buffer_copy(data)
+    if header.signature != IO_TRACE_SIGNATURE or header.entry_size != ctypes.sizeof(IOTraceEntry):
+        raise ValueError("Not an AML port I/O trace")
+    return io_trace_factory(header.num_entries).from_buffer_copy(data)
+
+def io_trace():
+    """Return the recorded AML port I/O, oldest access first"""
+    return decode_io_trace(io_trace_data())
+
+def io_trace_ports(trace):
+    """Count the accesses in a decoded trace by (port, width, direction)"""
+    return Counter((e.port, e.width, _io_trace_directions[e.direction]) for e in trace.entries)
 
 _AcpiGetHandle_docstring = """Get the object handle associated with an ACPI name"""
 AcpiGetHandle = needs_init(CFUNCTYPE(ACPI_STATUS, ACPI_HANDLE, ACPI_STRING, POINTER(ACPI_HANDLE))(_acpi.AcpiGetHandle), _AcpiGetHandle_docstring)
@@ -4342,6 +2484,9 @@ AcpiGetTableByIndex = needs_early_init(CFUNCTYPE(ACPI_STATUS, UINT32, POINTER(PO
 _AcpiOsGetRootPointer_docstring = """Return the address of the ACPI RSDP table"""
 AcpiOsGetRootPointer = needs_init(CFUNCTYPE(c_ulong)(_acpi.AcpiOsGetRootPointer), _AcpiOsGetRootPointer_docstring)
 
+_AcpiGetType_docstring = """Get the type of an ACPI object"""
+AcpiGetType = needs_init(CFUNCTYPE(ACPI_STATUS, ACPI_HANDLE, POINTER(ACPI_OBJECT_TYPE))(_acpi.AcpiGetType), _AcpiGetType_docstring)
+
 _AcpiInstallInterface_docstring = """Install an interface into the _OSI method"""
 AcpiInstallInterface = needs_init(CFUNCTYPE(ACPI_STATUS, ACPI_STRING)(_acpi.AcpiInstallInterface), _AcpiInstallInterface_docstring)
 
@@ -4376,29 +2521,182 @@ def get_object_info(pathname):
 
     return ObjectInfo(buf.raw, info.value)
 
+class NamespaceNode(object):
+    """An object in the ACPI namespace index"""
+    __slots__ = ("name", "path", "object_type", "parent", "children", "depth")
+
+    def __init__(self, name, path, object_type, parent):
+        self.name = name
+        self.path = path
+        self.object_type = object_type
+        self.parent = parent
+        self.children = OrderedDict()
+        self.depth = 0 if parent is None else parent.depth + 1
+
+    def __repr__(self):
+        return "NamespaceNode({!r}, {})".format(self.path, acpi_object_types.get(self.object_type, "Reserved"))
+
+    def walk(self):
+        """Yield all the nodes below this one, in namespace walk order"""
+        stack = list(reversed(self.children.values()))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children.values()))
+
+class NamespaceIndex(object):
+    """Index of the ACPI namespace, organized as a trie of name segments.
+
+    objects provides the (full path, object type) of each object, in the
+    order a depth-first walk of the namespace visits them; queries return
+    nodes in the same order."""
+
+    def __init__(self, objects):
+        self.root = NamespaceNode("\\", "\\", ACPI_TYPE_ANY, None)
+        self.nodes = []
+        self._by_name = {}
+        self._by_type = {}
+        for path, object_type in objects:
+            self._add(path, object_type)
+
+    @staticmethod
+    def _segments(path):
+        path = path.lstrip("\\").rstrip(".")
+        if not path:
+            return []
+        return path.split(".")
+
+    def _add(self, path, object_type):
+        node = self.root
+        for segment in self._segments(path):
+            child = node.children.get(segment)
+            if child is None:
+                # Parents precede their children in walk order, so this only
+                # creates the node for path itself
+                child = NamespaceNode(segment, path, ACPI_TYPE_ANY, node)
+                node.children[segment] = child
+            node = child
+        node.object_type = object_type
+        self.nodes.append(node)
+        self._by_name.setdefault(node.name, []).append(node)
+        self._by_type.setdefault(object_type, []).append(node)
+
+    @staticmethod
+    def _ancestors(node):
+        node = node.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def node(self, path):
+        """Return the node for a full path, or None"""
+        node = self.root
+        for segment in self._segments(path):
+            node = node.children.get(segment)
+            if node is None:
+                return None
+        return node
+
+    def children(self, path):
+        """Return the nodes directly below the specified path"""
+        node = self.node(path)
+        if node is None:
+            return []
+        return node.children.values()
+
+    def descendants(self, path):
+        """Return all the nodes below the specified path"""
+        node = self.node(path)
+        if node is None:
+            return []
+        return list(node.walk())
+
+    def named(self, name):
+        """Return all the nodes with the specified name, such as _CRS"""
+        return list(self._by_name.get(name, ()))
+
+    def of_type(self, object_type):
+        """Return all the nodes with the specified ACPI_TYPE_*"""
+        return list(self._by_type.get(object_type, ()))
+
+    def search(self, objectname, depth=(2**32-1)):
+        """Return the full paths containing objectname, as get_objpaths does"""
+        if len(objectname) == 4 and "." not in objectname and "\\" not in objectname:
+            # Name segments have exactly four characters, so this can only
+            # match an entire segment: the named nodes and everything below
+            # them
+            nodes = []
+            for node in self._by_name.get(objectname, ()):
+                if any(p.name == objectname for p in self._ancestors(node)):
+                    continue
+                nodes.append(node)
+                nodes.extend(node.walk())
+        elif objectname.startswith("\\"):
+            # A backslash only appears at the start of a full path, so this
+            # can only match a prefix
+            head, sep, partial = objectname[1:].rpartition(".")
+            parent = self.node(head)
+            nodes = []
+            if parent is not None and (sep or parent is self.root):
+                for child in parent.children.itervalues():
+                    if child.name.startswith(partial):
+                        nodes.append(child)
+                        nodes.extend(child.walk())
+        else:
+            nodes = [n for n in self.nodes if objectname in n.path]
+        return [n.path for n in nodes if n.depth <= depth]
+
+_namespace = None
+
+def get_namespace(refresh=False):
+    """Return the NamespaceIndex for the ACPI namespace.
+
+    The index gets built with a single walk of the namespace on first use
+    and reused afterward. It gets rebuilt after load_table, terminate, or the
+    first get_cpupaths (which can load processor tables through _OSC or
+    _PDC); pass refresh=True, or call refresh_namespace, after anything else
+    that changes the namespace."""
+    global _namespace
+    if _namespace is None or refresh:
+        objects = []
+        @ACPI_WALK_CALLBACK
+        def callback(handle, nesting_level, context, return_value):
+            buf = ACPI_BUFFER(ACPI_ALLOCATE_BUFFER, None)
+            status = AcpiGetName(handle, ACPI_FULL_PATHNAME, byref(buf))
+            if status:
+                print "AcpiGetName:", ACPIException(status)
+                return 0
+            name = string_at(buf.Pointer)
+            ACPI_FREE(buf.Pointer)
+            object_type = ACPI_OBJECT_TYPE(ACPI_TYPE_ANY)
+            AcpiGetType(handle, byref(object_type))
+            objects.append((name, object_type.value))
+            return 0
+        null_callback = ACPI_WALK_CALLBACK(0)
+        check_status(AcpiWalkNamespace(ACPI_TYPE_ANY, ACPI_ROOT_OBJECT, 2**32-1, callback, null_callback, None, None))
+        _namespace = NamespaceIndex(objects)
+    return _namespace
+
+def refresh_namespace():
+    """Rebuild the ACPI namespace index"""
+    get_namespace(refresh=True)
+
+def _namespace_changed():
+    """Discard cached tables and namespace information"""
+    global _tables, _table_index, _namespace, _cpumap, _interrupt_routing
+    _tables = _table_index = _namespace = _cpumap = _interrupt_routing = None
+    eval_cache.clear()
+
 def get_objpaths(objectname, depth=(2**32-1)):
     """Return a list of names of ACPI objects matching objectname
 
     If depth is specified, search only that deep in the namespace."""
-    l = []
-    @ACPI_WALK_CALLBACK
-    def callback(handle, nesting_level, context, return_value):
-        buf = ACPI_BUFFER(ACPI_ALLOCATE_BUFFER, None)
-        status = AcpiGetName(handle, ACPI_FULL_PATHNAME, byref(buf))
-        if status:
-            print "AcpiGetName:", ACPIException(status)
-            return 0
-        name = string_at(buf.Pointer)
-        ACPI_FREE(buf.Pointer)
-        if objectname in name:
-            l.append(name)
-        return 0
-    null_callback = ACPI_WALK_CALLBACK(0)
-    check_status(AcpiWalkNamespace(ACPI_TYPE_ANY, ACPI_ROOT_OBJECT, depth, callback, null_callback, None, None))
-    return l
+    return get_namespace().search(objectname, depth)
 
 def install_interface(name):
     check_status(AcpiInstallInterface(name))
+    # _OSI results can change what methods return
+    eval_cache.clear()
 
 def get_rsdt_addr():
     """Return the address of the RSDT"""
@@ -4418,37 +2716,107 @@ def get_xsdt_addr():
         raise RuntimeError("XSDT located above 4G; cannot access on 32-bit")
     return xsdt
 
+class AcpiTable(namedtuple("AcpiTable", ("signature", "instance", "address", "length", "revision", "checksum_valid", "data"))):
+    """An ACPI table in the table registry.
+
+    data holds a snapshot of the table's bytes taken when building the
+    registry, except for the FACS: firmware and OSPM update it in place, so
+    lookups re-read it. checksum_valid is None for the FACS, which has no
+    checksum."""
+    __slots__ = ()
+
+# Tables that change at runtime, such as the FACS waking vector and global
+# lock, get re-read on every lookup instead of served from the snapshot.
+_volatile_tables = frozenset(("FACS",))
+
+def _current(table):
+    if table is not None and table.signature in _volatile_tables:
+        return table._replace(data=string_at(table.address, table.length))
+    return table
+
+_table_aliases = {
+    'RSD PTR': 'RSDP',
+    'RSD PTR ': 'RSDP',
+}
+
+_tables = None
+_table_index = None
+
+def _make_table(signature, instance, address):
+    if signature == 'RSDP':
+        rsdp = RSDP(address)
+        length = sizeof(rsdp)
+        data = string_at(address, length)
+        return AcpiTable(signature, instance, address, length, rsdp.revision, bits.integrity.rsdp_valid(data), data)
+    header = TableHeader.from_address(address)
+    data = string_at(address, header.length)
+    if signature == 'FACS':
+        return AcpiTable(signature, instance, address, header.length, None, None, data)
+    return AcpiTable(signature, instance, address, header.length, header.revision, bits.integrity.checksum_valid(data), data)
+
+def _build_tables():
+    instances = {}
+    tables = []
+    def add(signature, address):
+        instance = instances.get(signature, 0) + 1
+        instances[signature] = instance
+        tables.append(_make_table(signature, instance, address))
+    # Walk the root table in the same order AcpiGetTable counts instances.
+    # Indexes 0-2 hold the DSDT and FACS, any of which may be absent.
+    tableptrs = itertools.chain(itertools.ifilter(bool, (get_table_addr_by_index(index) for index in range(3))),
+                                itertools.takewhile(bool, (get_table_addr_by_index(index) for index in itertools.count(start=3))))
+    for ptr in tableptrs:
+        add((ctypes.c_char * 4).from_address(ptr).value, ptr)
+    add('RSDP', AcpiOsGetRootPointer())
+    rsdt = get_rsdt_addr()
+    if rsdt:
+        add('RSDT', rsdt)
+    try:
+        xsdt = get_xsdt_addr()
+    except RuntimeError as e:
+        xsdt = None
+    if xsdt:
+        add('XSDT', xsdt)
+    tables.sort(key=lambda t: (t.signature, t.instance))
+    return tables
+
+def get_tables(refresh=False):
+    """Return the registry of all ACPI tables, as a list of AcpiTable.
+
+    The list is sorted by signature and instance. The registry gets built on
+    first use and reused afterward; pass refresh=True, or call refresh_tables,
+    to rebuild it after the set of tables changes."""
+    global _tables, _table_index
+    if _tables is None or refresh:
+        _tables = _build_tables()
+        _table_index = dict(((t.signature, t.instance), t) for t in _tables)
+    return [_current(t) for t in _tables]
+
+def refresh_tables():
+    """Rebuild the ACPI table registry, such as after loading a table"""
+    get_tables(refresh=True)
+
+def find_table(signature, instance=1):
+    """Return the AcpiTable for the specified signature and instance, or None"""
+    get_tables()
+    if instance == 0:
+        # AcpiGetTable treats instance 0 as the first instance
+        instance = 1
+    return _current(_table_index.get((_table_aliases.get(signature, signature), instance)))
+
 def get_table(signature, instance=1):
     """Get the requested ACPI table based on signature"""
-    if signature in ('RSDP', 'RSD PTR', 'RSD PTR '):
-        if instance == 1:
-            rsdp_addr = AcpiOsGetRootPointer()
-            rsdp = RSDP(rsdp_addr)
-            return string_at(rsdp_addr, sizeof(rsdp))
+    table = find_table(signature, instance)
+    if table is None:
         return None
-    addr = get_table_addr(signature, instance)
-    if addr is None:
-        return None
-    header = TableHeader.from_address(addr)
-    return string_at(addr, header.length)
+    return table.data
 
 def get_table_addr(signature, instance=1):
     """Get the requested ACPI table address based on signature"""
-    special_get = {
-        'RSDP': AcpiOsGetRootPointer,
-        'RSD PTR': AcpiOsGetRootPointer,
-        'RSD PTR ': AcpiOsGetRootPointer,
-        'RSDT': get_rsdt_addr,
-        'XSDT': get_xsdt_addr,
-    }.get(signature)
-    if special_get is not None:
-        if instance == 1:
-            return special_get()
-        return None
-    header = POINTER(TableHeader)()
-    if AcpiGetTable(signature, instance, byref(header)):
+    table = find_table(signature, instance)
+    if table is None:
         return None
-    return addressof(header.contents)
+    return table.address
 
 def get_table_by_index(index):
     """Get ACPI table based on an index in the root table"""
@@ -4466,12 +2834,7 @@ def get_table_addr_by_index(index):
 
 def get_table_list():
     """Get the list of ACPI table signatures"""
-    tableptrs = itertools.chain(itertools.ifilter(bool, (get_table_addr_by_index(index) for index in range(3))),
-                                itertools.takewhile(bool, (get_table_addr_by_index(index) for index in itertools.count(start=3))))
-    signatures = [(ctypes.c_char * 4).from_address(ptr).value for ptr in tableptrs]
-    signatures.extend([s for s in ['RSDP', 'RSDT', 'XSDT'] if get_table_addr(s)])
-    signatures = sorted(set(signatures))
-    return signatures
+    return sorted(set(t.signature for t in get_tables()))
 
 def load_table(table_data):
     """Load an SSDT table binary into the ACPI namespace
@@ -4488,11 +2851,13 @@ def load_table(table_data):
     acpi.load_table(open("/ssdt.aml").read())"""
     buf = create_string_buffer(table_data, len(table_data))
     check_status(AcpiLoadTable(cast(buf, POINTER(TableHeader))))
+    _namespace_changed()
 
 def display_objects(name="\\", depth=0xffffffff):
     s = ""
+    namespace = get_namespace()
     for path in get_objpaths(name, depth):
-        s += "{} ({})\n".format(path, acpi_object_types.get(get_object_info(path).object_type, "Reserved"))
+        s += "{} ({})\n".format(path, acpi_object_types.get(namespace.node(path).object_type, "Reserved"))
     ttypager.ttypager_wrap(s, indent=False)
 
 def dump(name="", depth=0xffffffff):
@@ -4501,27 +2866,24 @@ def dump(name="", depth=0xffffffff):
         s += ttypager._wrap('{} : {!r}'.format(path, evaluate(path))) + '\n'
     return s
 
-def dumptable(name="", instance=1):
+def dumptable(name="", instance=1, compact=False):
     """Dump hexadecimal and printable ASCII bytes for an ACPI table specified by 4CC and instance"""
-    s = ''
     data = get_table(name, instance)
     if data is None:
-        s += "ACPI table with signature of {} and instance of {} not found.\n".format(name, instance)
-        return s
-    s += bits.dumpmem(data)
-    return s
+        return "ACPI table with signature of {} and instance of {} not found.\n".format(name, instance)
+    return bits.dumpmem(data, compact=compact)
+
+def write_tables_dump(sink, compact=False):
+    """Write hexadecimal and printable ASCII bytes for all ACPI tables to sink"""
+    for table in get_tables():
+        sink.write("ACPI Table {} instance {}\n".format(table.signature, table.instance))
+        bits.hexdump.hexdump(table.data, sink, compact=compact)
 
-def dumptables():
+def dumptables(compact=False):
     """Dump hexdecimal and printable ASCII bytes for all ACPI tables"""
-    s = ''
-    for signature in get_table_list():
-        for instance in itertools.count(1):
-            data = get_table(signature, instance)
-            if data is None:
-                break
-            s += "ACPI Table {} instance {}\n".format(signature, instance)
-            s += bits.dumpmem(data)
-    return s
+    sink = StringIO()
+    write_tables_dump(sink, compact)
+    return sink.getvalue()
 
 created_explore_acpi_tables_cfg = False
 
@@ -4546,6 +2908,13 @@ def create_explore_acpi_tables_cfg():
         cfg += '    echo "Done."\n'
         cfg += "    py 'from bits import pause ; pause.pause()'\n"
         cfg += '}\n\n'
+        cfg += 'menuentry "Save all ACPI tables (raw and decoded) to acpi.zip" {\n'
+        cfg += '    echo "Saving all ACPI tables (raw and decoded) to acpi.zip..."\n'
+        cfg += "    py 'import acpi'\n"
+        cfg += """    py "acpi.efi_save_tables(archive='acpi.zip', compress=True)"\n"""
+        cfg += '    echo "Done."\n'
+        cfg += "    py 'from bits import pause ; pause.pause()'\n"
+        cfg += '}\n\n'
     except:
         cfg += 'menuentry "Dump all ACPI tables to log only" {\n'
         cfg += '    echo "Dumping ACPI tables to log..."\n'
@@ -4554,22 +2923,20 @@ def create_explore_acpi_tables_cfg():
         cfg += '    echo "Done."\n'
         cfg += "    py 'from bits import pause ; pause.pause()'\n"
         cfg += '}\n\n'
-    for signature in get_table_list():
-        for instance in itertools.count(1):
-            if get_table_addr(signature, instance) is None:
-                break
-            parse_method = 'parse_{}'.format(string.rstrip(str.lower(signature),"!"), instance)
-            if parse_method in globals():
-                cfg += 'menuentry "Decode {} Instance {}" {{\n'.format(signature, instance)
-                cfg += '    py "import acpi ; acpi.{}(printflag=True, instance={})"\n'.format(parse_method, instance)
-                cfg += '}\n\n'
-            if signature in ("APIC", "SRAT"):
-                cfg += 'menuentry "Decode {} Instance {} (enabled only)" {{\n'.format(signature, instance)
-                cfg += '    py "import acpi ; acpi.{}(EnabledOnly=True, instance={})"\n'.format(parse_method, instance)
-                cfg += '}\n\n'
-            cfg += 'menuentry "Dump {} Instance {} raw" {{\n'.format(signature, instance)
-            cfg += """    py 'import ttypager, acpi; ttypager.ttypager(acpi.dumptable("{}", {}))'\n""".format(signature, instance)
-            cfg += '}\n'
+    for table in get_tables():
+        signature, instance = table.signature, table.instance
+        parse_method = 'parse_{}'.format(string.rstrip(str.lower(signature),"!"), instance)
+        if string.rstrip(signature, "!") in _table_decoders or parse_method in globals():
+            cfg += 'menuentry "Decode {} Instance {}" {{\n'.format(signature, instance)
+            cfg += '    py "import acpi ; acpi.{}(printflag=True, instance={})"\n'.format(parse_method, instance)
+            cfg += '}\n\n'
+        if signature in ("APIC", "SRAT"):
+            cfg += 'menuentry "Decode {} Instance {} (enabled only)" {{\n'.format(signature, instance)
+            cfg += '    py "import acpi ; acpi.{}(EnabledOnly=True, instance={})"\n'.format(parse_method, instance)
+            cfg += '}\n\n'
+        cfg += 'menuentry "Dump {} Instance {} raw" {{\n'.format(signature, instance)
+        cfg += """    py 'import ttypager, acpi; ttypager.ttypager(acpi.dumptable("{}", {}))'\n""".format(signature, instance)
+        cfg += '}\n'
     bits.pyfs.add_static("explore_acpi_tables.cfg", cfg)
     created_explore_acpi_tables_cfg = True
 
@@ -4580,18 +2947,17 @@ def create_explore_acpi_cpu_methods_cfg():
     if created_explore_acpi_cpu_methods_cfg:
         return
     methods = set()
-    for c in get_cpupaths():
-        for o in get_objpaths(c + "."):
-            method = o[len(c)+1:]
-            if "." in method:
-                continue
-            methods.add(method)
+    cpupaths = get_cpupaths()
+    namespace = get_namespace()
+    for c in cpupaths:
+        for node in namespace.children(c):
+            methods.add(node.name)
     cfg = ""
     for method in sorted(methods):
         # Whitelist for now until splitting this into its own module
         if method in ("_CSD", "_CST", "_MAT", "PDL", "_PPC", "_PCT", "_PTC", "_PSD", "_PSS", "_TDL", "_TPC", "_TSD", "_TSS"):
             parse_method = 'parse' + string.lower(method)
-            cfg += 'menuentry "{} ({})" {{\n'.format(method, globals()[parse_method].__doc__)
+            cfg += 'menuentry "{} ({})" {{\n'.format(method, _lookup(parse_method).__doc__)
             cfg += """    py 'import acpi ; acpi.display_cpu_method("{}")'\n""".format(method)
             cfg += '}\n'
     bits.pyfs.add_static("explore_acpi_cpu_methods.cfg", cfg)
@@ -4605,17 +2971,58 @@ def show_checksum(signature, instance=1):
         print "ACPI table with signature of {} and instance of {} not found.\n".format(signature, instance)
         return
 
-    csum = sum(ord(c) for c in data)
+    csum = bits.integrity.byte_sum(data)
     print 'Full checksum is {:#x}'.format(csum)
     print '1-byte checksum is {:#x}'.format(csum & 0xff)
 
 try:
     import efi
 
-    def efi_save_tables(decode=True):
+    def _table_files(decode):
+        """Yield (filename, data) for each file saved by efi_save_tables"""
+        address_list = ''
+        for table in get_tables():
+            signature, instance, address = table.signature, table.instance, table.address
+            basename = signature
+            if instance > 1:
+                basename += "{}".format(instance)
+            yield "{}.bin".format(basename), table.data
+
+            address_list += "{:5}: {:#x}\n".format(basename, address)
+
+            parse_method = 'parse_{}'.format(string.rstrip(str.lower(signature),"!"), instance)
+            if (decode == True) and (string.rstrip(signature, "!") in _table_decoders or parse_method in globals()):
+                data = "{} address = {:#x}\n".format(basename, address)
+                data += str(parse_table(signature, instance))
+                yield "{}.txt".format(basename), data
+
+        yield "address_list.txt", address_list
+
+    def _tables_manifest():
+        """Return a manifest of all ACPI tables, with their lengths and checksums"""
+        manifest = "{:<4} {:>8} {:>18} {:>10} {:>8} {:>10}\n".format("sig", "instance", "address", "length", "checksum", "crc32")
+        for table in get_tables():
+            if table.checksum_valid is None:
+                checksum = "-"
+            else:
+                checksum = "ok" if table.checksum_valid else "BAD"
+            manifest += "{:<4} {:>8} {:#18x} {:#10x} {:>8} {:#010x}\n".format(table.signature, table.instance, table.address, table.length, checksum, bits.integrity.crc32(table.data))
+        return manifest
+
+    def efi_save_tables(decode=True, archive=None, compress=False):
         """Save all ACPI tables to files; only works under EFI.
 
-        Warning: All files in the /acpi directory will be deleted!"""
+        By default, each table goes in a separate file in the /acpi directory.
+        Warning: All files in the /acpi directory will be deleted!
+
+        If archive names a .zip or .tar file, save all the tables into that one
+        file instead, along with a manifest.txt listing each table's signature,
+        instance, address, length, checksum status, and CRC32. compress=True
+        deflates the entries of a zip archive."""
+        if archive is not None:
+            efi.save_archive(archive, itertools.chain(_table_files(decode), [("manifest.txt", _tables_manifest())]), compress)
+            return
+
         root = efi.get_boot_fs()
         acpidir = root.mkdir("acpi")
         # delete all files in \acpi directory
@@ -4626,36 +3033,10 @@ try:
                 acpidir.open(f, efi.EFI_FILE_MODE_READ | efi.EFI_FILE_MODE_WRITE).delete()
                 print "Done"
 
-        address_list = ''
-        for signature in get_table_list():
-            for instance in itertools.count(1):
-                data = get_table(signature, instance)
-                if data is None:
-                    break
-                basename = signature
-                if instance > 1:
-                    basename += "{}".format(instance)
-                fname = "{}.bin".format(basename)
-                print "Saving {}...".format(fname),
-                acpidir.create(fname).write(data)
-                print "Done"
-
-                address = get_table_addr(signature, instance)
-                address_list += "{:5}: {:#x}\n".format(basename, address)
-
-                parse_method = 'parse_{}'.format(string.rstrip(str.lower(signature),"!"), instance)
-                if (decode == True) and (parse_method in globals()):
-                    data = "{} address = {:#x}\n".format(basename, address)
-                    data += str(parse_table(signature, instance))
-                    fname = "{}.txt".format(basename)
-                    print "Saving {}...".format(fname),
-                    acpidir.create(fname).write(data)
-                    print "Done"
-
-        fname = "address_list.txt"
-        print "Saving {}...".format(fname),
-        acpidir.create(fname).write(address_list)
-        print "Done"
+        for fname, data in _table_files(decode):
+            print "Saving {}...".format(fname),
+            acpidir.create(fname).write(data)
+            print "Done"
 
 except:
     pass
@@ -4682,41 +3063,37 @@ def save_tables_object_format():
 
     details = ''
     data_list = ''
-    for signature in get_table_list():
-        for instance in itertools.count(1):
-            data = get_table(signature, instance)
-
-            if data is None:
-                break
-
-            basename = signature
-            if instance > 1:
-                basename += "{}".format(instance)
+    for table in get_tables():
+        signature, instance = table.signature, table.instance
+        data = table.data
+        address = table.address
+
+        basename = signature
+        if instance > 1:
+            basename += "{}".format(instance)
+
+        addr_adjust = address % 4
+        len_adjust = (len(data) + addr_adjust) % 4
+        if len_adjust:
+            len_adjust = 4 - len_adjust
+
+        if addr_adjust or len_adjust:
+            # Data is not aligned on dword boundary or len is not multiple of dwords
+            new_address = address - addr_adjust
+            new_length = len(data) + len_adjust
+            if addr_adjust:
+                print "Address modified from {} to {}".format(address, new_address)
+            if len_adjust:
+                print "Length modified from {} to {}".format(len(data), new_length)
+            data = bits.memory(new_address, new_length)
+            address = new_address
 
-            address = get_table_addr(signature, instance)
+        details += "{:5}: address={:#x}, address>>2={:#x}, len={}, len/4={}\n".format(basename, address, address>>2, len(data), len(data)/4)
 
-            addr_adjust = address % 4
-            len_adjust = (len(data) + addr_adjust) % 4
-            if len_adjust:
-                len_adjust = 4 - len_adjust
-
-            if addr_adjust or len_adjust:
-                # Data is not aligned on dword boundary or len is not multiple of dwords
-                new_address = address - addr_adjust
-                new_length = len(data) + len_adjust
-                if addr_adjust:
-                    print "Address modified from {} to {}".format(address, new_address)
-                if len_adjust:
-                    print "Length modified from {} to {}".format(len(data), new_length)
-                data = bits.memory(new_address, new_length)
-                address = new_address
-
-            details += "{:5}: address={:#x}, address>>2={:#x}, len={}, len/4={}\n".format(basename, address, address>>2, len(data), len(data)/4)
-
-            print "Saving {}...".format(basename),
-            data_list += "/origin {:x}\n".format(address >> 2)
-            data_list += dumpmem_dwords(data)
-            print "Done"
+        print "Saving {}...".format(basename),
+        data_list += "/origin {:x}\n".format(address >> 2)
+        data_list += dumpmem_dwords(data)
+        print "Done"
 
     data_list += "/eof\n"
 
@@ -4738,3 +3115,43 @@ def save_tables_object_format():
         print open("(python)/acpi_details.txt").read()
         print
         print open("(python)/acpi_memory.txt").read()
+
+class _AcpiModule(types.ModuleType):
+    """The acpi module, loading table decoders on first attribute access.
+
+    Python 2 modules cannot define __getattr__, so the acpi module replaces
+    itself in sys.modules with an instance of this class, which forwards
+    attribute access to the module's globals."""
+    def __init__(self, module):
+        super(_AcpiModule, self).__init__(module.__name__, module.__doc__)
+        self.__dict__["_module"] = module
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            return getattr(self._module, name)
+        if name == "acpi_unsafe_io":
+            return bool(_native_unsafe_io.value)
+        try:
+            return _lookup(name)
+        except KeyError:
+            raise AttributeError("'module' object has no attribute '{}'".format(name))
+
+    def __setattr__(self, name, value):
+        if name == "acpi_unsafe_io":
+            _native_unsafe_io.value = bool(value)
+            return
+        setattr(self._module, name, value)
+
+    def __delattr__(self, name):
+        if name == "acpi_unsafe_io":
+            raise AttributeError("can't delete attribute 'acpi_unsafe_io'")
+        delattr(self._module, name)
+
+    def __dir__(self):
+        return sorted(set(dir(self._module)) | set(_decoder_names) | set(["acpi_unsafe_io"]))
+
+sys.modules[__name__] = _AcpiModule(sys.modules[__name__])
+
+# cpudetect loads CPU modules that import acpi in turn; import it only after
+# installing _AcpiModule, so that those modules get the wrapper.
+from cpudetect import cpulib
@@ -0,0 +1,361 @@
+# Copyright (c) 2015, Intel Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright notice,
+#       this list of conditions and the following disclaimer in the documentation
+#       and/or other materials provided with the distribution.
+#     * Neither the name of Intel Corporation nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""ACPI Multiple APIC Description Table (MADT, signature APIC) decoder."""
+
+from acpi import parse_table, _subtable_source, _table_source, TableHeader
+import bits.cdata
+import copy
+import ctypes
+import ttypager
+import unpack
+
+__all__ = [
+    "APIC", "APICSubtable", "APICSubtableIOApic",
+    "APICSubtableIntSrcOverride", "APICSubtableLocalApic",
+    "APICSubtableLocalApicNmi", "APICSubtableLocalGIC",
+    "APICSubtableLocalGICDistributor", "APICSubtableLocalGIC_flags",
+    "APICSubtableLocalGIC_flags_bits", "APICSubtableLocalx2Apic",
+    "APICSubtableLocalx2ApicNmi", "APICSubtableNmiIntSrc",
+    "APICSubtableUnknown_factory", "APICSubtable_int_flags",
+    "APICSubtable_int_flags_bits", "APIC_table_flags",
+    "APIC_table_flags_bits", "MADT_TYPE_INT_SRC_OVERRIDE",
+    "MADT_TYPE_IO_APIC", "MADT_TYPE_LOCAL_APIC", "MADT_TYPE_LOCAL_APIC_NMI",
+    "MADT_TYPE_LOCAL_GIC", "MADT_TYPE_LOCAL_GIC_DISTRIBUTOR",
+    "MADT_TYPE_LOCAL_X2APIC", "MADT_TYPE_LOCAL_X2APIC_NMI",
+    "MADT_TYPE_NMI_INT_SRC", "_MAT", "_mat_factory",
+    "_performance_interrupt_mode", "apic_factory", "apic_subtable_list",
+    "local_apic_flags", "local_apic_flags_bits", "mps_inti_polarity",
+    "mps_inti_trigger_mode", "parse_apic", "parse_mat",
+]
+
+class APICSubtable(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('subtype', ctypes.c_uint8),
+        ('length', ctypes.c_uint8),
+    ]
+
+class local_apic_flags_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('enabled', ctypes.c_uint32, 1),
+    ]
+
+class local_apic_flags(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint32),
+        ('bits', local_apic_flags_bits),
+    ]
+
+class APICSubtableLocalApic(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = copy.copy(APICSubtable._fields_) + [
+        ('proc_id', ctypes.c_uint8),
+        ('apic_id', ctypes.c_uint8),
+        ('flags', local_apic_flags),
+    ]
+
+class APICSubtableIOApic(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = copy.copy(APICSubtable._fields_) + [
+        ('io_apic_id', ctypes.c_uint8),
+        ('reserved', ctypes.c_uint8),
+        ('io_apic_addr', ctypes.c_uint32),
+        ('global_sys_int_base', ctypes.c_uint32),
+    ]
+
+mps_inti_polarity = {
+    0b00: 'Conforms to bus specifications',
+    0b01: 'Active high',
+    0b11: 'Active low',
+}
+
+mps_inti_trigger_mode = {
+    0b00: 'Conforms to bus specifications',
+    0b01: 'Edge-triggered',
+    0b11: 'Level-triggered',
+}
+
+class APICSubtable_int_flags_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('polarity', ctypes.c_uint16, 2),
+        ('trigger_mode', ctypes.c_uint16, 2),
+    ]
+    _formats = {
+        'polarity': unpack.format_table("{}", mps_inti_polarity),
+        'trigger_mode': unpack.format_table("{}", mps_inti_trigger_mode),
+    }
+
+class APICSubtable_int_flags(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint16),
+        ('bits', APICSubtable_int_flags_bits),
+    ]
+
+class APICSubtableNmiIntSrc(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = copy.copy(APICSubtable._fields_) + [
+        ('flags', APICSubtable_int_flags),
+        ('global_sys_interrupt', ctypes.c_uint32),
+    ]
+
+class APICSubtableLocalApicNmi(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = copy.copy(APICSubtable._fields_) + [
+        ('proc_id', ctypes.c_uint8),
+        ('flags', APICSubtable_int_flags),
+        ('lint_num', ctypes.c_uint8),
+    ]
+
+class APICSubtableIntSrcOverride(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = copy.copy(APICSubtable._fields_) + [
+        ('bus', ctypes.c_uint8),
+        ('source', ctypes.c_uint8),
+        ('global_sys_interrupt', ctypes.c_uint32),
+        ('flags', APICSubtable_int_flags)
+    ]
+
+class APICSubtableLocalx2Apic(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = copy.copy(APICSubtable._fields_) + [
+        ('reserved', ctypes.c_uint16),
+        ('x2apicid', ctypes.c_uint32),
+        ('flags', local_apic_flags),
+        ('uid', ctypes.c_uint32),
+    ]
+
+class APICSubtableLocalx2ApicNmi(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = copy.copy(APICSubtable._fields_) + [
+        ('flags', APICSubtable_int_flags),
+        ('uid', ctypes.c_uint32),
+        ('lint_num', ctypes.c_uint8),
+        ('reserved', ctypes.c_uint8 * 3),
+    ]
+
+_performance_interrupt_mode = {
+    0: 'Level-triggered',
+    1: 'Edge-triggered',
+}
+
+class APICSubtableLocalGIC_flags_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('enabled', ctypes.c_uint32, 1),
+        ('performance_interrupt_mode', ctypes.c_uint32, 1),
+    ]
+    _formats = {
+        'performance_interrupt_mode': unpack.format_table("{}", mps_inti_polarity),
+    }
+
+class APICSubtableLocalGIC_flags(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint32),
+        ('bits', APICSubtableLocalGIC_flags_bits),
+    ]
+
+class APICSubtableLocalGIC(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = copy.copy(APICSubtable._fields_) + [
+        ('reserved', ctypes.c_uint16),
+        ('gic_id', ctypes.c_uint32),
+        ('uid', ctypes.c_uint32),
+        ('flags', APICSubtableLocalGIC_flags),
+        ('parking_protocol_version', ctypes.c_uint32),
+        ('performance_interrupt_gsiv', ctypes.c_uint32),
+        ('parked_address', ctypes.c_uint64),
+        ('physical_base_adddress', ctypes.c_uint64),
+    ]
+
+class APICSubtableLocalGICDistributor(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = copy.copy(APICSubtable._fields_) + [
+        ('reserved1', ctypes.c_uint16),
+        ('gic_id', ctypes.c_uint32),
+        ('physical_base_adddress', ctypes.c_uint64),
+        ('system_vector_base', ctypes.c_uint32),
+        ('reserved2', ctypes.c_uint32),
+    ]
+
+@bits.cdata.memoize_factory
+def APICSubtableUnknown_factory(_len):
+    class APICSubtableUnknown(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = APICSubtable._fields_ + [
+            ('data', ctypes.c_uint8 * _len),
+        ]
+    return APICSubtableUnknown
+
+MADT_TYPE_LOCAL_APIC = 0
+MADT_TYPE_IO_APIC = 1
+MADT_TYPE_INT_SRC_OVERRIDE = 2
+MADT_TYPE_NMI_INT_SRC = 3
+MADT_TYPE_LOCAL_APIC_NMI = 4
+MADT_TYPE_LOCAL_X2APIC = 9
+MADT_TYPE_LOCAL_X2APIC_NMI = 0xA
+MADT_TYPE_LOCAL_GIC = 0xB
+MADT_TYPE_LOCAL_GIC_DISTRIBUTOR = 0xC
+
+class APIC_table_flags_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('pcat_compat', ctypes.c_uint32, 1),
+    ]
+
+class APIC_table_flags(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint32),
+        ('bits', APIC_table_flags_bits),
+    ]
+
+@bits.cdata.memoize_factory
+def apic_factory(field_list):
+    class subtables(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = field_list
+
+        def __iter__(self):
+            for f in self._fields_:
+                yield getattr(self, f[0])
+
+    class APIC_v3(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = [
+            ('header', TableHeader),
+            ('local_apic_address', ctypes.c_uint32),
+            ('flags', APIC_table_flags),
+            ('interrupt_controller_structures', subtables),
+        ]
+
+        @property
+        def procid_apicid(self):
+            procid_apicid_dict = {}
+            for subtable in self.interrupt_controller_structures:
+                # accumulate the dictionary
+                if subtable.subtype == MADT_TYPE_LOCAL_APIC:
+                    if subtable.flags.bits.enabled == 1:
+                        procid_apicid_dict[subtable.proc_id] = subtable.apic_id
+            return procid_apicid_dict
+
+        @property
+        def uid_x2apicid(self):
+            uid_x2apicid_dict = {}
+            for subtable in self.interrupt_controller_structures:
+                # accumulate the dictionary
+                if subtable.subtype == MADT_TYPE_LOCAL_X2APIC:
+                    if subtable.flags.bits.enabled == 1:
+                        uid_x2apicid_dict[subtable.uid] = subtable.x2apicid
+            return uid_x2apicid_dict
+
+    return APIC_v3
+
+def apic_subtable_list(addr, length=None):
+    addr, length, buf = _subtable_source(addr, length)
+    end = addr + length
+    field_list = list()
+    subtable_num = 0
+    while addr < end:
+        subtable_num += 1
+        subtable = APICSubtable.from_address(addr)
+        addr += subtable.length
+        if subtable.subtype == MADT_TYPE_LOCAL_APIC:
+            cls = APICSubtableLocalApic
+        elif subtable.subtype == MADT_TYPE_IO_APIC:
+            cls = APICSubtableIOApic
+        elif subtable.subtype == MADT_TYPE_INT_SRC_OVERRIDE:
+            cls = APICSubtableIntSrcOverride
+        elif subtable.subtype == MADT_TYPE_NMI_INT_SRC:
+            cls = APICSubtableNmiIntSrc
+        elif subtable.subtype == MADT_TYPE_LOCAL_APIC_NMI:
+            cls = APICSubtableLocalApicNmi
+        elif subtable.subtype == MADT_TYPE_LOCAL_X2APIC:
+            cls = APICSubtableLocalx2Apic
+        elif subtable.subtype == MADT_TYPE_LOCAL_X2APIC_NMI:
+            cls = APICSubtableLocalx2ApicNmi
+        elif subtable.subtype == MADT_TYPE_LOCAL_GIC:
+            cls = APICSubtableLocalGIC
+        elif subtable.subtype == MADT_TYPE_LOCAL_GIC_DISTRIBUTOR:
+            cls = APICSubtableLocalGICDistributor
+        else:
+            cls = APICSubtableUnknown_factory(subtable.length - ctypes.sizeof(APICSubtable))
+        field_list.append( ('subtable{}'.format(subtable_num), cls) )
+    return field_list
+
+def APIC(val):
+    """Create class based on decode of an APIC table from address, filename, or data."""
+    preamble_length = ctypes.sizeof(apic_factory(list()))
+    addr, data, buf = _table_source(val)
+    hdr = TableHeader.from_address(addr)
+    subtable_list = apic_subtable_list(addr + preamble_length, hdr.length - preamble_length)
+    if data is not None:
+        return apic_factory(subtable_list).from_buffer_copy(data)
+    return bits.cdata.from_address(apic_factory(subtable_list), addr)
+
+def parse_apic(printflag=False, EnabledOnly=False, instance=1):
+    """Parse and optionally print an ACPI MADT table."""
+
+    apic = parse_table("APIC", instance)
+    if apic is None:
+        return None, None
+    if printflag:
+        with ttypager.page():
+            print apic
+    if EnabledOnly:
+        with ttypager.page():
+            print '\n'.join(str(subtable) for subtable in apic.interrupt_controller_structures if ((subtable.subtype in (MADT_TYPE_LOCAL_APIC, MADT_TYPE_LOCAL_X2APIC)) and subtable.flags.bits.enabled))
+    return apic
+
+@bits.cdata.memoize_factory
+def _mat_factory(field_list):
+    class _mat_subtables(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = field_list
+
+        def __iter__(self):
+            for f in self._fields_:
+                yield getattr(self, f[0])
+
+    return _mat_subtables
+
+def _MAT(mat_buffer):
+    """Multiple APIC Table Entry"""
+    subtable_list = apic_subtable_list(mat_buffer)
+    return _mat_factory(subtable_list).from_buffer_copy(mat_buffer)
+
+def parse_mat(mat_data):
+    """Parse Multiple APIC Table Entry"""
+    return _MAT(mat_data)
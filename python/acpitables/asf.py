@@ -0,0 +1,321 @@
+# Copyright (c) 2015, Intel Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright notice,
+#       this list of conditions and the following disclaimer in the documentation
+#       and/or other materials provided with the distribution.
+#     * Neither the name of Intel Corporation nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""ACPI Alert Standard Format table (ASF!) decoder."""
+
+from acpi import make_compat_parser, _subtable_source, _table_source, TableHeader
+import bits.cdata
+import copy
+import ctypes
+
+__all__ = [
+    "ASF", "ASFSubtable", "ASF_ADDR", "ASF_ALERTDATA", "ASF_ALRT",
+    "ASF_CONTROLDATA", "ASF_INFO", "ASF_RCTL", "ASF_RMCP",
+    "ASF_addr_record_factory", "ASF_alrt_factory",
+    "ASF_boot_options_capabilities_1", "ASF_boot_options_capabilities_1_bits",
+    "ASF_boot_options_capabilities_2", "ASF_boot_options_capabilities_2_bits",
+    "ASF_factory", "ASF_info_flags", "ASF_info_flags_bits", "ASF_info_record",
+    "ASF_rctl_factory", "ASF_rmcp", "ASF_special_commands_2",
+    "ASF_special_commands_2_bits", "ASF_subtable_list",
+    "ASF_subtable_unknown_factory", "ASF_system_capabilities",
+    "ASF_system_capabilities_bits", "fixed_smbus_address", "parse_asf",
+]
+
+class ASFSubtable(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('record_type', ctypes.c_uint8, 7),
+        ('last_record', ctypes.c_uint8, 1),
+        ('reserved', ctypes.c_uint8),
+        ('record_length', ctypes.c_uint16),
+    ]
+
+@bits.cdata.memoize_factory
+def ASF_subtable_unknown_factory(data_len):
+    class ASFSubtableUnknown(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = copy.copy(ASFSubtable._fields_) + [
+            ('data', ctypes.c_uint8 * data_len),
+        ]
+    return ASFSubtableUnknown
+
+class ASF_info_flags_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('smbus_support', ctypes.c_uint8, 1),
+    ]
+
+class ASF_info_flags(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint8),
+        ('bits', ASF_info_flags_bits),
+    ]
+
+class fixed_smbus_address(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('ASF_compliant_device', ctypes.c_uint8, 1),
+        ('address', ctypes.c_uint8, 7),
+    ]
+
+class ASF_info_record(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = copy.copy(ASFSubtable._fields_) + [
+        ('min_watchdog_reset_value', ctypes.c_uint8),
+        ('min_pollng_interval', ctypes.c_uint8),
+        ('system_id', ctypes.c_uint16),
+        ('iana_manufacturer_id', ctypes.c_uint8 * 4),
+        ('flags', ASF_info_flags),
+        ('reserved2', ctypes.c_uint8 * 3),
+    ]
+
+class ASF_ALERTDATA(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('device_address', ctypes.c_uint8),
+        ('command', ctypes.c_uint8),
+        ('data_mask', ctypes.c_uint8),
+        ('compare_value', ctypes.c_uint8),
+        ('event_sensor_type', ctypes.c_uint8),
+        ('event_type', ctypes.c_uint8),
+        ('event_offset', ctypes.c_uint8),
+        ('event_source_type', ctypes.c_uint8),
+        ('event_severity', ctypes.c_uint8),
+        ('sendor_number', ctypes.c_uint8),
+        ('entity', ctypes.c_uint8),
+        ('entity_instance', ctypes.c_uint8),
+    ]
+
+@bits.cdata.memoize_factory
+def ASF_alrt_factory(num_alerts):
+    class ASF_ALRT(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = copy.copy(ASFSubtable._fields_) + [
+            ('assertion_event_mask', ctypes.c_uint8),
+            ('deassertion_event_mask', ctypes.c_uint8),
+            ('number_alerts', ctypes.c_uint8),
+            ('array_element_length', ctypes.c_uint8),
+            ('device_array', ASF_ALERTDATA * num_alerts),
+        ]
+    return ASF_ALRT
+
+class ASF_CONTROLDATA(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('function', ctypes.c_uint8),
+        ('device_address', ctypes.c_uint8),
+        ('command', ctypes.c_uint8),
+        ('data_value', ctypes.c_uint8),
+    ]
+
+@bits.cdata.memoize_factory
+def ASF_rctl_factory(num_controls):
+    class ASF_RCTL(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = copy.copy(ASFSubtable._fields_) + [
+            ('number_controls', ctypes.c_uint8),
+            ('array_element_length', ctypes.c_uint8),
+            ('reserved2', ctypes.c_uint16),
+            ('control_array', ASF_CONTROLDATA * num_controls),
+        ]
+    return ASF_RCTL
+
+class ASF_boot_options_capabilities_1_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('firmware_verbosity_screen_blank', ctypes.c_uint8, 1),
+        ('power_button_lock', ctypes.c_uint8, 1),
+        ('reset_button_lock', ctypes.c_uint8, 1),
+        ('reserved_4_3', ctypes.c_uint8, 2),
+        ('lock_keyboard', ctypes.c_uint8, 1),
+        ('sleep_button_lock', ctypes.c_uint8, 1),
+        ('reserved_7', ctypes.c_uint8, 1),
+    ]
+
+class ASF_boot_options_capabilities_1(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint8),
+        ('bits', ASF_boot_options_capabilities_1_bits),
+    ]
+
+class ASF_boot_options_capabilities_2_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('reserved_2_0', ctypes.c_uint8, 3),
+        ('user_password_bypass', ctypes.c_uint8, 1),
+        ('forced_progress_events', ctypes.c_uint8, 1),
+        ('firmware_verbosity_verbose', ctypes.c_uint8, 1),
+        ('firmware_verbosity_quiet', ctypes.c_uint8, 1),
+        ('configuration_data_reset', ctypes.c_uint8, 1),
+    ]
+
+class ASF_boot_options_capabilities_2(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint8),
+        ('bits', ASF_boot_options_capabilities_2_bits),
+    ]
+
+class ASF_special_commands_2_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('force_pxe_boot', ctypes.c_uint8, 1),
+        ('force_hard_drive_boot', ctypes.c_uint8, 1),
+        ('force_hard_drive_safe_mode_boot', ctypes.c_uint8, 1),
+        ('force_diagnostic_boot', ctypes.c_uint8, 1),
+        ('force_cd_dvd_boot', ctypes.c_uint8, 1),
+        ('reserved', ctypes.c_uint8, 3),
+    ]
+
+class ASF_special_commands_2(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint8),
+        ('bits', ASF_special_commands_2_bits),
+    ]
+
+class ASF_system_capabilities_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('power_cycle_reset_only_on_secure_port', ctypes.c_uint8, 1),
+        ('power_down_only_on_secure_port', ctypes.c_uint8, 1),
+        ('power_on_only_on_secure_port', ctypes.c_uint8, 1),
+        ('reset_only_on_secure_port', ctypes.c_uint8, 1),
+        ('power_cycle_reset_on_compat_or_secure_port', ctypes.c_uint8, 1),
+        ('power_down_on_compat_or_secure_port', ctypes.c_uint8, 1),
+        ('power_on_via_compat_or_secure_port', ctypes.c_uint8, 1),
+        ('reset_only_on_compat_or_secure_port', ctypes.c_uint8, 1),
+    ]
+
+class ASF_system_capabilities(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint8),
+        ('bits', ASF_system_capabilities_bits),
+    ]
+
+class ASF_rmcp(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = copy.copy(ASFSubtable._fields_) + [
+        ('boot_options_capabilities_1', ASF_boot_options_capabilities_1),
+        ('boot_options_capabilities_2', ASF_boot_options_capabilities_2),
+        ('boot_options_capabilities_3', ctypes.c_uint8),
+        ('boot_options_capabilities_4', ctypes.c_uint8),
+        ('special_commands_1', ctypes.c_uint8),
+        ('special_commands_2', ASF_special_commands_2),
+        ('system_capabilities', ASF_system_capabilities),
+        ('completion_code', ctypes.c_uint8),
+        ('iana', ctypes.c_uint8 * 4),
+        ('special_command', ctypes.c_uint8),
+        ('special_command_parameter', ctypes.c_uint8 * 2),
+        ('boot_options', ctypes.c_uint8 * 2),
+        ('oem_parameters', ctypes.c_uint8 * 2),
+    ]
+
+@bits.cdata.memoize_factory
+def ASF_addr_record_factory(num_devices):
+
+    class ASF_addr_record(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = copy.copy(ASFSubtable._fields_) + [
+            ('seeprom_address', ctypes.c_uint8),
+            ('num_devices', ctypes.c_uint8),
+            ('fixed_smbus_addresses', fixed_smbus_address * num_devices),
+        ]
+    return ASF_addr_record
+
+@bits.cdata.memoize_factory
+def ASF_factory(field_list):
+    class subtables(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = field_list
+
+        def __iter__(self):
+            for f in self._fields_:
+                yield getattr(self, f[0])
+
+    class ASF_v1(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = [
+            ('header', TableHeader),
+            ('information_records', subtables),
+        ]
+
+    return ASF_v1
+
+ASF_INFO = 0
+ASF_ALRT = 1
+ASF_RCTL = 2
+ASF_RMCP = 3
+ASF_ADDR = 4
+
+def ASF_subtable_list(addr, length=None):
+    addr, length, buf = _subtable_source(addr, length)
+    end = addr + length
+    field_list = list()
+    subtable_num = 0
+    ASF_addr_record_base_len = ctypes.sizeof(ASF_addr_record_factory(0))
+    ASF_alrt_base = ASF_alrt_factory(0)
+    ASF_rctl_base = ASF_rctl_factory(0)
+    while addr < end:
+        subtable_num += 1
+        subtable = ASFSubtable.from_address(addr)
+        if subtable.record_type == ASF_INFO:
+            cls = ASF_info_record
+        elif subtable.record_type == ASF_ALRT:
+            num_alerts = ASF_alrt_base.from_address(addr).number_alerts
+            cls = ASF_alrt_factory(num_alerts)
+        elif subtable.record_type == ASF_RCTL:
+            num_controls = ASF_rctl_base.from_address(addr).number_controls
+            cls = ASF_rctl_factory(num_controls)
+        elif subtable.record_type == ASF_RMCP:
+            cls = ASF_rmcp
+        elif subtable.record_type == ASF_ADDR:
+            cls = ASF_addr_record_factory(subtable.record_length - ASF_addr_record_base_len)
+        else:
+            cls = (subtable.record_length - ctypes.sizeof(ASFSubtable))
+        addr += subtable.record_length
+        field_list.append( ('subtable{}'.format(subtable_num), cls) )
+    return field_list
+
+def ASF(val):
+    """Create class based on decode of an ASF! table from address, filename, or data."""
+    base_length = ctypes.sizeof(ASF_factory(list()))
+    addr, data, buf = _table_source(val)
+    hdr = TableHeader.from_address(addr)
+    field_list = ASF_subtable_list(addr + base_length, hdr.length - base_length)
+    if data is not None:
+        return ASF_factory(field_list).from_buffer_copy(data)
+    return bits.cdata.from_address(ASF_factory(field_list), addr)
+
+parse_asf = make_compat_parser("ASF!")
@@ -0,0 +1,116 @@
+# Copyright (c) 2015, Intel Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright notice,
+#       this list of conditions and the following disclaimer in the documentation
+#       and/or other materials provided with the distribution.
+#     * Neither the name of Intel Corporation nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""ACPI Boot Error Record Table (BERT) decoder."""
+
+from acpi import make_compat_parser, _table_source, TableHeader
+import bits.cdata
+import ctypes
+
+__all__ = [
+    "BERT", "BERT_v1", "block_status_flags", "block_status_flags_bits",
+    "boot_error_region", "error_severity_flags", "error_severity_flags_bits",
+    "generic_error_data_entry", "parse_bert",
+]
+
+class error_severity_flags_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('correctable', ctypes.c_uint32, 1),
+        ('fatal', ctypes.c_uint32, 1),
+        ('corrected', ctypes.c_uint32, 1),
+        ('none', ctypes.c_uint32, 1),
+        ('reserved', ctypes.c_uint32, 28),
+    ]
+
+class error_severity_flags(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint32),
+        ('bits', error_severity_flags_bits),
+    ]
+
+class generic_error_data_entry(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('section_type', bits.cdata.GUID),
+        ('error_severity', error_severity_flags),
+        ('revision', ctypes.c_uint16),
+        ('validation_bits', ctypes.c_uint8),
+        ('flags', ctypes.c_uint8),
+        ('error_data_length', ctypes.c_uint32),
+        #('FRU_id', ?),
+        ('FRU_text', ctypes.c_uint8),
+        #('data', array of generic_error_data),
+    ]
+
+class block_status_flags_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('uncorrectable_error_valid', ctypes.c_uint32, 1),
+        ('correctable_error_valid', ctypes.c_uint32, 1),
+        ('multiple_uncorrectable_errors', ctypes.c_uint32, 1),
+        ('multiple_correctable_errors', ctypes.c_uint32, 1),
+        ('error_data_entry_count', ctypes.c_uint32, 10),
+        ('reserved', ctypes.c_uint32, 18),
+    ]
+
+class block_status_flags(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint32),
+        ('bits', block_status_flags_bits),
+    ]
+
+class boot_error_region(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('block_status', block_status_flags),
+        ('raw_data_offset', ctypes.c_uint32),
+        ('raw_data_length', ctypes.c_uint32),
+        ('data_length', ctypes.c_uint32),
+        ('error_severity', error_severity_flags),
+        ('generic_error_data', generic_error_data_entry),
+    ]
+
+class BERT_v1(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('header', TableHeader),
+        ('boot_error_region_length', ctypes.c_uint32),
+        ('boot_error_region', ctypes.c_uint64),
+    ]
+
+def BERT(val):
+    """Create class based on decode of an BERT table from address, filename, or data."""
+    addr, data, buf = _table_source(val)
+    if data is not None:
+        return BERT_v1.from_buffer_copy(data)
+    return bits.cdata.from_address(BERT_v1, addr)
+
+parse_bert = make_compat_parser("BERT")
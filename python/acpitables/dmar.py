@@ -0,0 +1,305 @@
+# Copyright (c) 2015, Intel Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright notice,
+#       this list of conditions and the following disclaimer in the documentation
+#       and/or other materials provided with the distribution.
+#     * Neither the name of Intel Corporation nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""ACPI DMA Remapping table (DMAR) decoder."""
+
+from acpi import make_compat_parser, _subtable_source, _table_source, TableHeader
+import bits.cdata
+import copy
+import ctypes
+
+__all__ = [
+    "ACPI_DMAR_SCOPE_TYPE_BRIDGE", "ACPI_DMAR_SCOPE_TYPE_ENDPOINT",
+    "ACPI_DMAR_SCOPE_TYPE_HPET", "ACPI_DMAR_SCOPE_TYPE_IOAPIC",
+    "ACPI_DMAR_SCOPE_TYPE_NAMESPACE", "ACPI_DMAR_TYPE_ANDD",
+    "ACPI_DMAR_TYPE_ATSR", "ACPI_DMAR_TYPE_DRHD", "ACPI_DMAR_TYPE_RHSA",
+    "ACPI_DMAR_TYPE_RMRR", "DMAR", "DMARDeviceScopePath",
+    "DMARDeviceScope_factory", "DMARSubTableANDD_factory", "DMARSubtable",
+    "DMARSubtableATSR_factory", "DMARSubtableDRHD_factory",
+    "DMARSubtableRHSA", "DMARSubtableRMRR_factory",
+    "DMARSubtableUnknown_factory", "atsr_flags", "atsr_flags_bits",
+    "dmar_device_scope_list", "dmar_factory", "dmar_flags", "dmar_flags_bits",
+    "dmar_subtable_list", "drhd_flags", "drhd_flags_bits", "parse_dmar",
+]
+
+class DMARSubtable(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('subtype', ctypes.c_uint16),
+        ('length', ctypes.c_uint16),
+    ]
+
+class DMARDeviceScopePath(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('pci_device', ctypes.c_uint8),
+        ('pci_function', ctypes.c_uint8),
+    ]
+
+@bits.cdata.memoize_factory
+def DMARDeviceScope_factory(num_dev_scope_path):
+    class DMARDeviceScope(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = [
+            ('type', ctypes.c_uint8),
+            ('length', ctypes.c_uint8),
+            ('reserved', ctypes.c_uint16),
+            ('enumeration_id', ctypes.c_uint8),
+            ('start_bus_number', ctypes.c_uint8),
+            ('paths', DMARDeviceScopePath * num_dev_scope_path),
+        ]
+    return DMARDeviceScope
+
+def dmar_device_scope_list(addr, length=None):
+    addr, length, buf = _subtable_source(addr, length)
+    end = addr + length
+    field_list = list()
+    subtable_num = 0
+    base_len_DMARDeviceScope = ctypes.sizeof(DMARDeviceScope_factory(0))
+    len_DMARDeviceScopePath = ctypes.sizeof(DMARDeviceScopePath)
+    while addr < end:
+        subtable_num += 1
+        subtable = DMARDeviceScope_factory(0).from_address(addr)
+        num_dev_scope_path = (subtable.length - base_len_DMARDeviceScope) / len_DMARDeviceScopePath
+        cls = DMARDeviceScope_factory(num_dev_scope_path)
+        addr += subtable.length
+        field_list.append( ('subtable{}'.format(subtable_num), cls) )
+    return field_list
+
+class drhd_flags_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('include_pci_all', ctypes.c_uint8, 1),
+    ]
+
+class drhd_flags(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint8),
+        ('bits', drhd_flags_bits),
+    ]
+
+@bits.cdata.memoize_factory
+def DMARSubtableDRHD_factory(field_list):
+
+    class subtables(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = field_list
+
+        def __iter__(self):
+            for f in self._fields_:
+                yield getattr(self, f[0])
+
+    class DMARSubtableDRHD(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = copy.copy(DMARSubtable._fields_) + [
+            ('flags', drhd_flags),
+            ('reserved', ctypes.c_uint8),
+            ('segment_number', ctypes.c_uint16),
+            ('base_address', ctypes.c_uint64),
+            ('device_scopes', subtables)
+        ]
+    return DMARSubtableDRHD
+
+@bits.cdata.memoize_factory
+def DMARSubtableRMRR_factory(field_list):
+
+    class subtables(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = field_list
+
+        def __iter__(self):
+            for f in self._fields_:
+                yield getattr(self, f[0])
+
+    class DMARSubtableRMRR(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = copy.copy(DMARSubtable._fields_) + [
+            ('reserved', ctypes.c_uint16),
+            ('segment_number', ctypes.c_uint16),
+            ('base_address', ctypes.c_uint64),
+            ('limit_address', ctypes.c_uint64),
+            ('device_scopes', subtables),
+        ]
+
+    return DMARSubtableRMRR
+
+class atsr_flags_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('all_ports', ctypes.c_uint8, 1),
+    ]
+
+class atsr_flags(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint8),
+        ('bits', atsr_flags_bits),
+    ]
+
+@bits.cdata.memoize_factory
+def DMARSubtableATSR_factory(field_list):
+
+    class subtables(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = field_list
+
+        def __iter__(self):
+            for f in self._fields_:
+                yield getattr(self, f[0])
+
+    class DMARSubtableATSR(bits.cdata.Struct):
+        _pack = 1
+        _fields_ = copy.copy(DMARSubtable._fields_) + [
+            ('flags', atsr_flags),
+            ('reserved', ctypes.c_uint8),
+            ('segment_number', ctypes.c_uint16),
+            ('device_scopes', subtables),
+        ]
+    return DMARSubtableATSR
+
+class DMARSubtableRHSA(bits.cdata.Struct):
+    _pack = 1
+    _fields_ = copy.copy(DMARSubtable._fields_) + [
+        ('reserved', ctypes.c_uint32),
+        ('base_address', ctypes.c_uint64),
+        ('proximity_domain', ctypes.c_uint32),
+    ]
+
+@bits.cdata.memoize_factory
+def DMARSubTableANDD_factory(obj_name_len):
+    class DMARSubTableANDD(bits.cdata.Struct):
+        _pack = 1
+        _fields_ = copy.copy(DMARSubtable._fields_) + [
+            ('reserved', ctypes.c_uint8 * 3),
+            ('device_num', ctypes.c_uint8),
+            ('object_name', ctypes.c_char * obj_name_len),
+        ]
+    return DMARSubTableANDD
+
+@bits.cdata.memoize_factory
+def DMARSubtableUnknown_factory(data_len):
+    class DMARSubtableUnknown(bits.cdata.Struct):
+        _pack = 1
+        _fields_ = copy.copy(DMARSubtable._fields_) + [
+            ('data', ctypes.c_uint8 * data_len),
+        ]
+    return DMARSubtableUnknown
+
+ACPI_DMAR_TYPE_DRHD = 0
+ACPI_DMAR_TYPE_RMRR = 1
+ACPI_DMAR_TYPE_ATSR = 2
+ACPI_DMAR_TYPE_RHSA = 3
+ACPI_DMAR_TYPE_ANDD = 4
+
+ACPI_DMAR_SCOPE_TYPE_ENDPOINT = 1
+ACPI_DMAR_SCOPE_TYPE_BRIDGE = 2
+ACPI_DMAR_SCOPE_TYPE_IOAPIC = 3
+ACPI_DMAR_SCOPE_TYPE_HPET = 4
+ACPI_DMAR_SCOPE_TYPE_NAMESPACE = 5
+
+def dmar_subtable_list(addr, length=None):
+    addr, length, buf = _subtable_source(addr, length)
+    end = addr + length
+    field_list = list()
+    subtable_num = 0
+    base_len_DRHD = ctypes.sizeof(DMARSubtableDRHD_factory(list()))
+    base_len_RMRR = ctypes.sizeof(DMARSubtableRMRR_factory(list()))
+    base_len_ATSR = ctypes.sizeof(DMARSubtableATSR_factory(list()))
+    base_len_ANDD = ctypes.sizeof(DMARSubTableANDD_factory(0))
+    while addr < end:
+        subtable_num += 1
+        subtable = DMARSubtable.from_address(addr)
+        if subtable.subtype == ACPI_DMAR_TYPE_DRHD:
+            next_field_list = dmar_device_scope_list(addr + base_len_DRHD, subtable.length - base_len_DRHD)
+            cls = DMARSubtableDRHD_factory(next_field_list)
+        elif subtable.subtype == ACPI_DMAR_TYPE_RMRR:
+            next_field_list = dmar_device_scope_list(addr + base_len_RMRR, subtable.length - base_len_RMRR)
+            cls = DMARSubtableRMRR_factory(next_field_list)
+        elif subtable.subtype == ACPI_DMAR_TYPE_ATSR:
+            next_field_list = dmar_device_scope_list(addr + base_len_ATSR, subtable.length - base_len_ATSR)
+            cls = DMARSubtableATSR_factory(next_field_list)
+        elif subtable.subtype == ACPI_DMAR_TYPE_RHSA:
+            cls = DMARSubtableRHSA
+        elif subtable.subtype == ACPI_DMAR_TYPE_ANDD:
+            cls = DMARSubTableANDD_factory(subtable.length - base_len_ANDD)
+        else:
+            cls = DMARSubtableUnknown_factory(subtable.length - ctypes.sizeof(DMARSubtable))
+        addr += subtable.length
+        field_list.append( ('subtable{}'.format(subtable_num), cls) )
+    return field_list
+
+class dmar_flags_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('intr_remap', ctypes.c_uint8, 1),
+        ('x2apic_opt_out', ctypes.c_uint8, 1),
+    ]
+
+class dmar_flags(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint8),
+        ('bits', dmar_flags_bits),
+    ]
+
+@bits.cdata.memoize_factory
+def dmar_factory(field_list):
+
+    class subtables(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = field_list
+
+        def __iter__(self):
+            for f in self._fields_:
+                yield getattr(self, f[0])
+
+    class DMAR_v1(bits.cdata.Struct):
+        _pack = 1
+        _fields_ = [
+            ('header', TableHeader),
+            ('host_addr_width', ctypes.c_uint8),
+            ('flags', ctypes.c_uint8),
+            ('reserved', ctypes.c_uint8 * 10),
+            ('remapping_structures', subtables),
+        ]
+
+    return DMAR_v1
+
+def DMAR(val):
+    """Create class based on decode of an DMAR table from address, filename, or data."""
+    base_length = ctypes.sizeof(dmar_factory(list()))
+    addr, data, buf = _table_source(val)
+    hdr = TableHeader.from_address(addr)
+    field_list = dmar_subtable_list(addr + base_length, hdr.length - base_length)
+    if data is not None:
+        return dmar_factory(field_list).from_buffer_copy(data)
+    return bits.cdata.from_address(dmar_factory(field_list), addr)
+
+parse_dmar = make_compat_parser("DMAR")
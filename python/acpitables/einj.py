@@ -0,0 +1,235 @@
+# Copyright (c) 2015, Intel Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright notice,
+#       this list of conditions and the following disclaimer in the documentation
+#       and/or other materials provided with the distribution.
+#     * Neither the name of Intel Corporation nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""ACPI Error Injection table (EINJ) decoder."""
+
+from acpi import GAS, make_compat_parser, _table_source, TableHeader
+import bits.cdata
+import ctypes
+import unpack
+
+__all__ = [
+    "EINJ", "InjectionInstructionEntry", "_error_injection_action",
+    "_error_injection_instruction", "einj_factory", "error_type_flags",
+    "error_type_flags_bits", "injection_instruction_entry_flags",
+    "injection_instruction_entry_flags_bits", "parse_einj",
+    "pcie_sbdf_struct", "pcie_sbdf_struct_bits", "set_error_type_with_addr",
+    "set_error_type_with_addr_flags", "set_error_type_with_addr_flags_bits",
+    "trigger_error_action", "trigger_error_action_factory",
+    "trigger_error_header", "vendor_error_type_extension",
+]
+
+class trigger_error_header(bits.cdata.Struct):
+    """Trigger error header used with the trigger_error_action table."""
+    _pack_ = 1
+    _fields_ = [
+        ('header_size', ctypes.c_uint32),
+        ('revision', ctypes.c_uint32),
+        ('table_size', ctypes.c_uint32),
+        ('entry_count', ctypes.c_uint32),
+    ]
+
+@bits.cdata.memoize_factory
+def trigger_error_action_factory(num_entries):
+    """Create variable-sized trigger error action table based on the number of trigger error instruction entries."""
+    class trigger_error_action(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = [
+            ('header', trigger_error_header),
+            ('entries', num_entries * InjectionInstructionEntry),
+        ]
+    return trigger_error_action
+
+def trigger_error_action(val):
+    """Create class based on decode of an trigger_error_action table from address, filename, or data."""
+    addr, data, buf = _table_source(val)
+    hdr = trigger_error_header.from_address(addr)
+    num_entries = (hdr.table_size - ctypes.sizeof(trigger_error_action_factory(0))) / ctypes.sizeof(InjectionInstructionEntry)
+    if data is not None:
+        return trigger_error_action_factory(num_entries).from_buffer_copy(data)
+    return bits.cdata.from_address(trigger_error_action_factory(num_entries), addr)
+
+_error_injection_action = {
+    0x0  : 'BEGIN_INJECTION_OPERATION',
+    0x1  : 'GET_TRIGGER_ERROR_ACTION_TABLE',
+    0x2  : 'SET_ERROR_TYPE',
+    0x3  : 'GET_ERROR_TYPE',
+    0x4  : 'END_OPERATION',
+    0x5  : 'EXECUTE_OPERATION',
+    0x6  : 'CHECK_BUSY_STATUS',
+    0x7  : 'GET_COMMAND_STATUS',
+    0x8  : 'SET_ERROR_TYPE_WITH_ADDRESS',
+    0xFF : 'TRIGGER_ERROR',
+}
+
+_error_injection_instruction = {
+    0x00 : 'READ_REGISTER',
+    0x01 : 'READ_REGISTER_VALUE',
+    0x02 : 'WRITE_REGISTER',
+    0x03 : 'WRITE_REGISTER_VALUE',
+    0x04 : 'NOOP',
+}
+
+class error_type_flags_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('processor_correctable', ctypes.c_uint32, 1),
+        ('processor_uncorrectable_non_fatal', ctypes.c_uint32, 1),
+        ('processor_uncorrectable_fatal', ctypes.c_uint32, 1),
+        ('memory_correctable', ctypes.c_uint32, 1),
+        ('memory_uncorrectable_non_fatal', ctypes.c_uint32, 1),
+        ('memory_uncorrectable_fatal', ctypes.c_uint32, 1),
+        ('pci_express_correctable', ctypes.c_uint32, 1),
+        ('pci_express_uncorrectable_non_fatal', ctypes.c_uint32, 1),
+        ('pci_express_uncorrectable_fatal', ctypes.c_uint32, 1),
+        ('platform_correctable', ctypes.c_uint32, 1),
+        ('platform_uncorrectable_non_fatal', ctypes.c_uint32, 1),
+        ('platform_encorrectable_fatal', ctypes.c_uint32, 1),
+        ('reserved_12_30', ctypes.c_uint32, 19),
+        ('vendor_defined', ctypes.c_uint32, 1),
+    ]
+
+class error_type_flags(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint32),
+        ('bits', error_type_flags_bits),
+    ]
+
+class pcie_sbdf_struct_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('reserved_8_0', ctypes.c_uint32, 8),
+        ('function_num', ctypes.c_uint32, 3),
+        ('device_num', ctypes.c_uint32, 5),
+        ('bus_num', ctypes.c_uint32, 8),
+        ('pcie_segment', ctypes.c_uint32, 8),
+    ]
+
+class pcie_sbdf_struct(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint32),
+        ('bits', pcie_sbdf_struct_bits),
+    ]
+
+class set_error_type_with_addr_flags_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('processor_apic_valid', ctypes.c_uint32, 1),
+        ('memory_addr_and_mask_valid', ctypes.c_uint32, 1),
+        ('pcie_sbdf_valid', ctypes.c_uint32, 1),
+        ('reserved_31_3', ctypes.c_uint32, 29),
+    ]
+
+class set_error_type_with_addr_flags(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint32),
+        ('bits', set_error_type_with_addr_flags_bits),
+    ]
+
+class set_error_type_with_addr(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('error_type', error_type_flags),
+        ('vendor_error_type_extension_structure_offset', ctypes.c_uint32),
+        ('flags', set_error_type_with_addr_flags),
+        ('apic_id', ctypes.c_uint32),
+        ('memory_address', ctypes.c_uint64),
+        ('memory_address_range', ctypes.c_uint64),
+        ('pcie_sbdf', pcie_sbdf_struct),
+    ]
+
+class vendor_error_type_extension(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('length', ctypes.c_uint32),
+        ('sbdf', pcie_sbdf_struct),
+        ('vendor_id', ctypes.c_uint16),
+        ('device_id', ctypes.c_uint16),
+        ('rev_id', ctypes.c_uint8),
+        ('reserved', ctypes.c_uint8 * 3),
+    ]
+
+class injection_instruction_entry_flags_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('preserve_register', ctypes.c_uint8, 1),
+    ]
+
+class injection_instruction_entry_flags(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint8),
+        ('bits', injection_instruction_entry_flags_bits),
+    ]
+
+class InjectionInstructionEntry(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('injection_action', ctypes.c_uint8),
+        ('instruction', ctypes.c_uint8),
+        ('flags', injection_instruction_entry_flags),
+        ('reserved', ctypes.c_uint8),
+        ('register_region', GAS),
+        ('value', ctypes.c_uint64),
+        ('mask', ctypes.c_uint64),
+    ]
+    _formats = {
+        'injection_action' : unpack.format_table("{}", _error_injection_action),
+        'instruction' : unpack.format_table("{}", _error_injection_instruction),
+    }
+
+@bits.cdata.memoize_factory
+def einj_factory(num_entries):
+    """Create variable-sized EINJ table based on the number of injection instruction entries."""
+    class EINJ(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = [
+            ('header', TableHeader),
+            ('injection_header_size', ctypes.c_uint32),
+            ('injection_flags', ctypes.c_uint8),
+            ('reserved', 3 * ctypes.c_uint8),
+            ('injection_entry_count', ctypes.c_uint32),
+            ('entries', num_entries * InjectionInstructionEntry),
+        ]
+    return EINJ
+
+def EINJ(val):
+    """Create class based on decode of an EINJ table from address, filename, or data."""
+    addr, data, buf = _table_source(val)
+    hdr = TableHeader.from_address(addr)
+    num_entries = (hdr.length - ctypes.sizeof(einj_factory(0))) / ctypes.sizeof(InjectionInstructionEntry)
+    if data is not None:
+        return einj_factory(num_entries).from_buffer_copy(data)
+    return bits.cdata.from_address(einj_factory(num_entries), addr)
+
+parse_einj = make_compat_parser("EINJ")
@@ -0,0 +1,169 @@
+# Copyright (c) 2015, Intel Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright notice,
+#       this list of conditions and the following disclaimer in the documentation
+#       and/or other materials provided with the distribution.
+#     * Neither the name of Intel Corporation nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""ACPI Firmware ACPI Control Structure (FACS) decoder."""
+
+from acpi import make_compat_parser, _table_source
+import bits.cdata
+import ctypes
+
+__all__ = [
+    "FACS", "FACS_v0", "FACS_v1", "FACS_v2", "facs_flags", "facs_flags_bits",
+    "facs_flags_bits_v2", "facs_flags_v2", "facs_global_lock",
+    "facs_global_lock_bits", "facs_ospm_flags", "facs_ospm_flags_bits",
+    "parse_facs",
+]
+
+class facs_global_lock_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('pending', ctypes.c_uint32, 1),
+        ('owned', ctypes.c_uint32, 1),
+    ]
+
+class facs_global_lock(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint32),
+        ('bits', facs_global_lock_bits),
+    ]
+
+class facs_flags_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('s4bios_f', ctypes.c_uint32, 1),
+    ]
+
+class facs_flags(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint32),
+        ('bits', facs_flags_bits),
+    ]
+
+class facs_flags_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('s4bios_f', ctypes.c_uint32, 1),
+    ]
+
+class facs_flags(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint32),
+        ('bits', facs_flags_bits),
+    ]
+
+class facs_flags_bits_v2(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('s4bios_f', ctypes.c_uint32, 1),
+        ('64bit_wake_supported_f', ctypes.c_uint32, 1),
+    ]
+
+class facs_flags_v2(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint32),
+        ('bits', facs_flags_bits_v2),
+    ]
+
+class facs_ospm_flags_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('64bit_wake_f', ctypes.c_uint32, 1),
+    ]
+
+class facs_ospm_flags(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint32),
+        ('bits', facs_ospm_flags_bits),
+    ]
+
+class FACS_v0(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('signature', ctypes.c_char * 4),
+        ('length', ctypes.c_uint32),
+        ('hardware_signature', ctypes.c_uint32),
+        ('firmware_waking_vector', ctypes.c_uint32),
+        ('global_lock', facs_global_lock),
+        ('flags', facs_flags),
+        ('reserved', ctypes.c_uint8 * 40),
+    ]
+
+class FACS_v1(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('signature', ctypes.c_char * 4),
+        ('length', ctypes.c_uint32),
+        ('hardware_signature', ctypes.c_uint32),
+        ('firmware_waking_vector', ctypes.c_uint32),
+        ('global_lock', facs_global_lock),
+        ('flags', facs_flags),
+        ('x_firmware_waking_vector', ctypes.c_uint64),
+        ('version', ctypes.c_uint8),
+        ('reserved', ctypes.c_uint8 * 31),
+    ]
+
+class FACS_v2(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('signature', ctypes.c_char * 4),
+        ('length', ctypes.c_uint32),
+        ('hardware_signature', ctypes.c_uint32),
+        ('firmware_waking_vector', ctypes.c_uint32),
+        ('global_lock', facs_global_lock),
+        ('flags', facs_flags_v2),
+        ('x_firmware_waking_vector', ctypes.c_uint64),
+        ('version', ctypes.c_uint8),
+        ('pad', ctypes.c_uint8 * 3),
+        ('ospm_flags', facs_ospm_flags),
+        ('reserved', ctypes.c_uint8 * 24),
+    ]
+
+def FACS(val):
+    """Create class based on decode of an FACS table from address, filename, or data."""
+    addr, data, buf = _table_source(val)
+    cls = FACS_v0
+    r = FACS_v0.from_address(addr)
+    if r.length != ctypes.sizeof(FACS_v0):
+        r = FACS_v1.from_address(addr)
+        if r.version == 1:
+            cls = FACS_v1
+        elif r.version == 2:
+            cls = FACS_v2
+    if data is not None:
+        return cls.from_buffer_copy(data)
+    return bits.cdata.from_address(cls, addr)
+
+parse_facs = make_compat_parser("FACS")
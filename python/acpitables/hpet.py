@@ -0,0 +1,101 @@
+# Copyright (c) 2015, Intel Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright notice,
+#       this list of conditions and the following disclaimer in the documentation
+#       and/or other materials provided with the distribution.
+#     * Neither the name of Intel Corporation nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""ACPI High Precision Event Timer table (HPET) decoder."""
+
+from acpi import GAS, make_compat_parser, _table_source, TableHeader
+import bits.cdata
+import ctypes
+import unpack
+
+__all__ = [
+    "HPET", "HPET_v1", "_page_protection_table", "event_timer_block_id",
+    "event_timer_block_id_bits", "hpet_capabilities",
+    "hpet_capabilities_bits", "parse_hpet",
+]
+
+class event_timer_block_id_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('hardware_rev_id', ctypes.c_uint32, 8),
+        ('num_comparators', ctypes.c_uint32, 5),
+        ('count_size_cap_counter_size', ctypes.c_uint32, 1),
+        ('reserved', ctypes.c_uint32, 1),
+        ('legacy_replacement_IRQ_routing_capable', ctypes.c_uint32, 1),
+        ('pci_vid', ctypes.c_uint32, 16),
+    ]
+
+class event_timer_block_id(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint32),
+        ('bits', event_timer_block_id_bits),
+    ]
+
+_page_protection_table = {
+    0: 'No Guarantee for page protection',
+    1: '4KB page protected',
+    2: '64KB page protected',
+}
+
+class hpet_capabilities_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('page_protection', ctypes.c_uint8, 4),
+        ('oem_attributes', ctypes.c_uint8, 4),
+    ]
+    _formats = {
+        'page_protection': unpack.format_table("{:#x}", _page_protection_table),
+    }
+
+class hpet_capabilities(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint8),
+        ('bits', hpet_capabilities_bits),
+    ]
+
+class HPET_v1(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('header', TableHeader),
+        ('event_timer_block_id', event_timer_block_id),
+        ('base_address', GAS),
+        ('hpet_number', ctypes.c_uint8),
+        ('main_counter_min_clock_tick_in_periodic_mode', ctypes.c_uint16),
+        ('capabilities', hpet_capabilities),
+    ]
+
+def HPET(val):
+    """Create class based on decode of an HPET table from address, filename, or data."""
+    addr, data, buf = _table_source(val)
+    if data is not None:
+        return HPET_v1.from_buffer_copy(data)
+    return bits.cdata.from_address(HPET_v1, addr)
+
+parse_hpet = make_compat_parser("HPET")
@@ -0,0 +1,68 @@
+# Copyright (c) 2015, Intel Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright notice,
+#       this list of conditions and the following disclaimer in the documentation
+#       and/or other materials provided with the distribution.
+#     * Neither the name of Intel Corporation nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""ACPI PCI Express memory-mapped configuration table (MCFG) decoder."""
+
+from acpi import make_compat_parser, _table_source, TableHeader
+import bits.cdata
+import ctypes
+
+__all__ = [
+    "MCFG", "MCFGResource", "mcfg_factory", "parse_mcfg",
+]
+
+class MCFGResource(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('address', ctypes.c_uint64),
+        ('segment', ctypes.c_uint16),
+        ('start_bus', ctypes.c_uint8),
+        ('end_bus', ctypes.c_uint8),
+        ('reserved', ctypes.c_uint32),
+    ]
+
+@bits.cdata.memoize_factory
+def mcfg_factory(num_resources):
+    """Create variable-sized MCFG table based on the number of resources."""
+    class MCFG(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = [
+            ('header', TableHeader),
+            ('reserved', ctypes.c_uint64),
+            ('resources', num_resources * MCFGResource),
+        ]
+    return MCFG
+
+def MCFG(val):
+    """Create class based on decode of an MCFG table from address, filename, or data."""
+    addr, data, buf = _table_source(val)
+    hdr = TableHeader.from_address(addr)
+    num_tables = (hdr.length - ctypes.sizeof(mcfg_factory(0))) / ctypes.sizeof(MCFGResource)
+    if data is not None:
+        return mcfg_factory(num_tables).from_buffer_copy(data)
+    return bits.cdata.from_address(mcfg_factory(num_tables), addr)
+
+parse_mcfg = make_compat_parser("MCFG")
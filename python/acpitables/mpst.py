@@ -0,0 +1,176 @@
+# Copyright (c) 2015, Intel Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright notice,
+#       this list of conditions and the following disclaimer in the documentation
+#       and/or other materials provided with the distribution.
+#     * Neither the name of Intel Corporation nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""ACPI Memory Power State Table (MPST) decoder."""
+
+from acpi import make_compat_parser, _subtable_source, _table_source, TableHeader
+import bits.cdata
+import ctypes
+
+__all__ = [
+    "MPST", "MPSTCharacteristics", "MPSTMemPowerNode_factory",
+    "MPSTMemPowerNode_flags", "MPSTMemPowerNode_flags_bits", "MPSTState",
+    "mpst_factory", "mpst_subtable_list", "parse_mpst",
+    "power_state_structure_flags", "power_state_structure_flags_bits",
+    "power_state_structure_id", "power_state_structure_id_bits",
+]
+
+class MPSTMemPowerNode_flags_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('enabled', ctypes.c_uint8, 1),
+        ('power_managed', ctypes.c_uint8, 1),
+        ('hot_pluggable', ctypes.c_uint8, 1),
+    ]
+
+class MPSTMemPowerNode_flags(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint8),
+        ('bits', MPSTMemPowerNode_flags_bits),
+    ]
+
+class MPSTState(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('value', ctypes.c_uint8),
+        ('information_index', ctypes.c_uint8),
+    ]
+
+@bits.cdata.memoize_factory
+def MPSTMemPowerNode_factory(num_power_states, num_physical_components):
+    class MPSTMemPowerNode(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = [
+            ('flags', MPSTMemPowerNode_flags),
+            ('reserved', ctypes.c_uint8),
+            ('node_id', ctypes.c_uint16),
+            ('length', ctypes.c_uint32),
+            ('base_address_low', ctypes.c_uint32),
+            ('base_address_high', ctypes.c_uint32),
+            ('length_low', ctypes.c_uint32),
+            ('length_high', ctypes.c_uint32),
+            ('num_power_states', ctypes.c_uint32),
+            ('num_physical_components', ctypes.c_uint32),
+            ('memory_power_nodes', MPSTState * num_power_states),
+            ('physical_component_ids', ctypes.c_uint16 * num_physical_components),
+        ]
+    return MPSTMemPowerNode
+
+class power_state_structure_id_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('pss_id_value', ctypes.c_uint8, 6),
+        ('pss_id_revision', ctypes.c_uint8, 2),
+    ]
+
+class power_state_structure_id(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint8),
+        ('bits', power_state_structure_id_bits),
+    ]
+
+class power_state_structure_flags_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('memory_content_preserved', ctypes.c_uint8, 1),
+        ('autonomous_power_state_entry', ctypes.c_uint8, 1),
+        ('autonomous_power_state_exit', ctypes.c_uint8, 1),
+    ]
+
+class power_state_structure_flags(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint8),
+        ('bits', power_state_structure_flags_bits),
+    ]
+
+class MPSTCharacteristics(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('pss_id', power_state_structure_id),
+        ('flags', power_state_structure_flags),
+        ('reserved', ctypes.c_uint16),
+        ('average_power', ctypes.c_uint32),
+        ('relative_power', ctypes.c_uint32),
+        ('exit_latency', ctypes.c_uint64),
+        ('reserved2', ctypes.c_uint32),
+    ]
+
+@bits.cdata.memoize_factory
+def mpst_factory(field_list, characteristics_count):
+
+    class subtables(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = field_list
+
+        def __iter__(self):
+            for f in self._fields_:
+                yield getattr(self, f[0])
+
+    class MPST_v1(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = [
+            ('header', TableHeader),
+            ('pcc_id', ctypes.c_uint8),
+            ('reserved', ctypes.c_uint8 * 3),
+            ('memory_power_node_count', ctypes.c_uint16),
+            ('reserved2', ctypes.c_uint16),
+            ('memory_power_nodes', subtables),
+            ('characteristics_count', ctypes.c_uint16),
+            ('reserved3', ctypes.c_uint16),
+            ('characteristics', MPSTCharacteristics * characteristics_count),
+        ]
+
+    return MPST_v1
+
+def mpst_subtable_list(addr, memory_power_node_count):
+    addr, length, buf = _subtable_source(addr, None)
+    field_list = list()
+    base_MPSTMemPowerNode = MPSTMemPowerNode_factory(0, 0)
+    for subtable_num in range(1, memory_power_node_count + 1):
+        subtable = base_MPSTMemPowerNode.from_address(addr)
+        cls = MPSTMemPowerNode_factory(subtable.num_power_states, subtable.num_physical_components)
+        addr += subtable.length
+        field_list.append( ('subtable{}'.format(subtable_num), cls) )
+    return field_list
+
+def MPST(val):
+    """Create class based on decode of an PMTT table from address, filename, or data."""
+    base_length = ctypes.sizeof(mpst_factory(list(), 0))
+    addr, data, buf = _table_source(val)
+    mpst = mpst_factory(list(), 0).from_address(addr)
+    field_list = mpst_subtable_list(ctypes.addressof(mpst.memory_power_nodes), mpst.memory_power_node_count)
+    mpst = mpst_factory(field_list, 0).from_address(addr)
+    if data is not None:
+        return mpst_factory(field_list, mpst.characteristics_count).from_buffer_copy(data)
+    return bits.cdata.from_address(mpst_factory(field_list, mpst.characteristics_count), addr)
+
+parse_mpst = make_compat_parser("MPST")
@@ -0,0 +1,71 @@
+# Copyright (c) 2015, Intel Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright notice,
+#       this list of conditions and the following disclaimer in the documentation
+#       and/or other materials provided with the distribution.
+#     * Neither the name of Intel Corporation nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""ACPI Maximum System Characteristics Table (MSCT) decoder."""
+
+from acpi import make_compat_parser, _table_source, TableHeader
+import bits.cdata
+import ctypes
+
+__all__ = [
+    "MSCT", "MSCTProximityDomainInfo_v1", "msct_factory", "parse_msct",
+]
+
+class MSCTProximityDomainInfo_v1(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('revision', ctypes.c_uint8),
+        ('length', ctypes.c_uint8),
+        ('proximity_domain_range_low', ctypes.c_uint32),
+        ('proximity_domain_range_high', ctypes.c_uint32),
+        ('max_processor_capacity', ctypes.c_uint32),
+        ('max_memory_capacity', ctypes.c_uint64),
+    ]
+
+@bits.cdata.memoize_factory
+def msct_factory(num_proxdominfo):
+    class MSCT_v1(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = [
+            ('header', TableHeader),
+            ('proximity_domain_info_offset', ctypes.c_uint32),
+            ('max_proximity_domains', ctypes.c_uint32),
+            ('max_clock_domains', ctypes.c_uint32),
+            ('max_physical_address', ctypes.c_uint64),
+            ('proximity_domain_info_structs', num_proxdominfo * MSCTProximityDomainInfo_v1),
+        ]
+    return MSCT_v1
+
+def MSCT(val):
+    """Create class based on decode of an MSCT table from address, filename, or data."""
+    addr, data, buf = _table_source(val)
+    hdr = TableHeader.from_address(addr)
+    num_tables = (hdr.length - ctypes.sizeof(TableHeader)) / ctypes.sizeof(MSCTProximityDomainInfo_v1)
+    if data is not None:
+        return msct_factory(num_tables).from_buffer_copy(data)
+    return bits.cdata.from_address(msct_factory(num_tables), addr)
+
+parse_msct = make_compat_parser("MSCT")
@@ -0,0 +1,57 @@
+# Copyright (c) 2015, Intel Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright notice,
+#       this list of conditions and the following disclaimer in the documentation
+#       and/or other materials provided with the distribution.
+#     * Neither the name of Intel Corporation nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""ACPI Microsoft Data Management table (MSDM) decoder."""
+
+from acpi import make_compat_parser, _table_source, TableHeader
+import bits.cdata
+import ctypes
+
+__all__ = [
+    "MSDM", "msdm_factory", "parse_msdm",
+]
+
+@bits.cdata.memoize_factory
+def msdm_factory(data_len):
+    """Create variable-sized MSDM table."""
+    class MSDM_v1(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = [
+            ('header', TableHeader),
+            ('software_licensing_structure', ctypes.c_uint8 * data_len),
+        ]
+    return MSDM_v1
+
+def MSDM(val):
+    """Create class based on decode of an MSDM table from address, filename, or data."""
+    addr, data, buf = _table_source(val)
+    hdr = TableHeader.from_address(addr)
+    data_len = hdr.length - ctypes.sizeof(msdm_factory(0))
+    if data is not None:
+        return msdm_factory(data_len).from_buffer_copy(data)
+    return bits.cdata.from_address(msdm_factory(data_len), addr)
+
+parse_msdm = make_compat_parser("MSDM")
@@ -0,0 +1,134 @@
+# Copyright (c) 2015, Intel Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright notice,
+#       this list of conditions and the following disclaimer in the documentation
+#       and/or other materials provided with the distribution.
+#     * Neither the name of Intel Corporation nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""ACPI Platform Communications Channel Table (PCCT) decoder."""
+
+from acpi import GAS, make_compat_parser, _subtable_source, _table_source, TableHeader
+import bits.cdata
+import copy
+import ctypes
+
+__all__ = [
+    "PCCT", "PCCTGenericCommSubspace", "PCCTSubtable",
+    "PCCT_GENERIC_COMMUNICATION_SUBSPACE", "PCCT_flags", "PCCT_flags_bits",
+    "parse_pcct", "pcct_factory", "pcct_subtable_list",
+    "pcct_subtable_unknown_factory",
+]
+
+class PCCTSubtable(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('subtype', ctypes.c_uint8),
+        ('length', ctypes.c_uint8),
+    ]
+
+@bits.cdata.memoize_factory
+def pcct_subtable_unknown_factory(data_len):
+    class PCCTSubtableUnknown(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = copy.copy(PCCTSubtable._fields_) + [
+            ('data', ctypes.c_uint8 * data_len),
+        ]
+    return PCCTSubtableUnknown
+
+class PCCTGenericCommSubspace(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = copy.copy(PCCTSubtable._fields_) + [
+        ('reserved', ctypes.c_uint8 * 6),
+        ('base_address', ctypes.c_uint64),
+        ('mem_range_length', ctypes.c_uint64),
+        ('doorbell_register', GAS),
+        ('doorbell_preserve', ctypes.c_uint64),
+        ('doorbell_write', ctypes.c_uint64),
+        ('nominal_latency', ctypes.c_uint32),
+        ('max_periodic_access_rate', ctypes.c_uint32),
+        ('min_request_turnaround_time', ctypes.c_uint16),
+    ]
+
+class PCCT_flags_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('sci_doorbell', ctypes.c_uint32, 1),
+    ]
+
+class PCCT_flags(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint32),
+        ('bits', PCCT_flags_bits),
+    ]
+
+@bits.cdata.memoize_factory
+def pcct_factory(field_list):
+    class subtables(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = field_list
+
+        def __iter__(self):
+            for f in self._fields_:
+                yield getattr(self, f[0])
+
+    class PCCT_v1(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = [
+            ('header', TableHeader),
+            ('flags', PCCT_flags),
+            ('reserved', ctypes.c_uint64),
+            ('pcc_subspace_structures', subtables),
+        ]
+
+    return PCCT_v1
+
+PCCT_GENERIC_COMMUNICATION_SUBSPACE = 0
+
+def pcct_subtable_list(addr, length=None):
+    addr, length, buf = _subtable_source(addr, length)
+    end = addr + length
+    field_list = list()
+    subtable_num = 0
+    while addr < end:
+        subtable_num += 1
+        subtable = PCCTSubtable.from_address(addr)
+        if subtable.subtype == PCCT_GENERIC_COMMUNICATION_SUBSPACE:
+            cls = PCCTGenericCommSubspace
+        else:
+            cls = pcct_subtable_unknown_factory(subtable.length - ctypes.sizeof(PCCTSubtable))
+        addr += subtable.length
+        field_list.append( ('subtable{}'.format(subtable_num), cls) )
+    return field_list
+
+def PCCT(val):
+    """Create class based on decode of an PCCT table from address, filename, or data."""
+    base_length = ctypes.sizeof(pcct_factory(list()))
+    addr, data, buf = _table_source(val)
+    hdr = TableHeader.from_address(addr)
+    field_list = pcct_subtable_list(addr + base_length, hdr.length - base_length)
+    if data is not None:
+        return pcct_factory(field_list).from_buffer_copy(data)
+    return bits.cdata.from_address(pcct_factory(field_list), addr)
+
+parse_pcct = make_compat_parser("PCCT")
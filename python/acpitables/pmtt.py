@@ -0,0 +1,204 @@
+# Copyright (c) 2015, Intel Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright notice,
+#       this list of conditions and the following disclaimer in the documentation
+#       and/or other materials provided with the distribution.
+#     * Neither the name of Intel Corporation nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""ACPI Platform Memory Topology Table (PMTT) decoder."""
+
+from acpi import make_compat_parser, _subtable_source, _table_source, TableHeader
+import bits.cdata
+import copy
+import ctypes
+import unpack
+
+__all__ = [
+    "PMTT", "PMTTSubtable", "PMTTSubtableDIMM",
+    "PMTTSubtableMemController_factory", "PMTTSubtableSocket_factory",
+    "PMTT_DIMM", "PMTT_MEMORY_CONTROLLER", "PMTT_SOCKET",
+    "PMTT_component_memory_type", "PMTT_flags", "PMTT_flags_bits",
+    "parse_pmtt", "pmtt_factory", "pmtt_subtable_list",
+    "pmtt_subtable_unknown_factory",
+]
+
+PMTT_component_memory_type = {
+    0b00:   'Volatile memory',
+    0b01:   'Both volatile and non-volatile memory',
+    0b10:   'Non-volatile memory',
+}
+
+class PMTT_flags_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('top_level_aggregator_device', ctypes.c_uint16, 1),
+        ('physical_topology_element', ctypes.c_uint16, 1),
+    ]
+    _formats = {
+        'component_memory_type': unpack.format_table("{}", PMTT_component_memory_type),
+    }
+
+class PMTT_flags(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint16),
+        ('bits', PMTT_flags_bits),
+    ]
+
+class PMTTSubtable(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('subtype', ctypes.c_uint8),
+        ('reserved1', ctypes.c_uint8),
+        ('length', ctypes.c_uint16),
+        ('flags', PMTT_flags),
+        ('reserved2', ctypes.c_uint16),
+    ]
+
+@bits.cdata.memoize_factory
+def PMTTSubtableSocket_factory(field_list):
+
+    class subtables(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = field_list
+
+        def __iter__(self):
+            for f in self._fields_:
+                yield getattr(self, f[0])
+
+    class PMTTSubtableSocket(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = copy.copy(PMTTSubtable._fields_) + [
+            ('socket_identifier', ctypes.c_uint16),
+            ('reserved', ctypes.c_uint16),
+            ('memory_controller_structures', subtables),
+        ]
+
+    return PMTTSubtableSocket
+
+@bits.cdata.memoize_factory
+def PMTTSubtableMemController_factory(num_proximity_domains, field_list):
+    class subtables(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = field_list
+
+        def __iter__(self):
+            for f in self._fields_:
+                yield getattr(self, f[0])
+
+    class PMTTSubtableMemController(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = copy.copy(PMTTSubtable._fields_) + [
+            ('read_latency', ctypes.c_uint32),
+            ('write_latency', ctypes.c_uint32),
+            ('read_bandwidth', ctypes.c_uint32),
+            ('write_bandwidth', ctypes.c_uint32),
+            ('optimal_access_unit', ctypes.c_uint16),
+            ('optimal_access_aligment', ctypes.c_uint16),
+            ('reserved', ctypes.c_uint16),
+            ('number_proximity_domains', ctypes.c_uint16),
+            ('domains', (ctypes.c_uint32 * num_proximity_domains)),
+            ('physical_component_identifier_structures', subtables),
+        ]
+
+    return PMTTSubtableMemController
+
+class PMTTSubtableDIMM(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = copy.copy(PMTTSubtable._fields_) + [
+        ('physical_component_id', ctypes.c_uint16),
+        ('reserved', ctypes.c_uint16),
+        ('dimm_size', ctypes.c_uint32),
+        ('smbios_handle', ctypes.c_uint32),
+    ]
+
+@bits.cdata.memoize_factory
+def pmtt_subtable_unknown_factory(data_len):
+    class PMTTSubtableUnknown(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = copy.copy(PMTTSubtable._fields_) + [
+            ('data', ctypes.c_uint8 * data_len),
+        ]
+    return PMTTSubtableUnknown
+
+@bits.cdata.memoize_factory
+def pmtt_factory(field_list):
+    class subtables(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = field_list
+
+        def __iter__(self):
+            for f in self._fields_:
+                yield getattr(self, f[0])
+
+    class PMTT_v1(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = [
+            ('header', TableHeader),
+            ('reserved', ctypes.c_uint32),
+            ('memory_aggregator_device_structures', subtables),
+        ]
+
+    return PMTT_v1
+
+PMTT_SOCKET = 0
+PMTT_MEMORY_CONTROLLER = 1
+PMTT_DIMM = 2
+
+def pmtt_subtable_list(addr, length=None):
+    addr, length, buf = _subtable_source(addr, length)
+    end = addr + length
+    field_list = list()
+    subtable_num = 0
+    skt_base_length = ctypes.sizeof(PMTTSubtableSocket_factory(list()))
+    mc_base_cls = PMTTSubtableMemController_factory(0, list())
+    while addr < end:
+        subtable_num += 1
+        subtable = PMTTSubtable.from_address(addr)
+        if subtable.subtype == PMTT_SOCKET:
+            next_field_list = pmtt_subtable_list(addr + skt_base_length, subtable.length - skt_base_length)
+            cls = PMTTSubtableSocket_factory(next_field_list)
+        elif subtable.subtype == PMTT_MEMORY_CONTROLLER:
+            base_subtable = mc_base_cls.from_address(addr)
+            base_length = ctypes.sizeof(PMTTSubtableMemController_factory(base_subtable.number_proximity_domains, list()))
+            next_field_list = pmtt_subtable_list(addr + base_length, subtable.length - base_length)
+            cls = PMTTSubtableMemController_factory(base_subtable.number_proximity_domains, next_field_list)
+        elif subtable.subtype == PMTT_DIMM:
+            cls = PMTTSubtableDIMM
+        else:
+            cls = pmtt_subtable_unknown_factory(subtable.length - ctypes.sizeof(PMTTSubtable))
+        addr += subtable.length
+        field_list.append( ('subtable{}'.format(subtable_num), cls) )
+    return field_list
+
+def PMTT(val):
+    """Create class based on decode of an PMTT table from address, filename, or data."""
+    base_length = ctypes.sizeof(pmtt_factory(list()))
+    addr, data, buf = _table_source(val)
+    hdr = TableHeader.from_address(addr)
+    field_list = pmtt_subtable_list(addr + base_length, hdr.length - base_length)
+    if data is not None:
+        return pmtt_factory(field_list).from_buffer_copy(data)
+    return bits.cdata.from_address(pmtt_factory(field_list), addr)
+
+parse_pmtt = make_compat_parser("PMTT")
@@ -0,0 +1,103 @@
+# Copyright (c) 2015, Intel Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright notice,
+#       this list of conditions and the following disclaimer in the documentation
+#       and/or other materials provided with the distribution.
+#     * Neither the name of Intel Corporation nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""ACPI Serial Port Console Redirection table (SPCR) decoder."""
+
+from acpi import GAS, make_compat_parser, _table_source, TableHeader
+import bits.cdata
+import ctypes
+import unpack
+
+__all__ = [
+    "SPCR", "SPCR_v1", "_format_baud", "baud", "flow_control",
+    "flow_control_bits", "parse_spcr",
+]
+
+class flow_control_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('DCD', ctypes.c_uint8, 1),
+        ('RTSCTS', ctypes.c_uint8, 1),
+        ('XONXOFF', ctypes.c_uint8, 1),
+    ]
+
+class flow_control(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint8),
+        ('bits', flow_control_bits),
+    ]
+
+# Decode for baud rate the BIOS used for redirection
+baud = {
+    3: 9600,
+    4: 19200,
+    6: 57600,
+    7: 115200,
+}
+def _format_baud(val):
+    return baud.get(val, 'Reserved')
+
+class SPCR_v1(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('header', TableHeader),
+        ('interface_type', ctypes.c_uint8),
+        ('reserved0', ctypes.c_uint8 * 3),
+        ('base_address', GAS),
+        ('int_type', ctypes.c_uint8),
+        ('irq', ctypes.c_uint8),
+        ('global_sys_int', ctypes.c_uint32),
+        ('baud_rate', ctypes.c_uint8),
+        ('parity', ctypes.c_uint8),
+        ('stop_bits', ctypes.c_uint8),
+        ('flow_control', flow_control),
+        ('terminal_type', ctypes.c_uint8),
+        ('reserved1', ctypes.c_uint8),
+        ('pci_did', ctypes.c_uint16),
+        ('pci_vid', ctypes.c_uint16),
+        ('pci_bus', ctypes.c_uint8),
+        ('pci_dev', ctypes.c_uint8),
+        ('pci_func', ctypes.c_uint8),
+        ('pci_flags', ctypes.c_uint32),
+        ('pci_segment', ctypes.c_uint8),
+        ('reserved2', ctypes.c_uint8 * 4)
+    ]
+    _formats = {
+        'baud_rate': unpack.format_function("{}", _format_baud),
+        'parity': unpack.format_table("{}", { 0: 'No Parity' }),
+        'stop_bits': unpack.format_table("{}", { 1: '1 stop bit' }),
+    }
+
+def SPCR(val):
+    """Create class based on decode of an SPCR table from address, filename, or data."""
+    addr, data, buf = _table_source(val)
+    if data is not None:
+        return SPCR_v1.from_buffer_copy(data)
+    return bits.cdata.from_address(SPCR_v1, addr)
+
+parse_spcr = make_compat_parser("SPCR")
@@ -0,0 +1,232 @@
+# Copyright (c) 2015, Intel Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright notice,
+#       this list of conditions and the following disclaimer in the documentation
+#       and/or other materials provided with the distribution.
+#     * Neither the name of Intel Corporation nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""ACPI System Resource Affinity Table (SRAT) decoder."""
+
+from acpi import parse_table, _table_source, TableHeader
+import bits.cdata
+import copy
+from cStringIO import StringIO
+import ctypes
+import ttypager
+
+__all__ = [
+    "SRAT", "SRATLocalApicAffinity", "SRATLocalApicAffinity_flags",
+    "SRATLocalApicAffinity_flags_bits", "SRATLocalX2ApicAffinity",
+    "SRATLocalX2ApicAffinity_flags", "SRATLocalX2ApicAffinity_flags_bits",
+    "SRATMemoryAffinity", "SRATMemoryAffinity_flags",
+    "SRATMemoryAffinity_flags_bits", "SRATSubtable",
+    "SRATSubtableUnknown_factory", "SRAT_LOCAL_APIC_AFFINITY",
+    "SRAT_LOCAL_X2APIC_AFFINITY", "SRAT_MEMORY_AFFINITY", "parse_srat",
+    "srat_factory",
+]
+
+class SRATSubtable(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = [
+            ('subtype', ctypes.c_uint8),
+            ('length', ctypes.c_uint8),
+        ]
+
+class SRATLocalApicAffinity_flags_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('enabled', ctypes.c_uint32, 1),
+    ]
+
+class SRATLocalApicAffinity_flags(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint32),
+        ('bits', SRATLocalApicAffinity_flags_bits),
+    ]
+
+class SRATLocalApicAffinity(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = copy.copy(SRATSubtable._fields_) + [
+        ('proximity_domain_7_0', ctypes.c_uint8),
+        ('apic_id', ctypes.c_uint8),
+        ('flags', SRATLocalApicAffinity_flags),
+        ('local_sapic_eid', ctypes.c_uint8),
+        ('proximity_domain_31_8', ctypes.c_uint8 * 3),
+        ('clock_domain', ctypes.c_uint32),
+    ]
+
+class SRATMemoryAffinity_flags_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('enabled', ctypes.c_uint32, 1),
+        ('hot_pluggable', ctypes.c_uint32, 1),
+        ('nonvolatile', ctypes.c_uint32, 1),
+    ]
+
+class SRATMemoryAffinity_flags(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint32),
+        ('bits', SRATMemoryAffinity_flags_bits),
+    ]
+
+class SRATMemoryAffinity(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = copy.copy(SRATSubtable._fields_) + [
+        ('proximity_domain', ctypes.c_uint32),
+        ('reserved1', ctypes.c_uint8 * 2),
+        ('base_address_low', ctypes.c_uint32),
+        ('base_address_high', ctypes.c_uint32),
+        ('length_low', ctypes.c_uint32),
+        ('length_high', ctypes.c_uint32),
+        ('reserved2', ctypes.c_uint32),
+        ('flags', SRATMemoryAffinity_flags),
+        ('reserved3', ctypes.c_uint64),
+    ]
+
+class SRATLocalX2ApicAffinity_flags_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('enabled', ctypes.c_uint32, 1),
+    ]
+
+class SRATLocalX2ApicAffinity_flags(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint32),
+        ('bits', SRATLocalX2ApicAffinity_flags_bits),
+    ]
+
+class SRATLocalX2ApicAffinity(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = copy.copy(SRATSubtable._fields_) + [
+        ('reserved1', ctypes.c_uint16),
+        ('proximity_domain', ctypes.c_uint32),
+        ('x2apic_id', ctypes.c_uint32),
+        ('flags', SRATLocalX2ApicAffinity_flags),
+        ('clock_domain', ctypes.c_uint32),
+        ('reserved2', ctypes.c_uint32),
+    ]
+
+@bits.cdata.memoize_factory
+def SRATSubtableUnknown_factory(_len):
+    class SRATSubtableUnknown(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = copy.copy(SRATSubtable._fields_) + [
+            ('data', ctypes.c_uint8 * _len),
+        ]
+    return SRATSubtableUnknown
+
+SRAT_LOCAL_APIC_AFFINITY = 0
+SRAT_MEMORY_AFFINITY = 1
+SRAT_LOCAL_X2APIC_AFFINITY = 2
+
+@bits.cdata.memoize_factory
+def srat_factory(field_list):
+    class subtables(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = field_list
+
+        def __iter__(self):
+            for f in self._fields_:
+                yield getattr(self, f[0])
+
+    class SRAT_v3(bits.cdata.Struct):
+        _pack_ = 1
+        _fields_ = [
+            ('header', TableHeader),
+            ('reserved1', ctypes.c_uint32),
+            ('reserved2', ctypes.c_uint64),
+            ('subtables', subtables),
+        ]
+        def __str__(self):
+            out = StringIO()
+            print >>out, "SRAT Summary\n"
+            mem = [t for t in self.subtables if (t.subtype == SRAT_MEMORY_AFFINITY) and t.flags.bits.enabled]
+            if mem:
+                print >>out, "Enabled Memory Affinity Domains"
+                for m in mem:
+                    domain = m.proximity_domain
+                    addr = (m.base_address_high << 32) + m.base_address_low
+                    len = (m.length_high << 32) +  m.length_low
+                    print >>out, "domain = {:#x}  base address = {:#016x}  length = {:#016x}".format(domain, addr, len)
+                print >>out
+            xapic = [t for t in  self.subtables if (t.subtype == SRAT_LOCAL_APIC_AFFINITY) and t.flags.bits.enabled]
+            x2apic = [t for t in  self.subtables if (t.subtype == SRAT_LOCAL_X2APIC_AFFINITY) and t.flags.bits.enabled]
+            if xapic or x2apic:
+                domain_apicids = {}
+                print >>out, "Enabled Processor Affinity Domains"
+                for x in xapic:
+                    domain = (x.proximity_domain_31_8[2] << 24) + (x.proximity_domain_31_8[1] << 16) + (x.proximity_domain_31_8[0] << 8) + x.proximity_domain_7_0
+                    domain_apicids.setdefault(domain, []).append(x.apic_id)
+                for x2 in x2apic:
+                    domain_apicids.setdefault(x2.proximity_domain, []).append(x2.x2apic_id)
+                for domain, apicids in domain_apicids.iteritems():
+                    print >>out, "domain={:#x}  apicids={}".format(domain, ','.join("{:#x}".format(a) for a in sorted(apicids)))
+                print >>out
+            print >>out, super(SRAT_v3, self).__str__()
+            return out.getvalue()
+
+    return SRAT_v3
+
+def SRAT(val):
+    """Create class based on decode of an SRAT table from address, filename, or data."""
+    addr, data, buf = _table_source(val)
+    hdr = TableHeader.from_address(addr)
+    end = addr + hdr.length
+    current = addr + ctypes.sizeof(srat_factory(list()))
+    field_list = list()
+    subtable_num = 0
+    while current < end:
+        subtable_num += 1
+        subtable = SRATSubtable.from_address(current)
+        current += subtable.length
+        if subtable.subtype == SRAT_LOCAL_APIC_AFFINITY:
+            cls = SRATLocalApicAffinity
+        elif subtable.subtype == SRAT_MEMORY_AFFINITY:
+            cls = SRATMemoryAffinity
+        elif subtable.subtype == SRAT_LOCAL_X2APIC_AFFINITY:
+            cls = SRATLocalX2ApicAffinity
+        else:
+            cls = SRATSubtableUnknown_factory(subtable.length - ctypes.sizeof(SRATSubtable))
+        field_list.append( ('subtable{}'.format(subtable_num), cls) )
+    if data is not None:
+        return srat_factory(field_list).from_buffer_copy(data)
+    return bits.cdata.from_address(srat_factory(field_list), addr)
+
+def parse_srat(printflag=False, EnabledOnly=False, instance=1):
+    """Parse and optionally print an SRAT table."""
+
+    srat = parse_table("SRAT", instance)
+    if srat is None:
+        return None
+    if printflag:
+        with ttypager.page():
+            print srat
+    if EnabledOnly:
+        with ttypager.page():
+            print '\n'.join(str(subtable) for subtable in srat.subtables if subtable.flags.bits.enabled)
+    return srat
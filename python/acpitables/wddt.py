@@ -0,0 +1,121 @@
+# Copyright (c) 2015, Intel Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright notice,
+#       this list of conditions and the following disclaimer in the documentation
+#       and/or other materials provided with the distribution.
+#     * Neither the name of Intel Corporation nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""ACPI Watchdog Descriptor Table (WDDT) decoder."""
+
+from acpi import GAS, make_compat_parser, _table_source, TableHeader
+import bits.cdata
+import ctypes
+import unpack
+
+__all__ = [
+    "WDDT", "WDDT_v1", "_ownership_decode", "_wdt_active_decode",
+    "_wdt_available_decode", "parse_wddt", "wddt_capability",
+    "wddt_capability_bits", "wddt_status", "wddt_status_bits",
+]
+
+_wdt_available_decode = {
+    0: 'permanently disabled',
+    1: 'available',
+}
+
+_wdt_active_decode = {
+    0: 'WDT stopped when BIOS hands off control',
+    1: 'WDT running when BIOS hnads off control',
+}
+
+_ownership_decode = {
+    0: 'TCO is owned by the BIOS',
+    1: 'TCO is owned by the OS',
+}
+
+class wddt_status_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('wdt_available', ctypes.c_uint16, 1),
+        ('wdt_active', ctypes.c_uint16, 1),
+        ('ownership', ctypes.c_uint16, 1),
+        ('reserved', ctypes.c_uint16, 8),
+        ('user_reset_event', ctypes.c_uint16, 1),
+        ('wdt_event', ctypes.c_uint16, 1),
+        ('power_fail_event', ctypes.c_uint16, 1),
+        ('unknown_reset_event', ctypes.c_uint16, 1),
+    ]
+    _formats = {
+        'wdt_available': unpack.format_table("{}", _wdt_available_decode),
+        'wdt_active': unpack.format_table("{}", _wdt_active_decode),
+        'ownership': unpack.format_table("{}", _ownership_decode),
+    }
+
+class wddt_status(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint16),
+        ('bits', wddt_status_bits),
+    ]
+
+class wddt_capability_bits(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('auto_reset', ctypes.c_uint16, 1),
+        ('alert_support', ctypes.c_uint16, 1),
+        ('platform_directed_shutdown', ctypes.c_uint16, 1),
+        ('immediate_shutdown', ctypes.c_uint16, 1),
+        ('bios_handoff_support', ctypes.c_uint16, 1),
+    ]
+
+class wddt_capability(bits.cdata.Union):
+    _pack_ = 1
+    _anonymous_ = ("bits",)
+    _fields_ = [
+        ('data', ctypes.c_uint16),
+        ('bits', wddt_capability_bits),
+    ]
+
+class WDDT_v1(bits.cdata.Struct):
+    _pack_ = 1
+    _fields_ = [
+        ('header', TableHeader),
+        ('tco_spec_version', ctypes.c_uint16),
+        ('tco_description_table_version', ctypes.c_uint16),
+        ('pci_vid', ctypes.c_uint16),
+        ('tco_base_address', GAS),
+        ('timer_min_count', ctypes.c_uint16),
+        ('timer_max_count', ctypes.c_uint16),
+        ('timer_count_period', ctypes.c_uint16),
+        ('status', wddt_status),
+        ('capability', wddt_capability),
+    ]
+
+def WDDT(val):
+    """Create class based on decode of an WDDT table from address, filename, or data."""
+    addr, data, buf = _table_source(val)
+    if data is not None:
+        return WDDT_v1.from_buffer_copy(data)
+    return bits.cdata.from_address(WDDT_v1, addr)
+
+parse_wddt = make_compat_parser("WDDT")
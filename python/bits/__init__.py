@@ -35,7 +35,6 @@ import ctypes
 import functools
 import itertools
 from collections import namedtuple
-import string
 import struct
 import time
 
@@ -289,22 +288,12 @@ def grouper(n, iterable, fillvalue=None):
     args = [iter(iterable)] * n
     return itertools.izip_longest(fillvalue=fillvalue, *args)
 
-def dumpmem(mem, addr=0):
-    """Dump hexadecimal and printable ASCII bytes for a memory buffer"""
-    s = ''
-    for offset, chunk in zip( range(0, len(mem), 16), grouper(16, mem) ):
-        s += "{:08x}: ".format(addr + offset)
-        s += " ".join("  " if x is None else "{:02x}".format(ord(x)) for x in chunk)
-        s += "  "
-        for x in chunk:
-            if x is None:
-                s += ' '
-            elif x in string.letters or x in string.digits or x in string.punctuation:
-                s += x
-            else:
-                s += '.'
-        s += '\n'
-    return s
+def dumpmem(mem, addr=0, compact=False):
+    """Dump hexadecimal and printable ASCII bytes for a memory buffer
+
+    See bits.hexdump.hexdump to write a dump to a file instead."""
+    import bits.hexdump
+    return bits.hexdump.dumps(mem, addr, compact)
 
 def set_func_ptr(funcptr_ptr, wrapper):
     """Set a C function pointer to a ctypes-wrapped Python function
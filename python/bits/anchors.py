@@ -0,0 +1,139 @@
+# Copyright (c) 2015, Intel Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright notice,
+#       this list of conditions and the following disclaimer in the documentation
+#       and/or other materials provided with the distribution.
+#     * Neither the name of Intel Corporation nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Legacy BIOS anchor scanner.
+
+Finds the anchored firmware structures in the legacy BIOS regions (the EBDA,
+the last KB of base memory, and 0xE0000-0xFFFFF): SMBIOS entry points
+("_SM_", "_SM3_"), the MP floating pointer ("_MP_"), the PCI interrupt routing
+table ("$PIR"), and the ACPI RSDP ("RSD PTR ").  Takes a single snapshot of
+each region, finds anchors with str.find rather than probing every paragraph,
+validates each candidate's length and checksum, and caches the results for
+the rest of the session."""
+
+import bits
+import bits.integrity
+from collections import namedtuple
+import struct
+
+Anchor = namedtuple("Anchor", ("signature", "address", "length"))
+
+def _smbios_length(data, offset):
+    return ord(data[offset+5])
+
+def _smbios3_length(data, offset):
+    return ord(data[offset+6])
+
+def _mp_length(data, offset):
+    # Length in 16-byte paragraphs; the floating pointer structure has exactly one
+    if ord(data[offset+8]) != 1:
+        return None
+    return 16
+
+def _pir_length(data, offset):
+    table_size = struct.unpack_from("<H", data, offset+6)[0]
+    if (table_size - 32) % 16 != 0:
+        return None
+    return table_size
+
+def _rsdp_length(data, offset):
+    # The ACPI 1.0 checksum covers the first 20 bytes; revision 2 and later
+    # add an extended checksum over the full length.
+    if bits.integrity.sum8(data, offset, 20) != 0:
+        return None
+    if ord(data[offset+15]) < 2:
+        return 20
+    return struct.unpack_from("<I", data, offset+20)[0]
+
+# Map each anchor to a function returning the length covered by the
+# structure's checksum, or None if the structure is invalid.
+_anchors = {
+    "_SM_": _smbios_length,
+    "_SM3_": _smbios3_length,
+    "_MP_": _mp_length,
+    "$PIR": _pir_length,
+    "RSD PTR ": _rsdp_length,
+}
+
+def ebda_range():
+    """Return the (address, size) of the first KB of the Extended BIOS Data Area, or None"""
+    ebda_address = struct.unpack("<H", str(bits.memory(0x40E, 2)))[0] << 4
+    if not ebda_address:
+        return None
+    return (ebda_address, 0x400)
+
+def regions():
+    """Return the list of (address, size) ranges searched for anchors"""
+    ranges = [(0x9FC00, 0x400), (0xE0000, 0x20000)]
+    ebda = ebda_range()
+    if ebda is not None:
+        ranges.insert(0, ebda)
+    return ranges
+
+def _scan_region(address, data):
+    found = []
+    for signature, length_func in _anchors.iteritems():
+        offset = data.find(signature)
+        while offset >= 0:
+            if offset % 16 == 0:
+                try:
+                    length = length_func(data, offset)
+                except (IndexError, struct.error):
+                    length = None
+                if length is not None and length <= len(data) - offset and bits.integrity.sum8(data, offset, length) == 0:
+                    found.append(Anchor(signature, address + offset, length))
+            offset = data.find(signature, offset + 1)
+    return found
+
+_cache = None
+
+def scan(refresh=False):
+    """Return a list of all the valid anchored structures, sorted by address.
+
+    Scans the legacy BIOS regions the first time, and returns the cached
+    results after that, unless refresh is True."""
+    global _cache
+    if _cache is None or refresh:
+        found = set()
+        for address, size in regions():
+            found.update(_scan_region(address, str(bits.memory(address, size))))
+        _cache = sorted(found, key=lambda anchor: anchor.address)
+    return _cache
+
+def find(signature, ranges=None):
+    """Return the addresses of the valid structures with the given anchor.
+
+    If ranges is not None, only return addresses within the given list of
+    (address, size) ranges, in the order of the ranges."""
+    anchors = [anchor.address for anchor in scan() if anchor.signature == signature]
+    if ranges is None:
+        return anchors
+    addresses = []
+    for address, size in ranges:
+        for a in anchors:
+            if address <= a < address + size and a not in addresses:
+                addresses.append(a)
+    return addresses
@@ -0,0 +1,184 @@
+# Copyright (c) 2015, Intel Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright notice,
+#       this list of conditions and the following disclaimer in the documentation
+#       and/or other materials provided with the distribution.
+#     * Neither the name of Intel Corporation nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Write zip and tar archives to a file in a single pass.
+
+ZipWriter and TarWriter stream entries to any object with a write method,
+such as an efi.efi_file, without seeking, and buffer small writes into
+larger ones.  Each entry's data must be available in full when added, so
+that its size and CRC can go in its header.  Used as context managers, the
+writers only finalize the archive if the with block completes normally.
+
+open_writer picks the format from the archive name: ".zip" or ".tar"."""
+
+import binascii
+import bits.integrity
+import struct
+import time
+import zlib
+
+class _BufferedSink(object):
+    """Collect writes into blocks of at least block_size bytes"""
+    def __init__(self, fileobj, block_size=256*1024):
+        self.fileobj = fileobj
+        self.block_size = block_size
+        self.pending = []
+        self.pending_size = 0
+        self.offset = 0
+
+    def write(self, data):
+        if not isinstance(data, str):
+            data = str(data)
+        self.pending.append(data)
+        self.pending_size += len(data)
+        self.offset += len(data)
+        if self.pending_size >= self.block_size:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.fileobj.write("".join(self.pending))
+            self.pending = []
+            self.pending_size = 0
+
+class ZipEntry(object):
+    __slots__ = ("name", "offset", "crc", "compress_type", "compressed_size", "size", "dos_time", "dos_date")
+
+class ZipWriter(object):
+    """Write a zip archive, with entries either stored or deflated"""
+    ZIP_STORED = 0
+    ZIP_DEFLATED = 8
+
+    def __init__(self, fileobj, compress=False, date_time=None):
+        self.sink = _BufferedSink(fileobj)
+        self.compress_type = self.ZIP_DEFLATED if compress else self.ZIP_STORED
+        if date_time is None:
+            date_time = time.localtime()[:6]
+        year, month, day, hour, minute, second = date_time
+        self.dos_date = (max(year, 1980) - 1980) << 9 | month << 5 | day
+        self.dos_time = hour << 11 | minute << 5 | second // 2
+        self.entries = []
+        self.closed = False
+
+    def add(self, name, data):
+        """Add a file named name containing data (a string or buffer)"""
+        e = ZipEntry()
+        e.name = name
+        e.offset = self.sink.offset
+        e.crc = binascii.crc32(data) & 0xffffffff
+        e.size = len(data)
+        e.compress_type = self.compress_type
+        if e.compress_type == self.ZIP_DEFLATED:
+            c = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+            data = c.compress(data) + c.flush()
+        e.compressed_size = len(data)
+        e.dos_time = self.dos_time
+        e.dos_date = self.dos_date
+        self.sink.write(struct.pack("<4s5H3L2H", "PK\x03\x04", 20, 0, e.compress_type, e.dos_time, e.dos_date, e.crc, e.compressed_size, e.size, len(name), 0))
+        self.sink.write(name)
+        self.sink.write(data)
+        self.entries.append(e)
+
+    def close(self):
+        """Write the central directory and flush; does not close the underlying file"""
+        if self.closed:
+            return
+        start = self.sink.offset
+        for e in self.entries:
+            self.sink.write(struct.pack("<4s6H3L5H2L", "PK\x01\x02", 20, 20, 0, e.compress_type, e.dos_time, e.dos_date, e.crc, e.compressed_size, e.size, len(e.name), 0, 0, 0, 0, 0, e.offset))
+            self.sink.write(e.name)
+        size = self.sink.offset - start
+        self.sink.write(struct.pack("<4s4H2LH", "PK\x05\x06", 0, 0, len(self.entries), len(self.entries), size, start, 0))
+        self.sink.flush()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+
+class TarWriter(object):
+    """Write a ustar tar archive"""
+    BLOCK_SIZE = 512
+
+    def __init__(self, fileobj, mtime=None):
+        self.sink = _BufferedSink(fileobj)
+        if mtime is None:
+            mtime = int(time.time())
+        self.mtime = mtime
+        self.closed = False
+
+    def add(self, name, data):
+        """Add a file named name containing data (a string or buffer)"""
+        header = struct.pack("100s8s8s8s12s12s8sc100s6s2s32s32s8s8s155s12x",
+            name, "0000644\0", "0000000\0", "0000000\0", "{:011o}\0".format(len(data)), "{:011o}\0".format(self.mtime),
+            " " * 8, "0", "", "ustar\0", "00", "", "", "", "", "")
+        checksum = bits.integrity.byte_sum(header)
+        header = header[:148] + "{:06o}\0 ".format(checksum) + header[156:]
+        self.sink.write(header)
+        self.sink.write(data)
+        padding = -len(data) % self.BLOCK_SIZE
+        if padding:
+            self.sink.write("\0" * padding)
+
+    def close(self):
+        """Write the end-of-archive blocks and flush; does not close the underlying file"""
+        if self.closed:
+            return
+        self.sink.write("\0" * (2 * self.BLOCK_SIZE))
+        self.sink.flush()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+
+_formats = (
+    (".zip", ZipWriter),
+    (".tar", TarWriter),
+)
+
+def format_for(name):
+    """Return the writer class for an archive name, based on its extension"""
+    lower = name.lower()
+    for extension, cls in _formats:
+        if lower.endswith(extension):
+            return cls
+    raise ValueError("Unknown archive format for {!r}; use .zip or .tar".format(name))
+
+def open_writer(name, fileobj, compress=False):
+    """Return a ZipWriter or TarWriter for fileobj, based on the extension of name.
+
+    compress=True deflates the entries of a zip archive; tar archives ignore it."""
+    cls = format_for(name)
+    if cls is ZipWriter:
+        return ZipWriter(fileobj, compress)
+    return cls(fileobj)
@@ -28,8 +28,12 @@
 
 from __future__ import print_function
 import binascii
+from collections import OrderedDict
+import contextlib
 import ctypes, _ctypes
+import functools
 import textwrap
+import time
 import ttypager
 import uuid
 
@@ -44,6 +48,75 @@ def print_fields(cls):
 def to_bytes(var):
     return (ctypes.c_char * ctypes.sizeof(var)).from_buffer(var).raw
 
+snapshot_default = False
+snapshot_stats = {"copies": 0, "bytes": 0, "seconds": 0.0}
+
+def from_address(cls, address, snapshot=None):
+    """Return an instance of the ctypes type cls for the data at address.
+
+    Normally this overlays cls directly on the memory at address, so every
+    field access reads that memory again. With snapshot=True, or with
+    snapshot=None and snapshot_default set, this copies the data once into a
+    buffer owned by the instance and overlays cls on the copy instead.
+    snapshot_stats accumulates the number of copies, their total size in
+    bytes, and the time spent copying."""
+    if snapshot is None:
+        snapshot = snapshot_default
+    if not snapshot:
+        return cls.from_address(address)
+    start = time.time()
+    obj = cls()
+    size = ctypes.sizeof(cls)
+    ctypes.memmove(ctypes.addressof(obj), address, size)
+    snapshot_stats["copies"] += 1
+    snapshot_stats["bytes"] += size
+    snapshot_stats["seconds"] += time.time() - start
+    return obj
+
+@contextlib.contextmanager
+def snapshots(enable=True):
+    """Context manager that sets snapshot_default within its body"""
+    global snapshot_default
+    old_default = snapshot_default
+    snapshot_default = enable
+    try:
+        yield snapshot_stats
+    finally:
+        snapshot_default = old_default
+
+factory_cache_size = 512
+_factory_cache = OrderedDict()
+
+def _freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def memoize_factory(factory):
+    """Decorator that caches the classes created by a ctypes class factory.
+
+    Factories such as acpi.apic_factory create a new ctypes class for each
+    shape of a variable-length structure, and creating a ctypes class costs
+    far more than decoding with one.  The decorated factory returns the same
+    class when called again with equal arguments (comparing lists, such as
+    field lists, by contents).  All factories share one cache, which keeps
+    the factory_cache_size most recently used classes."""
+    @functools.wraps(factory)
+    def wrapper(*args, **kwargs):
+        key = (factory, _freeze(args), tuple(sorted(kwargs.iteritems())))
+        try:
+            cls = _factory_cache.pop(key)
+        except KeyError:
+            cls = factory(*args, **kwargs)
+        except TypeError:
+            # Unhashable arguments; don't cache
+            return factory(*args, **kwargs)
+        _factory_cache[key] = cls
+        while len(_factory_cache) > factory_cache_size:
+            _factory_cache.popitem(last=False)
+        return cls
+    return wrapper
+
 _CTYPES_HEX_TYPES = (
     ctypes.c_void_p,
     ctypes.c_uint8, ctypes.c_uint16, ctypes.c_uint32, ctypes.c_uint64,
@@ -0,0 +1,95 @@
+# Copyright (c) 2015, Intel Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright notice,
+#       this list of conditions and the following disclaimer in the documentation
+#       and/or other materials provided with the distribution.
+#     * Neither the name of Intel Corporation nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Hexadecimal and printable ASCII dumps of memory.
+
+hexdump formats 16-byte rows and writes them to a file-like sink a chunk at
+a time.  It converts bytes with precomputed hex and ASCII tables, so the
+cost per row is one string format rather than per-byte concatenation."""
+
+from cStringIO import StringIO
+import string
+
+ROW_SIZE = 16
+_CHUNK_SIZE = 256 * ROW_SIZE
+
+_hex = ["{:02x}".format(b) for b in range(256)]
+_printable = string.ascii_letters + string.digits + string.punctuation
+_ascii = "".join(chr(b) if chr(b) in _printable else "." for b in range(256))
+
+def _format_row(address, hexes, text):
+    if len(hexes) < ROW_SIZE:
+        pad = ROW_SIZE - len(hexes)
+        hexes = hexes + ["  "] * pad
+        text = text + " " * pad
+    return "%08x: %s  %s\n" % (address, " ".join(hexes), text)
+
+def hexdump(mem, sink, addr=0, compact=False):
+    """Write hexadecimal and printable ASCII bytes for a memory buffer to sink.
+
+    mem may be a string, bytearray, buffer, or other object supporting the
+    buffer interface; addr gives the address of its first byte.  sink only
+    needs a write method.
+
+    With compact=True, a run of rows identical to the row before it becomes
+    a single "*" line, as in "hexdump -C"; the last row always appears, to
+    show where the dump ends."""
+    view = buffer(mem)
+    previous = None
+    squeezed = None
+    for start in xrange(0, len(view), _CHUNK_SIZE):
+        chunk = view[start:start+_CHUNK_SIZE]
+        hexes = map(_hex.__getitem__, bytearray(chunk))
+        text = chunk.translate(_ascii)
+        address = addr + start
+        if not compact:
+            full = len(chunk) - len(chunk) % ROW_SIZE
+            lines = ["%08x: %s  %s\n" % (address + offset, " ".join(hexes[offset:offset+ROW_SIZE]), text[offset:offset+ROW_SIZE]) for offset in xrange(0, full, ROW_SIZE)]
+            if full < len(chunk):
+                lines.append(_format_row(address + full, hexes[full:], text[full:]))
+            sink.write("".join(lines))
+            continue
+        lines = []
+        for offset in xrange(0, len(chunk), ROW_SIZE):
+            end = offset + ROW_SIZE
+            row = chunk[offset:end]
+            if row == previous:
+                if squeezed is None:
+                    lines.append("*\n")
+                squeezed = (address + offset, hexes[offset:end], text[offset:end])
+                continue
+            previous = row
+            squeezed = None
+            lines.append(_format_row(address + offset, hexes[offset:end], text[offset:end]))
+        sink.write("".join(lines))
+    if squeezed is not None:
+        sink.write(_format_row(*squeezed))
+
+def dumps(mem, addr=0, compact=False):
+    """Return hexadecimal and printable ASCII bytes for a memory buffer as a string"""
+    sink = StringIO()
+    hexdump(mem, sink, addr, compact)
+    return sink.getvalue()
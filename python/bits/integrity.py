@@ -0,0 +1,186 @@
+# Copyright (c) 2016, Intel Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright notice,
+#       this list of conditions and the following disclaimer in the documentation
+#       and/or other materials provided with the distribution.
+#     * Neither the name of Intel Corporation nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Firmware table checksums and integrity verification.
+
+byte_sum and sum8 compute the byte sums used by ACPI, SMBIOS, MP and $PIR
+checksums without a Python-level loop over the bytes: the low half of an
+Adler-32 holds one plus the sum of the bytes modulo 65521, which stays exact
+for chunks of up to 256 bytes, so zlib sums each chunk in C.  crc32_zeroed
+computes the CRC32 of EFI table headers.
+
+verify_all checks every ACPI, SMBIOS, MP, $PIR and EFI table it can find and
+returns a list of Result."""
+
+import binascii
+from collections import namedtuple
+import struct
+import zlib
+
+_CHUNK = 256
+
+def byte_sum(data, offset=0, length=None):
+    """Return the sum of length bytes of data (a string, bytearray, or buffer), starting at offset"""
+    if length is None:
+        length = len(data) - offset
+    view = buffer(data, offset, length)
+    total = 0
+    for start in xrange(0, length, _CHUNK):
+        total += (zlib.adler32(view[start:start+_CHUNK]) & 0xffff) - 1
+    return total
+
+def sum8(data, offset=0, length=None):
+    """Return the 8-bit sum of length bytes of data, starting at offset"""
+    return byte_sum(data, offset, length) & 0xff
+
+def checksum_valid(data, offset=0, length=None):
+    """Return True if the bytes sum to zero, modulo 256"""
+    return sum8(data, offset, length) == 0
+
+def crc32(data, crc=0):
+    """Return the CRC32 of data as an unsigned value, continuing from crc"""
+    return binascii.crc32(data, crc) & 0xffffffff
+
+def crc32_zeroed(data, offset, size=4):
+    """Return the CRC32 of data computed with size bytes at offset replaced by zeroes.
+
+    EFI table headers compute their CRC32 with the CRC32 field itself zeroed."""
+    view = buffer(data)
+    crc = binascii.crc32(view[:offset])
+    crc = binascii.crc32("\0" * size, crc)
+    return binascii.crc32(view[offset+size:], crc) & 0xffffffff
+
+def acpi_table_valid(data):
+    """Check the checksum of an ACPI table with a standard header"""
+    length = struct.unpack_from("<I", data, 4)[0]
+    return length <= len(data) and checksum_valid(data, 0, length)
+
+def rsdp_valid(data):
+    """Check the ACPI 1.0 checksum of an RSDP, and its extended checksum for revision 2 and later"""
+    if not checksum_valid(data, 0, 20):
+        return False
+    if ord(data[15]) < 2:
+        return True
+    length = struct.unpack_from("<I", data, 20)[0]
+    return length <= len(data) and checksum_valid(data, 0, length)
+
+def smbios_entry_point_valid(data):
+    """Check the checksums of an SMBIOS 2.x ("_SM_") or 3.x ("_SM3_") entry point"""
+    if data[:5] == "_SM3_":
+        return checksum_valid(data, 0, ord(data[6]))
+    # The intermediate checksum covers the intermediate entry point at 0x10
+    return checksum_valid(data, 0, ord(data[5])) and checksum_valid(data, 0x10, 0xf)
+
+def mp_config_table_valid(data):
+    """Check the base and extended table checksums of an MP configuration table"""
+    base_table_length, = struct.unpack_from("<H", data, 4)
+    extended_table_length, extended_table_checksum = struct.unpack_from("<HB", data, 40)
+    if base_table_length + extended_table_length > len(data):
+        return False
+    if not checksum_valid(data, 0, base_table_length):
+        return False
+    return (byte_sum(data, base_table_length, extended_table_length) + extended_table_checksum) & 0xff == 0
+
+def pir_valid(data):
+    """Check the checksum of a $PIR table"""
+    table_size, = struct.unpack_from("<H", data, 6)
+    return table_size <= len(data) and checksum_valid(data, 0, table_size)
+
+def efi_table_valid(data):
+    """Check the CRC32 of an EFI table header"""
+    header_size, crc = struct.unpack_from("<II", data, 12)
+    return header_size <= len(data) and crc32_zeroed(buffer(data, 0, header_size), 16) == crc
+
+Result = namedtuple("Result", ("kind", "name", "address", "length", "valid"))
+
+def _verify_acpi():
+    import acpi
+    results = []
+    for table in acpi.get_tables():
+        if table.checksum_valid is None:
+            continue
+        name = table.signature
+        if table.instance > 1:
+            name += "{}".format(table.instance)
+        results.append(Result("ACPI", name, table.address, table.length, table.checksum_valid))
+    return results
+
+def _verify_anchors():
+    import bits
+    import bits.anchors
+    results = []
+    for anchor in bits.anchors.scan():
+        # The anchor scan only returns structures with valid checksums
+        if anchor.signature in ("_SM_", "_SM3_"):
+            results.append(Result("SMBIOS", "entry point", anchor.address, anchor.length, True))
+        elif anchor.signature == "$PIR":
+            results.append(Result("PIR", "$PIR", anchor.address, anchor.length, True))
+        elif anchor.signature == "_MP_":
+            results.append(Result("MP", "floating pointer", anchor.address, anchor.length, True))
+            config_address, = struct.unpack("<I", str(bits.memory(anchor.address + 4, 4)))
+            if config_address:
+                header = str(bits.memory(config_address, 44))
+                base_table_length, = struct.unpack_from("<H", header, 4)
+                extended_table_length, = struct.unpack_from("<H", header, 40)
+                length = base_table_length + extended_table_length
+                data = str(bits.memory(config_address, length))
+                results.append(Result("MP", "configuration table", config_address, length, mp_config_table_valid(data)))
+    return results
+
+def _verify_efi():
+    try:
+        import efi
+    except ImportError:
+        return []
+    import bits
+    import ctypes
+    results = []
+    tables = [
+        ("system table", ctypes.addressof(efi.system_table)),
+        ("runtime services", ctypes.addressof(efi.system_table.RuntimeServices.contents)),
+        ("boot services", ctypes.addressof(efi.system_table.BootServices.contents)),
+    ]
+    for name, address in tables:
+        header_size, = struct.unpack("<I", str(bits.memory(address + 12, 4)))
+        data = str(bits.memory(address, header_size))
+        results.append(Result("EFI", name, address, header_size, efi_table_valid(data)))
+    return results
+
+def verify_all():
+    """Verify the checksums of all the firmware tables, and return a list of Result.
+
+    Covers the ACPI tables (other than the FACS, which has no checksum), the
+    SMBIOS entry points, the MP floating pointer and configuration table,
+    the $PIR table, and the EFI system, runtime services and boot services
+    tables."""
+    return _verify_acpi() + _verify_anchors() + _verify_efi()
+
+def format_results(results):
+    """Format a list of Result as a table"""
+    lines = ["{:6} {:20} {:>18} {:>8} {}".format("Kind", "Name", "Address", "Length", "Status")]
+    for r in results:
+        lines.append("{:6} {:20} {:#18x} {:8} {}".format(r.kind, r.name, r.address, r.length, "PASS" if r.valid else "FAIL"))
+    return "\n".join(lines)
@@ -28,6 +28,8 @@
 
 from __future__ import print_function
 import bits
+import bits.anchors
+import bits.cdata
 import ctypes
 import testsuite
 import ttypager
@@ -42,19 +44,12 @@ bad_address_ranges = [
 
 def find_pir_table():
     """Find and validate the address of the PCI Interrupt Routing table"""
-    address_ranges = valid_address_ranges + bad_address_ranges
-    for address, size in address_ranges:
-        mem = bits.memory(address, size)
-        for offset in range(0, len(mem), 16):
-            signature = (ctypes.c_char * 4).from_address(address + offset).value
-            if signature == '$PIR':
-                table_size = ctypes.c_uint16.from_address(address + offset + 6).value
-                if table_size <= (size - offset) and ((table_size - 32) % 16 == 0):
-                    csum = sum(ord(mem[c]) for c in range(offset, offset + table_size))
-                    if csum & 0xff == 0:
-                        return address + offset
-    return None
+    addresses = bits.anchors.find("$PIR", valid_address_ranges + bad_address_ranges)
+    if not addresses:
+        return None
+    return addresses[0]
 
+@bits.cdata.memoize_factory
 def pir_factory(num_slots):
     """Create variable-sized PIR table based on the number of Slot Entry structures."""
     class PIR(bits.cdata.Struct):
@@ -76,8 +71,8 @@ def PIR(val):
     hdr = TableHeader.from_address(addr)
     num_slots = (hdr.table_size - ctypes.sizeof(pir_factory(0))) / ctypes.sizeof(SlotEntry)
     if isinstance(val, str):
-        return pir_factory(num_tables).from_buffer_copy(data)
-    return pir_factory(num_slots).from_address(addr)
+        return pir_factory(num_slots).from_buffer_copy(data)
+    return bits.cdata.from_address(pir_factory(num_slots), addr)
 
 def PIRTable():
     """Find and decode the PCI Interrupt Routing Table."""
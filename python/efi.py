@@ -31,9 +31,10 @@ from cStringIO import StringIO
 from _ctypes import CFuncPtr as _CFuncPtr
 import _efi
 import atexit
-import binascii
 import bits
+import bits.archive
 import bits.cdata
+import bits.integrity
 from collections import OrderedDict
 from ctypes import *
 from efikeys import *
@@ -249,12 +250,7 @@ def FUNC(*argtypes, **kw):
     return EFIFUNCTYPE(ret, *argtypes)
 
 def compute_crc(buf, offset):
-    before_buffer = (UINT8 * offset).from_buffer(buf)
-    zero = (UINT8 * 4)()
-    after_buffer = (UINT8 * (sizeof(buf) - offset - 4)).from_buffer(buf, offset + 4)
-    crc = binascii.crc32(before_buffer)
-    crc = binascii.crc32(zero, crc)
-    return binascii.crc32(after_buffer, crc)
+    return bits.integrity.crc32_zeroed(buf, offset)
 
 def table_crc(table):
     th = TableHeader.from_buffer(table)
@@ -643,7 +639,7 @@ class EFI_SYSTEM_TABLE(bits.cdata.Struct):
     @property
     def ConfigurationTable(self):
         ptr = cast(self.ConfigurationTablePtr, c_void_p)
-        return (ConfigurationTable * self.NumberOfTableEntries).from_address(ptr.value)
+        return bits.cdata.from_address(ConfigurationTable * self.NumberOfTableEntries, ptr.value)
 
     @property
     def ConfigurationTableDict(self):
@@ -1569,6 +1565,29 @@ def save_tables(decode=True):
                 tables_dir.create(fname).write(str(table))
             print("Done")
 
+def save_archive(name, entries, compress=False):
+    """Save (filename, data) pairs from the iterable entries into one archive file.
+
+    The archive goes in the root of the boot filesystem, replacing any existing
+    file of that name, and gets written through a single open file. The
+    extension of name selects the format: .zip or .tar. compress=True deflates
+    the entries of a zip archive."""
+    bits.archive.format_for(name)
+    root = get_boot_fs()
+    # EFI_FILE_MODE_CREATE does not truncate an existing file
+    try:
+        root.open(name, EFI_FILE_MODE_READ | EFI_FILE_MODE_WRITE).delete()
+    except EFIException:
+        pass
+    print("Saving {}...".format(name))
+    with root.create(name) as f:
+        with bits.archive.open_writer(name, f, compress) as archive:
+            for fname, data in entries:
+                print("Adding {}...".format(fname), end='')
+                archive.add(fname, data)
+                print("Done")
+    print("Done")
+
 created_explore_efi_cfg = False
 
 def create_explore_efi_cfg():
@@ -1715,8 +1734,8 @@ def hii_list_package_lists():
         for handle in Handles:
             print("{:#x}".format(handle))
 
-def hii_export_package_lists():
-    """Exports the contents of one or all package lists in the HII database into a buffer."""
+def hii_get_package_lists():
+    """Return the contents of all package lists in the HII database, as a string."""
 
     handle = locate_handles(EFI_HII_DATABASE_PROTOCOL_GUID)[0]
 
@@ -1730,9 +1749,53 @@ def hii_export_package_lists():
     buf = create_string_buffer(buf_size.value)
     check_status( hii.ExportPackageLists( byref(hii), 0, byref(buf_size), byref(buf)))
 
+    return buf.raw[:buf_size.value]
+
+def hii_export_package_lists():
+    """Exports the contents of one or all package lists in the HII database into a buffer."""
+
+    buf = hii_get_package_lists()
+
     with ttypager.page():
-        print("buf_size={}\n".format(buf_size.value))
-        print(bits.dumpmem(buf.raw))
+        print("buf_size={}\n".format(len(buf)))
+        print(bits.dumpmem(buf))
+
+def hii_split_package_lists(buf):
+    """Split exported HII package lists into a list of (uuid, data) pairs, one per package list.
+
+    Any trailing data that does not form a complete package list gets a uuid of None."""
+    package_lists = []
+    offset = 0
+    header_size = sizeof(EFI_HII_PACKAGE_LIST_HEADER)
+    while offset + header_size <= len(buf):
+        header = EFI_HII_PACKAGE_LIST_HEADER.from_buffer_copy(buf, offset)
+        length = header.PackagLength
+        if length < header_size or offset + length > len(buf):
+            break
+        package_lists.append((header.PackageListGuid.uuid, buf[offset:offset+length]))
+        offset += length
+    if offset < len(buf):
+        package_lists.append((None, buf[offset:]))
+    return package_lists
+
+def hii_save_archive(name="hii.zip", compress=True):
+    """Save the HII database into one archive file on the boot filesystem.
+
+    The archive holds the full package list export, each package list
+    separately, the exported configuration, and a manifest listing each
+    package list with its GUID, length, and CRC32. The extension of name
+    selects the format: .zip or .tar."""
+    def entries():
+        buf = hii_get_package_lists()
+        yield "package_lists.bin", buf
+        manifest = "{:<24} {:<36} {:>10} {:>10}\n".format("file", "guid", "length", "crc32")
+        for index, (u, data) in enumerate(hii_split_package_lists(buf)):
+            fname = "package_list_{:03}.bin".format(index)
+            yield fname, data
+            manifest += "{:<24} {:<36} {:#10x} {:#010x}\n".format(fname, str(u) if u is not None else "-", len(data), bits.integrity.crc32(data))
+        yield "config.txt", hii_export_config().encode("utf-8")
+        yield "manifest.txt", manifest
+    save_archive(name, entries(), compress)
 
 EFI_PCI_IO_PROTOCOL_WIDTH = UINTN
 EfiPciIoWidthUint8, EfiPciIoWidthUint16, EfiPciIoWidthUint32, EfiPciIoWidthUint64, EfiPciIoWidthFifoUint8, EfiPciIoWidthFifoUint16, EfiPciIoWidthFifoUint32, EfiPciIoWidthFifoUint64, EfiPciIoWidthFillUint8, EfiPciIoWidthFillUint16, EfiPciIoWidthFillUint32, EfiPciIoWidthFillUint64, EfiPciIoWidthMaximum = range(13)
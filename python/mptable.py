@@ -28,8 +28,7 @@
 
 from __future__ import print_function
 import bits
-import bitfields
-import ctypes
+import bits.anchors
 import struct
 import unpack
 import testsuite
@@ -51,21 +50,13 @@ def find_mp_table():
         return efi.system_table.ConfigurationTableDict.get(efi.MPS_TABLE_GUID)
 
     address_ranges = valid_address_ranges + bad_address_ranges
-    bda_address = 0x400
-    ebda_address = ctypes.c_uint16.from_address(bda_address + 0x14).value << 4
-    if ebda_address:
-        address_ranges.insert(0, (ebda_address, 0x400))
-    for address, size in address_ranges:
-        mem = bits.memory(address, size)
-        for offset in range(0, size, 16):
-            signature = (ctypes.c_char * 4).from_address(address + offset).value
-            if signature == "_MP_":
-                length = ctypes.c_ubyte.from_address(address + offset + 8).value
-                if length == 1:
-                    csum = sum(map(ord, mem[offset:offset+16])) & 0xff
-                    if csum == 0:
-                        return address + offset
-    return None
+    ebda = bits.anchors.ebda_range()
+    if ebda is not None:
+        address_ranges.insert(0, ebda)
+    addresses = bits.anchors.find("_MP_", address_ranges)
+    if not addresses:
+        return None
+    return addresses[0]
 
 class MPTable(unpack.Struct):
     """Find and decode the MP Table."""
@@ -81,58 +72,66 @@ class MPTable(unpack.Struct):
 
     def __init__(self):
         super(MPTable, self).__init__()
-        u = unpack.Unpackable(self._floating_pointer_memory)
+        u = unpack.Unpackable(self._floating_pointer_memory, views=True)
         self.add_field('floating_pointer', FloatingPointer(u))
 
         self._base_header_memory = bits.memory(self.floating_pointer.physical_address_pointer, 44)
-        u = unpack.Unpackable(self._base_header_memory)
+        u = unpack.Unpackable(self._base_header_memory, views=True)
         self.add_field('header', Header(u), "\n\n{!r}")
 
         self._base_table_memory = bits.memory(self.floating_pointer.physical_address_pointer, self.header.base_table_length)
-        u = unpack.Unpackable(self._base_table_memory)
+        u = unpack.Unpackable(self._base_table_memory, views=True)
         u.skip(44)
-        self.add_field('base_structures', unpack.unpack_all(u, _base_structures), unpack.format_each("\n\n{!r}"))
+        self.add_field('base_structures', unpack.unpack_all(u, _base_registry), unpack.format_each("\n\n{!r}"))
 
         self._extended_table_memory = bits.memory(self.floating_pointer.physical_address_pointer + self.header.base_table_length, self.header.extended_table_length)
-        u = unpack.Unpackable(self._extended_table_memory)
-        self.add_field('extended_structures', unpack.unpack_all(u, _extended_structures), unpack.format_each("\n\n{!r}"))
+        u = unpack.Unpackable(self._extended_table_memory, views=True)
+        self.add_field('extended_structures', unpack.unpack_all(u, _extended_registry), unpack.format_each("\n\n{!r}"))
 
 class FloatingPointer(unpack.Struct):
+    _layout = unpack.Layout([
+        ('anchor_string', "4s"),
+        ('physical_address_pointer', "<I"),
+        ('length', "B"),
+        ('spec_revision', "B"),
+        ('checksum', "B"),
+        ('mp_feature_info_1', "B"),
+        ('mp_feature_info_2', "B"),
+        ('multiple_clock_sources', unpack.field_bit('mp_feature_info_2', 6), "mp_feature_info_2[6]={}"),
+        ('imcrp_present', unpack.field_bit('mp_feature_info_2', 7), "mp_feature_info_2[7]={}"),
+        ('mp_feature_info_3', "B"),
+        ('mp_feature_info_4', "B"),
+        ('mp_feature_info_5', "B"),
+    ])
+
     def __init__(self, u):
         super(FloatingPointer, self).__init__()
         self.raw_data = u.unpack_peek_rest()
-        self.add_field('anchor_string', u.unpack_one("4s"))
-        self.add_field('physical_address_pointer', u.unpack_one("<I"))
-        self.add_field('length', u.unpack_one("B"))
-        self.add_field('spec_revision', u.unpack_one("B"))
-        self.add_field('checksum', u.unpack_one("B"))
-        self.add_field('mp_feature_info_1', u.unpack_one("B"))
-        self.add_field('mp_feature_info_2', u.unpack_one("B"))
-        self.add_field('multiple_clock_sources', bool(bitfields.getbits(self.mp_feature_info_2, 6)), "mp_feature_info_2[6]={}")
-        self.add_field('imcrp_present', bool(bitfields.getbits(self.mp_feature_info_2, 7)), "mp_feature_info_2[7]={}")
-        self.add_field('mp_feature_info_3', u.unpack_one("B"))
-        self.add_field('mp_feature_info_4', u.unpack_one("B"))
-        self.add_field('mp_feature_info_5', u.unpack_one("B"))
+        self._layout.unpack(u, self)
         if not u.at_end():
             self.add_field('data', u.unpack_rest())
 
 class Header(unpack.Struct):
+    _layout = unpack.Layout([
+        ('signature', "4s"),
+        ('base_table_length', "<H"),
+        ('spec_revision', "B"),
+        ('checksum', "B"),
+        ('oem_id', "8s"),
+        ('product_id', "12s"),
+        ('oem_table_pointer', "<I"),
+        ('oem_table_size', "<H"),
+        ('entry_count', "<H"),
+        ('local_apic_address', "<I"),
+        ('extended_table_length', "<H"),
+        ('extended_table_checksum', "B"),
+        (None, "x"),    # reserved byte
+    ])
+
     def __init__(self, u):
         super(Header, self).__init__()
         self.raw_data = u.unpack_peek_rest()
-        self.add_field('signature', u.unpack_one("4s"))
-        self.add_field('base_table_length', u.unpack_one("<H"))
-        self.add_field('spec_revision', u.unpack_one("B"))
-        self.add_field('checksum', u.unpack_one("B"))
-        self.add_field('oem_id', u.unpack_one("8s"))
-        self.add_field('product_id', u.unpack_one("12s"))
-        self.add_field('oem_table_pointer', u.unpack_one("<I"))
-        self.add_field('oem_table_size', u.unpack_one("<H"))
-        self.add_field('entry_count', u.unpack_one("<H"))
-        self.add_field('local_apic_address', u.unpack_one("<I"))
-        self.add_field('extended_table_length', u.unpack_one("<H"))
-        self.add_field('extended_table_checksum', u.unpack_one("B"))
-        u.skip(1)   # reserved byte
+        self._layout.unpack(u, self)
         if not u.at_end():
             self.add_field('data', u.unpack_rest())
 
@@ -163,41 +162,47 @@ class MpBaseStructure(unpack.Struct):
 
 class Processor(MpBaseStructure):
     mp_structure_type = 0
+    _layout = unpack.Layout([
+        ('local_apic_id', "B"),
+        ('local_apic_version', "B"),
+        ('cpu_flags', "B"),
+        ('enable', unpack.field_bit('cpu_flags', 0), "cpu_flags[0]={}"),
+        ('bsp', unpack.field_bit('cpu_flags', 1), "cpu_flags[1]={}"),
+        ('cpu_signature', "<I"),
+        ('feature_flags', "<I"),
+        ('reserved', "<Q"),
+    ])
 
     def __init__(self, u):
         super(Processor, self).__init__(u)
-        u = self.u
-        self.add_field('local_apic_id', u.unpack_one("B"))
-        self.add_field('local_apic_version', u.unpack_one("B"))
-        self.add_field('cpu_flags', u.unpack_one("B"))
-        self.add_field('enable', bool(bitfields.getbits(self.cpu_flags, 0)), "cpu_flags[0]={}")
-        self.add_field('bsp', bool(bitfields.getbits(self.cpu_flags, 1)), "cpu_flags[1]={}")
-        self.add_field('cpu_signature', u.unpack_one("<I"))
-        self.add_field('feature_flags', u.unpack_one("<I"))
-        self.add_field('reserved', u.unpack_one("<Q"))
+        self._layout.unpack(self.u, self)
         self.fini()
 
 class Bus(MpBaseStructure):
     mp_structure_type = 1
+    _layout = unpack.Layout([
+        ('bus_id', "B"),
+        ('bus_type', "6s"),
+    ])
 
     def __init__(self, u):
         super(Bus, self).__init__(u)
-        u = self.u
-        self.add_field('bus_id', u.unpack_one("B"))
-        self.add_field('bus_type', u.unpack_one("6s"))
+        self._layout.unpack(self.u, self)
         self.fini()
 
 class IOApic(MpBaseStructure):
     mp_structure_type = 2
+    _layout = unpack.Layout([
+        ('io_apic_id', "B"),
+        ('io_apic_version', "B"),
+        ('io_apic_flags', "B"),
+        ('enable', unpack.field_bit('io_apic_flags', 0), "io_apic_flags[0]={}"),
+        ('io_apic_address', "<I"),
+    ])
 
     def __init__(self, u):
         super(IOApic, self).__init__(u)
-        u = self.u
-        self.add_field('io_apic_id', u.unpack_one("B"))
-        self.add_field('io_apic_version', u.unpack_one("B"))
-        self.add_field('io_apic_flags', u.unpack_one("B"))
-        self.add_field('enable', bool(bitfields.getbits(self.io_apic_flags, 0)), "io_apic_flags[0]={}")
-        self.add_field('io_apic_address', u.unpack_one("<I"))
+        self._layout.unpack(self.u, self)
         self.fini()
 
 _int_types = {
@@ -223,36 +228,40 @@ _trigger_modes = {
 
 class IOInterrupt(MpBaseStructure):
     mp_structure_type = 3
+    _layout = unpack.Layout([
+        ('interrupt_type', "B", unpack.format_table("{}", _int_types)),
+        ('io_interrupt_flags', "B"),
+        ('polarity', unpack.field_bits('io_interrupt_flags', 1, 0), unpack.format_table("io_interrupt_flags[1:0]={}", _polarity)),
+        ('trigger', unpack.field_bits('io_interrupt_flags', 3, 2), unpack.format_table("io_interrupt_flags[3:2]={}", _trigger_modes)),
+        (None, "x"),
+        ('source_bus_id', "B"),
+        ('source_bus_irq', "B"),
+        ('destination_io_apic_id', "B"),
+        ('destination_io_apic_int_pin', "B"),
+    ])
 
     def __init__(self, u):
         super(IOInterrupt, self).__init__(u)
-        u = self.u
-        self.add_field('interrupt_type', u.unpack_one("B"), unpack.format_table("{}", _int_types))
-        self.add_field('io_interrupt_flags', u.unpack_one("B"))
-        self.add_field('polarity', bitfields.getbits(self.io_interrupt_flags, 1, 0), unpack.format_table("io_interrupt_flags[1:0]={}", _polarity))
-        self.add_field('trigger', bitfields.getbits(self.io_interrupt_flags, 3, 2), unpack.format_table("io_interrupt_flags[3:2]={}", _trigger_modes))
-        u.skip(1)
-        self.add_field('source_bus_id', u.unpack_one("B"))
-        self.add_field('source_bus_irq', u.unpack_one("B"))
-        self.add_field('destination_io_apic_id', u.unpack_one("B"))
-        self.add_field('destination_io_apic_int_pin', u.unpack_one("B"))
+        self._layout.unpack(self.u, self)
         self.fini()
 
 class LocalInterrupt(MpBaseStructure):
     mp_structure_type = 4
+    _layout = unpack.Layout([
+        ('interrupt_type', "B", unpack.format_table("{}", _int_types)),
+        ('local_interrupt_flags', "B"),
+        ('polarity', unpack.field_bits('local_interrupt_flags', 1, 0), unpack.format_table("local_interrupt_flags[1:0]={}", _polarity)),
+        ('trigger', unpack.field_bits('local_interrupt_flags', 3, 2), unpack.format_table("local_interrupt_flags[3:2]={}", _trigger_modes)),
+        (None, "x"),
+        ('source_bus_id', "B"),
+        ('source_bus_irq', "B"),
+        ('destination_local_apic_id', "B"),
+        ('destination_local_apic_lint_pin', "B"),
+    ])
 
     def __init__(self, u):
         super(LocalInterrupt, self).__init__(u)
-        u = self.u
-        self.add_field('interrupt_type', u.unpack_one("B"), unpack.format_table("{}", _int_types))
-        self.add_field('local_interrupt_flags', u.unpack_one("B"))
-        self.add_field('polarity', bitfields.getbits(self.local_interrupt_flags, 1, 0), unpack.format_table("local_interrupt_flags[1:0]={}", _polarity))
-        self.add_field('trigger', bitfields.getbits(self.local_interrupt_flags, 3, 2), unpack.format_table("local_interrupt_flags[3:2]={}", _trigger_modes))
-        u.skip(1)
-        self.add_field('source_bus_id', u.unpack_one("B"))
-        self.add_field('source_bus_irq', u.unpack_one("B"))
-        self.add_field('destination_local_apic_id', u.unpack_one("B"))
-        self.add_field('destination_local_apic_lint_pin', u.unpack_one("B"))
+        self._layout.unpack(self.u, self)
         self.fini()
 
 class MpBaseStructureUnknown(MpBaseStructure):
@@ -271,6 +280,8 @@ _base_structures = [
     MpBaseStructureUnknown, # Must always come last
 ]
 
+_base_registry = unpack.StructRegistry(_base_structures, 'mp_structure_type')
+
 class MpExtendedStructure(unpack.Struct):
     def __new__(cls, u):
         t = u.unpack_peek_one("B")
@@ -294,44 +305,50 @@ class MpExtendedStructure(unpack.Struct):
 
 class SystemAddressSpaceMapping(MpExtendedStructure):
     mp_structure_type = 128
+    _address_types = {
+        0: "I/O address",
+        1: " Memory address",
+        2: "Prefetch address",
+    }
+    _layout = unpack.Layout([
+        ('bus_id', "B"),
+        ('address_type', "B", unpack.format_table("{}", _address_types)),
+        ('address_base', "<Q"),
+        ('address_length', "<Q"),
+    ])
 
     def __init__(self, u):
         super(SystemAddressSpaceMapping, self).__init__(u)
-        u = self.u
-        _address_types = {
-            0: "I/O address",
-            1: " Memory address",
-            2: "Prefetch address",
-        }
-        self.add_field('bus_id', u.unpack_one("B"))
-        self.add_field('address_type', u.unpack_one("B"), unpack.format_table("{}", _address_types))
-        self.add_field('address_base', u.unpack_one("<Q"))
-        self.add_field('address_length', u.unpack_one("<Q"))
+        self._layout.unpack(self.u, self)
         self.fini()
 
 class BusHierachyDescriptor(MpExtendedStructure):
     mp_structure_type = 129
+    _layout = unpack.Layout([
+        ('bus_id', "B"),
+        ('bus_info', "B"),
+        ('subtractive_decode', unpack.field_bit('bus_info', 0), "bus_info[0]={}"),
+        ('parent_bus', "B"),
+        (None, "3x"),
+    ])
 
     def __init__(self, u):
         super(BusHierachyDescriptor, self).__init__(u)
-        u = self.u
-        self.add_field('bus_id', u.unpack_one("B"))
-        self.add_field('bus_info', u.unpack_one("B"))
-        self.add_field('subtractive_decode', bool(bitfields.getbits(self.bus_info, 0)), "bus_info[0]={}")
-        self.add_field('parent_bus', u.unpack_one("B"))
-        u.skip(3)
+        self._layout.unpack(self.u, self)
         self.fini()
 
 class CompatibilityBusAddressSpaceModifier(MpExtendedStructure):
     mp_structure_type = 130
+    _layout = unpack.Layout([
+        ('bus_id', "B"),
+        ('address_modifier', "B"),
+        ('predefined_list_subtracted', unpack.field_bit('address_modifier', 0), "address_modifier[0]={}"),
+        ('predefined_range_list', "<I"),
+    ])
 
     def __init__(self, u):
         super(CompatibilityBusAddressSpaceModifier, self).__init__(u)
-        u = self.u
-        self.add_field('bus_id', u.unpack_one("B"))
-        self.add_field('address_modifier', u.unpack_one("B"))
-        self.add_field('predefined_list_subtracted', bool(bitfields.getbits(self.address_modifier, 0)), "address_modifier[0]={}")
-        self.add_field('predefined_range_list', u.unpack_one("<I"))
+        self._layout.unpack(self.u, self)
         self.fini()
 
 class MpExtendedStructureUnknown(MpExtendedStructure):
@@ -348,6 +365,8 @@ _extended_structures = [
     MpExtendedStructureUnknown, # Must always come last
 ]
 
+_extended_registry = unpack.StructRegistry(_extended_structures, 'mp_structure_type')
+
 def dump_raw():
     try:
         mp = MPTable()
@@ -24,36 +24,117 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-"""SMBIOS/DMI module."""
+"""SMBIOS/DMI module.
+
+Decoding SMBIOS from a file or str via SMBIOS.from_file or SMBIOS.from_data
+doesn't require BITS, so this module only imports the BITS runtime modules
+(bits, redirect, ttypager) in the functions that access live firmware or
+the console."""
 
-import bits
 import bitfields
-import ctypes
-import redirect
+from collections import namedtuple
+import re
 import struct
 import uuid
 import unpack
-import ttypager
 import sys
 
+StructureIndexEntry = namedtuple("StructureIndexEntry", ("offset", "type", "length", "handle", "strings_offset", "strings_length"))
+
+_string_set_terminator = re.compile("\0\0")
+
+def string_set_end(data, offset, end=None):
+    """Return the offset just past the string set starting at offset in the structure table data.
+
+    data may be a str or a buffer; finds the terminating double-NUL in a
+    single search without copying data.  A string set starting with a NUL
+    has no strings, and always occupies two bytes."""
+    if end is None:
+        end = len(data)
+    if data[offset:offset+1] == "\0":
+        strings_end = offset + 2
+    else:
+        m = _string_set_terminator.search(data, offset, end)
+        strings_end = m.end() if m else end + 1
+    if strings_end > end:
+        raise unpack.UnpackError("SMBIOS string set at offset {:#x} not terminated by end of table".format(offset))
+    return strings_end
+
+def split_string_set(raw_strings):
+    """Split a raw string set, including its terminating double-NUL, into a list of strings"""
+    if raw_strings[:1] == "\0":
+        return []
+    return raw_strings[:-2].split("\0")
+
+def index_structures(data, stop_at_end_of_table=False):
+    """Locate each structure in the SMBIOS structure table data without decoding it.
+
+    Returns a tuple of StructureIndexEntry, one per structure, giving the
+    offsets of the structure's formatted area and string set within data.
+    If stop_at_end_of_table is True, stops after the End-of-Table (type 127)
+    structure, for tables whose length only gives an upper bound."""
+    index = []
+    offset = 0
+    end = len(data)
+    while offset < end:
+        if offset + 4 > end:
+            raise unpack.UnpackError("SMBIOS structure at offset {:#x} truncated by end of table".format(offset))
+        structure_type, length, handle = struct.unpack_from("<BBH", data, offset)
+        strings_offset = offset + length
+        strings_end = string_set_end(data, strings_offset, end)
+        index.append(StructureIndexEntry(offset, structure_type, length, handle, strings_offset, strings_end - strings_offset))
+        offset = strings_end
+        if stop_at_end_of_table and structure_type == EndOfTable.smbios_structure_type:
+            break
+    return tuple(index)
+
+class LazyStructures(object):
+    """Sequence of the structures in an SMBIOS table, decoding each one the first time it gets accessed"""
+    def __init__(self, sm):
+        self._sm = sm
+        self._structures = [None] * len(sm.index)
+
+    def __len__(self):
+        return len(self._structures)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return tuple(self[j] for j in xrange(*i.indices(len(self))))
+        s = self._structures[i]
+        if s is None:
+            u = unpack.Unpackable(self._sm._structure_memory, self._sm.index[i].offset, views=True)
+            s = self._structures[i] = _smbios_registry.lookup(u)(u, self._sm)
+        return s
+
+    def __iter__(self):
+        return (self[i] for i in xrange(len(self)))
+
 class SMBIOS(unpack.Struct):
-    def __new__(cls):
+    """SMBIOS entry point and structure table.
+
+    By default, decodes every structure up front.  With lazy=True, only
+    scans the structure table to build index, and decodes each structure
+    the first time it gets accessed via structures.
+
+    type_index maps each structure type to the list of positions in
+    structures of the structures of that type, and handle_index maps each
+    handle to the position of its structure; use structures_of_type and
+    resolve_handle to look structures up through them.
+
+    SMBIOS() finds and decodes the SMBIOS tables of the running system, and
+    returns None if it has none.  Use from_data or from_file to decode a
+    captured copy instead."""
+    def __new__(cls, lazy=False):
+        import bits
         if sys.platform == "BITS-EFI":
             import efi
             sm_ptr = efi.system_table.ConfigurationTableDict.get(efi.SMBIOS_TABLE_GUID)
         else:
-            address = 0xF0000
-            mem = bits.memory(0xF0000, 0x10000)
-            for offset in range(0, len(mem), 16):
-                signature = (ctypes.c_char * 4).from_address(address + offset).value
-                if signature == "_SM_":
-                    entry_point_length = ctypes.c_ubyte.from_address(address + offset + 5).value
-                    csum = sum(map(ord, mem[offset:offset + entry_point_length])) & 0xff
-                    if csum == 0:
-                        sm_ptr = address + offset
-                        break
-            else:
+            import bits.anchors
+            addresses = bits.anchors.find("_SM_", [(0xF0000, 0x10000)])
+            if not addresses:
                 return None
+            sm_ptr = addresses[0]
 
         if not sm_ptr:
             return None
@@ -62,57 +143,201 @@ class SMBIOS(unpack.Struct):
         sm._header_memory = bits.memory(sm_ptr, 0x1f)
         return sm
 
-    def __init__(self):
+    def __init__(self, lazy=False):
+        import bits
         super(SMBIOS, self).__init__()
-        u = unpack.Unpackable(self._header_memory)
+        u = unpack.Unpackable(self._header_memory, views=True)
         self.add_field('header', Header(u))
         self._structure_memory = bits.memory(self.header.structure_table_address, self.header.structure_table_length)
-        u = unpack.Unpackable(self._structure_memory)
-        self.add_field('structures', unpack.unpack_all(u, _smbios_structures, self), unpack.format_each("\n\n{!r}"))
+        self._decode_structures(lazy)
+
+    @classmethod
+    def from_data(cls, data, lazy=False, table_offset=None):
+        """Decode SMBIOS from data containing an entry point followed by the structure table.
+
+        data may be a str, buffer, or mmap, such as the output of
+        "dmidecode --dump-bin".  It must start with an SMBIOS 2.x ("_SM_") or
+        3.x ("_SM3_") entry point.  table_offset gives the offset of the
+        structure table within data; by default, uses the table address from
+        the entry point if the table lies within data there (as dmidecode
+        writes it), and otherwise assumes the table immediately follows the
+        entry point.  Does not access memory via bits."""
+        if data[:5] == "_SM3_":
+            header_class = Header3
+        elif data[:4] == "_SM_":
+            header_class = Header
+        else:
+            raise unpack.UnpackError("SMBIOS data does not start with an SMBIOS entry point")
+        sm = super(SMBIOS, cls).__new__(cls)
+        super(SMBIOS, sm).__init__()
+        sm._header_memory = buffer(data, 0, header_class._layout.size)
+        u = unpack.Unpackable(sm._header_memory, views=True)
+        sm.add_field('header', header_class(u))
+        if header_class is Header3:
+            length = sm.header.structure_table_max_size
+        else:
+            length = sm.header.structure_table_length
+        if table_offset is None:
+            table_offset = sm.header.structure_table_address
+            if header_class is Header3:
+                # structure_table_max_size only bounds the table, so just the start has to lie within data
+                out_of_range = table_offset >= len(data)
+            else:
+                out_of_range = table_offset + length > len(data)
+            if out_of_range:
+                table_offset = sm.header.length
+        if header_class is Header3:
+            length = min(length, len(data) - table_offset)
+            last = index_structures(buffer(data, table_offset, length), stop_at_end_of_table=True)[-1]
+            length = last.strings_offset + last.strings_length
+        elif table_offset + length > len(data):
+            raise unpack.UnpackError("SMBIOS structure table at offset {:#x} with length {:#x} exceeds data length {:#x}".format(table_offset, length, len(data)))
+        sm._structure_memory = buffer(data, table_offset, length)
+        sm._decode_structures(lazy)
+        return sm
+
+    @classmethod
+    def from_file(cls, filename, lazy=False, table_offset=None):
+        """Decode SMBIOS from a file, such as one written by "dmidecode --dump-bin".
+
+        Memory-maps the file rather than reading it; see from_data for the
+        expected contents."""
+        import mmap
+        with open(filename, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls.from_data(data, lazy, table_offset)
+
+    def _decode_structures(self, lazy):
+        if lazy:
+            self.index = index_structures(self._structure_memory)
+            self.add_field('structures', LazyStructures(self), unpack.format_each("\n\n{!r}"))
+        else:
+            u = unpack.Unpackable(self._structure_memory, views=True)
+            self.add_field('structures', unpack.unpack_all(u, _smbios_registry, self), unpack.format_each("\n\n{!r}"))
+            self.index = tuple(StructureIndexEntry(s.start_offset, s.type, s.length, s.handle, s.strings_offset, s.strings_length) for s in self.structures)
+        self._build_indexes()
+
+    def _build_indexes(self):
+        self.type_index = {}
+        self.handle_index = {}
+        for i, entry in enumerate(self.index):
+            self.type_index.setdefault(entry.type, []).append(i)
+            self.handle_index.setdefault(entry.handle, i)
+
+    def structures_of_type(self, num):
+        """Return a tuple of all the structures of the given type"""
+        return tuple(self.structures[i] for i in self.type_index.get(num, ()))
+
+    def resolve_handle(self, handle):
+        """Return the structure with the given handle.
+
+        Returns None for the handles 0xFFFE and 0xFFFF, which structures use
+        to indicate no referenced structure, or for a handle not present in
+        the table."""
+        if handle is None or handle >= 0xFFFE:
+            return None
+        i = self.handle_index.get(handle)
+        if i is None:
+            return None
+        return self.structures[i]
+
+    def referenced(self, structure, field):
+        """Return the structure referenced by the handle in the named field of structure, or None"""
+        return self.resolve_handle(getattr(structure, field, None))
+
+    def referencing(self, structure, num, field):
+        """Return a tuple of the structures of the given type whose named field references structure"""
+        return tuple(s for s in self.structures_of_type(num) if getattr(s, field, None) == structure.handle)
+
+    def physical_memory_array(self, memory_device):
+        """Return the Physical Memory Array containing a Memory Device"""
+        return self.referenced(memory_device, 'physical_memory_array_handle')
+
+    def memory_devices(self, physical_memory_array):
+        """Return the Memory Devices in a Physical Memory Array"""
+        return self.referencing(physical_memory_array, MemoryDevice.smbios_structure_type, 'physical_memory_array_handle')
+
+    def memory_device(self, mapped_address):
+        """Return the Memory Device mapped by a Memory Device Mapped Address structure"""
+        return self.referenced(mapped_address, 'memory_device_handle')
+
+    def memory_array_mapped_address(self, mapped_address):
+        """Return the Memory Array Mapped Address containing a Memory Device Mapped Address structure"""
+        return self.referenced(mapped_address, 'memory_array_mapped_address_handle')
 
     def structure_type(self, num):
         '''Dumps structure of given Type if present'''
-        try:
-            types_present = [self.structures[x].smbios_structure_type for x in range(len(self.structures))]
-            matrix = dict()
-            for index in range(len(types_present)):
-                if types_present.count(types_present[index]) == 1:
-                    matrix[types_present[index]] = self.structures[index]
-                else: # if multiple structures of the same type, return a list of structures for the type number
-                    if matrix.has_key(types_present[index]):
-                        matrix[types_present[index]].append(self.structures[index])
-                    else:
-                        matrix[types_present[index]] = [self.structures[index]]
-            return matrix[num]
-        except:
+        structures = self.structures_of_type(num)
+        if not structures:
             print "Failure: Type {} - not found".format(num)
+            return None
+        if len(structures) == 1:
+            return structures[0]
+        # if multiple structures of the same type, return a list of structures for the type number
+        return list(structures)
+
+class Header(unpack.CompactStruct):
+    __slots__ = ('raw_data',)
+    _layout = unpack.Layout([
+        ('anchor_string', "4s"),
+        ('checksum', "B"),
+        ('length', "B"),
+        ('major_version', "B"),
+        ('minor_version', "B"),
+        ('max_structure_size', "<H"),
+        ('entry_point_revision', "B"),
+        ('formatted_area', "5s"),
+        ('intermediate_anchor_string', "5s"),
+        ('intermediate_checksum', "B"),
+        ('structure_table_length', "<H"),
+        ('structure_table_address', "<I"),
+        ('number_structures', "<H"),
+        ('bcd_revision', "B"),
+    ])
 
-class Header(unpack.Struct):
     def __new__(cls, u):
         return super(Header, cls).__new__(cls)
 
     def __init__(self, u):
         super(Header, self).__init__()
         self.raw_data = u.unpack_rest()
-        u = unpack.Unpackable(self.raw_data)
-        self.add_field('anchor_string', u.unpack_one("4s"))
-        self.add_field('checksum', u.unpack_one("B"))
-        self.add_field('length', u.unpack_one("B"))
-        self.add_field('major_version', u.unpack_one("B"))
-        self.add_field('minor_version', u.unpack_one("B"))
-        self.add_field('max_structure_size', u.unpack_one("<H"))
-        self.add_field('entry_point_revision', u.unpack_one("B"))
-        self.add_field('formatted_area', u.unpack_one("5s"))
-        self.add_field('intermediate_anchor_string', u.unpack_one("5s"))
-        self.add_field('intermediate_checksum', u.unpack_one("B"))
-        self.add_field('structure_table_length', u.unpack_one("<H"))
-        self.add_field('structure_table_address', u.unpack_one("<I"))
-        self.add_field('number_structures', u.unpack_one("<H"))
-        self.add_field('bcd_revision', u.unpack_one("B"))
+        u = unpack.Unpackable(self.raw_data, views=u.views)
+        self._layout.unpack(u, self)
+        if not u.at_end():
+            self.add_field('data', u.unpack_rest())
+
+class Header3(unpack.CompactStruct):
+    """SMBIOS 3.x (64-bit) entry point"""
+    __slots__ = ('raw_data',)
+    _layout = unpack.Layout([
+        ('anchor_string', "5s"),
+        ('checksum', "B"),
+        ('length', "B"),
+        ('major_version', "B"),
+        ('minor_version', "B"),
+        ('docrev', "B"),
+        ('entry_point_revision', "B"),
+        (None, "x"),
+        ('structure_table_max_size', "<I"),
+        ('structure_table_address', "<Q"),
+    ])
+
+    def __init__(self, u):
+        super(Header3, self).__init__()
+        self.raw_data = u.unpack_rest()
+        u = unpack.Unpackable(self.raw_data, views=u.views)
+        self._layout.unpack(u, self)
         if not u.at_end():
             self.add_field('data', u.unpack_rest())
 
-class SmbiosBaseStructure(unpack.Struct):
+class SmbiosBaseStructure(unpack.CompactStruct):
+    __slots__ = ('start_offset', 'raw_data', 'u', 'strings_offset', 'strings_length', 'raw_strings', 'strings', 'decode_failure', 'decodeFailure')
+    _header_layout = unpack.Layout([
+        ('type', "B"),
+        ('length', "B"),
+        ('handle', "<H"),
+    ])
+
     def __new__(cls, u, sm):
         t = u.unpack_peek_one("B")
         if cls.smbios_structure_type is not None and t != cls.smbios_structure_type:
@@ -124,24 +349,16 @@ class SmbiosBaseStructure(unpack.Struct):
         self.start_offset = u.offset
         length = u.unpack_peek_one("<xB")
         self.raw_data = u.unpack_raw(length)
-        self.u = unpack.Unpackable(self.raw_data)
+        self.u = unpack.Unpackable(self.raw_data, views=u.views)
 
         self.strings_offset = u.offset
-        def unpack_string():
-            return "".join(iter(lambda: u.unpack_one("c"), "\x00"))
-        strings = list(iter(unpack_string, ""))
-        if not strings:
-            u.skip(1)
-
-        self.strings_length = u.offset - self.strings_offset
-        self.raw_strings = str(bits.memory(sm.header.structure_table_address + self.strings_offset, self.strings_length))
-
-        if len(strings):
+        self.strings_length = string_set_end(u.data, u.offset, u.size) - self.strings_offset
+        self.raw_strings = str(u.unpack_raw(self.strings_length))
+        strings = split_string_set(self.raw_strings)
+        if strings:
             self.strings = strings
 
-        self.add_field('type', self.u.unpack_one("B"))
-        self.add_field('length', self.u.unpack_one("B"))
-        self.add_field('handle', self.u.unpack_one("<H"))
+        self._header_layout.unpack(self.u, self)
 
     def fini(self):
         if not self.u.at_end():
@@ -164,17 +381,27 @@ class SmbiosBaseStructure(unpack.Struct):
 
 class BIOSInformation(SmbiosBaseStructure):
     smbios_structure_type = 0
+    __slots__ = ()
+    _layout = unpack.Layout([
+        ('vendor', "B", unpack.format_method("fmtstr")),
+        ('version', "B", unpack.format_method("fmtstr")),
+        ('starting_address_segment', "<H"),
+        ('release_date', "B", unpack.format_method("fmtstr")),
+        ('rom_size', "B"),
+        ('characteristics', "<Q"),
+    ])
+    _release_layout = unpack.Layout([
+        ('major_release', "B"),
+        ('minor_release', "B"),
+        ('ec_major_release', "B"),
+        ('ec_minor_release', "B"),
+    ])
 
     def __init__(self, u, sm):
         super(BIOSInformation, self).__init__(u, sm)
         u = self.u
         try:
-            self.add_field('vendor', u.unpack_one("B"), self.fmtstr)
-            self.add_field('version', u.unpack_one("B"), self.fmtstr)
-            self.add_field('starting_address_segment', u.unpack_one("<H"))
-            self.add_field('release_date', u.unpack_one("B"), self.fmtstr)
-            self.add_field('rom_size', u.unpack_one("B"))
-            self.add_field('characteristics', u.unpack_one("<Q"))
+            self._layout.unpack(u, self)
             minor_version_str = str(sm.header.minor_version) # 34 is .34, 4 is .4, 41 is .41; compare ASCIIbetically to compare initial digits rather than numeric value
             if (sm.header.major_version, minor_version_str) >= (2,"4"):
                 characteristic_bytes = 2
@@ -182,10 +409,7 @@ class BIOSInformation(SmbiosBaseStructure):
                 characteristic_bytes = self.length - 0x12
             self.add_field('characteristics_extensions', [u.unpack_one("B") for b in range(characteristic_bytes)])
             if (sm.header.major_version, minor_version_str) >= (2,"4"):
-                self.add_field('major_release', u.unpack_one("B"))
-                self.add_field('minor_release', u.unpack_one("B"))
-                self.add_field('ec_major_release', u.unpack_one("B"))
-                self.add_field('ec_minor_release', u.unpack_one("B"))
+                self._release_layout.unpack(u, self)
         except:
             self.decode_failure = True
             print "Error parsing BIOSInformation"
@@ -195,32 +419,34 @@ class BIOSInformation(SmbiosBaseStructure):
 
 class SystemInformation(SmbiosBaseStructure):
     smbios_structure_type = 1
+    __slots__ = ()
+    _wakeup_types = {
+        0: 'Reserved',
+        1: 'Other',
+        2: 'Unknown',
+        3: 'APM Timer',
+        4: 'Modem Ring',
+        5: 'LAN Remote',
+        6: 'Power Switch',
+        7: 'PCI PME#',
+        8: 'AC Power Restored'
+    }
+    _layout = unpack.Layout([
+        ('manufacturer', "B", unpack.format_method("fmtstr")),
+        ('product_name', "B", unpack.format_method("fmtstr")),
+        ('version', "B", unpack.format_method("fmtstr")),
+        ('serial_number', "B", unpack.format_method("fmtstr")),
+        ('uuid', unpack.converted("16s", lambda b: uuid.UUID(bytes_le=b))),
+        ('wakeup_type', "B", unpack.format_table("{}", _wakeup_types)),
+        ('sku_number', "B", unpack.format_method("fmtstr")),
+        ('family', "B", unpack.format_method("fmtstr")),
+    ], required=4)
 
     def __init__(self, u, sm):
         super(SystemInformation, self).__init__(u, sm)
         u = self.u
         try:
-            self.add_field('manufacturer', u.unpack_one("B"), self.fmtstr)
-            self.add_field('product_name', u.unpack_one("B"), self.fmtstr)
-            self.add_field('version', u.unpack_one("B"), self.fmtstr)
-            self.add_field('serial_number', u.unpack_one("B"), self.fmtstr)
-            if self.length > 0x8:
-                self.add_field('uuid', uuid.UUID(bytes_le=u.unpack_one("16s")))
-                wakeup_types = {
-                    0: 'Reserved',
-                    1: 'Other',
-                    2: 'Unknown',
-                    3: 'APM Timer',
-                    4: 'Modem Ring',
-                    5: 'LAN Remote',
-                    6: 'Power Switch',
-                    7: 'PCI PME#',
-                    8: 'AC Power Restored'
-                }
-                self.add_field('wakeup_type', u.unpack_one("B"), unpack.format_table("{}", wakeup_types))
-            if self.length > 0x19:
-                self.add_field('sku_number', u.unpack_one("B"), self.fmtstr)
-                self.add_field('family', u.unpack_one("B"), self.fmtstr)
+            self._layout.unpack(u, self)
         except:
             self.decode_failure = True
             print "Error parsing SystemInformation"
@@ -246,40 +472,32 @@ _board_types = {
 
 class BaseboardInformation(SmbiosBaseStructure):
     smbios_structure_type = 2
+    __slots__ = ()
+    _layout = unpack.Layout([
+        ('manufacturer', "B", unpack.format_method("fmtstr")),
+        ('product', "B", unpack.format_method("fmtstr")),
+        ('version', "B", unpack.format_method("fmtstr")),
+        ('serial_number', "B", unpack.format_method("fmtstr")),
+        ('asset_tag', "B", unpack.format_method("fmtstr")),
+        ('feature_flags', "B"),
+        ('hosting_board', unpack.field_bit('feature_flags', 0), "feature_flags[0]={}"),
+        ('requires_daughter_card', unpack.field_bit('feature_flags', 1), "feature_flags[1]={}"),
+        ('removable', unpack.field_bit('feature_flags', 2), "feature_flags[2]={}"),
+        ('replaceable', unpack.field_bit('feature_flags', 3), "feature_flags[3]={}"),
+        ('hot_swappable', unpack.field_bit('feature_flags', 4), "feature_flags[4]={}"),
+        ('location', "B", unpack.format_method("fmtstr")),
+        ('chassis_handle', "<H"),
+        ('board_type', "B", unpack.format_table("{}", _board_types)),
+        ('handle_count', "B"),
+    ], required=4)
 
     def __init__(self, u, sm):
         super(BaseboardInformation, self).__init__(u, sm)
         u = self.u
         try:
-            self.add_field('manufacturer', u.unpack_one("B"), self.fmtstr)
-            self.add_field('product', u.unpack_one("B"), self.fmtstr)
-            self.add_field('version', u.unpack_one("B"), self.fmtstr)
-            self.add_field('serial_number', u.unpack_one("B"), self.fmtstr)
-
-            if self.length > 0x8:
-                self.add_field('asset_tag', u.unpack_one("B"), self.fmtstr)
-
-            if self.length > 0x9:
-                self.add_field('feature_flags', u.unpack_one("B"))
-                self.add_field('hosting_board', bool(bitfields.getbits(self.feature_flags, 0)), "feature_flags[0]={}")
-                self.add_field('requires_daughter_card', bool(bitfields.getbits(self.feature_flags, 1)), "feature_flags[1]={}")
-                self.add_field('removable', bool(bitfields.getbits(self.feature_flags, 2)), "feature_flags[2]={}")
-                self.add_field('replaceable', bool(bitfields.getbits(self.feature_flags, 3)), "feature_flags[3]={}")
-                self.add_field('hot_swappable', bool(bitfields.getbits(self.feature_flags, 4)), "feature_flags[4]={}")
-
-            if self.length > 0xA:
-                self.add_field('location', u.unpack_one("B"), self.fmtstr)
-
-            if self.length > 0xB:
-                self.add_field('chassis_handle', u.unpack_one("<H"))
-
-            if self.length > 0xD:
-                self.add_field('board_type', u.unpack_one("B"), unpack.format_table("{}", _board_types))
-
-            if self.length > 0xE:
-                self.add_field('handle_count', u.unpack_one("B"))
-                if self.handle_count > 0:
-                    self.add_field('contained_object_handles', tuple(u.unpack_one("<H") for i in range(self.handle_count)))
+            self._layout.unpack(u, self)
+            if getattr(self, 'handle_count', 0):
+                self.add_field('contained_object_handles', tuple(u.unpack_one("<H") for i in range(self.handle_count)))
         except:
             self.decode_failure = True
             print "Error parsing BaseboardInformation"
@@ -289,77 +507,77 @@ class BaseboardInformation(SmbiosBaseStructure):
 
 class SystemEnclosure(SmbiosBaseStructure):
     smbios_structure_type = 3
+    __slots__ = ()
+    _enclosure_types = {
+        0x01: 'Other',
+        0x02: 'Unknown',
+        0x03: 'Desktop',
+        0x04: 'Low Profile Desktop',
+        0x05: 'Pizza Box',
+        0x06: 'Mini Tower',
+        0x07: 'Tower',
+        0x08: 'Portable',
+        0x09: 'Laptop',
+        0x0A: 'Notebook',
+        0x0B: 'Hand Held',
+        0x0C: 'Docking Station',
+        0x0D: 'All in One',
+        0x0E: 'Sub Notebook',
+        0x0F: 'Space-saving',
+        0x10: 'Lunch Box',
+        0x11: 'Main Server Chassis',
+        0x12: 'Expansion Chassis',
+        0x13: 'SubChassis',
+        0x14: 'Bus Expansion Chassis',
+        0x15: 'Peripheral Chassis',
+        0x16: 'RAID Chassis',
+        0x17: 'Rack Mount Chassis',
+        0x18: 'Sealed-case PC',
+        0x19: 'Multi-system chassis W',
+        0x1A: 'Compact PCI',
+        0x1B: 'Advanced TCA',
+        0x1C: 'Blade',
+        0x1D: 'Blade Enclosure',
+    }
+    _chassis_states = {
+        0x01: 'Other',
+        0x02: 'Unknown',
+        0x03: 'Safe',
+        0x04: 'Warning',
+        0x05: 'Critical',
+        0x06: 'Non-recoverable',
+    }
+    _security_states = {
+        0x01: 'Other',
+        0x02: 'Unknown',
+        0x03: 'None',
+        0x04: 'External interface locked out',
+        0x05: 'External interface enabled',
+    }
+    _layout = unpack.Layout([
+        ('manufacturer', "B", unpack.format_method("fmtstr")),
+        ('enumerated_type', "B"),
+        ('chassis_lock_present', unpack.field_bit('enumerated_type', 7), "enumerated_type[7]={}"),
+        ('system_enclosure_type', unpack.field_bits('enumerated_type', 6, 0), unpack.format_table("enumerated_type[6:0]={}", _enclosure_types)),
+        ('version', "B", unpack.format_method("fmtstr")),
+        ('serial_number', "B", unpack.format_method("fmtstr")),
+        ('asset_tag', "B", unpack.format_method("fmtstr")),
+        ('bootup_state', "B", unpack.format_table("{}", _chassis_states)),
+        ('power_supply_state', "B", unpack.format_table("{}", _chassis_states)),
+        ('thermal_state', "B", unpack.format_table("{}", _chassis_states)),
+        ('security_status', "B", unpack.format_table("{}", _security_states)),
+        ('oem_defined', "<I"),
+        ('height', "B"),
+        ('num_power_cords', "B"),
+        ('contained_element_count', "B"),
+        ('contained_element_length', "B"),
+    ], required=7)
 
     def __init__(self, u, sm):
         super(SystemEnclosure, self).__init__(u, sm)
         u = self.u
         try:
-            self.add_field('manufacturer', u.unpack_one("B"), self.fmtstr)
-            self.add_field('enumerated_type', u.unpack_one("B"))
-            self.add_field('chassis_lock_present', bool(bitfields.getbits(self.enumerated_type, 7)), "enumerated_type[7]={}")
-            board_types = {
-                0x01: 'Other',
-                0x02: 'Unknown',
-                0x03: 'Desktop',
-                0x04: 'Low Profile Desktop',
-                0x05: 'Pizza Box',
-                0x06: 'Mini Tower',
-                0x07: 'Tower',
-                0x08: 'Portable',
-                0x09: 'Laptop',
-                0x0A: 'Notebook',
-                0x0B: 'Hand Held',
-                0x0C: 'Docking Station',
-                0x0D: 'All in One',
-                0x0E: 'Sub Notebook',
-                0x0F: 'Space-saving',
-                0x10: 'Lunch Box',
-                0x11: 'Main Server Chassis',
-                0x12: 'Expansion Chassis',
-                0x13: 'SubChassis',
-                0x14: 'Bus Expansion Chassis',
-                0x15: 'Peripheral Chassis',
-                0x16: 'RAID Chassis',
-                0x17: 'Rack Mount Chassis',
-                0x18: 'Sealed-case PC',
-                0x19: 'Multi-system chassis W',
-                0x1A: 'Compact PCI',
-                0x1B: 'Advanced TCA',
-                0x1C: 'Blade',
-                0x1D: 'Blade Enclosure',
-            }
-            self.add_field('system_enclosure_type', bitfields.getbits(self.enumerated_type, 6, 0), unpack.format_table("enumerated_type[6:0]={}", board_types))
-            self.add_field('version', u.unpack_one("B"), self.fmtstr)
-            self.add_field('serial_number', u.unpack_one("B"), self.fmtstr)
-            self.add_field('asset_tag', u.unpack_one("B"), self.fmtstr)
-            minor_version_str = str(sm.header.minor_version) # 34 is .34, 4 is .4, 41 is .41; compare ASCIIbetically to compare initial digits rather than numeric value
-            if self.length > 9:
-                chassis_states = {
-                    0x01: 'Other',
-                    0x02: 'Unknown',
-                    0x03: 'Safe',
-                    0x04: 'Warning',
-                    0x05: 'Critical',
-                    0x06: 'Non-recoverable',
-                }
-                self.add_field('bootup_state', u.unpack_one("B"), unpack.format_table("{}", chassis_states))
-                self.add_field('power_supply_state', u.unpack_one("B"), unpack.format_table("{}", chassis_states))
-                self.add_field('thermal_state', u.unpack_one("B"), unpack.format_table("{}", chassis_states))
-                security_states = {
-                    0x01: 'Other',
-                    0x02: 'Unknown',
-                    0x03: 'None',
-                    0x04: 'External interface locked out',
-                    0x05: 'External interface enabled',
-                }
-                self.add_field('security_status', u.unpack_one("B"), unpack.format_table("{}", security_states))
-            if self.length > 0xd:
-                self.add_field('oem_defined', u.unpack_one("<I"))
-            if self.length > 0x11:
-                self.add_field('height', u.unpack_one("B"))
-                self.add_field('num_power_cords', u.unpack_one("B"))
-                self.add_field('contained_element_count', u.unpack_one("B"))
-                self.add_field('contained_element_length', u.unpack_one("B"))
+            self._layout.unpack(u, self)
             if getattr(self, 'contained_element_count', 0):
                 self.add_field('contained_elements', tuple(SystemEnclosureContainedElement(u, self.contained_element_length) for i in range(self.contained_element_count)))
             if self.length > (0x15 + (getattr(self, 'contained_element_count', 0) * getattr(self, 'contained_element_length', 0))):
@@ -371,12 +589,14 @@ class SystemEnclosure(SmbiosBaseStructure):
             traceback.print_exc()
         self.fini()
 
-class SystemEnclosureContainedElement(unpack.Struct):
+class SystemEnclosureContainedElement(unpack.CompactStruct):
+    __slots__ = ('start_offset', 'raw_data', 'u')
+
     def __init__(self, u, length):
         super(SystemEnclosureContainedElement, self).__init__()
         self.start_offset = u.offset
         self.raw_data = u.unpack_raw(length)
-        self.u = unpack.Unpackable(self.raw_data)
+        self.u = unpack.Unpackable(self.raw_data, views=u.views)
         u = self.u
         self.add_field('contained_element_type', u.unpack_one("B"))
         type_selections = {
@@ -397,94 +617,93 @@ class SystemEnclosureContainedElement(unpack.Struct):
 
 class ProcessorInformation(SmbiosBaseStructure):
     smbios_structure_type = 4
+    __slots__ = ()
+    _processor_types = {
+        0x01: 'Other',
+        0x02: 'Unknown',
+        0x03: 'Central Processor',
+        0x04: 'Math Processor',
+        0x05: 'DSP Processor',
+        0x06: 'Video Processor',
+    }
+    _processor_upgrades = {
+        0x01: 'Other',
+        0x02: 'Unknown',
+        0x03: 'Daughter Board',
+        0x04: 'ZIF Socket',
+        0x05: 'Replaceable Piggy Back',
+        0x06: 'None',
+        0x07: 'LIF Socket',
+        0x08: 'Slot 1',
+        0x09: 'Slot 2',
+        0x0A: '370-pin socket',
+        0x0B: 'Slot A',
+        0x0C: 'Slot M',
+        0x0D: 'Socket 423',
+        0x0E: 'Socket A (Socket 462)',
+        0x0F: 'Socket 478',
+        0x10: 'Socket 754',
+        0x11: 'Socket 940',
+        0x12: 'Socket 939',
+        0x13: 'Socket mPGA604',
+        0x14: 'Socket LGA771',
+        0x15: 'Socket LGA775',
+        0x16: 'Socket S1',
+        0x17: 'Socket AM2',
+        0x18: 'Socket F (1207)',
+        0x19: 'Socket LGA1366',
+        0x1A: 'Socket G34',
+        0x1B: 'Socket AM3',
+        0x1C: 'Socket C32',
+        0x1D: 'Socket LGA1156',
+        0x1E: 'Socket LGA1567',
+        0x1F: 'Socket PGA988A',
+        0x20: 'Socket BGA1288',
+        0x21: 'Socket rPGA988B',
+        0x22: 'Socket BGA1023',
+        0x23: 'Socket BGA1224',
+        0x24: 'Socket BGA1155',
+        0x25: 'Socket LGA1356',
+        0x26: 'Socket LGA2011',
+        0x27: 'Socket FS1',
+        0x28: 'Socket FS2',
+        0x29: 'Socket FM1',
+        0x2A: 'Socket FM2',
+    }
+    _layout = unpack.Layout([
+        ('socket_designation', "B", unpack.format_method("fmtstr")),
+        ('processor_type', "B", unpack.format_table("{}", _processor_types)),
+        ('processor_family', "B"),
+        ('processor_manufacturer', "B", unpack.format_method("fmtstr")),
+        ('processor_id', "<Q"),
+        ('processor_version', "B", unpack.format_method("fmtstr")),
+        ('voltage', "B"),
+        ('external_clock', "<H"),
+        ('max_speed', "<H"),
+        ('current_speed', "<H"),
+        ('status', "B"),
+        ('processor_upgrade', "B", unpack.format_table("{}", _processor_upgrades)),
+        ('l1_cache_handle', "<H"),
+        ('l2_cache_handle', "<H"),
+        ('l3_cache_handle', "<H"),
+        ('serial_number', "B", unpack.format_method("fmtstr")),
+        ('asset_tag', "B", unpack.format_method("fmtstr")),
+        ('part_number', "B", unpack.format_method("fmtstr")),
+        ('core_count', "B"),
+        ('core_enabled', "B"),
+        ('thread_count', "B"),
+        ('processor_characteristics', "<H"),
+        ('processor_family_2', "<H"),
+        ('core_count2', "<H"),
+        ('core_enabled2', "<H"),
+        ('thread_count2', "<H"),
+    ], required=12)
 
     def __init__(self, u, sm):
         super(ProcessorInformation, self).__init__(u, sm)
         u = self.u
         try:
-            self.add_field('socket_designation', u.unpack_one("B"), self.fmtstr)
-            processor_types = {
-                0x01: 'Other',
-                0x02: 'Unknown',
-                0x03: 'Central Processor',
-                0x04: 'Math Processor',
-                0x05: 'DSP Processor',
-                0x06: 'Video Processor',
-            }
-            self.add_field('processor_type', u.unpack_one("B"), unpack.format_table("{}", processor_types))
-            self.add_field('processor_family', u.unpack_one("B"))
-            self.add_field('processor_manufacturer', u.unpack_one("B"), self.fmtstr)
-            self.add_field('processor_id', u.unpack_one("<Q"))
-            self.add_field('processor_version', u.unpack_one("B"), self.fmtstr)
-            self.add_field('voltage', u.unpack_one("B"))
-            self.add_field('external_clock', u.unpack_one("<H"))
-            self.add_field('max_speed', u.unpack_one("<H"))
-            self.add_field('current_speed', u.unpack_one("<H"))
-            self.add_field('status', u.unpack_one("B"))
-            processor_upgrades = {
-                0x01: 'Other',
-                0x02: 'Unknown',
-                0x03: 'Daughter Board',
-                0x04: 'ZIF Socket',
-                0x05: 'Replaceable Piggy Back',
-                0x06: 'None',
-                0x07: 'LIF Socket',
-                0x08: 'Slot 1',
-                0x09: 'Slot 2',
-                0x0A: '370-pin socket',
-                0x0B: 'Slot A',
-                0x0C: 'Slot M',
-                0x0D: 'Socket 423',
-                0x0E: 'Socket A (Socket 462)',
-                0x0F: 'Socket 478',
-                0x10: 'Socket 754',
-                0x11: 'Socket 940',
-                0x12: 'Socket 939',
-                0x13: 'Socket mPGA604',
-                0x14: 'Socket LGA771',
-                0x15: 'Socket LGA775',
-                0x16: 'Socket S1',
-                0x17: 'Socket AM2',
-                0x18: 'Socket F (1207)',
-                0x19: 'Socket LGA1366',
-                0x1A: 'Socket G34',
-                0x1B: 'Socket AM3',
-                0x1C: 'Socket C32',
-                0x1D: 'Socket LGA1156',
-                0x1E: 'Socket LGA1567',
-                0x1F: 'Socket PGA988A',
-                0x20: 'Socket BGA1288',
-                0x21: 'Socket rPGA988B',
-                0x22: 'Socket BGA1023',
-                0x23: 'Socket BGA1224',
-                0x24: 'Socket BGA1155',
-                0x25: 'Socket LGA1356',
-                0x26: 'Socket LGA2011',
-                0x27: 'Socket FS1',
-                0x28: 'Socket FS2',
-                0x29: 'Socket FM1',
-                0x2A: 'Socket FM2',
-            }
-            self.add_field('processor_upgrade', u.unpack_one("B"), unpack.format_table("{}", processor_upgrades))
-            if self.length > 0x1A:
-                self.add_field('l1_cache_handle', u.unpack_one("<H"))
-                self.add_field('l2_cache_handle', u.unpack_one("<H"))
-                self.add_field('l3_cache_handle', u.unpack_one("<H"))
-            if self.length > 0x20:
-                self.add_field('serial_number', u.unpack_one("B"), self.fmtstr)
-                self.add_field('asset_tag', u.unpack_one("B"), self.fmtstr)
-                self.add_field('part_number', u.unpack_one("B"), self.fmtstr)
-            if self.length > 0x24:
-                self.add_field('core_count', u.unpack_one("B"))
-                self.add_field('core_enabled', u.unpack_one("B"))
-                self.add_field('thread_count', u.unpack_one("B"))
-                self.add_field('processor_characteristics', u.unpack_one("<H"))
-            if self.length > 0x28:
-                self.add_field('processor_family_2', u.unpack_one("<H"))
-            if self.length > 0x2A:
-                self.add_field('core_count2', u.unpack_one("<H"))
-                self.add_field('core_enabled2', u.unpack_one("<H"))
-                self.add_field('thread_count2', u.unpack_one("<H"))
+            self._layout.unpack(u, self)
         except:
             self.decode_failure = True
             print "Error parsing Processor Information"
@@ -494,6 +713,7 @@ class ProcessorInformation(SmbiosBaseStructure):
 
 class MemoryControllerInformation(SmbiosBaseStructure): #obsolete starting with v2.1
     smbios_structure_type = 5
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(MemoryControllerInformation, self).__init__(u, sm)
@@ -541,6 +761,7 @@ class MemoryControllerInformation(SmbiosBaseStructure): #obsolete starting with
 
 class MemoryModuleInformation(SmbiosBaseStructure): #obsolete starting with v2.1
     smbios_structure_type = 6
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(MemoryModuleInformation, self).__init__(u, sm)
@@ -573,91 +794,85 @@ class MemoryModuleInformation(SmbiosBaseStructure): #obsolete starting with v2.1
 
 class CacheInformation(SmbiosBaseStructure):
     smbios_structure_type = 7
+    __slots__ = ()
+    _operational_mode = {
+        0b00: 'Write Through',
+        0b01: 'Write Back',
+        0b10: 'Varies with Memory Address',
+        0b11: 'Unknown'
+        }
+    _location = {
+        0b00: 'Internal',
+        0b01: 'External',
+        0b10: 'Reserved',
+        0b11: 'Unknown'
+        }
+    _granularity = {
+        0: '1K granularity',
+        1: '64K granularity'
+        }
+    _error_correction = {
+        0x01: 'Other',
+        0x02: 'Unknown',
+        0x03: 'None',
+        0x04: 'Parity',
+        0x05: 'Single-bit ECC',
+        0x06: 'Multi-bit ECC'
+        }
+    _system_cache_type = {
+        0x01: 'Other',
+        0x02: 'Unknown',
+        0x03: 'Instruction',
+        0x04: 'Data',
+        0x05: 'Unified'
+        }
+    _associativity = {
+        0x01: 'Other',
+        0x02: 'Unknown',
+        0x03: 'Direct Mapped',
+        0x04: '2-way Set-Associative',
+        0x05: '4-way Set-Associative',
+        0x06: 'Fully Associative',
+        0x07: '8-way Set-Associative',
+        0x08: '16-way Set-Associative',
+        0x09: '12-way Set-Associative',
+        0x0A: '24-way Set-Associative',
+        0x0B: '32-way Set-Associative',
+        0x0C: '48-way Set-Associative',
+        0x0D: '64-way Set-Associative',
+        0x0E: '20-way Set-Associative'
+        }
+    _layout = unpack.Layout([
+        ('socket_designation', "B", unpack.format_method("fmtstr")),
+        ('cache_configuration', "<H"),
+        ('operational_mode', unpack.field_bits('cache_configuration', 9, 8), unpack.format_table("cache_configuration[9:8]={}", _operational_mode)),
+        ('enabled_at_boot_time', unpack.field_bit('cache_configuration', 7), "cache_configuration[7]={}"),
+        ('location_relative_to_cpu_module', unpack.field_bits('cache_configuration', 6, 5), unpack.format_table("cache_configuration[6:5]={}", _location)),
+        ('cache_socketed', unpack.field_bit('cache_configuration', 3), "cache_configuration[3]={}"),
+        ('cache_level', unpack.field_bits('cache_configuration', 2, 0), "cache_configuration[2:0]={}"),
+        ('max_cache_size', "<H"),
+        ('max_granularity', unpack.field_bits('cache_configuration', 15), unpack.format_table("max_cache_size[15]={}", _granularity)),
+        ('max_size_in_granularity', unpack.field_bits('cache_configuration', 14, 0), "max_cache_size[14, 0]={}"),
+        ('installed_size', "<H"),
+    ])
+    _sram_layout = unpack.Layout([
+        ('supported_sram_type', "<H"),
+        ('current_sram_type', "<H"),
+        ('cache_speed', "B"),
+        ('error_correction', "B", unpack.format_table("{}", _error_correction)),
+        ('system_cache_type', "B", unpack.format_table("{}", _system_cache_type)),
+        ('associativity', "B", unpack.format_table("{}", _associativity)),
+    ], required=2)
 
     def __init__(self, u, sm):
         super(CacheInformation, self).__init__(u, sm)
         u = self.u
         try:
-            self.add_field('socket_designation', u.unpack_one("B"), self.fmtstr)
-            processor_types = {
-                0x01: 'Other',
-                0x02: 'Unknown',
-                0x03: 'Central Processor',
-                0x04: 'Math Processor',
-                0x05: 'DSP Processor',
-                0x06: 'Video Processor',
-            }
-            self.add_field('cache_configuration', u.unpack_one("<H"))
-            _operational_mode = {
-                0b00: 'Write Through',
-                0b01: 'Write Back',
-                0b10: 'Varies with Memory Address',
-                0b11: 'Unknown'
-                }
-            self.add_field('operational_mode', bitfields.getbits(self.cache_configuration, 9, 8), unpack.format_table("cache_configuration[9:8]={}", _operational_mode))
-            self.add_field('enabled_at_boot_time', bool(bitfields.getbits(self.cache_configuration, 7)), "cache_configuration[7]={}")
-            _location = {
-                0b00: 'Internal',
-                0b01: 'External',
-                0b10: 'Reserved',
-                0b11: 'Unknown'
-                }
-            self.add_field('location_relative_to_cpu_module', bitfields.getbits(self.cache_configuration, 6, 5), unpack.format_table("cache_configuration[6:5]={}", _location))
-            self.add_field('cache_socketed', bool(bitfields.getbits(self.cache_configuration, 3)), "cache_configuration[3]={}")
-            self.add_field('cache_level', bitfields.getbits(self.cache_configuration, 2, 0), "cache_configuration[2:0]={}")
-            self.add_field('max_cache_size', u.unpack_one("<H"))
-            _granularity = {
-                0: '1K granularity',
-                1: '64K granularity'
-                }
-            self.add_field('max_granularity', bitfields.getbits(self.cache_configuration, 15), unpack.format_table("max_cache_size[15]={}", _granularity))
-            self.add_field('max_size_in_granularity', bitfields.getbits(self.cache_configuration, 14, 0), "max_cache_size[14, 0]={}")
-            self.add_field('installed_size', u.unpack_one("<H"))
+            self._layout.unpack(u, self)
             if self.installed_size != 0:
-                self.add_field('installed_granularity', bitfields.getbits(self.cache_configuration, 15), unpack.format_table("installed_size[15]={}", _granularity))
+                self.add_field('installed_granularity', bitfields.getbits(self.cache_configuration, 15), unpack.format_table("installed_size[15]={}", self._granularity))
                 self.add_field('installed_size_in_granularity', bitfields.getbits(self.cache_configuration, 14, 0), "installed_size[14, 0]={}")
-            self.add_field('supported_sram_type', u.unpack_one("<H"))
-            self.add_field('current_sram_type', u.unpack_one("<H"))
-            if self.length > 0x0F:
-                self.add_field('cache_speed', u.unpack_one("B"))
-            if self.length > 0x10:
-                _error_correction = {
-                    0x01: 'Other',
-                    0x02: 'Unknown',
-                    0x03: 'None',
-                    0x04: 'Parity',
-                    0x05: 'Single-bit ECC',
-                    0x06: 'Multi-bit ECC'
-                    }
-                self.add_field('error_correction', u.unpack_one("B"), unpack.format_table("{}", _error_correction))
-            if self.length > 0x10:
-                _system_cache_type = {
-                    0x01: 'Other',
-                    0x02: 'Unknown',
-                    0x03: 'Instruction',
-                    0x04: 'Data',
-                    0x05: 'Unified'
-                    }
-                self.add_field('system_cache_type', u.unpack_one("B"), unpack.format_table("{}", _system_cache_type))
-            if self.length > 0x12:
-                _associativity = {
-                    0x01: 'Other',
-                    0x02: 'Unknown',
-                    0x03: 'Direct Mapped',
-                    0x04: '2-way Set-Associative',
-                    0x05: '4-way Set-Associative',
-                    0x06: 'Fully Associative',
-                    0x07: '8-way Set-Associative',
-                    0x08: '16-way Set-Associative',
-                    0x09: '12-way Set-Associative',
-                    0x0A: '24-way Set-Associative',
-                    0x0B: '32-way Set-Associative',
-                    0x0C: '48-way Set-Associative',
-                    0x0D: '64-way Set-Associative',
-                    0x0E: '20-way Set-Associative'
-                    }
-                self.add_field('associativity', u.unpack_one("B"), unpack.format_table("{}", _associativity))
-
+            self._sram_layout.unpack(u, self)
         except:
             self.decode_failure = True
             print "Error parsing CacheInformation"
@@ -667,6 +882,7 @@ class CacheInformation(SmbiosBaseStructure):
 
 class PortConnectorInfo(SmbiosBaseStructure):
     smbios_structure_type = 8
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(PortConnectorInfo, self).__init__(u, sm)
@@ -768,109 +984,111 @@ class PortConnectorInfo(SmbiosBaseStructure):
 
 class SystemSlots(SmbiosBaseStructure):
     smbios_structure_type = 9
+    __slots__ = ()
+    _slot_types = {
+        0x01: 'Other',
+        0x02: 'Unknown',
+        0x03: 'ISA',
+        0x04: 'MCA',
+        0x05: 'EISA',
+        0x06: 'PCI',
+        0x07: 'PC Card (PCMCIA)',
+        0x08: 'VL-VESA',
+        0x09: 'Proprietary',
+        0x0A: 'Processor Card Slot',
+        0x0B: 'Proprietary Memory Card Slot',
+        0x0C: 'I/O Riser Card Slot',
+        0x0D: 'NuBus',
+        0x0E: 'PCI 66MHz Capable',
+        0x0F: 'AGP',
+        0x10: 'AGP 2X',
+        0x11: 'AGP 4X',
+        0x12: 'PCI-X',
+        0x13: 'AGP 8X',
+        0xA0: 'PC-98/C20',
+        0xA1: 'PC-98/C24',
+        0xA2: 'PC-98/E',
+        0xA3: 'PC-98/Local Bus',
+        0xA4: 'PC-98/Card',
+        0xA5: 'PCI Express',
+        0xA6: 'PCI Express x1',
+        0xA7: 'PCI Express x2',
+        0xA8: 'PCI Express x4',
+        0xA9: 'PCI Express x8',
+        0xAA: 'PCI Express x16',
+        0xAB: 'PCI Express Gen 2',
+        0xAC: 'PCI Express Gen 2 x1',
+        0xAD: 'PCI Express Gen 2 x2',
+        0xAE: 'PCI Express Gen 2 x4',
+        0xAF: 'PCI Express Gen 2 x8',
+        0xB0: 'PCI Express Gen 2 x16',
+        0xB1: 'PCI Express Gen 3',
+        0xB2: 'PCI Express Gen 3 x1',
+        0xB3: 'PCI Express Gen 3 x2',
+        0xB4: 'PCI Express Gen 3 x4',
+        0xB5: 'PCI Express Gen 3 x8',
+        0xB6: 'PCI Express Gen 3 x16',
+    }
+    _slot_data_bus_widths = {
+        0x01: 'Other',
+        0x02: 'Unknown',
+        0x03: '8 bit',
+        0x04: '16 bit',
+        0x05: '32 bit',
+        0x06: '64 bit',
+        0x07: '128 bit',
+        0x08: '1x or x1',
+        0x09: '2x or x2',
+        0x0A: '4x or x4',
+        0x0B: '8x or x8',
+        0x0C: '12x or x12',
+        0x0D: '16x or x16',
+        0x0E: '32x or x32',
+    }
+    _current_usages = {
+        0x01: 'Other',
+        0x02: 'Unknown',
+        0x03: 'Available',
+        0x04: 'In use',
+    }
+    _slot_lengths = {
+        0x01: 'Other',
+        0x02: 'Unknown',
+        0x03: 'Short Length',
+        0x04: 'Long Length',
+    }
+    _layout = unpack.Layout([
+        ('designation', "B", unpack.format_method("fmtstr")),
+        ('slot_type', "B", unpack.format_table("{}", _slot_types)),
+        ('slot_data_bus_width', "B", unpack.format_table("{}", _slot_data_bus_widths)),
+        ('current_usage', "B", unpack.format_table("{}", _current_usages)),
+        ('slot_length', "B", unpack.format_table("{}", _slot_lengths)),
+        ('slot_id', "<H"),
+        ('characteristics1', "B"),
+        ('characteristics_unknown', unpack.field_bit('characteristics1', 0), "characteristics1[0]={}"),
+        ('provides_5_0_volts', unpack.field_bit('characteristics1', 1), "characteristics1[1]={}"),
+        ('provides_3_3_volts', unpack.field_bit('characteristics1', 2), "characteristics1[2]={}"),
+        ('shared_slot', unpack.field_bit('characteristics1', 3), "characteristics1[3]={}"),
+        ('supports_pc_card_16', unpack.field_bit('characteristics1', 4), "characteristics1[4]={}"),
+        ('supports_cardbus', unpack.field_bit('characteristics1', 5), "characteristics1[5]={}"),
+        ('supports_zoom_video', unpack.field_bit('characteristics1', 6), "characteristics1[6]={}"),
+        ('supports_modem_ring_resume', unpack.field_bit('characteristics1', 7), "characteristics1[7]={}"),
+        ('characteristics2', "B"),
+        ('supports_PME', unpack.field_bit('characteristics2', 0), "characteristics2[0]={}"),
+        ('supports_hot_plug', unpack.field_bit('characteristics2', 1), "characteristics2[1]={}"),
+        ('supports_smbus', unpack.field_bit('characteristics2', 2), "characteristics2[2]={}"),
+        ('segment_group_number', "<H"),
+        ('bus_number', "B"),
+        ('device_function_number', "B"),
+        ('device_number', unpack.field_bits('device_function_number', 7, 3), "device_function_number[7:3]={}"),
+        ('function_number', unpack.field_bits('device_function_number', 2, 0), "device_function_number[2:0]={}"),
+    ], required=15)
 
     def __init__(self, u, sm):
         super(SystemSlots, self).__init__(u, sm)
         u = self.u
         try:
-            self.add_field('designation', u.unpack_one("B"), self.fmtstr)
-            _slot_types = {
-                0x01: 'Other',
-                0x02: 'Unknown',
-                0x03: 'ISA',
-                0x04: 'MCA',
-                0x05: 'EISA',
-                0x06: 'PCI',
-                0x07: 'PC Card (PCMCIA)',
-                0x08: 'VL-VESA',
-                0x09: 'Proprietary',
-                0x0A: 'Processor Card Slot',
-                0x0B: 'Proprietary Memory Card Slot',
-                0x0C: 'I/O Riser Card Slot',
-                0x0D: 'NuBus',
-                0x0E: 'PCI 66MHz Capable',
-                0x0F: 'AGP',
-                0x10: 'AGP 2X',
-                0x11: 'AGP 4X',
-                0x12: 'PCI-X',
-                0x13: 'AGP 8X',
-                0xA0: 'PC-98/C20',
-                0xA1: 'PC-98/C24',
-                0xA2: 'PC-98/E',
-                0xA3: 'PC-98/Local Bus',
-                0xA4: 'PC-98/Card',
-                0xA5: 'PCI Express',
-                0xA6: 'PCI Express x1',
-                0xA7: 'PCI Express x2',
-                0xA8: 'PCI Express x4',
-                0xA9: 'PCI Express x8',
-                0xAA: 'PCI Express x16',
-                0xAB: 'PCI Express Gen 2',
-                0xAC: 'PCI Express Gen 2 x1',
-                0xAD: 'PCI Express Gen 2 x2',
-                0xAE: 'PCI Express Gen 2 x4',
-                0xAF: 'PCI Express Gen 2 x8',
-                0xB0: 'PCI Express Gen 2 x16',
-                0xB1: 'PCI Express Gen 3',
-                0xB2: 'PCI Express Gen 3 x1',
-                0xB3: 'PCI Express Gen 3 x2',
-                0xB4: 'PCI Express Gen 3 x4',
-                0xB5: 'PCI Express Gen 3 x8',
-                0xB6: 'PCI Express Gen 3 x16',
-            }
-            self.add_field('slot_type', u.unpack_one("B"), unpack.format_table("{}", _slot_types))
-            _slot_data_bus_widths = {
-                0x01: 'Other',
-                0x02: 'Unknown',
-                0x03: '8 bit',
-                0x04: '16 bit',
-                0x05: '32 bit',
-                0x06: '64 bit',
-                0x07: '128 bit',
-                0x08: '1x or x1',
-                0x09: '2x or x2',
-                0x0A: '4x or x4',
-                0x0B: '8x or x8',
-                0x0C: '12x or x12',
-                0x0D: '16x or x16',
-                0x0E: '32x or x32',
-            }
-            self.add_field('slot_data_bus_width', u.unpack_one('B'), unpack.format_table("{}", _slot_data_bus_widths))
-            _current_usages = {
-                0x01: 'Other',
-                0x02: 'Unknown',
-                0x03: 'Available',
-                0x04: 'In use',
-            }
-            self.add_field('current_usage', u.unpack_one('B'), unpack.format_table("{}", _current_usages))
-            _slot_lengths = {
-                0x01: 'Other',
-                0x02: 'Unknown',
-                0x03: 'Short Length',
-                0x04: 'Long Length',
-            }
-            self.add_field('slot_length', u.unpack_one('B'), unpack.format_table("{}", _slot_lengths))
-            self.add_field('slot_id', u.unpack_one('<H'))
-            self.add_field('characteristics1', u.unpack_one('B'))
-            self.add_field('characteristics_unknown', bool(bitfields.getbits(self.characteristics1, 0)), "characteristics1[0]={}")
-            self.add_field('provides_5_0_volts', bool(bitfields.getbits(self.characteristics1, 1)), "characteristics1[1]={}")
-            self.add_field('provides_3_3_volts', bool(bitfields.getbits(self.characteristics1, 2)), "characteristics1[2]={}")
-            self.add_field('shared_slot', bool(bitfields.getbits(self.characteristics1, 3)), "characteristics1[3]={}")
-            self.add_field('supports_pc_card_16', bool(bitfields.getbits(self.characteristics1, 4)), "characteristics1[4]={}")
-            self.add_field('supports_cardbus', bool(bitfields.getbits(self.characteristics1, 5)), "characteristics1[5]={}")
-            self.add_field('supports_zoom_video', bool(bitfields.getbits(self.characteristics1, 6)), "characteristics1[6]={}")
-            self.add_field('supports_modem_ring_resume', bool(bitfields.getbits(self.characteristics1, 7)), "characteristics1[7]={}")
-            if self.length > 0x0C:
-                self.add_field('characteristics2', u.unpack_one('B'))
-                self.add_field('supports_PME', bool(bitfields.getbits(self.characteristics2, 0)), "characteristics2[0]={}")
-                self.add_field('supports_hot_plug', bool(bitfields.getbits(self.characteristics2, 1)), "characteristics2[1]={}")
-                self.add_field('supports_smbus', bool(bitfields.getbits(self.characteristics2, 2)), "characteristics2[2]={}")
-            if self.length > 0x0D:
-                self.add_field('segment_group_number', u.unpack_one('<H'))
-                self.add_field('bus_number', u.unpack_one('B'))
-                self.add_field('device_function_number', u.unpack_one('B'))
-                self.add_field('device_number', bitfields.getbits(self.device_function_number, 7, 3), "device_function_number[7:3]={}")
-                self.add_field('function_number', bitfields.getbits(self.device_function_number, 2, 0), "device_function_number[2:0]={}")
+            self._layout.unpack(u, self)
         except:
             self.decodeFailure = True
             print "Error parsing SystemSlots"
@@ -880,6 +1098,7 @@ class SystemSlots(SmbiosBaseStructure):
 
 class OnBoardDevicesInformation(SmbiosBaseStructure):
     smbios_structure_type = 10
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(OnBoardDevicesInformation, self).__init__(u, sm)
@@ -910,6 +1129,7 @@ class OnBoardDevicesInformation(SmbiosBaseStructure):
 
 class OEMStrings(SmbiosBaseStructure):
     smbios_structure_type = 11
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(OEMStrings, self).__init__(u, sm)
@@ -925,6 +1145,7 @@ class OEMStrings(SmbiosBaseStructure):
 
 class SystemConfigOptions(SmbiosBaseStructure):
     smbios_structure_type = 12
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(SystemConfigOptions, self).__init__(u, sm)
@@ -940,6 +1161,7 @@ class SystemConfigOptions(SmbiosBaseStructure):
 
 class BIOSLanguageInformation(SmbiosBaseStructure):
     smbios_structure_type = 13
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(BIOSLanguageInformation, self).__init__(u, sm)
@@ -961,6 +1183,7 @@ class BIOSLanguageInformation(SmbiosBaseStructure):
 
 class GroupAssociations(SmbiosBaseStructure):
     smbios_structure_type = 14
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(GroupAssociations, self).__init__(u, sm)
@@ -978,6 +1201,7 @@ class GroupAssociations(SmbiosBaseStructure):
 
 class SystemEventLog(SmbiosBaseStructure):
     smbios_structure_type = 15
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(SystemEventLog, self).__init__(u, sm)
@@ -1027,7 +1251,9 @@ class SystemEventLog(SmbiosBaseStructure):
             traceback.print_exc()
         self.fini()
 
-class EventLogDescriptor(unpack.Struct):
+class EventLogDescriptor(unpack.CompactStruct):
+    __slots__ = ()
+
     @staticmethod
     def _unpack(u):
         _event_log_type_descriptors = {
@@ -1074,59 +1300,56 @@ class EventLogDescriptor(unpack.Struct):
 
 class PhysicalMemoryArray(SmbiosBaseStructure):
     smbios_structure_type = 16
+    __slots__ = ()
+    _location_field = {
+        0x01: "Other",
+        0x02: "Unknown",
+        0x03: "System board or motherboard",
+        0x04: "ISA add-on card",
+        0x05: "EISA add-on card",
+        0x06: "PCI add-on card",
+        0x07: "MCA add-on card",
+        0x08: "PCMCIA add-on card",
+        0x09: "Proprietary add-on card",
+        0x0A: "NuBus",
+        0xA0: "PC-98/C20 add-on card",
+        0xA1: "PC-98/C24 add-on card",
+        0xA2: "PC-98/E add-on card",
+        0xA3: "PC-98/Local bus add-on card"
+        }
+    _use = {
+        0x01: "Other",
+        0x02: "Unknown",
+        0x03: "System memory",
+        0x04: "Video memory",
+        0x05: "Flash memory",
+        0x06: "Non-volatile RAM",
+        0x07: "Cache memory"
+        }
+    _error_correction = {
+        0x01: "Other",
+        0x02: "Unknown",
+        0x03: "None",
+        0x04: "Parity",
+        0x05: "Single-bit ECC",
+        0x06: "Multi-bit ECC",
+        0x07: "CRC"
+        }
+    _layout = unpack.Layout([
+        ('location', "B", unpack.format_table("{}", _location_field)),
+        ('use', "B", unpack.format_table("{}", _use)),
+        ('memory_error_correction', "B", unpack.format_table("{}", _error_correction)),
+        ('maximum_capacity', "<I"),
+        ('memory_error_information_handle', "<H"),
+        ('num_memory_devices', "<H"),
+        ('extended_maximum_capacity', "<Q"),
+    ], required=0)
 
     def __init__(self, u, sm):
         super(PhysicalMemoryArray, self).__init__(u, sm)
         u = self.u
         try:
-            if self.length > 0x4:
-                _location_field = {
-                    0x01: "Other",
-                    0x02: "Unknown",
-                    0x03: "System board or motherboard",
-                    0x04: "ISA add-on card",
-                    0x05: "EISA add-on card",
-                    0x06: "PCI add-on card",
-                    0x07: "MCA add-on card",
-                    0x08: "PCMCIA add-on card",
-                    0x09: "Proprietary add-on card",
-                    0x0A: "NuBus",
-                    0xA0: "PC-98/C20 add-on card",
-                    0xA1: "PC-98/C24 add-on card",
-                    0xA2: "PC-98/E add-on card",
-                    0xA3: "PC-98/Local bus add-on card"
-                    }
-                self.add_field('location', u.unpack_one("B"), unpack.format_table("{}", _location_field))
-            if self.length > 0x05:
-                _use = {
-                    0x01: "Other",
-                    0x02: "Unknown",
-                    0x03: "System memory",
-                    0x04: "Video memory",
-                    0x05: "Flash memory",
-                    0x06: "Non-volatile RAM",
-                    0x07: "Cache memory"
-                    }
-                self.add_field('use', u.unpack_one('B'), unpack.format_table("{}", _use))
-            if self.length > 0x06:
-                _error_correction = {
-                    0x01: "Other",
-                    0x02: "Unknown",
-                    0x03: "None",
-                    0x04: "Parity",
-                    0x05: "Single-bit ECC",
-                    0x06: "Multi-bit ECC",
-                    0x07: "CRC"
-                    }
-                self.add_field('memory_error_correction', u.unpack_one('B'), unpack.format_table("{}", _error_correction))
-            if self.length > 0x07:
-                self.add_field('maximum_capacity', u.unpack_one('<I'))
-            if self.length > 0x0B:
-                self.add_field('memory_error_information_handle', u.unpack_one('<H'))
-            if self.length > 0x0D:
-                self.add_field('num_memory_devices', u.unpack_one('<H'))
-            if self.length > 0x0F:
-                self.add_field('extended_maximum_capacity', u.unpack_one('<Q'))
+            self._layout.unpack(u, self)
         except:
             self.decodeFailure = True
             print "Error parsing PhysicalMemoryArray"
@@ -1136,88 +1359,81 @@ class PhysicalMemoryArray(SmbiosBaseStructure):
 
 class MemoryDevice(SmbiosBaseStructure):
     smbios_structure_type = 17
+    __slots__ = ()
+    _form_factors = {
+        0x01: 'Other',
+        0x02: 'Unknown',
+        0x03: 'SIMM',
+        0x04: 'SIP',
+        0x05: 'Chip',
+        0x06: 'DIP',
+        0x07: 'ZIP',
+        0x08: 'Proprietary Card',
+        0x09: 'DIMM',
+        0x0A: 'TSOP',
+        0x0B: 'Row of chips',
+        0x0C: 'RIMM',
+        0x0D: 'SODIMM',
+        0x0E: 'SRIMM',
+        0x0F: 'FB-DIMM'
+        }
+    _memory_types = {
+        0x01: 'Other',
+        0x02: 'Unknown',
+        0x03: 'DRAM',
+        0x04: 'EDRAM',
+        0x05: 'VRAM',
+        0x06: 'SRAM',
+        0x07: 'RAM',
+        0x08: 'ROM',
+        0x09: 'FLASH',
+        0x0A: 'EEPROM',
+        0x0B: 'FEPROM',
+        0x0C: 'EPROM',
+        0x0D: 'CDRAM',
+        0x0E: '3DRAM',
+        0x0F: 'SDRAM',
+        0x10: 'SGRAM',
+        0x11: 'RDRAM',
+        0x12: 'DDR',
+        0x13: 'DDR2',
+        0x14: 'DDR2 FB-DIMM',
+        xrange(0x15, 0x17): 'Reserved',
+        0x18: 'DDR3',
+        0x19: 'FBD2'
+        }
+    _layout = unpack.Layout([
+        ('physical_memory_array_handle', "<H"),
+        ('memory_error_information_handle', "<H"),
+        ('total_width', "<H"),
+        ('data_width', "<H"),
+        ('size', "<H"),
+        ('form_factor', "B", unpack.format_table("{}", _form_factors)),
+        ('device_set', "B"),
+        ('device_locator', "B", unpack.format_method("fmtstr")),
+        ('bank_locator', "B", unpack.format_method("fmtstr")),
+        ('memory_type', "B", unpack.format_table("{}", _memory_types)),
+        ('type_detail', "<H"),
+        ('speed', "<H"),
+        ('manufacturer', "B", unpack.format_method("fmtstr")),
+        ('serial_number', "B", unpack.format_method("fmtstr")),
+        ('asset_tag', "B", unpack.format_method("fmtstr")),
+        ('part_number', "B", unpack.format_method("fmtstr")),
+        ('attributes', "B"),
+        ('rank', unpack.field_bits('attributes', 3, 0), "attributes[3:0]={}"),
+    ], required=0)
+    _voltage_layout = unpack.Layout([
+        ('configured_memory_clock_speed', "<H"),
+        ('minimum_voltage', "<H"),
+        ('maximum_voltage', "<H"),
+        ('configured_voltage', "<H"),
+    ], required=0)
 
     def __init__(self, u, sm):
         super(MemoryDevice, self).__init__(u, sm)
         u = self.u
         try:
-            if self.length > 0x4:
-                self.add_field('physical_memory_array_handle', u.unpack_one("<H"))
-            if self.length > 0x6:
-                self.add_field('memory_error_information_handle', u.unpack_one("<H"))
-            if self.length > 0x8:
-                self.add_field('total_width', u.unpack_one("<H"))
-            if self.length > 0xA:
-                self.add_field('data_width', u.unpack_one("<H"))
-            if self.length > 0xC:
-                self.add_field('size', u.unpack_one("<H"))
-            if self.length > 0xE:
-                _form_factors = {
-                    0x01: 'Other',
-                    0x02: 'Unknown',
-                    0x03: 'SIMM',
-                    0x04: 'SIP',
-                    0x05: 'Chip',
-                    0x06: 'DIP',
-                    0x07: 'ZIP',
-                    0x08: 'Proprietary Card',
-                    0x09: 'DIMM',
-                    0x0A: 'TSOP',
-                    0x0B: 'Row of chips',
-                    0x0C: 'RIMM',
-                    0x0D: 'SODIMM',
-                    0x0E: 'SRIMM',
-                    0x0F: 'FB-DIMM'
-                    }
-                self.add_field('form_factor', u.unpack_one("B"), unpack.format_table("{}", _form_factors))
-            if self.length > 0xF:
-                self.add_field('device_set', u.unpack_one("B"))
-            if self.length > 0x10:
-                self.add_field('device_locator', u.unpack_one("B"), self.fmtstr)
-            if self.length > 0x11:
-                self.add_field('bank_locator', u.unpack_one("B"), self.fmtstr)
-            if self.length > 0x12:
-                _memory_types = {
-                    0x01: 'Other',
-                    0x02: 'Unknown',
-                    0x03: 'DRAM',
-                    0x04: 'EDRAM',
-                    0x05: 'VRAM',
-                    0x06: 'SRAM',
-                    0x07: 'RAM',
-                    0x08: 'ROM',
-                    0x09: 'FLASH',
-                    0x0A: 'EEPROM',
-                    0x0B: 'FEPROM',
-                    0x0C: 'EPROM',
-                    0x0D: 'CDRAM',
-                    0x0E: '3DRAM',
-                    0x0F: 'SDRAM',
-                    0x10: 'SGRAM',
-                    0x11: 'RDRAM',
-                    0x12: 'DDR',
-                    0x13: 'DDR2',
-                    0x14: 'DDR2 FB-DIMM',
-                    xrange(0x15, 0x17): 'Reserved',
-                    0x18: 'DDR3',
-                    0x19: 'FBD2'
-                    }
-                self.add_field('memory_type', u.unpack_one("B"), unpack.format_table("{}", _memory_types))
-            if self.length > 0x13:
-                self.add_field('type_detail', u.unpack_one('<H'))
-            if self.length > 0x15:
-                self.add_field('speed', u.unpack_one("<H"))
-            if self.length > 0x17:
-                self.add_field('manufacturer', u.unpack_one("B"), self.fmtstr)
-            if self.length > 0x18:
-                self.add_field('serial_number', u.unpack_one("B"), self.fmtstr)
-            if self.length > 0x19:
-                self.add_field('asset_tag', u.unpack_one("B"), self.fmtstr)
-            if self.length > 0x1A:
-                self.add_field('part_number', u.unpack_one("B"), self.fmtstr)
-            if self.length > 0x1B:
-                self.add_field('attributes', u.unpack_one("B"))
-                self.add_field('rank', bitfields.getbits(self.attributes, 3, 0), "attributes[3:0]={}")
+            self._layout.unpack(u, self)
             if self.length > 0x1C:
                 if self.size == 0x7FFF:
                     self.add_field('extended_size', u.unpack_one('<I'))
@@ -1225,13 +1441,7 @@ class MemoryDevice(SmbiosBaseStructure):
                 else:
                     u.skip(4)
             if self.length > 0x20:
-                self.add_field('configured_memory_clock_speed', u.unpack_one("<H"))
-            if self.length > 0x22:
-                self.add_field('minimum_voltage', u.unpack_one("<H"))
-            if self.length > 0x24:
-                self.add_field('maximum_voltage', u.unpack_one("<H"))
-            if self.length > 0x26:
-                self.add_field('configured_voltage', u.unpack_one("<H"))
+                self._voltage_layout.unpack(u, self)
         except:
             self.decodeFailure = True
             print "Error parsing MemoryDevice"
@@ -1241,6 +1451,7 @@ class MemoryDevice(SmbiosBaseStructure):
 
 class MemoryErrorInfo32Bit(SmbiosBaseStructure):
     smbios_structure_type = 18
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(MemoryErrorInfo32Bit, self).__init__(u, sm)
@@ -1298,20 +1509,20 @@ class MemoryErrorInfo32Bit(SmbiosBaseStructure):
 
 class MemoryArrayMappedAddress(SmbiosBaseStructure):
     smbios_structure_type = 19
+    __slots__ = ()
+    _layout = unpack.Layout([
+        # if FFFF FFFF: address stored in Extended Starting Address
+        ('starting_address', "<I"),
+        ('ending_address', "<I"),
+        ('memory_array_handle', "<H"),
+        ('partition_width', "B"),
+    ], required=0)
 
     def __init__(self, u, sm):
         super(MemoryArrayMappedAddress, self).__init__(u, sm)
         u = self.u
         try:
-            if self.length > 0x4:
-                self.add_field('starting_address', u.unpack_one("<I"))
-                # if FFFF FFFF: address stored in Extended Starting Address
-            if self.length > 0x8:
-                self.add_field('ending_address', u.unpack_one("<I"))
-            if self.length > 0xC:
-                self.add_field('memory_array_handle', u.unpack_one("<H"))
-            if self.length > 0xE:
-                self.add_field('partition_width', u.unpack_one("B"))
+            self._layout.unpack(u, self)
             if self.length > 0xF:
                 # valid if starting_address = FFFF FFFF
                 if self.starting_address == 0xFFFFFFFF:
@@ -1330,6 +1541,7 @@ class MemoryArrayMappedAddress(SmbiosBaseStructure):
 
 class MemoryDeviceMappedAddress(SmbiosBaseStructure):
     smbios_structure_type = 20
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(MemoryDeviceMappedAddress, self).__init__(u, sm)
@@ -1367,6 +1579,7 @@ class MemoryDeviceMappedAddress(SmbiosBaseStructure):
 
 class BuiltInPointingDevice(SmbiosBaseStructure):
     smbios_structure_type = 21
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(BuiltInPointingDevice, self).__init__(u, sm)
@@ -1411,6 +1624,7 @@ class BuiltInPointingDevice(SmbiosBaseStructure):
 
 class PortableBattery(SmbiosBaseStructure):
     smbios_structure_type = 22
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(PortableBattery, self).__init__(u, sm)
@@ -1477,6 +1691,7 @@ class PortableBattery(SmbiosBaseStructure):
 
 class SystemReset(SmbiosBaseStructure):
     smbios_structure_type = 23
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(SystemReset, self).__init__(u, sm)
@@ -1511,6 +1726,7 @@ class SystemReset(SmbiosBaseStructure):
 
 class HardwareSecurity(SmbiosBaseStructure):
     smbios_structure_type = 24
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(HardwareSecurity, self).__init__(u, sm)
@@ -1537,6 +1753,7 @@ class HardwareSecurity(SmbiosBaseStructure):
 
 class SystemPowerControls(SmbiosBaseStructure):
     smbios_structure_type = 25
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(SystemPowerControls, self).__init__(u, sm)
@@ -1557,6 +1774,7 @@ class SystemPowerControls(SmbiosBaseStructure):
 
 class VoltageProbe(SmbiosBaseStructure):
     smbios_structure_type = 26
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(VoltageProbe, self).__init__(u, sm)
@@ -1612,6 +1830,7 @@ class VoltageProbe(SmbiosBaseStructure):
 
 class CoolingDevice(SmbiosBaseStructure):
     smbios_structure_type = 27
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(CoolingDevice, self).__init__(u, sm)
@@ -1661,6 +1880,7 @@ class CoolingDevice(SmbiosBaseStructure):
 
 class TemperatureProbe(SmbiosBaseStructure):
     smbios_structure_type = 28
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(TemperatureProbe, self).__init__(u, sm)
@@ -1720,6 +1940,7 @@ class TemperatureProbe(SmbiosBaseStructure):
 
 class ElectricalCurrentProbe(SmbiosBaseStructure):
     smbios_structure_type = 29
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(ElectricalCurrentProbe, self).__init__(u, sm)
@@ -1779,6 +2000,7 @@ class ElectricalCurrentProbe(SmbiosBaseStructure):
 
 class OutOfBandRemoteAccess(SmbiosBaseStructure):
     smbios_structure_type = 30
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(OutOfBandRemoteAccess, self).__init__(u, sm)
@@ -1799,31 +2021,35 @@ class OutOfBandRemoteAccess(SmbiosBaseStructure):
 
 class BootIntegrityServicesEntryPoint(SmbiosBaseStructure):
     smbios_structure_type = 31
+    __slots__ = ()
 
 class SystemBootInformation(SmbiosBaseStructure):
     smbios_structure_type = 32
+    __slots__ = ()
+    _boot_status = {
+        0: 'No errors detected',
+        1: 'No bootable media',
+        2: '"normal" operating system failed to load',
+        3: 'Firmware-detected hardware failure, including "unknown" failure types',
+        4: 'Operating system-detected hardware failure',
+        5: 'User-requested boot, usually through a keystroke',
+        6: 'System security violation',
+        7: 'Previously-requested image',
+        8: 'System watchdog timer expired, causing the system to reboot',
+        xrange(9,127): 'Reserved for future assignment',
+        xrange(128, 191): 'Vendor/OEM-specific implementations',
+        xrange(192, 255): 'Product-specific implementations'
+        }
+    _layout = unpack.Layout([
+        (None, "6x"),
+        ('boot_status', "B", unpack.format_table("{}", _boot_status)),
+    ], required=0)
 
     def __init__(self, u, sm):
         super(SystemBootInformation, self).__init__(u, sm)
         u = self.u
         try:
-            if self.length > 0xA:
-                u.skip(6)
-                _boot_status = {
-                    0: 'No errors detected',
-                    1: 'No bootable media',
-                    2: '"normal" operating system failed to load',
-                    3: 'Firmware-detected hardware failure, including "unknown" failure types',
-                    4: 'Operating system-detected hardware failure',
-                    5: 'User-requested boot, usually through a keystroke',
-                    6: 'System security violation',
-                    7: 'Previously-requested image',
-                    8: 'System watchdog timer expired, causing the system to reboot',
-                    xrange(9,127): 'Reserved for future assignment',
-                    xrange(128, 191): 'Vendor/OEM-specific implementations',
-                    xrange(192, 255): 'Product-specific implementations'
-                    }
-                self.add_field('boot_status', u.unpack_one("B"), unpack.format_table("{}", _boot_status))
+            self._layout.unpack(u, self)
         except:
             self.decodeFailure = True
             print "Error parsing SystemBootInformation"
@@ -1833,6 +2059,7 @@ class SystemBootInformation(SmbiosBaseStructure):
 
 class MemoryErrorInfo64Bit(SmbiosBaseStructure):
     smbios_structure_type = 33
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(MemoryErrorInfo64Bit, self).__init__(u, sm)
@@ -1890,6 +2117,7 @@ class MemoryErrorInfo64Bit(SmbiosBaseStructure):
 
 class ManagementDevice(SmbiosBaseStructure):
     smbios_structure_type = 34
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(ManagementDevice, self).__init__(u, sm)
@@ -1934,6 +2162,7 @@ class ManagementDevice(SmbiosBaseStructure):
 
 class ManagementDeviceComponent(SmbiosBaseStructure):
     smbios_structure_type = 35
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(ManagementDeviceComponent, self).__init__(u, sm)
@@ -1956,6 +2185,7 @@ class ManagementDeviceComponent(SmbiosBaseStructure):
 
 class ManagementDeviceThresholdData(SmbiosBaseStructure):
     smbios_structure_type = 36
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(ManagementDeviceThresholdData, self).__init__(u, sm)
@@ -1982,6 +2212,7 @@ class ManagementDeviceThresholdData(SmbiosBaseStructure):
 
 class MemoryChannel(SmbiosBaseStructure):
     smbios_structure_type = 37
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(MemoryChannel, self).__init__(u, sm)
@@ -2012,6 +2243,7 @@ class MemoryChannel(SmbiosBaseStructure):
 
 class IPMIDeviceInformation(SmbiosBaseStructure):
     smbios_structure_type = 38
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(IPMIDeviceInformation, self).__init__(u, sm)
@@ -2063,6 +2295,7 @@ class IPMIDeviceInformation(SmbiosBaseStructure):
 
 class SystemPowerSupply(SmbiosBaseStructure):
     smbios_structure_type = 39
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(SystemPowerSupply, self).__init__(u, sm)
@@ -2136,6 +2369,7 @@ class SystemPowerSupply(SmbiosBaseStructure):
 
 class AdditionalInformation(SmbiosBaseStructure):
     smbios_structure_type = 40
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(AdditionalInformation, self).__init__(u, sm)
@@ -2158,6 +2392,7 @@ class AdditionalInformation(SmbiosBaseStructure):
 
 class OnboardDevicesExtendedInformation(SmbiosBaseStructure):
     smbios_structure_type = 41
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(OnboardDevicesExtendedInformation, self).__init__(u, sm)
@@ -2200,6 +2435,7 @@ class OnboardDevicesExtendedInformation(SmbiosBaseStructure):
 
 class ManagementControllerHostInterface(SmbiosBaseStructure):
     smbios_structure_type = 42
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(ManagementControllerHostInterface, self).__init__(u, sm)
@@ -2230,6 +2466,7 @@ class ManagementControllerHostInterface(SmbiosBaseStructure):
 
 class Inactive(SmbiosBaseStructure):
     smbios_structure_type = 126
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(Inactive, self).__init__(u, sm)
@@ -2237,6 +2474,7 @@ class Inactive(SmbiosBaseStructure):
 
 class EndOfTable(SmbiosBaseStructure):
     smbios_structure_type = 127
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(EndOfTable, self).__init__(u, sm)
@@ -2244,6 +2482,7 @@ class EndOfTable(SmbiosBaseStructure):
 
 class SmbiosStructureUnknown(SmbiosBaseStructure):
     smbios_structure_type = None
+    __slots__ = ()
 
     def __init__(self, u, sm):
         super(SmbiosStructureUnknown, self).__init__(u, sm)
@@ -2298,19 +2537,23 @@ _smbios_structures = [
     SmbiosStructureUnknown, # Must always come last
 ]
 
+_smbios_registry = unpack.StructRegistry(_smbios_structures, 'smbios_structure_type')
+
 def log_smbios_info():
+    import redirect
+    import ttypager
     with redirect.logonly():
         try:
-            sm = SMBIOS()
+            sm = SMBIOS(lazy=True)
             print
             if sm is None:
                 print "No SMBIOS structures found"
                 return
             output = {}
             known_types = (0, 1)
-            for sm_struct in sm.structures:
-                if sm_struct.type in known_types:
-                    output.setdefault(sm_struct.type, []).append(sm_struct)
+            for i, entry in enumerate(sm.index):
+                if entry.type in known_types:
+                    output.setdefault(entry.type, []).append(sm.structures[i])
                     if len(output) == len(known_types):
                         break
 
@@ -2324,25 +2567,33 @@ def log_smbios_info():
             traceback.print_exc()
 
 def dump_raw():
+    import bits.hexdump
+    from cStringIO import StringIO
+    import ttypager
     try:
         sm = SMBIOS()
         if sm:
-            s = "SMBIOS -- Raw bytes and structure decode.\n\n"
+            out = StringIO()
+            out.write("SMBIOS -- Raw bytes and structure decode.\n\n")
 
-            s += str(sm.header) + '\n'
-            s += bits.dumpmem(sm._header_memory) + '\n'
+            out.write(str(sm.header) + '\n')
+            bits.hexdump.hexdump(sm._header_memory, out)
+            out.write('\n')
 
-            s += "Raw bytes for the SMBIOS structures\n"
-            s += bits.dumpmem(sm._structure_memory) + '\n'
+            out.write("Raw bytes for the SMBIOS structures\n")
+            bits.hexdump.hexdump(sm._structure_memory, out)
+            out.write('\n')
 
             for sm_struct in sm.structures:
-                s += str(sm_struct) + '\n'
-                s += bits.dumpmem(sm_struct.raw_data)
+                out.write(str(sm_struct) + '\n')
+                bits.hexdump.hexdump(sm_struct.raw_data, out)
 
-                s += "Strings:\n"
+                out.write("Strings:\n")
                 for n in range(1, len(getattr(sm_struct, "strings", [])) + 1):
-                    s += str(sm_struct.fmtstr(n)) + '\n'
-                s += bits.dumpmem(sm_struct.raw_strings) + '\n'
+                    out.write(str(sm_struct.fmtstr(n)) + '\n')
+                bits.hexdump.hexdump(sm_struct.raw_strings, out)
+                out.write('\n')
+            s = out.getvalue()
         else:
             s = "No SMBIOS structures found"
         ttypager.ttypager_wrap(s, indent=False)
@@ -2352,6 +2603,7 @@ def dump_raw():
         traceback.print_exc()
 
 def dump():
+    import ttypager
     try:
         sm = SMBIOS()
         if sm:
@@ -2366,7 +2618,7 @@ def dump():
 
 def annex_a_conformance():
     try:
-        sm = SMBIOS()
+        sm = SMBIOS(lazy=True)
 
         # check: 1. The table anchor string "_SM_" is present in the address range 0xF0000 to 0xFFFFF on a 16-byte bound
 
@@ -2387,15 +2639,14 @@ def annex_a_conformance():
 
         def req_structures():
             '''Checks for required structures and corresponding data'''
-            types_present = [sm.structures[x].smbios_structure_type for x in range(len(sm.structures))]
             required = [0, 1, 4, 7, 9, 16, 17, 19, 31, 32]
             for s in required:
-                if s not in set(types_present):
+                if s not in sm.type_index:
                     print "Failure: Type {} required but not found".format(s)
 
                 else:
                     if s == 0:
-                        if types_present.count(s) > 1:
+                        if len(sm.type_index[s]) > 1:
                             print "Failure: Type {} - One and only one structure of this type must be present.".format(s)
                         if sm.structure_type(s).length < 0x18:
                             print "Failure: Type {} - The structure Length field must be at least 0x18".format(s)
@@ -2406,7 +2657,7 @@ def annex_a_conformance():
                         if bitfields.getbits(sm.structure_type(s).characteristics, 3, 0) != 0 or bitfields.getbits(sm.structure_type(s).characteristics, 31, 4) == 0:
                             print "Failure: Type {} - BIOS Characteristics: bits 3:0 must all be 0, and at least one of bits 31:4 must be set to 1.".format(s)
                     elif s == 1:
-                        if types_present.count(s) > 1:
+                        if len(sm.type_index[s]) > 1:
                             print "Failure: Type {} - One and only one structure of this type must be present.".format(s)
                         if sm.structure_type(s).length < 0x1B:
                             print "Failure: Type {} - The structure Length field must be at least 0x1B".format(s)
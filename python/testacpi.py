@@ -28,12 +28,22 @@
 
 import acpi
 import bits
+import bits.integrity
 import bits.mwait
 import struct
 import testutil
 import testsuite
 import time
 
+def cached_evaluation(f):
+    """Decorator to run a test with the ACPI evaluation cache enabled"""
+    def wrapper(*args, **kwargs):
+        with acpi.cached_evaluation():
+            return f(*args, **kwargs)
+    wrapper.__name__ = f.__name__
+    wrapper.__doc__ = f.__doc__
+    return wrapper
+
 def register_tests():
     testsuite.add_test("ACPI _MAT (Multiple APIC Table Entry) under Processor objects", test_mat, submenu="ACPI Tests")
     testsuite.add_test("ACPI _PSS (Pstate) table conformance tests", test_pss, submenu="ACPI Tests")
@@ -46,12 +56,12 @@ def register_tests():
     testsuite.add_test("ACPI RSDP (Root System Description Pointer Structure)", test_rsdp, submenu="ACPI Tests")
     testsuite.add_test("ACPI XSDT (Extended System Description Table)", test_xsdt, submenu="ACPI Tests")
 
+@cached_evaluation
 def test_mat():
-    cpupaths = acpi.get_cpupaths()
-    apic = acpi.parse_apic()
-    procid_apicid = apic.procid_apicid
-    uid_x2apicid = apic.uid_x2apicid
-    for cpupath in cpupaths:
+    cpumap = acpi.get_cpumap()
+    procid_apicid = cpumap.procid_apicid
+    uid_x2apicid = cpumap.uid_x2apicid
+    for cpupath in cpumap.cpupaths:
         # Find the ProcId defined by the processor object
         processor = acpi.evaluate(cpupath)
         # Find the UID defined by the processor object's _UID method
@@ -84,6 +94,7 @@ def test_mat():
                         testsuite.print_detail("{} x2ApicId derived from MADT ({:#02x}) != _MAT x2ApicId ({:#02x})".format(cpupath, uid_x2apicid[subtable.uid], subtable.x2apicid))
                         testsuite.print_detail("_MAT entry[{}]: {}".format(index, subtable))
 
+@cached_evaluation
 def test_pss():
     uniques = acpi.parse_cpu_method("_PSS")
     # We special-case None here to avoid a double-failure for CPUs without a _PSS
@@ -114,28 +125,16 @@ def test_pss():
         dissipations = [p.power for p in pss.pstates]
         testsuite.test("_PSS must list Pstates in descending order of power dissipation", dissipations == sorted(dissipations, reverse=True))
 
+@cached_evaluation
 def test_pstates():
     """Execute and verify frequency for each Pstate in the _PSS"""
     IA32_PERF_CTL = 0x199
     with bits.mwait.use_hint(), bits.preserve_msr(IA32_PERF_CTL):
-        cpupath_procid = acpi.find_procid()
-        cpupath_uid = acpi.find_uid()
-        apic = acpi.parse_apic()
-        procid_apicid = apic.procid_apicid
-        uid_x2apicid = apic.uid_x2apicid
+        cpumap = acpi.get_cpumap()
         def cpupath_apicid(cpupath):
-            if procid_apicid is not None:
-                procid = cpupath_procid.get(cpupath, None)
-                if procid is not None:
-                    apicid = procid_apicid.get(procid, None)
-                    if apicid is not None:
-                        return apicid
-            if uid_x2apicid is not None:
-                uid = cpupath_uid.get(cpupath, None)
-                if uid is not None:
-                    apicid = uid_x2apicid.get(uid, None)
-                    if apicid is not None:
-                        return apicid
+            apicid = cpumap.cpupath_apicid.get(cpupath, None)
+            if apicid is not None:
+                return apicid
             return bits.cpus()[0]
 
         bclk = testutil.adjust_to_nearest(bits.bclk(), 100.0/12) * 1000000
@@ -186,6 +185,7 @@ def test_pstates():
                 else:
                     testsuite.test("P{}: measured frequency {} MHz == expected {} MHz".format(n, aperf, pstate.core_frequency), aperf == pstate.core_frequency)
 
+@cached_evaluation
 def test_psd_thread_scope():
     uniques = acpi.parse_cpu_method("_PSD")
     if not testsuite.test("_PSD (P-State Dependency) must exist for each processor", None not in uniques):
@@ -224,7 +224,7 @@ def test_psd_thread_scope():
     detail(unique_num_processors, 'num_processors = {} (Expected 1)')
 
 def test_table_checksum(data):
-    csum = sum(ord(c) for c in data) % 0x100
+    csum = bits.integrity.sum8(data)
     testsuite.test('ACPI table cumulative checksum must equal 0', csum == 0)
     testsuite.print_detail("Cumulative checksum = {} (Expected 0)".format(csum))
 
@@ -268,7 +268,7 @@ def test_rsdp():
         return
 
     # Checksum the first 20 bytes per ACPI 1.0
-    csum = sum(ord(c) for c in data[:20]) % 0x100
+    csum = bits.integrity.sum8(data, 0, 20)
     testsuite.test('ACPI 1.0 table first 20 bytes cummulative checksum must equal 0', csum == 0)
     testsuite.print_detail("Cummulative checksum = {} (Expected 0)".format(csum))
 
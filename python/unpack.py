@@ -26,6 +26,8 @@
 
 """unpack module."""
 
+import bisect
+import bitfields
 from collections import OrderedDict
 import struct
 
@@ -33,8 +35,16 @@ class UnpackError(Exception):
     pass
 
 class Unpackable(object):
-    def __init__(self, data, offset=0, size=None):
+    """Unpack binary data from a str or buffer.
+
+    By default, raw bytes unpacked from an Unpackable get returned as str
+    copies.  Pass views=True to return read-only buffer views into data
+    instead, so that nested structures share one underlying buffer and only
+    copy their bytes when a caller explicitly converts them with str().
+    Unpackables created via unpack_unpackable inherit this setting."""
+    def __init__(self, data, offset=0, size=None, views=False):
         self.data = data
+        self.views = views
         data_size = len(data)
         if offset > data_size:
             raise UnpackError("Unpackable.__init__: offset={} but len(data)={}".format(offset, data_size))
@@ -78,31 +88,36 @@ class Unpackable(object):
     def unpack_peek_one(self, fmt):
         return self.unpack_peek(fmt)[0]
 
+    def _raw(self, start, end):
+        if self.views:
+            return buffer(self.data, start, end - start)
+        return self.data[start:end]
+
     def unpack_peek_raw(self, size):
-        """Peek at the specified number of bytes as a str"""
+        """Peek at the specified number of bytes as a str (or buffer view)"""
         self._check_unpack(size)
-        return self.data[self.offset:self.offset+size]
+        return self._raw(self.offset, self.offset+size)
 
     def unpack_peek_rest(self):
-        """Peek at the remainder of the unpackable as a str"""
-        return self.data[self.offset:self.size]
+        """Peek at the remainder of the unpackable as a str (or buffer view)"""
+        return self._raw(self.offset, self.size)
 
     def unpack_raw(self, size):
-        """Unpack the specified number of bytes as a str"""
+        """Unpack the specified number of bytes as a str (or buffer view)"""
         self._check_unpack(size)
         old_offset = self.offset
         self.offset += size
-        return self.data[old_offset:self.offset]
+        return self._raw(old_offset, self.offset)
 
     def unpack_rest(self):
-        """Return the remainder of the unpackable as a str"""
+        """Return the remainder of the unpackable as a str (or buffer view)"""
         offset = self.offset
         self.offset = self.size
-        return self.data[offset:self.size]
+        return self._raw(offset, self.size)
 
     def unpack_unpackable(self, size):
-        """Unpack the specified number of bytes as an Unpackable"""
-        u = Unpackable(self.data, self.offset, size)
+        """Unpack the specified number of bytes as an Unpackable sharing the same data"""
+        u = Unpackable(self.data, self.offset, size, self.views)
         self.offset += size
         return u
 
@@ -112,7 +127,17 @@ class Unpackable(object):
 class StructError(Exception):
     pass
 
+def _default_format(value):
+    """Return the formatter add_field uses for value when not given one"""
+    if isinstance(value, (int, long)) and not isinstance(value, bool):
+        return _format_hex
+    elif isinstance(value, buffer):
+        return format_buffer
+    return _format_repr
+
 class Struct(object):
+    __slots__ = ()
+
     def __init__(self):
         self.fields = OrderedDict()
 
@@ -127,10 +152,7 @@ class Struct(object):
         if hasattr(self, name):
             raise StructError("Internal error: Duplicate Struct field name {}".format(name))
         if fmt is None:
-            if isinstance(value, (int, long)) and not isinstance(value, bool):
-                fmt = "{:#x}".format
-            else:
-                fmt = "{!r}".format
+            fmt = _default_format(value)
         elif isinstance(fmt, str):
             fmt = fmt.format
         elif not callable(fmt):
@@ -158,38 +180,323 @@ class Struct(object):
     def __hash__(self):
         return hash(tuple((name, getattr(self, name)) for name in self.fields.iterkeys()))
 
-def format_each(fmt_one):
-    def f(it):
+class Schema(object):
+    """Field names and formatters shared by all CompactStruct instances with the same fields.
+
+    The schemas of a CompactStruct subclass form a tree rooted at an empty
+    schema; extend returns the child schema with one more field, creating and
+    caching it the first time.  Each schema caches at most max_children
+    children, so formatters that never compare equal (such as a closure
+    created per instance) cost sharing but don't grow the tree without
+    bound."""
+    __slots__ = ('names', 'fmts', 'index', 'hash', '_children')
+    max_children = 64
+
+    def __init__(self, names=(), fmts=()):
+        self.names = names
+        self.fmts = fmts
+        self.index = dict((name, i) for i, name in enumerate(names))
+        self.hash = hash(names)
+        self._children = {}
+
+    def extend(self, name, key, fmt):
+        """Return the schema with the additional field name, formatted by fmt.
+
+        key identifies fmt for sharing: fields added with equal names and
+        keys share a single schema."""
+        try:
+            return self._children[name, key]
+        except KeyError:
+            pass
+        except TypeError:
+            return Schema(self.names + (name,), self.fmts + (fmt,))
+        child = Schema(self.names + (name,), self.fmts + (fmt,))
+        if len(self._children) < self.max_children:
+            self._children[name, key] = child
+        return child
+
+class CompactStruct(Struct):
+    """Struct that stores its field names and formatters in a class-level Schema.
+
+    Instances hold only their schema and a list of field values, rather
+    than an OrderedDict of formatters and an instance attribute per field.
+    Fields remain readable as attributes.  Formatters should not vary per
+    instance: pass format strings, format_method, bound methods of the
+    Struct itself (stored as the equivalent format_method), or formatters
+    such as format_table that compare equal when built from equal
+    arguments.
+
+    Subclasses should declare __slots__ for any non-field attributes they
+    set, or leave out __slots__ to get an instance __dict__ for them."""
+    __slots__ = ('_schema', '_values')
+
+    def __init__(self):
+        cls = type(self)
+        root = cls.__dict__.get('_root_schema')
+        if root is None:
+            root = cls._root_schema = Schema()
+        self._schema = root
+        self._values = []
+
+    def __getattr__(self, name):
+        if name in ('_schema', '_values'):
+            raise AttributeError(name)
+        try:
+            return self._values[self._schema.index[name]]
+        except KeyError:
+            raise AttributeError("{!r} object has no attribute {!r}".format(type(self).__name__, name))
+
+    @property
+    def fields(self):
+        return OrderedDict((name, self._formatter(i)) for i, name in enumerate(self._schema.names))
+
+    def add_field(self, name, value, fmt=None):
+        if hasattr(self, name):
+            raise StructError("Internal error: Duplicate Struct field name {}".format(name))
+        key = fmt
+        if fmt is None:
+            fmt = key = _default_format(value)
+        elif isinstance(fmt, str):
+            fmt = fmt.format
+        elif getattr(fmt, '__self__', None) is self:
+            fmt = key = format_method(fmt.__name__)
+        elif not callable(fmt) and not isinstance(fmt, format_method):
+            raise StructError("Internal error: Expected a format string or callable, but got: {}".format(fmt))
+        self._schema = self._schema.extend(name, key, fmt)
+        self._values.append(value)
+
+    def _formatter(self, i):
+        fmt = self._schema.fmts[i]
+        if isinstance(fmt, format_method):
+            return getattr(self, fmt.name)
+        return fmt
+
+    def format_field(self, name):
+        i = self._schema.index[name]
+        return self._formatter(i)(self._values[i])
+
+    def __repr__(self):
+        return "{}({})".format(self.__class__.__name__, ", ".join("{}={}".format(name, self._formatter(i)(value)) for i, (name, value) in enumerate(zip(self._schema.names, self._values))))
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        return (self._schema is other._schema or self._schema.names == other._schema.names) and self._values == other._values
+
+    def __hash__(self):
+        return hash((self._schema.hash, tuple(self._values)))
+
+def format_buffer(value):
+    """Format a buffer view the same way as the equivalent str"""
+    return repr(str(value))
+
+_format_hex = "{:#x}".format
+_format_repr = "{!r}".format
+
+class _formatter(object):
+    """Base class for formatters that compare equal when constructed with equal arguments.
+
+    This allows CompactStruct instances to share the schema for fields
+    formatted by separately constructed but equivalent formatters."""
+    def __init__(self, *args):
+        self.args = args
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        return self.args == other.args
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((type(self),) + tuple(arg for arg in self.args if not isinstance(arg, dict)))
+
+class format_each(_formatter):
+    def __init__(self, fmt_one):
+        super(format_each, self).__init__(fmt_one)
+
+    def __call__(self, it):
+        fmt_one, = self.args
         return "({})".format(", ".join(fmt_one.format(i) for i in it))
-    return f
 
 format_each_hex = format_each("{:#x}")
 
-def format_table(fmt, table, default='Reserved'):
-    def f(value):
+class format_table(_formatter):
+    def __init__(self, fmt, table, default='Reserved'):
+        super(format_table, self).__init__(fmt, table, default)
+
+    def __call__(self, value):
+        fmt, table, default = self.args
         return "{} ({})".format(fmt.format(value), table.get(value, default))
-    return f
 
-def format_function(fmt, function):
-    def f(value):
+class format_function(_formatter):
+    def __init__(self, fmt, function):
+        super(format_function, self).__init__(fmt, function)
+
+    def __call__(self, value):
+        fmt, function = self.args
         return "{} ({})".format(fmt.format(value), function(value))
-    return f
 
-def reserved_None(fmt="{!r}"):
-    def f(value):
+class reserved_None(_formatter):
+    def __init__(self, fmt="{!r}"):
+        super(reserved_None, self).__init__(fmt)
+
+    def __call__(self, value):
+        fmt, = self.args
         if value is None:
             return "Reserved"
         return fmt.format(value)
+
+class format_method(_formatter):
+    """Format a field using the named method of the Struct containing it"""
+    def __init__(self, name):
+        super(format_method, self).__init__(name)
+        self.name = name
+
+def field_bits(name, msb, lsb=None):
+    """Derive a Layout field from the bitfield [msb:lsb] (or [msb] if lsb is None) of field name"""
+    def f(s):
+        return bitfields.getbits(getattr(s, name), msb, lsb)
+    return f
+
+def field_bit(name, bit):
+    """Derive a boolean Layout field from the specified bit of field name"""
+    def f(s):
+        return bool(bitfields.getbits(getattr(s, name), bit))
     return f
 
+class converted(object):
+    """Layout field format whose unpacked value gets passed through function.
+
+    For example, converted("16s", lambda b: uuid.UUID(bytes_le=b))."""
+    def __init__(self, fmt, function):
+        self.fmt = fmt
+        self.function = function
+
+class Layout(object):
+    """Declarative, compiled layout of the fields at the start of a record.
+
+    fields should consist of a list of (name, fmt) or (name, fmt, formatter)
+    tuples, in the order the fields appear.  fmt gives the struct format of
+    the field; layouts always unpack little-endian, so fmt should either
+    omit the byte-order prefix or use "<".  A format that produces multiple values yields a tuple.  A
+    name of None skips the corresponding bytes.  If fmt is callable, the field
+    gets derived rather than unpacked: unpack calls fmt with the Struct after
+    adding all the preceding fields, and adds the result.  If fmt is a
+    converted, the field unpacks using its format and adds the result of its
+    function.  formatter works as for Struct.add_field, and may also be a
+    format_method.
+
+    The fields get compiled into a single struct.Struct, so unpack decodes
+    the whole layout with one call.  The first required fields (by default,
+    all of them) must exist; any fields after those only get decoded if the
+    unpackable has enough data remaining for them, for records whose length
+    determines which trailing fields they contain."""
+    def __init__(self, fields, required=None):
+        self.fields = []
+        self.ends = []
+        self._codes = []
+        offset = 0
+        value_index = 0
+        for field in fields:
+            name, fmt = field[:2]
+            formatter = field[2] if len(field) > 2 else None
+            if callable(fmt):
+                self.fields.append((name, fmt, None, 0, None, formatter))
+                self.ends.append(offset)
+                continue
+            convert = None
+            if isinstance(fmt, converted):
+                fmt, convert = fmt.fmt, fmt.function
+            fmt = fmt.lstrip("<")
+            size = struct.calcsize("<" + fmt)
+            count = len(struct.unpack("<" + fmt, "\0" * size))
+            offset += size
+            self._codes.append((fmt, offset))
+            if name is not None:
+                self.fields.append((name, None, value_index, count, convert, formatter))
+                self.ends.append(offset)
+            value_index += count
+        if required is None:
+            required = len(self.fields)
+        self.required = required
+        self.struct = struct.Struct("<" + "".join(fmt for fmt, end in self._codes))
+        self.size = self.struct.size
+        self._prefixes = {}
+
+    def _prefix(self, available):
+        """Return the number of fields that fit in available bytes, and the compiled struct for them"""
+        n = bisect.bisect_right(self.ends, available)
+        st = self._prefixes.get(n)
+        if st is None:
+            end = self.ends[n - 1] if n else 0
+            st = struct.Struct("<" + "".join(fmt for fmt, fmt_end in self._codes if fmt_end <= end))
+            self._prefixes[n] = st
+        return n, st
+
+    def unpack(self, u, s):
+        """Unpack the fields of the layout from the unpackable u, and add them to the Struct s"""
+        available = u.size - u.offset
+        if available >= self.size:
+            n, st = len(self.fields), self.struct
+        else:
+            n, st = self._prefix(available)
+            if n < self.required:
+                u._check_unpack(self.ends[self.required - 1])
+        try:
+            values = st.unpack_from(u.data, u.offset)
+        except struct.error as e:
+            raise UnpackError("Layout.unpack: " + str(e))
+        u.offset += st.size
+        for name, derive, index, count, convert, formatter in self.fields[:n]:
+            if derive is not None:
+                value = derive(s)
+            elif count == 1:
+                value = values[index]
+            else:
+                value = values[index:index+count]
+            if convert is not None:
+                value = convert(value)
+            if isinstance(formatter, format_method):
+                formatter = getattr(s, formatter.name)
+            s.add_field(name, value, formatter)
+
+class StructRegistry(object):
+    """Map the type value at the start of each record to the Struct subclass that decodes it.
+
+    structs should consist of a list of Struct subclasses, each of which
+    identifies the record type it decodes via the class attribute named by
+    type_attr.  A class with a type of None serves as the catch-all for any
+    type not otherwise registered.  fmt gives the format used to peek at the
+    type value of the next record."""
+    def __init__(self, structs, type_attr, fmt="B"):
+        self.fmt = fmt
+        self.types = {}
+        self.default = None
+        for s in structs:
+            t = getattr(s, type_attr)
+            if t is None:
+                if self.default is None:
+                    self.default = s
+            else:
+                self.types.setdefault(t, s)
+
+    def lookup(self, u):
+        """Return the Struct subclass for the next record in the unpackable u, or None"""
+        return self.types.get(u.unpack_peek_one(self.fmt), self.default)
+
 def unpack_all(u, structs, *args):
     """Keep constructing structs from the unpackable u until it runs out of data.
 
-    structs should consist of a list of Struct subclasses to be tried in order.
-    Each of them should return None from their constructor if they're not the
-    correct type to unpack the next chunk of data.  Any catch-all generic
-    structure should apepar last in the list.  Raises a StructError if no
-    struct matches."""
+    structs should consist of either a StructRegistry, or a list of Struct
+    subclasses to be tried in order.  For a list, each of them should return
+    None from their constructor if they're not the correct type to unpack the
+    next chunk of data, and any catch-all generic structure should appear last
+    in the list.  Raises a StructError if no struct matches."""
     def _substructs():
         while not u.at_end():
             for s in structs:
@@ -199,4 +506,13 @@ def unpack_all(u, structs, *args):
                     break
             else:
                 raise StructError("Internal error: unable to unpack any structure at byte {} of unpackable".format(u.offset))
+    def _registered_substructs():
+        while not u.at_end():
+            s = structs.lookup(u)
+            temp = None if s is None else s(u, *args)
+            if temp is None:
+                raise StructError("Internal error: unable to unpack any structure at byte {} of unpackable".format(u.offset))
+            yield temp
+    if isinstance(structs, StructRegistry):
+        return tuple(_registered_substructs())
     return tuple(_substructs())
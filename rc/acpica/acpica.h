@@ -42,11 +42,15 @@ SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #pragma GCC diagnostic error "-Wunused-parameter"
 
 extern bool acpica_cpus_initialized;
+extern bool acpi_unsafe_io;
+extern struct acpi_io_trace acpi_io_trace;
 extern U32 acpica_cpus_init_caps;
 
 asmlinkage bool acpica_early_init(void);
 extern asmlinkage ACPI_STATUS (*AcpiOsReadPort_ptr)(ACPI_IO_ADDRESS Address, UINT32 *Value, UINT32 Width);
 extern asmlinkage ACPI_STATUS (*AcpiOsWritePort_ptr)(ACPI_IO_ADDRESS Address, UINT32 Value, UINT32 Width);
+asmlinkage ACPI_STATUS AcpiOsReadPortNative(ACPI_IO_ADDRESS Address, UINT32 *Value, UINT32 Width);
+asmlinkage ACPI_STATUS AcpiOsWritePortNative(ACPI_IO_ADDRESS Address, UINT32 Value, UINT32 Width);
 asmlinkage bool acpica_init(void);
 asmlinkage void acpica_terminate(void);
 bool IsEnabledProcessor(ACPI_HANDLE ObjHandle);
@@ -50,6 +50,7 @@
 #endif
 
 #include "portable.h"
+#include "smprc.h"
 
 #include "acpi.h"
 #include "accommon.h"
@@ -671,6 +672,103 @@ AcpiOsWritePciConfiguration (
 }
 
 
+/* When false, AML port reads return all ones and writes do nothing. */
+bool acpi_unsafe_io = true;
+
+/* Ring of recent AML port I/O, enabled by setting entries and size; python/acpi.py
+ * mirrors these layouts. */
+#define ACPI_IO_TRACE_READ 0
+#define ACPI_IO_TRACE_WRITE 1
+
+struct acpi_io_trace_entry {
+    U64 tsc;
+    U32 value;
+    U16 port;
+    U8 width;
+    U8 direction;
+};
+
+struct acpi_io_trace {
+    U64 count;
+    struct acpi_io_trace_entry *entries;
+    U32 size;
+    U32 next;
+};
+
+struct acpi_io_trace acpi_io_trace;
+
+static void acpi_io_trace_record(ACPI_IO_ADDRESS Address, UINT32 Value, UINT32 Width, U8 Direction)
+{
+    struct acpi_io_trace_entry *entry;
+
+    if (!acpi_io_trace.entries || !acpi_io_trace.size)
+        return;
+    entry = &acpi_io_trace.entries[acpi_io_trace.next];
+    entry->tsc = rdtsc64();
+    entry->value = Value;
+    entry->port = Address;
+    entry->width = Width;
+    entry->direction = Direction;
+    if (++acpi_io_trace.next >= acpi_io_trace.size)
+        acpi_io_trace.next = 0;
+    acpi_io_trace.count++;
+}
+
+
+/******************************************************************************
+ *
+ * FUNCTION:    AcpiOsReadPortNative, AcpiOsWritePortNative
+ *
+ * PARAMETERS:  Address             - Address of I/O port/register
+ *              Value               - Where value is placed, or value to write
+ *              Width               - Number of bits
+ *
+ * RETURN:      Status
+ *
+ * DESCRIPTION: Default port I/O handlers, which access the port directly
+ *              without calling back into Python.
+ *
+ *****************************************************************************/
+
+asmlinkage ACPI_STATUS AcpiOsReadPortNative(ACPI_IO_ADDRESS Address, UINT32 *Value, UINT32 Width)
+{
+    switch (Width) {
+    case 8:
+        *Value = acpi_unsafe_io ? grub_inb(Address) : 0xFF;
+        break;
+    case 16:
+        *Value = acpi_unsafe_io ? grub_inw(Address) : 0xFFFF;
+        break;
+    case 32:
+        *Value = acpi_unsafe_io ? grub_inl(Address) : 0xFFFFFFFF;
+        break;
+    default:
+        return AE_BAD_PARAMETER;
+    }
+    return AE_OK;
+}
+
+asmlinkage ACPI_STATUS AcpiOsWritePortNative(ACPI_IO_ADDRESS Address, UINT32 Value, UINT32 Width)
+{
+    if (Width != 8 && Width != 16 && Width != 32)
+        return AE_BAD_PARAMETER;
+    if (!acpi_unsafe_io)
+        return AE_OK;
+    switch (Width) {
+    case 8:
+        grub_outb(Value, Address);
+        break;
+    case 16:
+        grub_outw(Value, Address);
+        break;
+    case 32:
+        grub_outl(Value, Address);
+        break;
+    }
+    return AE_OK;
+}
+
+
 /******************************************************************************
  *
  * FUNCTION:    AcpiOsReadPort
@@ -685,11 +783,15 @@ AcpiOsWritePciConfiguration (
  *
  *****************************************************************************/
 
-asmlinkage ACPI_STATUS (*AcpiOsReadPort_ptr)(ACPI_IO_ADDRESS Address, UINT32 *Value, UINT32 Width);
+asmlinkage ACPI_STATUS (*AcpiOsReadPort_ptr)(ACPI_IO_ADDRESS Address, UINT32 *Value, UINT32 Width) = AcpiOsReadPortNative;
 
 ACPI_STATUS AcpiOsReadPort(ACPI_IO_ADDRESS Address, UINT32 *Value, UINT32 Width)
 {
-    return AcpiOsReadPort_ptr(Address, Value, Width);
+    ACPI_STATUS Status = AcpiOsReadPort_ptr(Address, Value, Width);
+
+    if (ACPI_SUCCESS(Status))
+        acpi_io_trace_record(Address, *Value, Width, ACPI_IO_TRACE_READ);
+    return Status;
 }
 
 
@@ -707,11 +809,15 @@ ACPI_STATUS AcpiOsReadPort(ACPI_IO_ADDRESS Address, UINT32 *Value, UINT32 Width)
  *
  *****************************************************************************/
 
-asmlinkage ACPI_STATUS (*AcpiOsWritePort_ptr)(ACPI_IO_ADDRESS Address, UINT32 Value, UINT32 Width);
+asmlinkage ACPI_STATUS (*AcpiOsWritePort_ptr)(ACPI_IO_ADDRESS Address, UINT32 Value, UINT32 Width) = AcpiOsWritePortNative;
 
 ACPI_STATUS AcpiOsWritePort(ACPI_IO_ADDRESS Address, UINT32 Value, UINT32 Width)
 {
-    return AcpiOsWritePort_ptr(Address, Value, Width);
+    ACPI_STATUS Status = AcpiOsWritePort_ptr(Address, Value, Width);
+
+    if (ACPI_SUCCESS(Status))
+        acpi_io_trace_record(Address, Value, Width, ACPI_IO_TRACE_WRITE);
+    return Status;
 }
 
 
@@ -34,8 +34,6 @@ SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #include "acpica.h"
 #include "acpimodule.h"
 
-extern bool acpi_unsafe_io;
-
 static PyObject *acpi_object_to_python(ACPI_OBJECT *obj)
 {
     if (obj == NULL)
@@ -432,6 +430,11 @@ static asmlinkage ACPI_STATUS wrap_AcpiGetTableByIndex(UINT32 TableIndex, ACPI_T
     return AcpiGetTableByIndex(TableIndex, OutTable);
 }
 
+static asmlinkage ACPI_STATUS wrap_AcpiGetType(ACPI_HANDLE Object, ACPI_OBJECT_TYPE *OutType)
+{
+    return AcpiGetType(Object, OutType);
+}
+
 static asmlinkage ACPI_STATUS wrap_AcpiInstallInterface(ACPI_STRING InterfaceName)
 {
     return AcpiInstallInterface(InterfaceName);
@@ -495,6 +498,10 @@ PyMODINIT_FUNC init_acpi_module(void)
     PyModule_AddObject(m, "acpica_terminate", PyLong_FromVoidPtr(acpica_terminate));
     PyModule_AddObject(m, "AcpiOsReadPort_ptrptr", PyLong_FromVoidPtr(&AcpiOsReadPort_ptr));
     PyModule_AddObject(m, "AcpiOsWritePort_ptrptr", PyLong_FromVoidPtr(&AcpiOsWritePort_ptr));
+    PyModule_AddObject(m, "AcpiOsReadPortNative", PyLong_FromVoidPtr(AcpiOsReadPortNative));
+    PyModule_AddObject(m, "AcpiOsWritePortNative", PyLong_FromVoidPtr(AcpiOsWritePortNative));
+    PyModule_AddObject(m, "acpi_unsafe_io", PyLong_FromVoidPtr(&acpi_unsafe_io));
+    PyModule_AddObject(m, "acpi_io_trace", PyLong_FromVoidPtr(&acpi_io_trace));
     PyModule_AddObject(m, "ACPI_FREE", PyLong_FromVoidPtr(wrap_ACPI_FREE));
     PyModule_AddObject(m, "AcpiFormatException", PyLong_FromVoidPtr(wrap_AcpiFormatException));
     PyModule_AddObject(m, "AcpiGetHandle", PyLong_FromVoidPtr(wrap_AcpiGetHandle));
@@ -502,6 +509,7 @@ PyMODINIT_FUNC init_acpi_module(void)
     PyModule_AddObject(m, "AcpiGetObjectInfo", PyLong_FromVoidPtr(wrap_AcpiGetObjectInfo));
     PyModule_AddObject(m, "AcpiGetTable", PyLong_FromVoidPtr(wrap_AcpiGetTable));
     PyModule_AddObject(m, "AcpiGetTableByIndex", PyLong_FromVoidPtr(wrap_AcpiGetTableByIndex));
+    PyModule_AddObject(m, "AcpiGetType", PyLong_FromVoidPtr(wrap_AcpiGetType));
     PyModule_AddObject(m, "AcpiInstallInterface", PyLong_FromVoidPtr(wrap_AcpiInstallInterface));
     PyModule_AddObject(m, "AcpiLoadTable", PyLong_FromVoidPtr(wrap_AcpiLoadTable));
     PyModule_AddObject(m, "AcpiOsGetRootPointer", PyLong_FromVoidPtr(wrap_AcpiOsGetRootPointer));